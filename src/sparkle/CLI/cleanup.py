@@ -4,12 +4,16 @@
 import re
 import math
 import sys
+import json
 import argparse
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+import pandas as pd
 from runrunner.base import Status
 
-from sparkle.structures import PerformanceDataFrame, FeatureDataFrame
+from sparkle.structures import PerformanceDataFrame, FeatureDataFrame, FeatureCache
 
 from sparkle.CLI.help import logging as sl
 from sparkle.CLI.help import global_variables as gv
@@ -37,19 +41,102 @@ def parser_function() -> argparse.ArgumentParser:
         *ac.CleanUpFeatureDataArgument.names,
         **ac.CleanUpFeatureDataArgument.kwargs,
     )
+    parser.add_argument(
+        *ac.CleanUpFeatureCacheArgument.names,
+        **ac.CleanUpFeatureCacheArgument.kwargs,
+    )
+    parser.add_argument(
+        *ac.CleanUpScenarioIndexArgument.names,
+        **ac.CleanUpScenarioIndexArgument.kwargs,
+    )
     return parser
 
 
-def check_logs_performance_data(performance_data: PerformanceDataFrame) -> int:
+def harvest_log(
+    log: Path, pattern: re.Pattern, offset: int = 0
+) -> tuple[list[tuple[int, dict[str, str]]], int]:
+    """Stream a log file from an offset and collect all lines matching a pattern.
+
+    Args:
+        log: The log file to read.
+        pattern: The compiled regex to match each line against.
+        offset: The byte offset from which to start reading.
+
+    Returns:
+        The offset and named groups of each matching line, and the offset up to
+        which the file was read. Incomplete last lines are not read, so they are
+        harvested on a later call.
+    """
+    matches = []
+    try:
+        with log.open("rb") as fin:
+            fin.seek(offset)
+            for line in fin:
+                if not line.endswith(b"\n"):  # Line is still being written
+                    break
+                match = pattern.match(line.decode(errors="replace").rstrip())
+                if match:
+                    matches.append((offset, match.groupdict()))
+                offset += len(line)
+    except FileNotFoundError:  # Log was removed in the meantime
+        pass
+    return matches, offset
+
+
+def harvest_logs(
+    log_files: list[Path], pattern: re.Pattern, offsets: dict[str, int] = None
+) -> tuple[list[tuple[str, int, dict[str, str]]], dict[str, int]]:
+    """Collect all lines matching a pattern from log files using a thread pool.
+
+    Args:
+        log_files: The log files to harvest.
+        pattern: The compiled regex to match each line against.
+        offsets: The offsets up to which each log was harvested before. Logs are
+            only read from their offset onwards. If None, all logs are read
+            completely.
+
+    Returns:
+        The log, line offset and named groups of each match, in order of the log
+        files, and the offsets up to which each log has now been read.
+    """
+    offsets = {} if offsets is None else dict(offsets)
+
+    def harvest(log: Path) -> tuple[list[tuple[int, dict[str, str]]], int]:
+        """Harvest a single log from its known offset."""
+        offset = offsets.get(str(log), 0)
+        try:
+            if log.stat().st_size < offset:  # File was rewritten, start over
+                offset = 0
+        except FileNotFoundError:
+            return [], offset
+        return harvest_log(log, pattern, offset)
+
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(harvest, log_files))
+    matches = []
+    for log, (log_matches, offset) in zip(log_files, results):
+        matches.extend((str(log), line, groups) for line, groups in log_matches)
+        offsets[str(log)] = offset
+    return matches, offsets
+
+
+def check_logs_performance_data(
+    performance_data: PerformanceDataFrame, index_path: Path = None
+) -> int:
     """Check if the performance data is missing values that can be extracted from the logs.
 
+    Only cells that are currently missing a value are filled.
+
     Args:
         performance_data (PerformanceDataFrame): The performance data.
+        index_path: Path to a JSON file with the offsets up to which each log was
+            harvested. Logs are only read from their offset onwards, and the index
+            is updated once the values are saved. If None, all logs are read
+            completely.
 
     Returns:
         int: The number of updated values.
     """
-    # empty_indices = performance_data.empty_indices
     pattern = re.compile(
         r"^(?P<objective>\S+)\s*,\s*"
         r"(?P<instance>\S+)\s*,\s*"
@@ -65,35 +152,81 @@ def check_logs_performance_data(performance_data: PerformanceDataFrame) -> int:
         for f in gv.settings().DEFAULT_log_output.glob("**/*")
         if f.is_file() and f.suffix == ".out"
     ]
+    offsets: dict[str, int] = {}
+    if index_path is not None and index_path.exists():
+        try:
+            offsets = json.loads(index_path.read_text())
+        except json.JSONDecodeError:  # Corrupted index, harvest everything again
+            offsets = {}
+    matches, offsets = harvest_logs(log_files, pattern, offsets)
     count = 0
-    for log in log_files:
-        for line in log.read_text().splitlines():
-            match = pattern.match(line)
-            if match:
-                objective = match.group("objective")
-                instance = match.group("instance")
-                run_id = int(match.group("run_id"))
-                solver = match.group("solver")
-                config_id = match.group("config_id")
-                target_value = match.group("target_value")
-                current_value = performance_data.get_value(
-                    solver, instance, config_id, objective, run_id
-                )
-                # TODO: Would be better to extract all nan indices from PDF and check against this?
-                if (
-                    (
-                        isinstance(current_value, (int, float))
-                        and math.isnan(current_value)
-                    )
-                    or isinstance(current_value, str)
-                    and current_value == "nan"
-                ):
-                    performance_data.set_value(
-                        target_value, solver, instance, config_id, objective, run_id
-                    )
-                    count += 1
+    if matches:
+        harvested = pd.DataFrame(
+            [{"log": log, "line": line, **groups} for log, line, groups in matches]
+        )
+        harvested = harvested[harvested["run_id"].str.isdigit()]
+        harvested["run_id"] = harvested["run_id"].astype(int)
+        # Restrict to cells that exist in the PerformanceDataFrame
+        known = pd.MultiIndex.from_frame(
+            harvested[["objective", "instance", "run_id"]]
+        ).isin(performance_data.index) & pd.MultiIndex.from_arrays(
+            [
+                harvested["solver"],
+                harvested["config_id"],
+                [PerformanceDataFrame.column_value] * len(harvested),
+            ]
+        ).isin(performance_data.columns)
+        # Lines of unknown cells are harvested again once the cells are added
+        unknown = harvested.loc[~known].groupby("log")["line"].min()
+        for log, line in unknown.items():
+            offsets[log] = min(offsets[log], line)
+        count = fill_performance_data(performance_data, harvested.loc[known])
+        if count:
+            performance_data.save_csv()
+    if index_path is not None:  # Only once the harvested values have been saved
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.write_text(json.dumps(offsets))
+    return count
+
+
+def fill_performance_data(
+    performance_data: PerformanceDataFrame, harvested: pd.DataFrame
+) -> int:
+    """Fill the missing cells of the performance data with harvested values.
+
+    Args:
+        performance_data: The performance data.
+        harvested: The harvested lines of cells in the performance data.
+
+    Returns:
+        The number of updated values.
+    """
+    if harvested.empty:
+        return 0
+    # Later lines take precedence over earlier lines
+    harvested = harvested.drop_duplicates(
+        subset=["objective", "instance", "run_id", "solver", "config_id"], keep="last"
+    )
+    # Pivot to the layout of the PerformanceDataFrame
+    harvested = harvested.set_index(
+        ["objective", "instance", "run_id", "solver", "config_id"]
+    )["target_value"].unstack(["solver", "config_id"])
+    harvested.columns = pd.MultiIndex.from_tuples(
+        [
+            (solver, config_id, PerformanceDataFrame.column_value)
+            for solver, config_id in harvested.columns
+        ],
+        names=PerformanceDataFrame.multi_column_names,
+    )
+    harvested.index.names = PerformanceDataFrame.multi_index_names
+    current = performance_data.loc[harvested.index, harvested.columns]
+    # Only fill currently missing cells for which the logs have a value
+    missing = (current.isna() | (current == "nan")) & harvested.notna()
+    count = int(missing.to_numpy().sum())
     if count:
-        performance_data.save_csv()
+        performance_data.loc[harvested.index, harvested.columns] = current.mask(
+            missing, harvested
+        )
     return count
 
 
@@ -188,7 +321,9 @@ def main(argv: list[str]) -> None:
         performance_data = PerformanceDataFrame(
             gv.settings().DEFAULT_performance_data_path
         )
-        count = check_logs_performance_data(performance_data)
+        count = check_logs_performance_data(
+            performance_data, gv.settings().DEFAULT_log_harvest_index
+        )
         print(
             f"Extracted {count} values from the logs and placed them in the PerformanceDataFrame."
         )
@@ -267,6 +402,14 @@ def main(argv: list[str]) -> None:
         # TODO: Can do other cleanup like index verification and empty line removal etc
         # For example, we can check if each index references a valid instance, if not, remove the line
 
+    if args.feature_cache:
+        FeatureCache(gv.settings().DEFAULT_feature_cache_dir).clear()
+        print("Cleared the feature extraction cache!")
+
+    if args.scenario_index:
+        index = gv.scenario_index(rebuild=True)
+        print(f"Rebuilt the scenario index with {len(index)} scenarios!")
+
     if args.all:
         shutil.rmtree(gv.settings().DEFAULT_output, ignore_errors=True)
         snh.create_working_dirs()
@@ -278,7 +421,12 @@ def main(argv: list[str]) -> None:
     elif args.logs:
         remove_temporary_files()
         print("Cleaned platform of log files!")
-    elif not args.performance_data and not args.feature_data:
+    elif not (
+        args.performance_data
+        or args.feature_data
+        or args.feature_cache
+        or args.scenario_index
+    ):
         print(parser.print_help())
         sys.exit(1)
     sys.exit(0)
@@ -9,7 +9,7 @@ from runrunner.base import Run, Runner
 
 from sparkle.selector import Extractor
 from sparkle.platform.settings_objects import Settings
-from sparkle.structures import FeatureDataFrame
+from sparkle.structures import FeatureDataFrame, FeatureCache
 from sparkle.instance import Instance_Set, InstanceSet
 
 
@@ -36,6 +36,9 @@ def parser_function() -> argparse.ArgumentParser:
     )
     # Settings arguments
     parser.add_argument(*ac.SettingsFileArgument.names, **ac.SettingsFileArgument.kwargs)
+    parser.add_argument(
+        *Settings.OPTION_result_store.args, **Settings.OPTION_result_store.kwargs
+    )
     parser.add_argument(*Settings.OPTION_run_on.args, **Settings.OPTION_run_on.kwargs)
     return parser
 
@@ -49,6 +52,7 @@ def compute_features(
 
     A RunRunner run is submitted for the computation of the features.
     The results are then stored in the csv file specified by feature_data_csv_path.
+    Unless features are recomputed, results present in the feature cache are reused.
 
     Args:
         feature_data: Feature Data Frame to use
@@ -93,6 +97,11 @@ def compute_features(
     sbatch_options = gv.settings().sbatch_settings
     slurm_prepend = gv.settings().slurm_job_prepend
     srun_options = ["-N1", "-n1"] + sbatch_options
+    feature_cache = None
+    if not recompute and gv.settings().feature_cache_size:
+        feature_cache = FeatureCache(
+            gv.settings().DEFAULT_feature_cache_dir, gv.settings().feature_cache_size
+        )
     runs = []
     for extractor_name, feature_groups in grouped_job_list.items():
         extractor_path = gv.settings().DEFAULT_extractor_dir / extractor_name
@@ -109,6 +118,9 @@ def compute_features(
                 gv.settings().slurm_jobs_in_parallel,
                 slurm_prepend,
                 log_dir=sl.caller_log_dir,
+                feature_cache=feature_cache,
+                batch_size=gv.settings().extractor_batch_size,
+                batch_workers=gv.settings().extractor_batch_workers,
             )
             runs.append(run)
     return runs
@@ -138,6 +150,7 @@ def main(argv: list[str]) -> None:
 
     # Load feature data
     feature_data = FeatureDataFrame(settings.DEFAULT_feature_data_path)
+    feature_data.use_result_store(settings.result_store == "sqlite")
 
     # Filter instances or extractors
     if args.instance_path:
@@ -15,6 +15,7 @@ from sparkle.CLI.help.nicknames import resolve_object_name, resolve_instance_nam
 from sparkle.CLI.help import argparse_custom as ac
 
 from sparkle.platform.settings_objects import Settings
+from sparkle.configurator.racing import submit_race
 from sparkle.structures import PerformanceDataFrame, FeatureDataFrame
 from sparkle.solver import Solver
 from sparkle.instance import Instance_Set
@@ -61,6 +62,13 @@ def parser_function() -> argparse.ArgumentParser:
         *Settings.OPTION_configurator_number_of_runs.args,
         **Settings.OPTION_configurator_number_of_runs.kwargs,
     )
+    parser.add_argument(
+        *Settings.OPTION_configurator_racing_test.args,
+        **Settings.OPTION_configurator_racing_test.kwargs,
+    )
+    parser.add_argument(
+        *Settings.OPTION_result_store.args, **Settings.OPTION_result_store.kwargs
+    )
     parser.add_argument(*Settings.OPTION_run_on.args, **Settings.OPTION_run_on.kwargs)
     return parser
 
@@ -155,6 +163,7 @@ def main(argv: list[str]) -> None:
         )
 
     performance_data = PerformanceDataFrame(settings.DEFAULT_performance_data_path)
+    performance_data.use_result_store(settings.result_store == "sqlite")
 
     # Check if given objectives are in the data frame
     for objective in sparkle_objectives:
@@ -203,15 +212,39 @@ def main(argv: list[str]) -> None:
 
     sbatch_options = settings.sbatch_settings
     slurm_prepend = settings.slurm_job_prepend
+    racing_test = settings.configurator_racing_test
     dependency_job_list = configurator.configure(
         scenario=config_scenario,
         data_target=performance_data,
+        validate_after=racing_test is None,
         sbatch_options=sbatch_options,
         slurm_prepend=slurm_prepend,
         num_parallel_jobs=settings.slurm_jobs_in_parallel,
         base_dir=sl.caller_log_dir,
         run_on=run_on,
     )
+    gv.register_scenario(config_scenario)
+    if racing_test is not None:
+        # Validate by racing, eliminating worse configurations early
+        race_runs = submit_race(
+            solver,
+            instance_set_train.instance_paths,
+            performance_data,
+            config_scenario.configuration_ids,
+            config_scenario.sparkle_objective,
+            test=racing_test,
+            confidence=settings.configurator_racing_confidence,
+            first_test=settings.configurator_racing_first_test,
+            wave_size=settings.configurator_racing_wave_size,
+            cutoff_time=config_scenario.solver_cutoff_time,
+            sbatch_options=sbatch_options,
+            slurm_prepend=slurm_prepend,
+            dependencies=dependency_job_list,
+            log_dir=config_scenario.validation,
+            base_dir=sl.caller_log_dir,
+            run_on=run_on,
+        )
+        dependency_job_list.extend(race_runs)
 
     # If we have default configurations that need to be run, schedule them too
     if default_jobs:
@@ -59,6 +59,14 @@ def parser_function() -> argparse.ArgumentParser:
         *Settings.OPTION_minimum_marginal_contribution.args,
         **Settings.OPTION_minimum_marginal_contribution.kwargs,
     )
+    parser.add_argument(
+        *Settings.OPTION_selection_run_aggregation.args,
+        **Settings.OPTION_selection_run_aggregation.kwargs,
+    )
+    parser.add_argument(
+        *Settings.OPTION_selection_expand_runs.args,
+        **Settings.OPTION_selection_expand_runs.kwargs,
+    )
     parser.add_argument(*Settings.OPTION_run_on.args, **Settings.OPTION_run_on.kwargs)
     return parser
 
@@ -231,6 +239,8 @@ def main(argv: list[str]) -> None:
         solver_cutoff=solver_cutoff_time,
         extractor_cutoff=extractor_cutoff_time,
         ablate=solver_ablation,
+        run_aggregation=settings.selection_run_aggregation,
+        expand_runs=settings.selection_expand_runs,
     )
 
     if selection_scenario.selector_file_path.exists():
@@ -255,6 +265,7 @@ def main(argv: list[str]) -> None:
         slurm_prepend=slurm_prepend,
         base_dir=sl.caller_log_dir,
     )
+    gv.register_scenario(selection_scenario)
     jobs = [selector_run]
     if run_on == Runner.LOCAL:
         print("Sparkle portfolio selector constructed!")
@@ -275,19 +286,22 @@ def main(argv: list[str]) -> None:
         slurm_prepend=slurm_prepend,
         dependencies=[selector_run],
         log_dir=sl.caller_log_dir,
+        batch_size=settings.selector_batch_size,
     )
     jobs.append(selector_validation)
 
-    if solver_ablation:
+    if solver_ablation and selection_scenario.ablation_scenarios:
+        # Construct the ablated selectors, reading the shared data only once
+        ablation_run = selector.construct(
+            selection_scenario.ablation_scenarios,
+            run_on=run_on,
+            job_name=f"Selector Ablation Construction {selection_scenario.name}",
+            sbatch_options=sbatch_options,
+            slurm_prepend=slurm_prepend,
+            base_dir=sl.caller_log_dir,
+        )
+        jobs.append(ablation_run)
         for ablated_scenario in selection_scenario.ablation_scenarios:
-            # Construct the ablated selector
-            ablation_run = selector.construct(
-                ablated_scenario,
-                run_on=run_on,
-                sbatch_options=sbatch_options,
-                slurm_prepend=slurm_prepend,
-                base_dir=sl.caller_log_dir,
-            )
             # Validate the ablated selector
             ablation_validation = selector.run_cli(
                 ablated_scenario.scenario_file,
@@ -299,8 +313,9 @@ def main(argv: list[str]) -> None:
                 job_name=f"Selector Ablation: {ablated_scenario.directory.name} on {len(instances)} instances",
                 dependencies=[ablation_run],
                 log_dir=sl.caller_log_dir,
+                batch_size=settings.selector_batch_size,
             )
-            jobs.extend([ablation_run, ablation_validation])
+            jobs.append(ablation_validation)
 
     if run_on == Runner.LOCAL:
         for job in jobs:
@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
 """Sparkle command to generate a report for an executed experiment."""
 
+import os
 import sys
 import shutil
 import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Any, Callable
 import time
 import json
 import pandas as pd
@@ -38,6 +43,7 @@ WIDE_TABLE_THRESHOLD = 4  # columns above which we switch to landscape
 NUM_KEYS_PDF = 3
 NUM_KEYS_FDF = 3
 MAX_CELL_LEN = 17
+FIGURE_SIZE = 500  # Width and height of the figures in pixels
 
 
 def parser_function() -> argparse.ArgumentParser:
@@ -61,6 +67,9 @@ def parser_function() -> argparse.ArgumentParser:
     parser.add_argument(
         *Settings.OPTION_appendices.args, **Settings.OPTION_appendices.kwargs
     )
+    parser.add_argument(
+        *Settings.OPTION_figure_backend.args, **Settings.OPTION_figure_backend.kwargs
+    )
 
     # Add argument for filtering configurators?
     # Add argument for filtering selectors?
@@ -69,12 +78,226 @@ def parser_function() -> argparse.ArgumentParser:
     return parser
 
 
+def write_figure(
+    plot: latex.ComparisonPlot,
+    plot_path: Path,
+    figures: list[tuple[latex.ComparisonPlot, Path, str]] = None,
+) -> Path:
+    """Write a figure to file, or defer it to be rendered with other figures.
+
+    Args:
+        plot: The figure to write.
+        plot_path: The path to write the figure to, its suffix is set by the backend.
+        figures: If given, the figure is added to this list to be rendered later by
+            `render_figures` instead.
+
+    Returns:
+        The path of the figure.
+    """
+    backend = gv.settings().figure_backend
+    if figures is None:
+        return plot.write(plot_path, backend, FIGURE_SIZE, FIGURE_SIZE)
+    plot_path = plot_path.with_suffix(latex.ComparisonPlot.suffix(backend))
+    figures.append((plot, plot_path, backend))
+    return plot_path
+
+
+def render_figure(plot: latex.ComparisonPlot, plot_path: Path, backend: str) -> None:
+    """Render a deferred figure."""
+    plot.write(plot_path, backend, FIGURE_SIZE, FIGURE_SIZE)
+
+
+def render_figures(figures: list[tuple[latex.ComparisonPlot, Path, str]]) -> None:
+    """Render the deferred figures, exported images in parallel processes.
+
+    Args:
+        figures: The figures, their paths and the backends to render them with.
+    """
+    exports = [figure for figure in figures if figure[2] != "pgfplots"]
+    for figure in figures:
+        if figure[2] == "pgfplots":  # Only writes text, no need for processes
+            render_figure(*figure)
+    if len(exports) <= 1:  # Not worth starting processes for
+        for figure in exports:
+            render_figure(*figure)
+        return
+    with ProcessPoolExecutor(
+        max_workers=min(len(exports), os.cpu_count() or 1)
+    ) as executor:
+        list(executor.map(render_figure, *zip(*exports)))
+
+
+def section_key(*inputs: Any) -> str:  # noqa: ANN401
+    """Determine the cache key of a report section from the inputs it is built from.
+
+    Args:
+        inputs: The inputs of the section. Bytes are hashed as is, other inputs by
+            their JSON representation.
+
+    Returns:
+        The hexadecimal key.
+    """
+
+    def serialisable(obj: object) -> object:
+        """Convert objects that JSON does not support."""
+        if hasattr(obj, "serialise"):
+            return obj.serialise()
+        if hasattr(obj, "to_dict"):
+            return obj.to_dict()
+        if hasattr(obj, "tolist"):
+            return obj.tolist()
+        return str(obj)
+
+    digest = hashlib.sha256(__sparkle_version__.encode())
+    for item in inputs:
+        if not isinstance(item, bytes):
+            item = json.dumps(item, sort_keys=True, default=serialisable).encode()
+        digest.update(hashlib.sha256(item).digest())
+    return digest.hexdigest()[:32]
+
+
+def configuration_section_key(
+    scenario_output: ConfigurationOutput, scenario: ConfigurationScenario
+) -> str:
+    """Determine the cache key of a configuration section.
+
+    Args:
+        scenario_output: The output of the configuration scenario.
+        scenario: The configuration scenario.
+
+    Returns:
+        The hexadecimal key.
+    """
+    solver = scenario_output.solver
+    return section_key(
+        "configuration",
+        scenario.scenario_file_path.read_bytes(),
+        scenario_output.serialise(),
+        # Reported values that are not part of the serialised output
+        scenario_output.default_performance_train,
+        scenario_output.all_configurations,
+        scenario_output.instance_set_results,
+        [
+            (instance_set.name, instance_set.size)
+            for instance_set in [scenario_output.instance_set_train]
+            + scenario_output.test_instance_sets
+        ],
+        solver.pcs_file.read_bytes() if solver.pcs_file else None,
+        scenario.ablation_scenario.read_ablation_table()
+        if scenario.ablation_scenario
+        else None,
+        scenario.configurator.full_name,
+        scenario.configurator.version,
+        gv.settings().figure_backend,
+    )
+
+
+def selection_section_key(
+    scenario_output: SelectionOutput, scenario: SelectionScenario
+) -> str:
+    """Determine the cache key of a selection section.
+
+    Args:
+        scenario_output: The output of the selection scenario.
+        scenario: The selection scenario.
+
+    Returns:
+        The hexadecimal key.
+    """
+    return section_key(
+        "selection",
+        scenario.scenario_file.read_bytes(),
+        scenario.feature_target_path.read_bytes()
+        if scenario.feature_target_path.exists()
+        else None,
+        scenario_output.serialise(),
+        # Reported values that are not part of the serialised output
+        scenario_output.sbs_performance,
+        scenario_output.vbs_performance_data,
+        scenario_output.actual_performance_data,
+        scenario_output.test_set_performance,
+        gv.settings().selection_class,
+        gv.settings().selection_model,
+        gv.settings().selection_run_aggregation,
+        gv.settings().selection_expand_runs,
+        gv.settings().figure_backend,
+    )
+
+
+def generate_sections(
+    report: pl.Document,
+    sections: list[tuple[str, Callable[..., None]]],
+    cache_dir: Path,
+) -> None:
+    """Generate the sections of the report, reusing cached sections.
+
+    Each section is keyed by a hash of its inputs. When the key is found in the
+    cache, the LaTeX and figures of the section are reused. Otherwise the section is
+    generated, its figures are rendered in parallel, and it is added to the cache.
+    Cached sections that are no longer part of the report are removed.
+
+    Args:
+        report: The report to append the sections to.
+        sections: The key of each section, with the function generating it on a
+            document and deferring its figures to a list.
+        cache_dir: The directory of the cached sections.
+    """
+    report_dir = Path(report.default_filepath).parent
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    empty_packages = {p.dumps() for p in pl.Document().packages}
+    figures: list[tuple[latex.ComparisonPlot, Path, str]] = []
+    generated = []
+    for key, generate in sections:
+        if (cache_dir / key / "section.tex").exists():
+            continue
+        section = pl.Document(default_filepath=report.default_filepath)
+        before = set(report_dir.iterdir())
+        generate(section, figures=figures)
+        generated.append((key, section, set(report_dir.iterdir()) - before))
+    render_figures(figures)
+    for key, section, outputs in generated:
+        # Store the section in the cache, writing its LaTeX last to mark completion
+        section_dir = cache_dir / key
+        shutil.rmtree(section_dir, ignore_errors=True)
+        section_dir.mkdir()
+        for output in outputs:
+            shutil.copytree(output, section_dir / output.name)
+        section._propagate_packages()
+        packages = [
+            p.dumps() for p in section.packages if p.dumps() not in empty_packages
+        ]
+        (section_dir / "packages.json").write_text(json.dumps(packages))
+        (section_dir / "section.tex").write_text(
+            pl.base_classes.Container.dumps_content(section)
+        )
+    for key, _ in sections:
+        section_dir = cache_dir / key
+        for output in section_dir.iterdir():
+            if output.is_dir() and not (report_dir / output.name).exists():
+                shutil.copytree(output, report_dir / output.name)
+        for package in json.loads((section_dir / "packages.json").read_text()):
+            report.preamble.append(NoEscape(package))
+        report.append(NoEscape((section_dir / "section.tex").read_text()))
+    keys = {key for key, _ in sections}
+    for section_dir in cache_dir.iterdir():
+        if section_dir.name not in keys:
+            shutil.rmtree(section_dir, ignore_errors=True)
+
+
 def generate_configuration_section(
     report: pl.Document,
     scenario: ConfigurationScenario,
     scenario_output: ConfigurationOutput,
+    figures: list[tuple[latex.ComparisonPlot, Path, str]] = None,
 ) -> None:
-    """Generate a section for a configuration scenario."""
+    """Generate a section for a configuration scenario.
+
+    Args:
+        report: The document to append the section to.
+        scenario: The configuration scenario.
+        scenario_output: The output of the scenario.
+        figures: If given, the figures are deferred to this list to be rendered later.
+    """
     report_dir = Path(report.default_filepath).parent
     time_stamp = time.strftime("%Y%m%d%H%M%S", time.localtime(time.time()))
     plot_dir = (
@@ -194,12 +417,9 @@ def generate_configuration_section(
             plot_dir / f"{scenario_output.best_configuration_key}_vs_"
             f"Default_{instance_set_name}.pdf"
         )
-        plot.write_image(plot_path, width=500, height=500)
+        plot_path = write_figure(plot, plot_path, figures)
         with report.create(pl.Figure(position="h")) as figure:
-            figure.add_image(
-                str(plot_path.relative_to(report_dir)),
-                width=pl.utils.NoEscape(r"0.6\textwidth"),
-            )
+            latex.add_plot(figure, plot_path.relative_to(report_dir), r"0.6\textwidth")
             figure.add_caption(
                 f"Best vs Default Performance on {instance_set_name} "
                 f"({scenario.sparkle_objectives[0]})"
@@ -275,6 +495,65 @@ def generate_configuration_section(
         table_best_values.add_caption("Best found configuration values")
         report.append(table_best_values)
 
+    if scenario_output.bootstrap_train is not None:
+        bootstrap = scenario_output.bootstrap_train.sort_values(
+            "performance", ascending=scenario.sparkle_objectives[0].minimise
+        )
+        report.append(pl.Subsubsection("Uncertainty of the Configuration Performance"))
+        report.append(
+            "The instances of the training set were resampled with replacement to "
+            "estimate a 95% confidence interval of the "
+            f"{scenario.sparkle_objectives[0]} value of each configuration, and the "
+            "probability that it is the best configuration, i.e. the fraction of the "
+            "resamples in which it was the best. Configurations with overlapping "
+            "intervals may not be better than one another beyond noise:\n"
+        )
+        tabular = pl.Tabular("l|r|c|r")
+        tabular.add_row(
+            ["Configuration", str(scenario.sparkle_objectives[0]), "95% CI", "P(best)"]
+        )
+        tabular.add_hline()
+        for config_id, row in bootstrap.iterrows():
+            tabular.add_row(
+                [
+                    config_id,
+                    round(row["performance"], MAX_DEC),
+                    f"[{round(row['lower'], MAX_DEC)}, {round(row['upper'], MAX_DEC)}]",
+                    round(row["probability_best"], MAX_DEC),
+                ]
+            )
+        table_bootstrap = pl.Table(position="h")
+        table_bootstrap.append(pl.UnsafeCommand("centering"))
+        table_bootstrap.append(tabular)
+        table_bootstrap.add_caption(
+            "Bootstrap confidence intervals of the configurations on the training set"
+        )
+        report.append(table_bootstrap)
+
+    if scenario_output.pareto_front_train is not None:
+        pareto_front = scenario_output.pareto_front_train
+        report.append(pl.Subsubsection("Pareto Front"))
+        report.append(
+            f"Of the {len(scenario_output.all_configurations)} configurations, the "
+            f"following {len(pareto_front)} are not dominated on the training set, "
+            "i.e. no other configuration is at least as good on all objectives and "
+            "better on at least one of them:\n"
+        )
+        tabular = pl.Tabular("l|" + "r" * len(pareto_front.columns))
+        tabular.add_row(["Configuration"] + list(pareto_front.columns))
+        tabular.add_hline()
+        for config_id, performance in pareto_front.iterrows():
+            tabular.add_row(
+                [config_id] + [round(value, MAX_DEC) for value in performance]
+            )
+        table_pareto_front = pl.Table(position="h")
+        table_pareto_front.append(pl.UnsafeCommand("centering"))
+        table_pareto_front.append(tabular)
+        table_pareto_front.add_caption(
+            "Non-dominated configurations on the training set"
+        )
+        report.append(table_pareto_front)
+
     # 6. Report the results of best vs default conf on the test sets
 
     for test_set in scenario_output.test_instance_sets:
@@ -329,9 +608,19 @@ def generate_configuration_section(
 
 
 def generate_selection_section(
-    report: pl.Document, scenario: SelectionScenario, scenario_output: SelectionOutput
+    report: pl.Document,
+    scenario: SelectionScenario,
+    scenario_output: SelectionOutput,
+    figures: list[tuple[latex.ComparisonPlot, Path, str]] = None,
 ) -> None:
-    """Generate a section for a selection scenario."""
+    """Generate a section for a selection scenario.
+
+    Args:
+        report: The document to append the section to.
+        scenario: The selection scenario.
+        scenario_output: The output of the scenario.
+        figures: If given, the figures are deferred to this list to be rendered later.
+    """
     report_dir = Path(report.default_filepath).parent
     time_stamp = time.strftime("%Y%m%d%H%M%S", time.localtime(time.time()))
     plot_dir = report_dir / f"{scenario.name.replace(' ', '_')}_plots_{time_stamp}"
@@ -496,12 +785,9 @@ def generate_selection_section(
         plot_dir / f"{Path(sbs_name).name}_{sbs_config}_vs_"
         f"Selector_{scenario.selector.model_class.__name__}.pdf"
     )
-    plot.write_image(plot_path, width=500, height=500)
+    plot_path = write_figure(plot, plot_path, figures)
     with report.create(pl.Figure()) as figure:
-        figure.add_image(
-            str(plot_path.relative_to(report_dir)),
-            width=pl.utils.NoEscape(r"0.6\textwidth"),
-        )
+        latex.add_plot(figure, plot_path.relative_to(report_dir), r"0.6\textwidth")
         figure.add_caption(
             "Empirical comparison between the Single Best Solver and the Selector"
         )
@@ -520,12 +806,9 @@ def generate_selection_section(
         plot_dir
         / f"Virtual_Best_Solver_vs_Selector_{scenario.selector.model_class.__name__}.pdf"
     )
-    plot.write_image(plot_path, width=500, height=500)
+    plot_path = write_figure(plot, plot_path, figures)
     with report.create(pl.Figure()) as figure:
-        figure.add_image(
-            str(plot_path.relative_to(report_dir)),
-            width=pl.utils.NoEscape(r"0.6\textwidth"),
-        )
+        latex.add_plot(figure, plot_path.relative_to(report_dir), r"0.6\textwidth")
         figure.add_caption(
             "Empirical comparison between the Virtual Best Solver and the Selector"
         )
@@ -547,9 +830,17 @@ def generate_selection_section(
 
 
 def generate_parallel_portfolio_section(
-    report: pl.Document, scenario: PerformanceDataFrame
+    report: pl.Document,
+    scenario: PerformanceDataFrame,
+    figures: list[tuple[latex.ComparisonPlot, Path, str]] = None,
 ) -> None:
-    """Generate a section for a parallel portfolio scenario."""
+    """Generate a section for a parallel portfolio scenario.
+
+    Args:
+        report: The document to append the section to.
+        scenario: The PerformanceDataFrame of the parallel portfolio.
+        figures: If given, the figures are deferred to this list to be rendered later.
+    """
     report_dir = Path(report.default_filepath).parent
     portfolio_name = scenario.csv_filepath.parent.name
     time_stamp = time.strftime("%Y%m%d%H%M%S", time.localtime(time.time()))
@@ -691,12 +982,9 @@ def generate_parallel_portfolio_section(
     ).T
     plot = latex.comparison_plot(df, None)
     plot_path = plot_dir / f"sbs_{sbs_name}_vs_parallel_portfolio.pdf"
-    plot.write_image(plot_path, width=500, height=500)
+    plot_path = write_figure(plot, plot_path, figures)
     with report.create(pl.Figure(position="h")) as figure:
-        figure.add_image(
-            str(plot_path.relative_to(report_dir)),
-            width=pl.utils.NoEscape(r"0.6\textwidth"),
-        )
+        latex.add_plot(figure, plot_path.relative_to(report_dir), r"0.6\textwidth")
         figure.add_caption(f"Portfolio vs SBS Performance ({objective})")
         figure.append(pl.UnsafeCommand(r"label{fig:portfoliovssbs}"))
 
@@ -950,45 +1238,25 @@ def main(argv: list[str]) -> None:
 
     # Process command line arguments
     args = parser.parse_args(argv)
+    gv.settings(args)  # Apply the report settings, e.g. the figure backend
 
     performance_data = PerformanceDataFrame(gv.settings().DEFAULT_performance_data_path)
     feature_data = FeatureDataFrame(gv.settings().DEFAULT_feature_data_path)
 
-    # Fetch all known scenarios
-    configuration_scenarios = gv.configuration_scenarios(refresh=True)
-    selection_scenarios = gv.selection_scenarios(refresh=True)
-    parallel_portfolio_scenarios = gv.parallel_portfolio_scenarios()
-
-    # Filter scenarios based on args
+    # Determine the solvers and instance sets to filter the scenarios on
+    solvers, instance_sets = None, None
     if args.solvers:
         solvers = [
-            resolve_object_name(
-                solver,
-                gv.solver_nickname_mapping,
-                gv.settings().DEFAULT_solver_dir,
-                Solver,
+            str(
+                resolve_object_name(
+                    solver,
+                    gv.solver_nickname_mapping,
+                    gv.settings().DEFAULT_solver_dir,
+                    Solver,
+                ).directory
             )
             for solver in args.solvers
         ]
-        configuration_scenarios = [
-            scenario
-            for scenario in configuration_scenarios
-            if scenario.solver.directory in [solver.directory for solver in solvers]
-        ]
-        selection_scenarios = [
-            scenario
-            for scenario in selection_scenarios
-            if set(scenario.solvers).intersection(
-                [str(solver.directory) for solver in solvers]
-            )
-        ]
-        parallel_portfolio_scenarios = [
-            scenario
-            for scenario in parallel_portfolio_scenarios
-            if set(scenario.solvers).intersection(
-                [str(solver.directory) for solver in solvers]
-            )
-        ]
     if args.instance_sets:
         instance_sets = [
             resolve_object_name(
@@ -996,29 +1264,20 @@ def main(argv: list[str]) -> None:
                 gv.instance_set_nickname_mapping,
                 gv.settings().DEFAULT_instance_dir,
                 Instance_Set,
-            )
+            ).name
             for instance_set in args.instance_sets
         ]
-        configuration_scenarios = [
-            scenario
-            for scenario in configuration_scenarios
-            if scenario.instance_set.directory
-            in [instance_set.directory for instance_set in instance_sets]
-        ]
-        selection_scenarios = [
-            scenario
-            for scenario in selection_scenarios
-            if set(scenario.instance_sets).intersection(
-                [str(instance_set.name) for instance_set in instance_sets]
-            )
-        ]
-        parallel_portfolio_scenarios = [
-            scenario
-            for scenario in parallel_portfolio_scenarios
-            if set(scenario.instance_sets).intersection(
-                [str(instance_set.name) for instance_set in instance_sets]
-            )
-        ]
+
+    # Fetch the known scenarios through the scenario index
+    configuration_scenarios = gv.configuration_scenarios(
+        solvers=solvers, instance_sets=instance_sets
+    )
+    selection_scenarios = gv.selection_scenarios(
+        solvers=solvers, instance_sets=instance_sets
+    )
+    parallel_portfolio_scenarios = gv.parallel_portfolio_scenarios(
+        solvers=solvers, instance_sets=instance_sets
+    )
 
     processed_configuration_scenarios = []
     processed_selection_scenarios = []
@@ -1127,14 +1386,48 @@ def main(argv: list[str]) -> None:
         )
     )
 
+    # Key each section by its inputs, unchanged sections are reused from the cache
+    sections = []
     for scenario_output, scenario in processed_configuration_scenarios:
-        generate_configuration_section(report, scenario, scenario_output)
-
+        sections.append(
+            (
+                configuration_section_key(scenario_output, scenario),
+                partial(
+                    generate_configuration_section,
+                    scenario=scenario,
+                    scenario_output=scenario_output,
+                ),
+            )
+        )
     for scenario_output, scenario in processed_selection_scenarios:
-        generate_selection_section(report, scenario, scenario_output)
-
+        sections.append(
+            (
+                selection_section_key(scenario_output, scenario),
+                partial(
+                    generate_selection_section,
+                    scenario=scenario,
+                    scenario_output=scenario_output,
+                ),
+            )
+        )
     for parallel_dataframe in parallel_portfolio_scenarios:
-        generate_parallel_portfolio_section(report, parallel_dataframe)
+        key = section_key(
+            "parallel_portfolio",
+            parallel_dataframe.csv_filepath.read_bytes(),
+            gv.settings().parallel_portfolio_num_seeds_per_solver,
+            gv.settings().solver_cutoff_time,
+            [objective.name for objective in gv.settings().objectives],
+            gv.settings().figure_backend,
+        )
+        sections.append(
+            (
+                key,
+                partial(
+                    generate_parallel_portfolio_section, scenario=parallel_dataframe
+                ),
+            )
+        )
+    generate_sections(report, sections, gv.settings().DEFAULT_report_cache)
 
     # Check if user wants to add appendix and
     settings = gv.settings(args)
@@ -122,6 +122,19 @@ CleanUpFeatureDataArgument = ArgumentContainer(
     kwargs={"action": "store_true", "help": "clean feature data from errorneous lines"},
 )
 
+CleanUpFeatureCacheArgument = ArgumentContainer(
+    names=["--feature-cache"],
+    kwargs={"action": "store_true", "help": "clear the feature extraction cache"},
+)
+
+CleanUpScenarioIndexArgument = ArgumentContainer(
+    names=["--scenario-index"],
+    kwargs={
+        "action": "store_true",
+        "help": "rebuild the scenario index from the scenario files",
+    },
+)
+
 ConfigurationArgument = ArgumentContainer(
     names=["--configuration"],
     kwargs={
@@ -422,6 +435,17 @@ SnapshotArgument = ArgumentContainer(
     },
 )
 
+SnapshotIncludeArgument = ArgumentContainer(
+    names=["--include"],
+    kwargs={
+        "required": False,
+        "type": Path,
+        "nargs": "+",
+        "help": "only restore these working directories or files from the snapshot, "
+        "e.g. Output/Performance_Data. Other parts of the platform are untouched",
+    },
+)
+
 SnapshotNameArgument = ArgumentContainer(
     names=["--name"],
     kwargs={"required": False, "type": str, "help": "name of the snapshot"},
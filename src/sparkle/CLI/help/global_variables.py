@@ -4,9 +4,12 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 import ast
+import json
 from argparse import Namespace
+from pathlib import Path
 import random
 import numpy as np
+from filelock import FileLock
 
 from sparkle.platform.settings_objects import Settings
 
@@ -15,6 +18,8 @@ if TYPE_CHECKING:
     from sparkle.selector import SelectionScenario
     from sparkle.structures import PerformanceDataFrame
 
+    Scenario = ConfigurationScenario | SelectionScenario | PerformanceDataFrame
+
 __settings: Settings = None
 
 
@@ -42,16 +47,22 @@ def settings(argsv: Namespace = None) -> Settings:
     return __settings
 
 
-__configuration_scenarios: list[ConfigurationScenario] = None
-__selection_scenarios: list[SelectionScenario] = None
+# The scenario types in the index, with the configurators of configuration scenarios
+scenario_types = ["configuration", "selection", "parallel_portfolio"]
+configurator_names = ["SMAC2", "SMAC3", "ParamILS", "IRACE"]
+
+__scenario_index: dict[str, dict] = None
+# Loaded scenarios by path, with the modification time of their file
+__scenarios: dict[str, tuple[float, Scenario]] = {}
 
 
-def configuration_scenarios(refresh: bool = False) -> list[ConfigurationScenario]:
-    """Fetch all known configuration scenarios."""
-    global __configuration_scenarios
-    config_path = Settings.DEFAULT_configuration_output
-    if __configuration_scenarios is None or refresh:
-        # NOTE: Import here for platform speedup
+def _load_scenario(path: Path, entry: dict) -> Scenario:
+    """Load the scenario of an index entry, reusing it if it was loaded before."""
+    mtime, scenario = __scenarios.get(str(path), (None, None))
+    if scenario is not None and mtime == entry["mtime"]:
+        return scenario
+    # NOTE: Import here for platform speedup
+    if entry["type"] == "configuration":
         from sparkle.configurator.implementations import (
             SMAC2Scenario,
             SMAC3Scenario,
@@ -59,44 +70,230 @@ def configuration_scenarios(refresh: bool = False) -> list[ConfigurationScenario
             IRACEScenario,
         )
 
-        __configuration_scenarios = []
-        for f in config_path.glob("*/*/*.*"):  # We look for files at depth three
-            if "scenario" not in f.name:
-                continue
-            if "SMAC2" in str(f):
-                __configuration_scenarios.append(SMAC2Scenario.from_file(f))
-            elif "SMAC3" in str(f):
-                __configuration_scenarios.append(SMAC3Scenario.from_file(f))
-            elif "ParamILS" in str(f):
-                __configuration_scenarios.append(ParamILSScenario.from_file(f))
-            elif "IRACE" in str(f):
-                __configuration_scenarios.append(IRACEScenario.from_file(f))
-    return __configuration_scenarios
-
-
-def selection_scenarios(refresh: bool = False) -> list[SelectionScenario]:
-    """Fetch all known selection scenarios."""
-    global __selection_scenarios
-    selection_path = Settings.DEFAULT_selection_output
-    if __selection_scenarios is None or refresh:
-        # NOTE: Import here for speedup
+        scenario_class = {
+            "SMAC2": SMAC2Scenario,
+            "SMAC3": SMAC3Scenario,
+            "ParamILS": ParamILSScenario,
+            "IRACE": IRACEScenario,
+        }[entry["configurator"]]
+        scenario = scenario_class.from_file(path)
+    elif entry["type"] == "selection":
         from sparkle.selector import SelectionScenario
 
-        __selection_scenarios = []
-        for f in selection_path.glob("*/*/*.txt"):  # We look for files at depth three
-            if "scenario" not in f.name:
-                continue
-            __selection_scenarios.append(SelectionScenario.from_file(f))
-    return __selection_scenarios
+        scenario = SelectionScenario.from_file(path)
+    else:
+        from sparkle.structures import PerformanceDataFrame
+
+        scenario = PerformanceDataFrame(path)
+    __scenarios[str(path)] = (entry["mtime"], scenario)
+    return scenario
+
+
+def _describe_scenario(path: Path, entry: dict, scenario: Scenario = None) -> dict:
+    """Fill the solvers, instance sets and modification time of an index entry."""
+    entry["mtime"] = path.stat().st_mtime
+    if scenario is None:
+        scenario = _load_scenario(path, entry)
+    __scenarios[str(path)] = (entry["mtime"], scenario)
+    if entry["type"] == "configuration":
+        entry["solvers"] = [str(scenario.solver.directory)]
+        entry["instance_sets"] = [scenario.instance_set.name]
+    elif entry["type"] == "selection":
+        entry["solvers"] = [
+            solver
+            for solver in scenario.selector_performance_data.solvers
+            if solver != scenario.__selector_solver_name__
+        ]
+        entry["instance_sets"] = scenario.instance_sets
+    else:  # Unless registered, the instance sets are the directories of instances
+        entry["solvers"] = scenario.solvers
+        entry.setdefault(
+            "instance_sets",
+            sorted({Path(i).parent.name for i in scenario.instances} - {""}),
+        )
+    return entry
+
+
+def _write_scenario_index(index: dict[str, dict]) -> None:
+    """Write the scenario index to the platform, replacing it at once."""
+    index_path = Settings.DEFAULT_scenario_index
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(f".{index_path.name}.tmp")
+    tmp_path.write_text(json.dumps(index, indent=1))
+    tmp_path.replace(index_path)
+
+
+def _build_scenario_index() -> dict[str, dict]:
+    """Build the scenario index by searching and reading all scenario files."""
+    entries: dict[Path, dict] = {}
+    # We look for files at depth three
+    for f in Settings.DEFAULT_configuration_output.glob("*/*/*.*"):
+        configurator = next(
+            (name for name in configurator_names if name in str(f)), None
+        )
+        if "scenario" in f.name and configurator is not None:
+            entries[f] = {"type": "configuration", "configurator": configurator}
+    for f in Settings.DEFAULT_selection_output.glob("*/*/*.txt"):
+        if "scenario" in f.name:
+            entries[f] = {"type": "selection"}
+    for f in Settings.DEFAULT_parallel_portfolio_output.glob("*/*.csv"):
+        entries[f] = {"type": "parallel_portfolio"}
+    return {
+        str(path): _describe_scenario(path, entry)
+        for path, entry in sorted(entries.items())
+    }
+
+
+def scenario_index(rebuild: bool = False) -> dict[str, dict]:
+    """Fetch the index of all known scenarios.
+
+    The index maps the file of each scenario to its type, solvers, instance sets and
+    modification time. It is persisted on the platform and updated by the commands
+    that create scenarios, so scenarios can be looked up without searching and
+    reading all scenario files. Entries of removed files are dropped and entries of
+    modified files are read again. The index is rebuilt from the scenario files if
+    it does not exist.
+
+    Args:
+        rebuild: Whether to rebuild the index from the scenario files.
 
+    Returns:
+        The scenario index.
+    """
+    global __scenario_index
+    index_path = Settings.DEFAULT_scenario_index
+    if rebuild or not index_path.exists():
+        with FileLock(f"{index_path}.lock"):
+            __scenario_index = _build_scenario_index()
+            _write_scenario_index(__scenario_index)
+        return __scenario_index
+    if __scenario_index is None:
+        try:
+            __scenario_index = json.loads(index_path.read_text())
+        except ValueError:  # Corrupted index
+            return scenario_index(rebuild=True)
+    changed = False
+    for path, entry in list(__scenario_index.items()):
+        try:
+            mtime = Path(path).stat().st_mtime
+        except FileNotFoundError:
+            del __scenario_index[path]
+            changed = True
+            continue
+        if mtime != entry["mtime"]:
+            _describe_scenario(Path(path), entry)
+            changed = True
+    if changed:
+        with FileLock(f"{index_path}.lock"):
+            _write_scenario_index(__scenario_index)
+    return __scenario_index
 
-def parallel_portfolio_scenarios() -> list[PerformanceDataFrame]:
-    """Fetch all known parallel portfolio scenarios."""
-    parallel_portfolio_path = Settings.DEFAULT_parallel_portfolio_output
-    # NOTE: Import here to speedup
+
+def register_scenario(scenario: Scenario, instance_sets: list[str] = None) -> None:
+    """Add a newly created scenario to the scenario index.
+
+    Args:
+        scenario: The configuration scenario, selection scenario or parallel
+            portfolio PerformanceDataFrame to add.
+        instance_sets: The names of the instance sets of a parallel portfolio.
+    """
+    global __scenario_index
+    from sparkle.selector import SelectionScenario
     from sparkle.structures import PerformanceDataFrame
 
-    return [PerformanceDataFrame(f) for f in parallel_portfolio_path.glob("*/*.csv")]
+    if isinstance(scenario, PerformanceDataFrame):
+        path = scenario.csv_filepath
+        entry = {"type": "parallel_portfolio"}
+        if instance_sets:
+            entry["instance_sets"] = instance_sets
+    elif isinstance(scenario, SelectionScenario):
+        path = scenario.scenario_file
+        entry = {"type": "selection"}
+    else:
+        path = scenario.scenario_file_path
+        entry = {
+            "type": "configuration",
+            "configurator": scenario.configurator.__name__,
+        }
+    index = scenario_index()
+    index_path = Settings.DEFAULT_scenario_index
+    with FileLock(f"{index_path}.lock"):
+        # Merge with scenarios registered by other commands in the meantime
+        if index_path.exists():
+            index.update(json.loads(index_path.read_text()))
+        index[str(path)] = _describe_scenario(path, entry, scenario)
+        _write_scenario_index(index)
+    __scenario_index = index
+
+
+def _indexed_scenarios(
+    scenario_type: str,
+    solvers: list[str] = None,
+    instance_sets: list[str] = None,
+    refresh: bool = False,
+) -> list[Scenario]:
+    """Load the indexed scenarios of a type, filtered on solvers and instance sets."""
+    solvers = None if solvers is None else {str(solver) for solver in solvers}
+    instance_sets = None if instance_sets is None else set(instance_sets)
+    scenarios = []
+    for path, entry in scenario_index(rebuild=refresh).items():
+        if entry["type"] != scenario_type:
+            continue
+        if solvers is not None and not solvers.intersection(entry["solvers"]):
+            continue
+        if instance_sets is not None and not instance_sets.intersection(
+            entry["instance_sets"]
+        ):
+            continue
+        scenarios.append(_load_scenario(Path(path), entry))
+    return scenarios
+
+
+def configuration_scenarios(
+    refresh: bool = False,
+    solvers: list[str | Path] = None,
+    instance_sets: list[str] = None,
+) -> list[ConfigurationScenario]:
+    """Fetch all known configuration scenarios.
+
+    Args:
+        refresh: Whether to rebuild the scenario index from the scenario files.
+        solvers: If given, only fetch scenarios of these solver directories.
+        instance_sets: If given, only fetch scenarios of these instance set names.
+    """
+    return _indexed_scenarios("configuration", solvers, instance_sets, refresh)
+
+
+def selection_scenarios(
+    refresh: bool = False,
+    solvers: list[str | Path] = None,
+    instance_sets: list[str] = None,
+) -> list[SelectionScenario]:
+    """Fetch all known selection scenarios.
+
+    Args:
+        refresh: Whether to rebuild the scenario index from the scenario files.
+        solvers: If given, only fetch scenarios with any of these solver directories.
+        instance_sets: If given, only fetch scenarios with any of these instance
+            set names.
+    """
+    return _indexed_scenarios("selection", solvers, instance_sets, refresh)
+
+
+def parallel_portfolio_scenarios(
+    refresh: bool = False,
+    solvers: list[str | Path] = None,
+    instance_sets: list[str] = None,
+) -> list[PerformanceDataFrame]:
+    """Fetch all known parallel portfolio scenarios.
+
+    Args:
+        refresh: Whether to rebuild the scenario index from the scenario files.
+        solvers: If given, only fetch portfolios with any of these solver directories.
+        instance_sets: If given, only fetch portfolios with any of these instance
+            set names.
+    """
+    return _indexed_scenarios("parallel_portfolio", solvers, instance_sets, refresh)
 
 
 reference_list_dir = Settings.DEFAULT_reference_dir
@@ -11,11 +11,11 @@ import zipfile
 
 from sparkle.CLI.help import global_variables as gv
 from sparkle.tools.general import get_time_pid_random_string
-from sparkle.platform import Settings
+from sparkle.platform import Settings, SnapshotStore
 
 
 def save_current_platform(name: str = None) -> None:
-    """Store the current Sparkle platform in a .zip file."""
+    """Store the current Sparkle platform as an incremental snapshot."""
     if name is None:
         time_stamp = time.strftime("%Y-%m-%d-%H.%M.%S", time.localtime(time.time()))
         try:
@@ -23,18 +23,13 @@ def save_current_platform(name: str = None) -> None:
         except Exception:  # Can fail on for example CI pipelines
             login = "unknown"
         name = f"Snapshot_{login}_{time_stamp}"
-    snapshot_tmp_path = gv.settings().DEFAULT_snapshot_dir / name
-    snapshot_tmp_path.mkdir(parents=True)  # Create temporary directory for zip
     available_dirs = [p.name for p in Path.cwd().iterdir()]
     root_working_dirs = [
         p for p in gv.settings().DEFAULT_working_dirs if p.name in available_dirs
     ]
-    for working_dir in root_working_dirs:
-        if working_dir.exists():
-            shutil.copytree(working_dir, snapshot_tmp_path / working_dir.name)
-    shutil.make_archive(snapshot_tmp_path, "zip", snapshot_tmp_path)
-    shutil.rmtree(snapshot_tmp_path)
-    print(f"Snapshot file {snapshot_tmp_path}.zip saved successfully!")
+    store = SnapshotStore(gv.settings().DEFAULT_snapshot_dir)
+    manifest_path = store.save(name, root_working_dirs, root=Path())
+    print(f"Snapshot file {manifest_path} saved successfully!")
 
 
 def remove_current_platform(filter: list[Path] = None) -> None:
@@ -52,46 +47,122 @@ def create_working_dirs() -> None:
         working_dir.mkdir(parents=True, exist_ok=True)
 
 
-def extract_snapshot(snapshot_file: Path) -> None:
-    """Restore a Sparkle platform from a snapshot.
+def extract_snapshot(
+    snapshot_file: Path, destination: Path, include: list[str] = None
+) -> None:
+    """Extract (part of) a snapshot, streaming each member to its location.
 
     Args:
-      snapshot_file: Path to the where the current Sparkle platform should be stored.
+        snapshot_file: Path to the snapshot manifest or (legacy) .zip file.
+        destination: The directory in which to extract the snapshot.
+        include: The relative (posix) paths to extract. If None, everything is
+            extracted.
     """
-    tmp_directory = Path(f"tmp_directory_{get_time_pid_random_string()}")
-    gv.settings().DEFAULT_tmp_output.mkdir(exist_ok=True)
-    with zipfile.ZipFile(snapshot_file, "r") as zip_ref:
-        zip_ref.extractall(tmp_directory)
-    shutil.copytree(tmp_directory, "./", dirs_exist_ok=True)
-    shutil.rmtree(tmp_directory)
+    if snapshot_file.suffix == ".zip":
+        with zipfile.ZipFile(snapshot_file, "r") as zip_ref:
+            for member in zip_ref.infolist():
+                if SnapshotStore.is_included(member.filename.rstrip("/"), include):
+                    zip_ref.extract(member, destination)
+    else:
+        SnapshotStore(snapshot_file.parent).restore(snapshot_file, destination, include)
 
 
-def load_snapshot(snapshot_file: Path) -> None:
+def swap_into_platform(staging: Path, targets: list[Path]) -> None:
+    """Replace paths of the platform with their staged versions.
+
+    Each target is renamed instead of copied. When a rename fails, all previously
+    swapped targets are restored before the exception is raised.
+
+    Args:
+        staging: The staging directory, on the same file system as the platform.
+        targets: The relative paths to replace. Targets that are not staged are
+            removed from the platform.
+    """
+    backup = staging.with_name(f"{staging.name}_previous")
+    swapped = []
+    try:
+        for target in targets:
+            swapped.append(target)
+            if target.exists() or target.is_symlink():
+                (backup / target).parent.mkdir(parents=True, exist_ok=True)
+                target.replace(backup / target)
+            if (staging / target).exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                (staging / target).replace(target)
+    except OSError:
+        for target in reversed(swapped):
+            if not (staging / target).exists() and target.exists():
+                # The staged version was moved in, move it back out
+                target.replace(staging / target)
+            if (backup / target).exists():
+                (backup / target).replace(target)
+        raise
+    finally:
+        shutil.rmtree(backup, ignore_errors=True)
+
+
+def load_snapshot(snapshot_file: Path, include: list[Path] = None) -> None:
     """Load a Sparkle platform from a snapshot.
 
+    The snapshot is extracted into a staging directory first, which is only swapped
+    into the platform when extraction succeeded, leaving the platform untouched
+    otherwise.
+
     Args:
         snapshot_file: File path to the file where the Sparkle platform is stored.
+        include: Only restore these working directories or files. If None, the
+            complete platform is replaced.
     """
     if not snapshot_file.exists():
         print(f"ERROR: Snapshot file {snapshot_file} does not exist!")
         sys.exit(-1)
-    if not snapshot_file.suffix == ".zip":
-        print(f"ERROR: File {snapshot_file} is not a .zip file!")
-        sys.exit(-1)
-    print("Cleaning existing Sparkle platform ...")
-    remove_current_platform()
-    print("Existing Sparkle platform cleaned!")
-
-    print(f"Loading snapshot file {snapshot_file} ...")
-    extract_snapshot(snapshot_file)
-    if any([not wd.exists() for wd in gv.settings().DEFAULT_working_dirs]):
-        missing_dirs = [
-            wd.name for wd in gv.settings().DEFAULT_working_dirs if not wd.exists()
-        ]
+    if snapshot_file.suffix not in (".zip", SnapshotStore.manifest_suffix):
         print(
-            "ERROR: Failed to load Sparkle platform! The snapshot file may be outdated"
-            " or corrupted. Missing the following directories: "
-            f"{', '.join(missing_dirs)}"
+            f"ERROR: File {snapshot_file} is not a snapshot manifest "
+            f"({SnapshotStore.manifest_suffix}) or .zip file!"
         )
         sys.exit(-1)
+    if include is not None:
+        include = [Path(path).as_posix().strip("/") for path in include]
+        # Paths within another included path are already restored by it
+        include = [
+            path
+            for path in include
+            if not any(
+                path != other and SnapshotStore.is_included(path, [other])
+                for other in include
+            )
+        ]
+    staging = Path(f".snapshot_staging_{get_time_pid_random_string()}")
+    try:
+        print(f"Loading snapshot file {snapshot_file} ...")
+        extract_snapshot(snapshot_file, staging, include)
+        if include is None:
+            missing_dirs = [
+                wd.name
+                for wd in gv.settings().DEFAULT_working_dirs
+                if not (staging / wd).exists()
+            ]
+            if missing_dirs:
+                print(
+                    "ERROR: Failed to load Sparkle platform! The snapshot file may be "
+                    "outdated or corrupted. Missing the following directories: "
+                    f"{', '.join(missing_dirs)}"
+                )
+                sys.exit(-1)
+            # Replace all working dirs, including the ones not in the snapshot
+            targets = {Path(path.name) for path in staging.iterdir()}
+            targets |= {Path(wd.parts[0]) for wd in gv.settings().DEFAULT_working_dirs}
+        else:
+            missing = [path for path in include if not (staging / path).exists()]
+            if missing:
+                print(
+                    f"ERROR: Snapshot file {snapshot_file} does not contain: "
+                    f"{', '.join(missing)}"
+                )
+                sys.exit(-1)
+            targets = {Path(path) for path in include}
+        swap_into_platform(staging, sorted(targets))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
     print(f"Snapshot file {snapshot_file} loaded successfully!")
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Sparkle command to load a Sparkle platform from a .zip file."""
+"""Sparkle command to load a Sparkle platform from a snapshot."""
 
 import sys
 import itertools
@@ -14,8 +14,13 @@ from sparkle.CLI.help import global_variables as gv
 
 def parser_function() -> argparse.ArgumentParser:
     """Define the command line arguments."""
-    parser = argparse.ArgumentParser(description="Load a platform from a zip file.")
+    parser = argparse.ArgumentParser(
+        description="Load a platform from a snapshot manifest or zip file."
+    )
     parser.add_argument(*ac.SnapshotArgument.names, **ac.SnapshotArgument.kwargs)
+    parser.add_argument(
+        *ac.SnapshotIncludeArgument.names, **ac.SnapshotIncludeArgument.kwargs
+    )
     return parser
 
 
@@ -28,11 +33,15 @@ def main(argv: list[str]) -> None:
     parser = parser_function()
     # Process command line arguments
     args = parser.parse_args(argv)
-    snapshot_help.load_snapshot(Path(args.snapshot_file_path))
+    snapshot_help.load_snapshot(Path(args.snapshot_file_path), args.include)
     # Make sure we have Solver/Extractor execution rights again after unpacking
-    for executable_dir in itertools.chain(
-        gv.settings().DEFAULT_solver_dir.iterdir(),
-        gv.settings().DEFAULT_extractor_dir.iterdir(),
+    for executable_dir in itertools.chain.from_iterable(
+        directory.iterdir()
+        for directory in (
+            gv.settings().DEFAULT_solver_dir,
+            gv.settings().DEFAULT_extractor_dir,
+        )
+        if directory.exists()
     ):
         if executable_dir.is_dir():
             for file in executable_dir.iterdir():
@@ -41,8 +50,8 @@ def main(argv: list[str]) -> None:
 
     # Reset Global variables as they should be re-read from snapshot
     gv.__settings = None
-    gv.__configuration_scenarios = None
-    gv.__selection_scenarios = None
+    gv.__scenario_index = None
+    gv.__scenarios = {}
     sys.exit(0)
 
 
@@ -2,6 +2,7 @@
 """Sparkle command to execute ablation analysis."""
 
 import argparse
+import os
 import sys
 
 from runrunner.base import Runner
@@ -41,6 +42,10 @@ def parser_function() -> argparse.ArgumentParser:
     parser.add_argument(
         *Settings.OPTION_ablation_racing.args, **Settings.OPTION_ablation_racing.kwargs
     )
+    parser.add_argument(
+        *Settings.OPTION_ablation_clis_per_node.args,
+        **Settings.OPTION_ablation_clis_per_node.kwargs,
+    )
     parser.add_argument(*Settings.OPTION_run_on.args, **Settings.OPTION_run_on.kwargs)
     parser.set_defaults(ablation_settings_help=False)
     return parser
@@ -130,11 +135,17 @@ def main(argv: list[str]) -> None:
     else:
         print("Configuration exists!")
 
+    run_on = settings.run_on
+    concurrent_clis = settings.ablation_max_parallel_runs_per_node
+    if concurrent_clis is None:
+        concurrent_clis = (
+            os.cpu_count() if run_on == Runner.LOCAL else settings.slurm_jobs_in_parallel
+        )
     ablation_scenario = AblationScenario(
         config_scenario,
         instance_set_test,
         cutoff_length=settings.smac2_target_cutoff_length,  # NOTE: SMAC2
-        concurrent_clis=settings.slurm_jobs_in_parallel,
+        concurrent_clis=concurrent_clis,
         best_configuration=best_configuration,
         ablation_racing=settings.ablation_racing_flag,
     )
@@ -143,7 +154,6 @@ def main(argv: list[str]) -> None:
     ablation_scenario.create_scenario(override_dirs=True)
 
     print("Submiting ablation run...")
-    run_on = settings.run_on
     runs = ablation_scenario.submit_ablation(
         log_dir=sl.caller_log_dir,
         sbatch_options=settings.sbatch_settings,
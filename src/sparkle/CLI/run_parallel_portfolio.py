@@ -4,13 +4,16 @@
 
 import sys
 import argparse
+import asyncio
 import random
 import time
 import shutil
 import itertools
+from concurrent.futures import ThreadPoolExecutor
 from operator import mod
 from pathlib import Path
 
+import pandas as pd
 from tqdm import tqdm
 
 import runrunner as rrr
@@ -27,6 +30,7 @@ from sparkle.solver import Solver
 from sparkle.instance import Instance_Set, InstanceSet
 from sparkle.types import SolverStatus, resolve_objective, UseTime
 from sparkle.structures import PerformanceDataFrame
+from sparkle.tools import async_runner, completion
 
 
 def parser_function() -> argparse.ArgumentParser:
@@ -115,12 +119,60 @@ def init_default_objectives() -> list:
     return default_objective_values, cpu_time_key, status_key, wall_time_key
 
 
+def init_job_output_dict(
+    instances_set: InstanceSet, solvers: list[Solver], default_objective_values: dict
+) -> dict:
+    """Create the job output dictionary with default values.
+
+    Args:
+        instances_set: Set of instances to run on.
+        solvers: List of solvers to run on the instances.
+        default_objective_values: Default objective values for each solver-instance.
+
+    Returns:
+        job_output_dict: Dictionary containing the default output for each
+                            instance-solver combination.
+    """
+    return {
+        instance_name: {
+            solver.name: default_objective_values.copy() for solver in solvers
+        }
+        for instance_name in instances_set._instance_names
+    }
+
+
+def mark_killed_solvers(
+    job_output_dict: dict,
+    instance_name: str,
+    solvers: list[Solver],
+    killed_jobs: list[int],
+) -> None:
+    """Set the status of solvers of which all seeds were killed on an instance.
+
+    Args:
+        job_output_dict: Dictionary containing the job output for each
+                            instance-solver combination.
+        instance_name: The instance on which the jobs were killed.
+        solvers: List of solvers to run on the instances.
+        killed_jobs: Indices of the killed jobs, relative to the first job of the
+            instance.
+    """
+    seeds_per_solver = gv.settings().parallel_portfolio_num_seeds_per_solver
+    solver_kills = [0] * len(solvers)
+    for job_index in killed_jobs:
+        solver_kills[job_index // seeds_per_solver] += 1
+    for solver_index, solver in enumerate(solvers):
+        if solver_kills[solver_index] == seeds_per_solver:
+            job_output_dict[instance_name][solver.name]["status"] = SolverStatus.KILLED
+
+
 def monitor_jobs(
     run: Run,
     instances_set: InstanceSet,
     solvers: list[Solver],
     default_objective_values: dict,
     run_on: Runner = Runner.SLURM,
+    sentinel_dir: Path = None,
 ) -> dict:
     """Monitor job progress and update job output dictionary.
 
@@ -130,6 +182,9 @@ def monitor_jobs(
         solvers: List of solvers to run on the instances.
         default_objective_values: Default objective values for each solver-instance.
         run_on: Unused
+        sentinel_dir: Directory in which the jobs write a sentinel file when they
+            finish, see `submit_jobs`. If given, the jobs are only polled when no
+            sentinel appeared within the check interval.
 
     Returns:
         job_output_dict: Dictionary containing the job output for each instance-solver
@@ -139,56 +194,130 @@ def monitor_jobs(
     seeds_per_solver = gv.settings().parallel_portfolio_num_seeds_per_solver
     n_instance_jobs = num_solvers * seeds_per_solver
 
-    job_output_dict = {
-        instance_name: {
-            solver.name: default_objective_values.copy() for solver in solvers
-        }
-        for instance_name in instances_set._instance_names
-    }
+    job_output_dict = init_job_output_dict(
+        instances_set, solvers, default_objective_values
+    )
 
     check_interval = gv.settings().parallel_portfolio_check_interval
     instances_done = [False] * num_instances
+    job_status_completed = [False] * len(run.jobs)
+    watcher = (
+        completion.SentinelWatcher(sentinel_dir) if sentinel_dir is not None else None
+    )
 
     with tqdm(total=len(instances_done)) as pbar:
         pbar.set_description("Instances done")
         while not all(instances_done):
             prev_done = sum(instances_done)
-            time.sleep(check_interval)
-            job_status_list = [r.status for r in run.jobs]
-            job_status_completed = [
-                status == Status.COMPLETED for status in job_status_list
-            ]
+            sentinels = set()
+            if watcher is None:
+                time.sleep(check_interval)
+            else:
+                sentinels = watcher.wait(timeout=check_interval)
+            for sentinel in sentinels:
+                # The sentinel holds the exit code of the job
+                if (sentinel_dir / sentinel).read_text().strip() == "0":
+                    job_status_completed[int(sentinel)] = True
+            if not sentinels:  # Fall back on the job statuses
+                job_status_completed = [
+                    completed or status == Status.COMPLETED
+                    for completed, status in zip(
+                        job_status_completed, [r.status for r in run.jobs]
+                    )
+                ]
             # The jobs are sorted by instance
             for i, instance in enumerate(instances_set._instance_paths):
                 if instances_done[i]:
                     continue
-                instance_job_slice = slice(
-                    i * n_instance_jobs, (i + 1) * n_instance_jobs
-                )
+                first_job = i * n_instance_jobs
+                instance_job_slice = slice(first_job, first_job + n_instance_jobs)
                 if any(job_status_completed[instance_job_slice]):
                     instances_done[i] = True
                     # Kill remaining jobs for this instance.
-                    solver_kills = [0] * num_solvers
-                    for job_index in range(
-                        i * n_instance_jobs, (i + 1) * n_instance_jobs
-                    ):
+                    killed_jobs = []
+                    for job_index in range(first_job, first_job + n_instance_jobs):
                         if not job_status_completed[job_index]:
                             run.jobs[job_index].kill()
-                            solver_index = int(
-                                (mod(job_index, n_instance_jobs)) // seeds_per_solver
-                            )
-                            solver_kills[solver_index] += 1
-                    for solver_index in range(num_solvers):
-                        # All seeds of a solver were killed on instance, set status kill
-                        if solver_kills[solver_index] == seeds_per_solver:
-                            solver_name = solvers[solver_index].name
-                            job_output_dict[instance.stem][solver_name]["status"] = (
-                                SolverStatus.KILLED
-                            )
+                            killed_jobs.append(job_index - first_job)
+                    mark_killed_solvers(
+                        job_output_dict, instance.stem, solvers, killed_jobs
+                    )
             pbar.update(sum(instances_done) - prev_done)
+    if watcher is not None:
+        watcher.close()
     return job_output_dict
 
 
+def run_jobs_locally(
+    cmd_list: list[str],
+    instances_set: InstanceSet,
+    solvers: list[Solver],
+    default_objective_values: dict,
+    portfolio_path: Path,
+) -> tuple[dict, list[str]]:
+    """Run the portfolio locally, as many instances at a time as there are cores for.
+
+    All solver-seed combinations of an instance start at the same time. As soon as
+    one of them completes successfully, the others are killed, together with their
+    child processes, and the next instance starts.
+
+    Args:
+        cmd_list: List of command strings for all instance-solver-seed combinations.
+        instances_set: Set of instances to run on.
+        solvers: List of solvers to run on the instances.
+        default_objective_values: Default objective values for each solver-instance.
+        portfolio_path: Path to the parallel portfolio, where the output is written.
+
+    Returns:
+        job_output_dict: Dictionary containing the job output for each instance-solver
+                            combination.
+        job_outputs: The standard output of each job.
+    """
+    seeds_per_solver = gv.settings().parallel_portfolio_num_seeds_per_solver
+    n_instance_jobs = len(solvers) * seeds_per_solver
+    job_output_dict = init_job_output_dict(
+        instances_set, solvers, default_objective_values
+    )
+    output_paths = [
+        portfolio_path / f"job_{index}.out" for index in range(len(cmd_list))
+    ]
+    instances = instances_set._instance_paths
+    jobs = [
+        async_runner.AsyncJob(cmd, stdout=path, stderr=path.with_suffix(".err"))
+        for cmd, path in zip(cmd_list, output_paths)
+    ]
+    job_instance = {id(job): index // n_instance_jobs for index, job in enumerate(jobs)}
+    jobs_finished = [0] * len(instances)
+
+    with tqdm(total=len(instances)) as pbar:
+        pbar.set_description("Instances done")
+
+        def instance_finished(job: async_runner.AsyncJob) -> None:
+            """Count the finished jobs per instance."""
+            i = job_instance[id(job)]
+            jobs_finished[i] += 1
+            if jobs_finished[i] == n_instance_jobs:
+                pbar.update(1)
+
+        run = async_runner.AsyncRun(
+            jobs,
+            parallel_jobs=max(1, async_runner.cpu_count() // n_instance_jobs),
+            group_size=n_instance_jobs,
+            race=True,
+            callback=instance_finished,
+        )
+        asyncio.run(run.execute())
+    for i, instance in enumerate(instances):
+        group = run.jobs[i * n_instance_jobs : (i + 1) * n_instance_jobs]
+        killed_jobs = [
+            job_index
+            for job_index, job in enumerate(group)
+            if job.status == Status.KILLED
+        ]
+        mark_killed_solvers(job_output_dict, instance.stem, solvers, killed_jobs)
+    return job_output_dict, [path.read_text() for path in output_paths]
+
+
 def wait_for_logs(cmd_list: list[str]) -> None:
     """Wait for all log files to be written.
 
@@ -210,7 +339,7 @@ def wait_for_logs(cmd_list: list[str]) -> None:
 
 def update_results_from_logs(
     cmd_list: list[str],
-    run: Run,
+    run: Run | list[str],
     solvers: list[Solver],
     job_output_dict: dict,
     cpu_time_key: str,
@@ -219,7 +348,8 @@ def update_results_from_logs(
 
     Args:
         cmd_list: List of command strings for all instance-solver-seed combinations.
-        run: The run object containing the submitted jobs.
+        run: The run object containing the submitted jobs, or the output of each
+            job when the jobs were run locally.
         solvers: List of solvers to run on the instances.
         job_output_dict: Dictionary containing the job output for each intsance-solver
                          combination.
@@ -232,23 +362,33 @@ def update_results_from_logs(
     num_solvers = len(solvers)
     n_instance_jobs = num_solvers * seeds_per_solver
     objectives = gv.settings().objectives
-
-    for index, cmd in enumerate(cmd_list):
-        solver_index = (mod(index, n_instance_jobs)) // seeds_per_solver
-        solver_obj = solvers[solver_index]
-        solver_output = Solver.parse_solver_output(
-            run.jobs[index].stdout,
-            cmd.split(" "),
+    objective_names = {o.name for o in objectives}
+    instance_names = list(job_output_dict.keys())
+
+    def parse(index: int) -> dict:
+        """Parse the output of a job, reading it from its log if needed."""
+        solver_obj = solvers[(mod(index, n_instance_jobs)) // seeds_per_solver]
+        job_output = run[index] if isinstance(run, list) else run.jobs[index].stdout
+        return Solver.parse_solver_output(
+            job_output,
+            cmd_list[index].split(" "),
             objectives=objectives,
             verifier=solver_obj.verifier,
         )
-        instance_name = list(job_output_dict.keys())[index // n_instance_jobs]
+
+    # Reading and parsing the logs is I/O bound, the results are applied in order
+    with ThreadPoolExecutor() as executor:
+        solver_outputs = list(executor.map(parse, range(len(cmd_list))))
+
+    for index, solver_output in enumerate(solver_outputs):
+        solver_obj = solvers[(mod(index, n_instance_jobs)) // seeds_per_solver]
+        instance_name = instance_names[index // n_instance_jobs]
         cpu_time = solver_output[cpu_time_key]
         cmd_output = job_output_dict[instance_name][solver_obj.name]
         if cpu_time > 0.0 and cpu_time < cmd_output[cpu_time_key]:
             for key, value in solver_output.items():
-                if key in [o.name for o in objectives]:
-                    job_output_dict[instance_name][solver_obj.name][key] = value
+                if key in objective_names:
+                    cmd_output[key] = value
             if cmd_output.get("status") != SolverStatus.KILLED:
                 cmd_output["status"] = solver_output.get("status")
     return job_output_dict
@@ -272,6 +412,7 @@ def fix_missing_times(
     """
     cutoff = gv.settings().solver_cutoff_time
     check_interval = gv.settings().parallel_portfolio_check_interval
+    resolved_objectives = {}  # Resolving an objective is costly, do it once per key
 
     # Fix the CPU/WC time for non existent logs to instance min time + check_interval
     for instance in job_output_dict.keys():
@@ -288,7 +429,9 @@ def fix_missing_times(
             job_output_dict[instance][solver][wall_time_key] = min_time + check_interval
             # Fix runtime objectives with resolved CPU/Wall times
             for key, value in job_output_dict[instance][solver].items():
-                objective = resolve_objective(key)
+                if key not in resolved_objectives:
+                    resolved_objectives[key] = resolve_objective(key)
+                objective = resolved_objectives[key]
                 if objective is not None and objective.time:
                     value = (
                         job_output_dict[instance][solver][cpu_time_key]
@@ -337,23 +480,26 @@ def print_and_write_results(
 
     instance_map = {Path(p).name: p for p in pdf.instances}
     solver_map = {Path(s).name: s for s in pdf.solvers}
+    rows = []
     for instance, instance_dict in job_output_dict.items():
         instance_name = Path(instance).name
         instance_full_path = instance_map.get(instance_name, instance)
         for solver, objective_dict in instance_dict.items():
             solver_name = Path(solver).name
             solver_full_path = solver_map.get(solver_name, solver)
-            for objective in objectives:
-                obj_name = objective.name
-                obj_val = objective_dict.get(
-                    obj_name, PerformanceDataFrame.missing_value
-                )
-                pdf.set_value(
-                    value=obj_val,
-                    solver=solver_full_path,
-                    instance=instance_full_path,
-                    objective=obj_name,
-                )
+            rows.extend(
+                {
+                    PerformanceDataFrame.index_objective: objective.name,
+                    PerformanceDataFrame.index_instance: instance_full_path,
+                    PerformanceDataFrame.column_solver: solver_full_path,
+                    PerformanceDataFrame.column_value: objective_dict.get(
+                        objective.name, PerformanceDataFrame.missing_value
+                    ),
+                }
+                for objective in objectives
+            )
+    if rows:
+        pdf.set_values(pd.DataFrame(rows))
     pdf.save_csv()
 
 
@@ -378,6 +524,7 @@ def build_command_list(
     objectives = gv.settings().objectives
     seeds_per_solver = gv.settings().parallel_portfolio_num_seeds_per_solver
     cmd_list = []
+    seed_rows = []
 
     # Create a command for each instance-solver-seed combination
     for instance, solver in itertools.product(instances_set._instance_paths, solvers):
@@ -392,14 +539,18 @@ def build_command_list(
             )
 
             cmd_list.append(" ".join(solver_call_list))
-            for objective in objectives:
-                performance_data.set_value(
-                    value=seed,
-                    solver=str(solver.directory),
-                    instance=instance.stem,
-                    objective=objective.name,
-                    solver_fields=["Seed"],
-                )
+            seed_rows.extend(
+                {
+                    PerformanceDataFrame.index_objective: objective.name,
+                    PerformanceDataFrame.index_instance: instance.stem,
+                    PerformanceDataFrame.column_solver: str(solver.directory),
+                    PerformanceDataFrame.column_seed: seed,
+                }
+                for objective in objectives
+            )
+    # Write all seeds at once, the last seed of each solver-instance pair remains
+    if seed_rows:
+        performance_data.set_values(pd.DataFrame(seed_rows))
     return cmd_list
 
 
@@ -408,6 +559,7 @@ def submit_jobs(
     solvers: list[Solver],
     instances_set: InstanceSet,
     run_on: Runner = Runner.SLURM,
+    sentinel_dir: Path = None,
 ) -> SlurmRun:
     """Submit jobs to the runner and return the run object.
 
@@ -416,6 +568,8 @@ def submit_jobs(
         solvers: List of solvers to run on the instances.
         instances_set: Set of instances to run on.
         run_on: Runner to use for submitting the jobs.
+        sentinel_dir: If given, each job writes a sentinel file named after its
+            index to this directory when it finishes.
 
     Returns:
         run: The run object containing the submitted jobs.
@@ -437,6 +591,13 @@ def submit_jobs(
 
     sbatch_options = gv.settings().sbatch_settings
     solver_names = ", ".join([s.name for s in solvers])
+    if sentinel_dir is not None:
+        sentinel_dir.mkdir(parents=True, exist_ok=True)
+        cmd_list = [
+            f"python3 {Path(completion.__file__).absolute()} "
+            f"{sentinel_dir.absolute() / str(index)} {cmd}"
+            for index, cmd in enumerate(cmd_list)
+        ]
     # Jobs are added in to the runrunner object in the same order they are provided
     return rrr.add_to_queue(
         runner=run_on,
@@ -487,9 +648,6 @@ def main(argv: list[str]) -> None:
     portfolio_path = args.portfolio_name
 
     run_on = settings.run_on
-    if run_on == Runner.LOCAL:
-        print("Parallel Portfolio is not fully supported yet for Local runs. Exiting.")
-        sys.exit(-1)
 
     # Retrieve instance sets
     instances = [
@@ -539,17 +697,31 @@ def main(argv: list[str]) -> None:
 
     portfolio_path.mkdir(parents=True)
     pdf = create_performance_dataframe(solvers, instances, portfolio_path)
+    gv.register_scenario(pdf, instance_sets=[instances.name])
     returned_cmd = build_command_list(instances, solvers, portfolio_path, pdf)
     default_objective_values, cpu_time_key, status_key, wall_time_key = (
         init_default_objectives()
     )
-    returned_run = submit_jobs(returned_cmd, solvers, instances, Runner.SLURM)
-    job_output_dict = monitor_jobs(
-        returned_run, instances, solvers, default_objective_values
-    )
-    wait_for_logs(returned_cmd)
+    if run_on == Runner.LOCAL:
+        job_output_dict, job_outputs = run_jobs_locally(
+            returned_cmd, instances, solvers, default_objective_values, portfolio_path
+        )
+    else:
+        sentinel_dir = portfolio_path / "Finished"
+        returned_run = submit_jobs(
+            returned_cmd, solvers, instances, Runner.SLURM, sentinel_dir
+        )
+        job_output_dict = monitor_jobs(
+            returned_run,
+            instances,
+            solvers,
+            default_objective_values,
+            sentinel_dir=sentinel_dir,
+        )
+        wait_for_logs(returned_cmd)
+        job_outputs = returned_run
     job_output_dict = update_results_from_logs(
-        returned_cmd, returned_run, solvers, job_output_dict, cpu_time_key
+        returned_cmd, job_outputs, solvers, job_output_dict, cpu_time_key
     )
     job_output_dict = fix_missing_times(
         job_output_dict, status_key, cpu_time_key, wall_time_key
@@ -102,6 +102,7 @@ def main(argv: list[str]) -> None:
         sbatch_options=settings.sbatch_settings,
         dependencies=feature_runs,
         log_dir=sl.caller_log_dir,
+        batch_size=settings.selector_batch_size,
     )
 
     if run_on == Runner.LOCAL:
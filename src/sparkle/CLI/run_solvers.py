@@ -2,11 +2,16 @@
 """Sparkle command to run solvers to get their performance data."""
 
 from __future__ import annotations
+import math
 import random
+import shlex
 import sys
 import argparse
 from pathlib import Path
 
+from tqdm import tqdm
+
+import runrunner as rrr
 from runrunner.base import Runner, Run
 
 from sparkle.solver import Solver
@@ -15,6 +20,7 @@ from sparkle.structures import PerformanceDataFrame
 from sparkle.types import SparkleObjective, resolve_objective
 from sparkle.instance import InstanceSet
 from sparkle.platform.settings_objects import Settings
+from sparkle.tools import async_runner
 from sparkle.CLI.help import global_variables as gv
 from sparkle.CLI.help import logging as sl
 from sparkle.CLI.help import argparse_custom as ac
@@ -57,6 +63,13 @@ def parser_function() -> argparse.ArgumentParser:
         *Settings.OPTION_solver_cutoff_time.args,
         **Settings.OPTION_solver_cutoff_time.kwargs,
     )
+    parser.add_argument(
+        *Settings.OPTION_adaptive_capping.args,
+        **Settings.OPTION_adaptive_capping.kwargs,
+    )
+    parser.add_argument(
+        *Settings.OPTION_result_store.args, **Settings.OPTION_result_store.kwargs
+    )
     parser.add_argument(*Settings.OPTION_run_on.args, **Settings.OPTION_run_on.kwargs)
     return parser
 
@@ -153,6 +166,7 @@ def run_solvers_performance_data(
     sbatch_options: list[str] = None,
     slurm_prepend: str | list[str] | Path = None,
     run_on: Runner = Runner.SLURM,
+    adaptive_capping: bool = False,
 ) -> list[Run]:
     """Run the solvers for the performance data.
 
@@ -176,6 +190,9 @@ def run_solvers_performance_data(
     run_on: Runner
         Where to execute the solvers. For available values see runrunner.base.Runner
         enum. Default: "Runner.SLURM".
+    adaptive_capping: bool
+        Run the jobs of each instance one after another, best known solver
+        configuration first, capping each run at the best known time on the instance.
 
     Returns
     -------
@@ -211,6 +228,26 @@ def run_solvers_performance_data(
     if instances is not None:  # Filter the instances
         jobs = [j for j in jobs if j[2] in instances]
 
+    capping_objective = next((o for o in performance_data.objectives if o.time), None)
+    if adaptive_capping and capping_objective is None:
+        print("WARNING: Adaptive capping requires a time based objective, ignoring it.")
+    elif adaptive_capping:
+        if run_on == Runner.LOCAL:
+            print(f"Cutoff time for each solver run: at most {cutoff_time} seconds")
+        run = run_adaptive_capping(
+            jobs,
+            performance_data,
+            solvers,
+            capping_objective,
+            cutoff_time,
+            sbatch_options=sbatch_options,
+            slurm_prepend=slurm_prepend,
+            run_on=run_on,
+        )
+        if run_on == Runner.SLURM:
+            print(f"Total number of jobs submitted: {len(run.jobs)}")
+        return [run]
+
     # Sort the jobs per solver
     solver_jobs = {p_solver: {} for p_solver in solvers}
     for p_solver, p_config, p_instance, p_run in jobs:
@@ -222,6 +259,7 @@ def run_solvers_performance_data(
             solver_jobs[p_solver][p_config][p_instance].append(p_run)
 
     runrunner_runs = []
+    local_cmds = []
     if run_on == Runner.LOCAL:
         print(f"Cutoff time for each solver run: {cutoff_time} seconds")
     for solver in solvers:
@@ -234,6 +272,19 @@ def run_solvers_performance_data(
             if solver_instances == []:
                 print(f"Warning: No jobs for instances found for solver {solver}")
                 continue
+            if run_on == Runner.LOCAL:
+                # All local jobs share one run, which keeps all cores busy
+                local_cmds.extend(
+                    solver.performance_dataframe_commands(
+                        list(solver_instances),
+                        performance_data,
+                        solver_config,
+                        run_ids=run_ids,
+                        cutoff_time=cutoff_time,
+                        log_dir=sl.caller_log_dir,
+                    )
+                )
+                continue
             run = solver.run_performance_dataframe(
                 solver_instances,
                 performance_data,
@@ -247,9 +298,15 @@ def run_solvers_performance_data(
                 run_on=run_on,
             )
             runrunner_runs.append(run)
-            if run_on == Runner.LOCAL:
-                # Do some printing?
-                pass
+    if local_cmds:
+        with tqdm(total=len(local_cmds)) as progress:
+            progress.set_description("Solver runs done")
+            run = async_runner.run(
+                local_cmds,
+                name=f"Run {len(solvers)} solvers",
+                callback=lambda _: progress.update(),
+            )
+        runrunner_runs.append(run)
     if run_on == Runner.SLURM:
         num_jobs = sum(len(r.jobs) for r in runrunner_runs)
         print(f"Total number of jobs submitted: {num_jobs}")
@@ -257,6 +314,99 @@ def run_solvers_performance_data(
     return runrunner_runs
 
 
+def run_adaptive_capping(
+    jobs: list[tuple[Solver, str, str, int]],
+    performance_data: PerformanceDataFrame,
+    solvers: list[Solver],
+    objective: SparkleObjective,
+    cutoff_time: int,
+    sbatch_options: list[str] = None,
+    slurm_prepend: str | list[str] | Path = None,
+    run_on: Runner = Runner.SLURM,
+) -> Run:
+    """Run the jobs of each instance in sequence with adaptive capping.
+
+    The jobs of an instance are ordered by the known mean performance of their
+    solver configuration, such that the first runs are likely to set a tight cap
+    for the runs after them. Each run caps its cutoff time at the best known time on
+    the instance, see `solver_cli.capping_bound`.
+
+    Parameters
+    ----------
+    jobs: list[tuple[Solver, str, str, int]]
+        The (solver, configuration id, instance path, run) jobs to run
+    performance_data: PerformanceDataFrame
+        The performance data
+    solvers: list[Solver]
+        The solvers of the jobs
+    objective: SparkleObjective
+        The time based objective to rank the configurations and cap the runs by
+    cutoff_time: int
+        The cut off time for the solvers
+    sbatch_options: list[str]
+        The sbatch options to use
+    slurm_prepend: str | list[str] | Path
+        The script to prepend to a slurm script
+    run_on: Runner
+        Where to execute the solvers.
+
+    Returns
+    -------
+    run: runrunner.LocalRun or runrunner.SlurmRun
+        One job per instance.
+    """
+    known_performance = (
+        performance_data.xs(objective.name, level=0)
+        .xs(PerformanceDataFrame.column_value, axis=1, level=2)
+        .astype(float)
+        .mean(axis=0)
+    )
+
+    def rank(job: tuple[Solver, str, str, int]) -> tuple[float, bool]:
+        """Rank a job by its known performance, unknown defaults before others."""
+        solver, config_id, _, _ = job
+        value = known_performance.get((str(solver.directory), config_id), math.nan)
+        return (
+            math.inf if math.isnan(value) else value,
+            config_id != PerformanceDataFrame.default_configuration,
+        )
+
+    jobs = [(solvers[solvers.index(s)], c, i, r) for s, c, i, r in jobs]
+    instance_jobs: dict[str, list[tuple[Solver, str, int]]] = {}
+    for solver, config_id, instance, run in sorted(jobs, key=rank):
+        instance_jobs.setdefault(instance, []).append((solver, config_id, run))
+    cmds = []
+    for instance, sequence in instance_jobs.items():
+        chain = "; ".join(
+            solver.performance_dataframe_command(
+                instance,
+                performance_data,
+                run,
+                config_id=config_id,
+                cutoff_time=cutoff_time,
+                objective=objective,
+                log_dir=sl.caller_log_dir,
+                adaptive_capping=True,
+            )
+            for solver, config_id, run in sequence
+        )
+        cmds.append(f"bash -c {shlex.quote(chain)}")
+    name = (
+        f"Run {len(solvers)} solvers with adaptive capping on "
+        f"{len(instance_jobs)} instances"
+    )
+    if run_on == Runner.LOCAL:
+        return async_runner.run(cmds, name=name)
+    return rrr.add_to_queue(
+        runner=run_on,
+        cmd=cmds,
+        name=name,
+        base_dir=sl.caller_log_dir,
+        sbatch_options=sbatch_options,
+        prepend=slurm_prepend,
+    )
+
+
 def main(argv: list[str]) -> None:
     """Main function of the run solvers command."""
     # Define command line arguments
@@ -322,6 +472,7 @@ def main(argv: list[str]) -> None:
     cutoff_time = settings.solver_cutoff_time
     # Open the performance data csv file
     performance_dataframe = PerformanceDataFrame(settings.DEFAULT_performance_data_path)
+    performance_dataframe.use_result_store(settings.result_store == "sqlite")
 
     print("Start running solvers ...")
     if args.performance_data_jobs:
@@ -334,8 +485,14 @@ def main(argv: list[str]) -> None:
             sbatch_options=sbatch_options,
             slurm_prepend=slurm_prepend,
             run_on=run_on,
+            adaptive_capping=settings.adaptive_capping,
         )
     else:
+        if settings.adaptive_capping:
+            print(
+                "WARNING: Adaptive capping only applies to the performance data jobs "
+                "(--performance-data-jobs), running without it."
+            )
         if args.best_configuration:
             train_instances = None
             if isinstance(args.best_configuration, list):
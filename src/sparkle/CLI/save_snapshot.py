@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Sparkle command to save the current Sparkle platform in a .zip file."""
+"""Sparkle command to save the current Sparkle platform as a snapshot."""
 
 import sys
 
@@ -13,7 +13,7 @@ import argparse
 def parser_function() -> argparse.ArgumentParser:
     """Parser for save_snapshot."""
     parser = argparse.ArgumentParser(
-        description="Save the current platform in a .zip file.",
+        description="Save the current platform as an incremental snapshot.",
         epilog="Can be loaded later with the load snapshot command.",
     )
     parser.add_argument(*ac.SnapshotNameArgument.names, **ac.SnapshotNameArgument.kwargs)
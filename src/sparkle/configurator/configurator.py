@@ -4,13 +4,17 @@ from __future__ import annotations
 import re
 import shutil
 import decimal
+import json
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterator, Optional
 import random
 
+import pandas as pd
 import runrunner as rrr
 from runrunner import Runner, Run
+from runrunner.base import Status
 
 from sparkle.solver import Solver
 from sparkle.tools.parameters import PCSConvention
@@ -69,6 +73,7 @@ class Configurator:
         num_parallel_jobs: int = None,
         base_dir: Path = None,
         run_on: Runner = Runner.SLURM,
+        cpus_per_task: int = None,
     ) -> Run:
         """Start configuration job.
 
@@ -87,6 +92,8 @@ class Configurator:
             num_parallel_jobs: The maximum number of jobs to run in parallel
             base_dir: The base_dir of RunRunner where the sbatch scripts will be placed
             run_on: On which platform to run the jobs. Default: Slurm.
+            cpus_per_task: The number of CPUs each configuration job requests on
+                Slurm, if it uses more than one. The validation jobs are not affected.
 
         Returns:
             A RunRunner Run object.
@@ -102,6 +109,11 @@ class Configurator:
             [{}] * len(configuration_ids),
         )
         data_target.save_csv()
+        configuration_sbatch_options = sbatch_options
+        if cpus_per_task is not None:
+            configuration_sbatch_options = (sbatch_options or []) + [
+                f"--cpus-per-task={cpus_per_task}"
+            ]
         # Submit the configuration job
         runs = [
             rrr.add_to_queue(
@@ -111,7 +123,7 @@ class Configurator:
                 base_dir=base_dir,
                 output_path=output,
                 parallel_jobs=num_parallel_jobs,
-                sbatch_options=sbatch_options,
+                sbatch_options=configuration_sbatch_options,
                 prepend=slurm_prepend,
             )
         ]
@@ -130,6 +142,8 @@ class Configurator:
                 job_name=f"{self.name}: Validating {len(configuration_ids)} "
                 f"{scenario.solver.name} Configurations on "
                 f"{scenario.instance_set.name}",
+                # Trials imported from the configurator are not run again
+                skip_existing=True,
                 run_on=run_on,
             )
             runs.append(validate)
@@ -158,12 +172,83 @@ class Configurator:
         """
         raise NotImplementedError
 
+    @staticmethod
+    def import_trials(
+        performance_data: PerformanceDataFrame,
+        solver: str,
+        scenario: ConfigurationScenario,
+        configuration_id: str,
+        trials: list[dict],
+    ) -> list[dict]:
+        """Fill missing values of a configuration with trials of the configurator.
+
+        Only trials that ran with the cutoff time of the scenario are imported, or
+        that finished within a lower cutoff. Each trial fills the first missing run
+        of its instance, existing values are never overwritten.
+
+        Args:
+            performance_data: The Performance DataFrame to fill.
+            solver: The solver column of the configuration in the dataframe.
+            scenario: ConfigurationScenario of the configuration.
+            configuration_id: ID (of the run) of the configuration.
+            trials: The trials of the configuration, as dictionaries with the keys
+                instance, seed, cutoff_time, timeout and value. The value is that of
+                the first objective of the scenario.
+
+        Returns:
+            The imported trials, extended with the objective and run they were
+            placed in.
+        """
+        objective = scenario.sparkle_objectives[0].name
+        if objective not in performance_data.objective_names:
+            return []
+        imported, seen = [], set()
+        for trial in trials:
+            instance = Path(trial["instance"]).stem
+            if instance not in performance_data.instances:
+                instance = str(Path(trial["instance"]).with_suffix(""))
+                if instance not in performance_data.instances:
+                    continue
+            capped = (
+                trial["timeout"]
+                and scenario.solver_cutoff_time is not None
+                and trial["cutoff_time"] < scenario.solver_cutoff_time
+            )
+            if capped or (instance, trial["seed"]) in seen:
+                continue
+            seen.add((instance, trial["seed"]))
+            for run in performance_data.run_ids:
+                value = performance_data.get_value(
+                    solver, instance, configuration_id, objective, run
+                )
+                if not pd.isna(value) and str(value) != "nan":
+                    continue
+                performance_data.set_value(
+                    [trial["value"], trial["seed"]],
+                    solver=solver,
+                    instance=instance,
+                    configuration=configuration_id,
+                    objective=objective,
+                    run=run,
+                    solver_fields=[
+                        PerformanceDataFrame.column_value,
+                        PerformanceDataFrame.column_seed,
+                    ],
+                )
+                imported.append(
+                    {**trial, "instance": instance, "objective": objective, "run": run}
+                )
+                break
+        return imported
+
     @staticmethod
     def save_configuration(
         scenario: ConfigurationScenario,
         configuration_id: str,
         configuration: dict,
         output_target: Path,
+        trials: list[dict] = None,
+        trials_source: Path = None,
     ) -> dict | None:
         """Method to save a configuration to a file.
 
@@ -174,6 +259,10 @@ class Configurator:
             configuration_id: ID (of the run) of the configuration.
             configuration: Configuration to save.
             output_target: Path to the Performance DataFrame to store result.
+            trials: The trials the configurator ran with the configuration, which
+                are imported into the Performance DataFrame. See `import_trials`.
+            trials_source: The configurator file the trials were read from,
+                recorded with the imported trials in the validation directory.
         """
         if output_target is None or not output_target.exists():
             return configuration
@@ -195,7 +284,21 @@ class Configurator:
                 configuration_id=configuration_id,
                 configuration=configuration,
             )
+            imported = Configurator.import_trials(
+                performance_data, solver, scenario, configuration_id, trials or []
+            )
             performance_data.save_csv()
+        if imported:
+            # Record the provenance of the imported values
+            scenario.validation.mkdir(parents=True, exist_ok=True)
+            provenance = {
+                "configurator": scenario.configurator.__name__,
+                "configuration_id": configuration_id,
+                "source": str(trials_source),
+                "trials": imported,
+            }
+            provenance_file = scenario.validation / f"{configuration_id}_imported.json"
+            provenance_file.write_text(json.dumps(provenance, indent=2))
 
     def get_status_from_logs(self: Configurator) -> None:
         """Method to scan the log files of the configurator for warnings."""
@@ -399,7 +502,8 @@ class AblationScenario:
             train_set: The training instance
             test_set: The test instance
             cutoff_length: The cutoff length for ablation analysis
-            concurrent_clis: The maximum number of concurrent jobs on a single node
+            concurrent_clis: The maximum number of concurrent solver runs on a single
+                node, e.g. evaluating the candidate configurations of a round.
             best_configuration: The configuration to ablate from.
             ablation_racing: Whether to use ablation racing
         """
@@ -455,6 +559,13 @@ class AblationScenario:
         else:
             return None
 
+    @property
+    def log_file(self: AblationScenario) -> Path:
+        """Return the path of the ablation log, extended as the rounds complete."""
+        if self.scenario_dir:
+            return self.scenario_dir / "log" / "ablation-run1234.txt"
+        return None
+
     @staticmethod
     def check_requirements(verbose: bool = False) -> bool:
         """Check if Ablation Analysis is installed."""
@@ -623,34 +734,90 @@ class AblationScenario:
         table_line = self.table_file.open().readline().strip()
         return table_line == "Ablation analysis validation complete."
 
-    def read_ablation_table(self: AblationScenario) -> list[list[str]]:
-        """Read from ablation table of a scenario."""
-        if not self.check_for_ablation():
+    @staticmethod
+    def parse_table_line(line: str) -> list[str] | None:
+        """Parse a row of an ablation table.
+
+        Args:
+            line: A line of the ablation table or log.
+
+        Returns:
+            The round, flipped parameter(s), source value(s), target value(s) and
+            result, or None if the line is not a row of the table.
+        """
+        # Sometimes ablation rounds switch multiple parameters at once.
+        # EXAMPLE: 2 EDR, EDRalpha   0, 0.1   1, 0.1013241633106732 486.31691
+        # To split the row correctly, we remove the space before the comma separated
+        # parameters and add it back.
+        values = re.sub(r"\s+", " ", line.strip())
+        values = re.sub(r", ", ",", values)
+        values = [val.replace(",", ", ") for val in values.split(" ")]
+        return values if len(values) == 5 and values[0].isdigit() else None
+
+    def read_ablation_table(
+        self: AblationScenario, partial: bool = False
+    ) -> list[list[str]]:
+        """Read from ablation table of a scenario.
+
+        Args:
+            partial: If the ablation has not finished, return the rounds that have
+                completed so far according to the ablation log.
+
+        Returns:
+            The rows of the table, starting with the header. Empty if there are no
+            (completed) rounds.
+        """
+        if self.check_for_ablation():
+            lines = self.table_file.open().readlines()
+        elif partial and self.log_file is not None and self.log_file.is_file():
+            lines = self.log_file.open().readlines()
+        else:
             # No ablation table exists for this solver-instance pair
             return []
-        results = [
-            [
-                "Round",
-                "Flipped parameter",
-                "Source value",
-                "Target value",
-                "Validation result",
-            ]
+        rows = [row for row in map(AblationScenario.parse_table_line, lines) if row]
+        if not rows:
+            return []
+        header = [
+            "Round",
+            "Flipped parameter",
+            "Source value",
+            "Target value",
+            "Validation result",
         ]
+        return [header] + rows
 
-        for line in self.table_file.open().readlines():
-            # Pre-process lines from the ablation file and add to the results dictionary.
-            # Sometimes ablation rounds switch multiple parameters at once.
-            # EXAMPLE: 2 EDR, EDRalpha   0, 0.1   1, 0.1013241633106732 486.31691
-            # To split the row correctly, we remove the space before the comma separated
-            # parameters and add it back.
-            # T.S. 30-01-2024: the results object is a nested list not dictionary?
-            values = re.sub(r"\s+", " ", line.strip())
-            values = re.sub(r", ", ",", values)
-            values = [val.replace(",", ", ") for val in values.split(" ")]
-            if len(values) == 5:
-                results.append(values)
-        return results
+    def stream_ablation_table(
+        self: AblationScenario,
+        finished: Callable[[], bool],
+        poll_interval: float = 1.0,
+    ) -> Iterator[list[str]]:
+        """Yield the rows of the ablation table as the rounds complete.
+
+        Args:
+            finished: Returns whether the ablation run has finished, after which the
+                remaining rows are yielded.
+            poll_interval: Seconds between reads of the ablation log.
+
+        Yields:
+            The rows of the completed rounds, see `parse_table_line`.
+        """
+        offset, buffer = 0, ""
+        while True:
+            done = finished()
+            if self.log_file.is_file():
+                with self.log_file.open() as fin:
+                    fin.seek(offset)
+                    buffer += fin.read()
+                    offset = fin.tell()
+                *lines, buffer = buffer.split("\n")  # Keep an incomplete last line
+                for line in lines:
+                    if row := AblationScenario.parse_table_line(line):
+                        yield row
+            if done:
+                if row := AblationScenario.parse_table_line(buffer):
+                    yield row
+                return
+            time.sleep(poll_interval)
 
     def submit_ablation(
         self: AblationScenario,
@@ -695,6 +862,13 @@ class AblationScenario:
 
         runs = []
         if run_on == Runner.LOCAL:
+            # Report the rounds as they complete
+            for row in self.stream_ablation_table(
+                lambda: run_ablation.status not in (Status.WAITING, Status.RUNNING)
+            ):
+                print(
+                    f"Ablation round {row[0]}: {row[1]} ({row[2]} -> {row[3]}) {row[4]}"
+                )
             run_ablation.wait()
         runs.append(run_ablation)
 
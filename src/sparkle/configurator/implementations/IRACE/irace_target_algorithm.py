@@ -2,35 +2,48 @@
 # -*- coding: UTF-8 -*-
 """Handles IRACE calls passing to sparkle solver wrappers."""
 
+import importlib.util
 import sys
 import warnings
 from pathlib import Path
 
-from runrunner import Runner
+target_daemon = sys.modules.get("target_daemon")  # Already loaded in the daemon
+if target_daemon is None:
+    spec = importlib.util.spec_from_file_location(
+        "target_daemon", Path(__file__).parent.parent / "target_daemon.py"
+    )
+    target_daemon = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(target_daemon)
 
-from sparkle.solver import Solver
-from sparkle.types import resolve_objective
 
+def run_target(argv: list[str]) -> str:
+    """Run the solver for an IRACE call.
 
-if __name__ == "__main__":
-    # Incoming call from IRACE:
+    Args:
+        argv: The arguments of the call, excluding the script itself.
+
+    Returns:
+        The result line for IRACE.
+    """
     # Translate input to Solver object input
-    solver_dir = Path(sys.argv[1])  # First argument is the path to the solver
-    objective = resolve_objective(sys.argv[2])  # Second is the objective to optimise
-    cutoff_time = float(sys.argv[3])  # Third is the cutoff time
+    solver_dir = Path(argv[0])  # First argument is the path to the solver
+    objective_name = argv[1]  # Second is the objective to optimise
+    cutoff_time = float(argv[2])  # Third is the cutoff time
     # Argument 4,5 are configuration id and instance id
-    config_id = sys.argv[4]
-    instance_id = sys.argv[5]
-    seed = int(sys.argv[6])  # Fifth is the seed
+    config_id = argv[3]
+    seed = int(argv[5])  # Sixth is the seed
     if str(config_id) == "1" and int(seed) == 1234567:
-        print(0, int(cutoff_time))  # Test call to Solver
-        sys.exit()
-    instance = Path(sys.argv[7])  # Sixth argument is the path to the instance
-    argsiter = iter(sys.argv[8:])
+        return f"0 {int(cutoff_time)}"  # Test call to Solver
+
+    from runrunner import Runner
+    from sparkle.types import resolve_objective
+
+    objective = resolve_objective(objective_name)
+    instance = Path(argv[6])  # Seventh argument is the path to the instance
+    argsiter = iter(argv[7:])
     args = zip(argsiter, argsiter)
     configuration = {arg.strip("-"): val for arg, val in args}
-    runsolver_binary = solver_dir / "runsolver"
-    solver = Solver(solver_dir, runsolver_exec=runsolver_binary)
+    solver = target_daemon.load_solver(solver_dir.absolute())
     # Call Runsolver with the solver configurator wrapper and its arguments
     # IRACE cannot deal with printed warnings, we filter out missing RunSolver logs
     warnings.filterwarnings("ignore", category=RuntimeWarning)
@@ -47,5 +60,12 @@ if __name__ == "__main__":
     objective_value = (
         output[objective.name] if objective.minimise else -1 * output[objective.name]
     )
+    return f"{objective_value} {output['cpu_time']}"
+
 
-    print(f"{objective_value} {output['cpu_time']}")
+if __name__ == "__main__":
+    # Incoming call from IRACE, computed by the daemon if it is running
+    output = target_daemon.call(Path(__file__), sys.argv[1:], Path(sys.argv[1]))
+    if output is None:
+        output = run_target(sys.argv[1:])
+    print(output)
@@ -2,33 +2,46 @@
 # -*- coding: UTF-8 -*-
 """Handles ParamILS calls passing to sparkle solver wrappers."""
 
+import importlib.util
 import sys
 from pathlib import Path
 
-from runrunner import Runner
+target_daemon = sys.modules.get("target_daemon")  # Already loaded in the daemon
+if target_daemon is None:
+    spec = importlib.util.spec_from_file_location(
+        "target_daemon", Path(__file__).parent.parent / "target_daemon.py"
+    )
+    target_daemon = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(target_daemon)
 
-from sparkle.solver import Solver
-from sparkle.types import resolve_objective
 
+def run_target(argv: list[str]) -> str:
+    """Run the solver for a ParamILS call.
+
+    Args:
+        argv: The arguments of the call, excluding the script itself.
+
+    Returns:
+        The result line for ParamILS.
+    """
+    from runrunner import Runner
+    from sparkle.types import resolve_objective
 
-if __name__ == "__main__":
-    # Incoming call from SMAC:
     # Translate input to Solver object input
-    argsiter = iter(sys.argv[9:])
+    argsiter = iter(argv[8:])
     args = zip(argsiter, argsiter)
     configuration = {arg.strip("-"): val for arg, val in args}
-    # Args 1-8 conditions of the run, the rest are configurations for the solver
+    # Args 0-7 conditions of the run, the rest are configurations for the solver
     # [Solver_dir, Solver_Log_dir, SparkleObjective, instance, specifics,
     #  cutoff_time, runlength, seed]
-    solver_dir = Path(sys.argv[1])
-    solver_log_dir = Path(sys.argv[2])
-    objective = resolve_objective(sys.argv[3])
-    instance = sys.argv[4]
-    cutoff_time = float(sys.argv[6])
-    seed = int(sys.argv[8])
-
-    runsolver_binary = solver_dir / "runsolver"
-    solver = Solver(solver_dir, runsolver_exec=runsolver_binary)
+    solver_dir = Path(argv[0])
+    solver_log_dir = Path(argv[1])
+    objective = resolve_objective(argv[2])
+    instance = argv[3]
+    cutoff_time = float(argv[5])
+    seed = int(argv[7])
+
+    solver = target_daemon.load_solver(solver_dir.absolute())
     # Call Runsolver with the solver configurator wrapper and its arguments
     output = solver.run(
         instances=instance,
@@ -47,7 +60,15 @@ if __name__ == "__main__":
         quality = float(output[objective.name])
         if not objective.minimise:
             quality = -1 * quality
-    print(
+    return (
         "Result of algorithm run: "
         f"{output['status']}, {output['cpu_time']}, 0, {quality}, {seed}"
     )
+
+
+if __name__ == "__main__":
+    # Incoming call from ParamILS, computed by the daemon if it is running
+    output = target_daemon.call(Path(__file__), sys.argv[1:], Path(sys.argv[1]))
+    if output is None:
+        output = run_target(sys.argv[1:])
+    print(output)
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 import sys
+import os
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 import copy
+import dataclasses
 import inspect
 import math
 import traceback
@@ -12,16 +16,17 @@ from functools import partial
 
 import numpy as np
 from ConfigSpace import Configuration
-from smac.runner.abstract_runner import StatusType
+from smac.runhistory.dataclasses import TrialInfo, TrialValue
+from smac.runner.abstract_runner import AbstractRunner, StatusType
 from smac.runner.abstract_serial_runner import AbstractSerialRunner
 from smac.scenario import Scenario
 
-from sparkle.configurator.implementations import SMAC3, SMAC3Scenario
+from sparkle.configurator.implementations.smac3 import SMAC3, SMAC3Scenario
 
 
 def smac3_solver_call(config: Configuration, instance: str, seed: int) -> list[float]:
     """Wrapper function."""
-    return solver.run(
+    result = solver.run(
         instance,
         objectives,
         seed,
@@ -29,6 +34,8 @@ def smac3_solver_call(config: Configuration, instance: str, seed: int) -> list[f
         configuration=dict(config),
         log_dir=log_dir,
     )
+    result["cutoff_time"] = cutoff  # Recorded with the trial in the run history
+    return result
 
 
 class SparkleTargetFunctionRunner(AbstractSerialRunner):
@@ -165,6 +172,7 @@ class SparkleTargetFunctionRunner(AbstractSerialRunner):
         # Presetting
         cost: float | list[float] = self._crash_cost
         runtime = 0.0
+        cpu_time = 0.0
         additional_info = {}
         status = StatusType.CRASHED
 
@@ -185,6 +193,8 @@ class SparkleTargetFunctionRunner(AbstractSerialRunner):
             cpu_time = result["cpu_time"]
             del result["cpu_time"]
             del result["memory"]
+            if "cutoff_time" in result:
+                additional_info["cutoff_time"] = result["cutoff_time"]
             result = {
                 key: value for key, value in result.items() if key in self._objectives
             }
@@ -257,6 +267,196 @@ class SparkleTargetFunctionRunner(AbstractSerialRunner):
         return algorithm(config, **algorithm_kwargs)
 
 
+def worker_cores(n_workers: int) -> list[int] | None:
+    """Determine the CPU cores to pin the workers of a run to.
+
+    Other runs may share the node, so the workers are only pinned when the process
+    has been given exactly one core per worker.
+
+    Args:
+        n_workers: The number of workers of the run.
+
+    Returns:
+        A core for each worker, or None if the workers should not be pinned.
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    cores = sorted(os.sched_getaffinity(0))
+    return cores if len(cores) == n_workers else None
+
+
+def initialise_worker(
+    scenario_file: Path,
+    run_index: int,
+    required_arguments: list[str],
+    cores: multiprocessing.SimpleQueue = None,
+    target_function: Callable = smac3_solver_call,
+) -> None:
+    """Initialise a worker process of the SparkleParallelTargetFunctionRunner.
+
+    Args:
+        scenario_file: Path to the scenario file.
+        run_index: The run index of the scenario.
+        required_arguments: The arguments SMAC passes to the target function.
+        cores: Queue of CPU cores to pin the workers to, one per worker. If None,
+            the worker is not pinned.
+        target_function: The target function of the trials.
+    """
+    global solver, objectives, cutoff, log_dir, worker_runner
+    if cores is not None:
+        os.sched_setaffinity(0, {cores.get()})  # Inherited by RunSolver
+    scenario = SMAC3Scenario.from_file(scenario_file, run_index=run_index)
+    solver = scenario.solver
+    cutoff = scenario.solver_cutoff_time
+    objectives = scenario.sparkle_objectives
+    log_dir = scenario.log_dir
+    worker_runner = SparkleTargetFunctionRunner(
+        scenario.smac3_scenario,
+        target_function=target_function,
+        required_arguments=required_arguments,
+    )
+
+
+def run_trial(trial_info: TrialInfo) -> tuple[TrialInfo, TrialValue]:
+    """Run a trial in a worker process of the SparkleParallelTargetFunctionRunner."""
+    return worker_runner.run_wrapper(trial_info)
+
+
+class SparkleParallelTargetFunctionRunner(AbstractRunner):
+    """Sparkle runner to execute multiple trials concurrently in a local process pool.
+
+    Each worker process holds its own Solver and runs its trials with a
+    SparkleTargetFunctionRunner, so every trial reports its own RunSolver wall clock
+    and CPU time. When the process has been given exactly one core per worker, such as
+    by the CPUs per task of its Slurm job, each worker is pinned to its own core.
+
+    Parameters
+    ----------
+    scenario: Scenario
+    scenario_file: Path
+        The Sparkle scenario file, from which each worker sets up its Solver.
+    run_index: int
+        The run index of the Sparkle scenario.
+    n_workers: int
+        The number of trials to run concurrently.
+    required_arguments: list[str], defaults to []
+        A list of required arguments, which are passed to the target function.
+    target_function: Callable
+        The target function, which must be picklable. Set to default to
+        smac3_solver_call.
+    """
+
+    def __init__(
+        self: SparkleParallelTargetFunctionRunner,
+        scenario: Scenario,
+        scenario_file: Path,
+        run_index: int,
+        n_workers: int,
+        required_arguments: list[str] = None,
+        target_function: Callable = smac3_solver_call,
+    ) -> None:
+        """Initialize SparkleParallelTargetFunctionRunner."""
+        super().__init__(scenario=scenario, required_arguments=required_arguments)
+        # Used for the meta data and for running trials in this process
+        self._serial_runner = SparkleTargetFunctionRunner(
+            scenario,
+            target_function=target_function,
+            required_arguments=self._required_arguments,
+        )
+        self._n_workers = n_workers
+        # Forkserver starts each worker from a clean process instead of a fork
+        start_method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        context = multiprocessing.get_context(start_method)
+        cores = None
+        pinned_cores = worker_cores(n_workers)
+        if pinned_cores is not None:
+            cores = context.SimpleQueue()
+            for core in pinned_cores:
+                cores.put(core)
+        self._executor = ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=context,
+            initializer=initialise_worker,
+            initargs=(
+                scenario_file,
+                run_index,
+                self._required_arguments,
+                cores,
+                target_function,
+            ),
+        )
+        self._pending_trials: list[Future] = []
+
+    @property
+    def meta(self: SparkleParallelTargetFunctionRunner) -> dict[str, Any]:  # noqa: D102
+        meta = self._serial_runner.meta
+        meta.update({"n_workers": self._n_workers})
+        return meta
+
+    def submit_trial(
+        self: SparkleParallelTargetFunctionRunner, trial_info: TrialInfo
+    ) -> None:
+        """Submit a trial to the process pool, waiting for a free worker if needed.
+
+        Parameters
+        ----------
+        trial_info : TrialInfo
+            An object containing the configuration launched.
+        """
+        if self.count_available_workers() <= 0:
+            wait(self._pending_trials, return_when=FIRST_COMPLETED)
+            self._process_pending_trials()
+        self._pending_trials.append(self._executor.submit(run_trial, trial_info))
+
+    def iter_results(
+        self: SparkleParallelTargetFunctionRunner,
+    ) -> Iterator[tuple[TrialInfo, TrialValue]]:
+        """Yield the results of the finished trials."""
+        self._process_pending_trials()
+        while self._results_queue:
+            yield self._results_queue.pop(0)
+
+    def wait(self: SparkleParallelTargetFunctionRunner) -> None:
+        """Wait until at least one of the running trials has finished."""
+        if self.is_running():
+            wait(self._pending_trials, return_when=FIRST_COMPLETED)
+
+    def is_running(self: SparkleParallelTargetFunctionRunner) -> bool:  # noqa: D102
+        return len(self._pending_trials) > 0
+
+    def run(
+        self: SparkleParallelTargetFunctionRunner,
+        config: Configuration,
+        instance: str | None = None,
+        budget: float | None = None,
+        seed: int | None = None,
+        **dask_data_to_scatter: dict[str, Any],
+    ) -> tuple[StatusType, float | list[float], float, float, dict]:
+        """Run a single trial in this process, see SparkleTargetFunctionRunner.run."""
+        return self._serial_runner.run(
+            config, instance, budget, seed, **dask_data_to_scatter
+        )
+
+    def count_available_workers(self: SparkleParallelTargetFunctionRunner) -> int:
+        """Returns the number of workers that are not running a trial."""
+        return self._n_workers - len(self._pending_trials)
+
+    def close(self: SparkleParallelTargetFunctionRunner) -> None:
+        """Shut down the process pool, cancelling trials that have not started."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _process_pending_trials(self: SparkleParallelTargetFunctionRunner) -> None:
+        """Move the finished trials to the results queue."""
+        done = [trial for trial in self._pending_trials if trial.done()]
+        for trial in done:
+            self._results_queue.append(trial.result())
+            self._pending_trials.remove(trial)
+
+
 if __name__ == "__main__":
     # Incoming call from Sparkle:
     args = sys.argv[1:]
@@ -270,28 +470,41 @@ if __name__ == "__main__":
     cutoff = scenario.solver_cutoff_time
     objectives = scenario.sparkle_objectives
     log_dir = scenario.log_dir
+    # With multiple workers SMAC3 would start a DASK cluster, we use our own runner
+    smac3_scenario = dataclasses.replace(scenario.smac3_scenario, n_workers=1)
     kwargs = {}
     if scenario.max_ratio is not None:  # Override the default initial design
         kwargs["initial_design"] = scenario.smac_facade.get_initial_design(
-            scenario=scenario.smac3_scenario, max_ratio=scenario.max_ratio
+            scenario=smac3_scenario, max_ratio=scenario.max_ratio
         )
     # Facade Configurable
-    smac_facade = scenario.smac_facade(
-        scenario.smac3_scenario, smac3_solver_call, **kwargs
-    )
+    smac_facade = scenario.smac_facade(smac3_scenario, smac3_solver_call, **kwargs)
     # Override the target function runner to control resource management
-    smac_facade._runner = SparkleTargetFunctionRunner(
-        scenario.smac3_scenario,
-        required_arguments=smac_facade._get_signature_arguments(),
-    )
+    if scenario.n_workers > 1:
+        smac_facade._runner = SparkleParallelTargetFunctionRunner(
+            smac3_scenario,
+            scenario_file=scenario_file,
+            run_index=seed,
+            n_workers=scenario.n_workers,
+            required_arguments=smac_facade._get_signature_arguments(),
+        )
+    else:
+        smac_facade._runner = SparkleTargetFunctionRunner(
+            smac3_scenario,
+            required_arguments=smac_facade._get_signature_arguments(),
+        )
     # Refresh the optimiser with new target class
     smac_facade._optimizer = smac_facade._get_optimizer()
 
-    incumbent = smac_facade.optimize()
+    try:
+        incumbent = smac_facade.optimize()
+    finally:  # Do not leave the worker processes behind
+        if isinstance(smac_facade._runner, SparkleParallelTargetFunctionRunner):
+            smac_facade._runner.close()
     # TODO: Fix taking first objective, how do we determine 'best configuration' from
     # a multi objective run?
     SMAC3.organise_output(
-        scenario.smac3_scenario.output_directory / "runhistory.json",
+        smac3_scenario.output_directory / "runhistory.json",
         output_target=output_path,
         scenario=scenario,
         configuration_id=config_id,
@@ -6,11 +6,14 @@ import subprocess
 import random
 from pathlib import Path
 
+import pandas as pd
+
 from sparkle.configurator.configurator import Configurator, ConfigurationScenario
 from sparkle.solver import Solver
 from sparkle.structures import PerformanceDataFrame, FeatureDataFrame
 from sparkle.instance import InstanceSet, Instance_Set
 from sparkle.types import SparkleObjective, resolve_objective
+from sparkle.tools.rdata import read_rdata
 
 from runrunner import Runner, Run
 
@@ -214,49 +217,41 @@ class IRACE(Configurator):
         configuration_id: str,
     ) -> None | dict:
         """Method to restructure and clean up after a single configurator call."""
-        get_config = subprocess.run(
-            [
-                "Rscript",
-                "-e",
-                'library("irace"); '
-                f'load("{output_source}"); '
-                "last <- length(iraceResults$iterationElites); "
-                "id <- iraceResults$iterationElites[last]; "
-                "print(getConfigurationById(iraceResults, ids = id))",
-            ],
-            capture_output=True,
-        )
-        r_table = get_config.stdout.decode()
-        if get_config.returncode != 0 or r_table.strip() == "":
-            raise RuntimeError(
-                "Failed to get configuration from IRACE file "
-                f"{output_source}:\n"
-                f"{get_config.stdout.decode()}\n"
-                f"{get_config.stderr.decode()}"
-            )
-
-        # Join the table header and content together
-        header = ""
-        content = ""
-        for i, line in enumerate(r_table.splitlines()):
-            if i & 1 == 0:  # Even lines are headers
-                header += line
-            else:  # Odd lines are parameter values
-                # First element is the ID
-                line = " ".join(line.split(" ")[1:])
-                content += line
-        # First header item is the ID
-        header = [x for x in header.split(" ") if x != ""][1:]
-        content = [x for x in content.split(" ") if x != ""][1:]
-        configuration = ""
-        for parameter, value in zip(header, content):
-            if not parameter == ".PARENT." and value != "NA" and value != "<NA>":
-                configuration += f"--{parameter} {value} "
-        configuration = Solver.config_str_to_dict(configuration)
+        configuration = IRACE.get_elite_configuration(output_source)
         return Configurator.save_configuration(
             scenario, configuration_id, configuration, output_target
         )
 
+    @staticmethod
+    def get_elite_configuration(output_source: Path) -> dict[str, str]:
+        """Read the final elite configuration from the results of an IRACE run.
+
+        The results are read directly from the R data file, without calling R.
+
+        Args:
+            output_source: Path to the .Rdata file written by IRACE.
+
+        Returns:
+            The configuration as a dictionary of parameter names and values.
+        """
+        try:
+            results = read_rdata(output_source)["iraceResults"]
+            elite_id = results["iterationElites"][-1]
+            configurations = results["allConfigurations"]
+            elite = configurations[configurations[".ID."] == elite_id].iloc[0]
+        except (OSError, ValueError, KeyError, IndexError) as error:
+            raise RuntimeError(
+                f"Failed to get configuration from IRACE file {output_source}: {error!r}"
+            ) from error
+        configuration = {}
+        for parameter, value in elite.items():
+            if parameter in (".ID.", ".PARENT.") or pd.isna(value):
+                continue  # Meta data or inactive parameter
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            configuration[parameter] = str(value)
+        return configuration
+
     def get_status_from_logs(self: Configurator) -> None:
         """Method to scan the log files of the configurator for warnings."""
         raise NotImplementedError
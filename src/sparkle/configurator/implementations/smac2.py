@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 from pathlib import Path
+import re
 import shutil
 import math
 import random
@@ -15,7 +16,7 @@ from sparkle.configurator.configurator import Configurator, ConfigurationScenari
 from sparkle.solver import Solver
 from sparkle.structures import PerformanceDataFrame, FeatureDataFrame
 from sparkle.instance import InstanceSet, Instance_Set
-from sparkle.types import SparkleObjective, resolve_objective
+from sparkle.types import SparkleObjective, SolverStatus, resolve_objective
 
 
 class SMAC2(Configurator):
@@ -152,8 +153,9 @@ class SMAC2(Configurator):
     ) -> None | dict:
         """Retrieves configuration from SMAC file and places them in output."""
         call_key = SMAC2.configurator_target.name
+        log_lines = output_source.open("r").readlines()
         # Last line describing a call is the best found configuration
-        for line in reversed(output_source.open("r").readlines()):
+        for line in reversed(log_lines):
             if call_key in line:
                 call_str = line.split(call_key, maxsplit=1)[1].strip()
                 # The Configuration appears after the first 7 arguments
@@ -161,10 +163,91 @@ class SMAC2(Configurator):
                 break
         configuration = Solver.config_str_to_dict(configuration)
         configuration["configuration_id"] = configuration_id
+        trials, trials_source = [], None
+        if output_target is not None:
+            trials, trials_source = SMAC2.get_incumbent_trials(log_lines, scenario)
         return Configurator.save_configuration(
-            scenario, configuration_id, configuration, output_target
+            scenario,
+            configuration_id,
+            configuration,
+            output_target,
+            trials=trials,
+            trials_source=trials_source,
         )
 
+    @staticmethod
+    def get_incumbent_trials(
+        log_lines: list[str], scenario: SMAC2Scenario
+    ) -> tuple[list[dict], Path | None]:
+        """Read the runs of the final incumbent from the SMAC2 state files.
+
+        Args:
+            log_lines: The lines of the output log of the SMAC2 run.
+            scenario: The scenario of the run.
+
+        Returns:
+            The trials of the final incumbent, as accepted by
+            `Configurator.import_trials`, and the runs and results file they were
+            read from. Empty and None if the state files could not be found.
+        """
+        log_file, incumbent = None, None
+        for line in log_lines:
+            if match := re.search(r"Logging to: (\S+)", line):
+                log_file = Path(match.group(1))
+            elif match := re.search(r"final incumbent: config (\d+)", line):
+                incumbent = int(match.group(1))
+        if log_file is None or incumbent is None:
+            return [], None
+        run_number = re.search(r"log-run(\d+)", log_file.name)
+        state_dir = log_file.parent / f"state-run{run_number.group(1)}"
+        # The state is saved per iteration, the last one contains all runs
+        results_files = sorted(
+            state_dir.glob("runs_and_results-it*.csv"),
+            key=lambda path: int(re.search(r"it(\d+)", path.name).group(1)),
+        )
+        instance_file = state_dir / "instances.txt"
+        if not instance_file.exists():
+            instance_file = scenario.instance_file_path
+        if not results_files or not instance_file.exists():
+            return [], None
+        # Instance IDs refer to the (one based) lines of the instance file
+        instances = [
+            line.split()[0] for line in instance_file.read_text().splitlines() if line
+        ]
+        runs = pd.read_csv(results_files[-1], index_col=False)
+        runs = runs[runs["Run History Configuration ID"] == incumbent]
+        objective = scenario.sparkle_objective
+        status_map = {status.value: status for status in SolverStatus}
+        trials = []
+        for _, run in runs.iterrows():
+            status = status_map.get(str(run["Run Result"]).strip())
+            if status not in (
+                SolverStatus.SUCCESS,
+                SolverStatus.SAT,
+                SolverStatus.UNSAT,
+                SolverStatus.TIMEOUT,
+            ):
+                continue
+            if objective.time:  # SMAC2 receives the measured time as runtime
+                value = float(run["Runtime"])
+                if objective.post_process is not None:
+                    value = objective.post_process(
+                        value, scenario.solver_cutoff_time, status
+                    )
+            else:  # Quality is negated for maximisation
+                value = float(run["Run Quality"])
+                value = value if objective.minimise else -value
+            trials.append(
+                {
+                    "instance": instances[int(run["Instance ID"]) - 1],
+                    "seed": int(run["Seed"]),
+                    "cutoff_time": float(run["Cutoff Time Used"]),
+                    "timeout": status == SolverStatus.TIMEOUT,
+                    "value": value,
+                }
+            )
+        return trials, results_files[-1]
+
     @staticmethod
     def get_smac_run_obj(objective: SparkleObjective) -> str:
         """Return the SMAC run objective based on the Performance Measure.
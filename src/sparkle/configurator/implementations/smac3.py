@@ -110,6 +110,8 @@ class SMAC3(Configurator):
             num_parallel_jobs=num_parallel_jobs,
             base_dir=base_dir,
             run_on=run_on,
+            # A core for each concurrent trial of a run
+            cpus_per_task=scenario.n_workers if scenario.n_workers > 1 else None,
         )
 
     @staticmethod
@@ -129,20 +131,55 @@ class SMAC3(Configurator):
         configurations = [value for _, value in results_dict["configs"].items()]
         config_evals = [[] for _ in range(len(configurations))]
         objective = scenario.sparkle_objective
+        # Multi objective runs have a cost per objective of the scenario
+        cost_index = [o.name for o in scenario.sparkle_objectives].index(objective.name)
+
+        def objective_cost(cost: float | list[float]) -> float:
+            """Return the cost of the objective of the scenario."""
+            return cost[cost_index] if isinstance(cost, list) else cost
+
         for entry in results_dict["data"]:
             smac_conf_id = entry["config_id"]
-            score = entry["cost"]
+            score = objective_cost(entry["cost"])
             # SMAC3 configuration ids start at 1
             config_evals[smac_conf_id - 1].append(score)
         config_evals = [
             objective.instance_aggregator(evaluations) for evaluations in config_evals
         ]
-        best_config = configurations[
-            config_evals.index(objective.solver_aggregator(config_evals))
-        ]
+        best_index = config_evals.index(objective.solver_aggregator(config_evals))
+        best_config = configurations[best_index]
         best_config["configuration_id"] = configuration_id
+        # Finished trials of the best configuration can be reused for validation,
+        # unless they ran with less than the maximum budget of a multi fidelity run
+        max_budget = scenario.max_budget
+        trials = [
+            {
+                "instance": entry["instance"],
+                "seed": entry["seed"],
+                # Trials record their cutoff time, older run histories do not
+                "cutoff_time": (entry.get("additional_info") or {}).get(
+                    "cutoff_time", scenario.solver_cutoff_time
+                ),
+                "timeout": entry["status"] == SmacStatusType.TIMEOUT,
+                "value": objective_cost(entry["cost"]),
+            }
+            for entry in results_dict["data"]
+            if entry["config_id"] == best_index + 1
+            and entry["instance"] is not None
+            and entry["status"] in (SmacStatusType.SUCCESS, SmacStatusType.TIMEOUT)
+            and (
+                entry.get("budget") is None
+                or max_budget is None
+                or entry["budget"] >= max_budget
+            )
+        ]
         return Configurator.save_configuration(
-            scenario, configuration_id, best_config, output_target
+            scenario,
+            configuration_id,
+            best_config,
+            output_target,
+            trials=trials,
+            trials_source=output_source,
         )
 
     def get_status_from_logs(self: SMAC3) -> None:
@@ -160,6 +197,7 @@ class SMAC3(Configurator):
             SolverStatus.UNKNOWN: SmacStatusType.CRASHED,
             SolverStatus.ERROR: SmacStatusType.CRASHED,
             SolverStatus.KILLED: SmacStatusType.TIMEOUT,
+            SolverStatus.CAPPED: SmacStatusType.TIMEOUT,
             SolverStatus.SAT: SmacStatusType.SUCCESS,
             SolverStatus.UNSAT: SmacStatusType.SUCCESS,
         }
@@ -255,9 +293,9 @@ class SMAC3Scenario(ConfigurationScenario):
                 The seed is used to make results reproducible.
                 If seed is -1, SMAC will generate a random seed.
             n_workers: int, defaults to 1
-                The number of workers to use for parallelization.
-                If `n_workers` is greather than 1, SMAC will use DASK to parallelize the
-                optimization.
+                The number of trials to evaluate concurrently in each run. If greater
+                than 1, Sparkle runs the trials in a local process pool instead of
+                SMAC3 using DASK, and each Slurm job requests a CPU per worker.
             max_ratio: float, defaults to None.
                 Facade uses at most scenario.n_trials * max_ratio number of
                 configurations in the initial design. Additional configurations are not
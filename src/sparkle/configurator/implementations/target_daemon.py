@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Persistent daemon serving target algorithm calls of configurators.
+
+Configurators such as SMAC2, ParamILS and IRACE start their target algorithm script
+as a fresh process for every call. The scripts are thin clients that forward their
+arguments over a Unix socket to a daemon, which keeps Sparkle imported and the
+Solver loaded. Each call is computed in a process forked from the warm daemon, so
+concurrent calls do not share state. When no daemon is available, the client starts
+one in the background and computes the call itself.
+
+This module only depends on the standard library, as it is imported by the clients.
+"""
+
+from __future__ import annotations
+import functools
+import hashlib
+import importlib.util
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable
+
+idle_timeout = 300  # Seconds without calls before the daemon shuts down
+startup_timeout = 60  # Seconds after which a start attempt is considered failed
+disable_variable = "SPARKLE_TARGET_DAEMON"  # Set to 0 to compute calls in the client
+
+
+def socket_path(script: Path, solver_dir: Path) -> Path:
+    """Determine the socket of the daemon for a target algorithm script and solver.
+
+    Args:
+        script: The target algorithm script.
+        solver_dir: The directory of the solver.
+
+    Returns:
+        Path to the socket in the temporary directory of this node.
+    """
+    # Unix socket paths are limited to ~100 characters, use a short hash
+    key = f"{socket.gethostname()}:{script.absolute()}:{solver_dir.absolute()}"
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"sparkle_target_{os.getuid()}_{digest}.sock"
+
+
+@functools.cache
+def load_solver(solver_dir: Path) -> Any:  # noqa: ANN401
+    """Load a Solver, kept in memory for consecutive calls.
+
+    Args:
+        solver_dir: The absolute path to the directory of the solver.
+
+    Returns:
+        The Solver object.
+    """
+    from sparkle.solver import Solver
+
+    solver = Solver(solver_dir, runsolver_exec=solver_dir / "runsolver")
+    # Resolve the lazily determined attributes once, before forking
+    solver.wrapper, solver.pcs_file
+    return solver
+
+
+def call(script: Path, argv: list[str], solver_dir: Path) -> str | None:
+    """Forward a target algorithm call to its daemon.
+
+    Args:
+        script: The target algorithm script.
+        argv: The arguments of the call, excluding the script itself.
+        solver_dir: The directory of the solver.
+
+    Returns:
+        The output of the call, or None if it should be computed by the client.
+    """
+    if os.environ.get(disable_variable) == "0":
+        return None
+    path = socket_path(script, solver_dir)
+    request = json.dumps({"argv": argv, "cwd": str(Path.cwd())}).encode()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(path))
+            client.sendall(request)
+            client.shutdown(socket.SHUT_WR)
+            with client.makefile("rb") as fin:
+                response = json.loads(fin.read())
+    except (OSError, ValueError):  # No (working) daemon
+        start_daemon(script, solver_dir)
+        return None
+    if "error" in response:
+        print(
+            f"WARNING: Target daemon call failed, computing locally:\n"
+            f"{response['error']}",
+            file=sys.stderr,
+        )
+    return response.get("output")
+
+
+def start_daemon(script: Path, solver_dir: Path, timeout: float = idle_timeout) -> bool:
+    """Start the daemon of a script and solver in the background.
+
+    Args:
+        script: The target algorithm script.
+        solver_dir: The directory of the solver.
+        timeout: Seconds without calls after which the daemon shuts down.
+
+    Returns:
+        True if a daemon was started, False if another client is starting one.
+    """
+    path = socket_path(script, solver_dir)
+    lock = path.with_suffix(".lock")
+    try:  # Clear the lock of a start attempt that never completed
+        if time.time() - lock.stat().st_mtime > startup_timeout:
+            lock.unlink(missing_ok=True)
+    except FileNotFoundError:
+        pass
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return False
+    subprocess.Popen(
+        [
+            sys.executable,
+            str(Path(__file__).absolute()),
+            str(script.absolute()),
+            str(solver_dir.absolute()),
+            str(timeout),
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,  # Outlive the client
+    )
+    return True
+
+
+class TargetRequestHandler(socketserver.StreamRequestHandler):
+    """Computes a single call, in a process forked from the daemon."""
+
+    def handle(self: TargetRequestHandler) -> None:
+        """Run the target function on the arguments and reply with its output."""
+        try:
+            request = json.loads(self.rfile.read())
+            os.chdir(request["cwd"])  # Relative paths are relative to the client
+            response = {"output": self.server.run_target(request["argv"])}
+        except (Exception, SystemExit):
+            response = {"error": traceback.format_exc()}
+        self.wfile.write(json.dumps(response).encode())
+
+
+class TargetServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that forks a process per target algorithm call."""
+
+    def __init__(
+        self: TargetServer,
+        path: Path,
+        run_target: Callable[[list[str]], str],
+        timeout: float,
+    ) -> None:
+        """Initialise the server.
+
+        Args:
+            path: The socket to listen on.
+            run_target: Function computing the output of a call from its arguments.
+            timeout: Seconds without calls after which the server stops.
+        """
+        super().__init__(str(path), TargetRequestHandler)
+        self.run_target = run_target
+        self.timeout = timeout
+        self.idle = False
+
+    def handle_timeout(self: TargetServer) -> None:
+        """Mark the server as idle when no calls are being computed."""
+        super().handle_timeout()  # Collects finished calls
+        self.idle = not self.active_children
+
+
+def serve(script: Path, solver_dir: Path, timeout: float = idle_timeout) -> None:
+    """Serve target algorithm calls until the daemon has been idle for a while.
+
+    Args:
+        script: The target algorithm script, defining `run_target(argv) -> str`.
+        solver_dir: The absolute path to the directory of the solver.
+        timeout: Seconds without calls after which the daemon shuts down.
+    """
+    path = socket_path(script, solver_dir)
+    try:
+        sys.modules["target_daemon"] = sys.modules[__name__]  # Shared with the script
+        spec = importlib.util.spec_from_file_location("sparkle_target_algorithm", script)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        load_solver(solver_dir)
+        path.unlink(missing_ok=True)  # Stale socket, we hold the start lock
+        server = TargetServer(path, module.run_target, timeout)
+        path.chmod(0o600)
+        socket_inode = path.stat().st_ino
+    finally:  # Allow a next client to start a daemon
+        path.with_suffix(".lock").unlink(missing_ok=True)
+    try:
+        while not server.idle:
+            server.handle_request()
+    finally:
+        server.server_close()
+        # Only remove the socket if it was not replaced by a newer daemon
+        if path.exists() and path.stat().st_ino == socket_inode:
+            path.unlink()
+
+
+if __name__ == "__main__":
+    serve(Path(sys.argv[1]), Path(sys.argv[2]), float(sys.argv[3]))
@@ -0,0 +1,277 @@
+"""Racing validation of configurations with statistical elimination.
+
+Instead of validating every configuration on all instances, the instances are
+evaluated in waves. After each wave, configurations that are statistically worse
+than the best configuration are eliminated, as in the F-Race of IRACE, and are
+not run on the remaining instances. The cells of the eliminated configurations
+are marked as skipped in the PerformanceDataFrame.
+"""
+
+from __future__ import annotations
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+import runrunner as rrr
+from runrunner import Runner, Run
+
+from sparkle.solver import Solver
+from sparkle.structures import PerformanceDataFrame
+from sparkle.types import SparkleObjective
+
+racing_tests = ["friedman", "t-test"]
+
+
+def friedman_elimination(
+    performance: pd.DataFrame, minimise: bool = True, confidence: float = 0.95
+) -> list[str]:
+    """Determine the configurations eliminated by the Friedman test.
+
+    Follows the F-Race of IRACE: if the Friedman test rejects that all
+    configurations perform equally, configurations whose rank sum differs more than
+    the critical difference from the best rank sum are eliminated.
+
+    Args:
+        performance: The performance with instances as rows and configurations
+            as columns, without missing values.
+        minimise: Whether lower values are better.
+        confidence: The confidence level of the tests.
+
+    Returns:
+        The configurations that are eliminated.
+    """
+    n, k = performance.shape
+    if n < 2 or k < 2:
+        return []
+    values = performance if minimise else -performance
+    if k == 2:
+        differences = values.iloc[:, 0] - values.iloc[:, 1]
+        if (differences == 0).all():
+            return []
+        p_value = stats.wilcoxon(differences).pvalue
+        if p_value >= 1 - confidence:
+            return []
+        return [values.columns[0] if differences.median() > 0 else values.columns[1]]
+    ranks = values.rank(axis=1)
+    rank_sums = ranks.sum(axis=0)
+    a = (ranks**2).to_numpy().sum()
+    c = n * k * (k + 1) ** 2 / 4
+    if math.isclose(a, c):  # All configurations tie on all instances
+        return []
+    statistic = (k - 1) * ((rank_sums**2).sum() - n * c) / (a - c)
+    if 1 - stats.chi2.cdf(statistic, k - 1) >= 1 - confidence:
+        return []
+    degrees = (n - 1) * (k - 1)
+    critical_difference = stats.t.ppf(1 - (1 - confidence) / 2, degrees) * math.sqrt(
+        2 * (n * a - (rank_sums**2).sum()) / degrees
+    )
+    best = rank_sums.min()
+    return [
+        config
+        for config, rank_sum in rank_sums.items()
+        if rank_sum - best > critical_difference
+    ]
+
+
+def t_test_elimination(
+    performance: pd.DataFrame, minimise: bool = True, confidence: float = 0.95
+) -> list[str]:
+    """Determine the configurations eliminated by paired t-tests against the best.
+
+    Args:
+        performance: The performance with instances as rows and configurations
+            as columns, without missing values.
+        minimise: Whether lower values are better.
+        confidence: The confidence level of the tests.
+
+    Returns:
+        The configurations that are eliminated.
+    """
+    if performance.shape[0] < 2 or performance.shape[1] < 2:
+        return []
+    values = performance if minimise else -performance
+    best = values.mean(axis=0).idxmin()
+    eliminated = []
+    for config in values.columns:
+        if config == best:
+            continue
+        differences = values[config] - values[best]
+        if np.allclose(differences, differences.iloc[0]):
+            # No variance, the test is undefined
+            if differences.iloc[0] > 0:
+                eliminated.append(config)
+            continue
+        p_value = stats.ttest_rel(
+            values[config], values[best], alternative="greater"
+        ).pvalue
+        if p_value < 1 - confidence:
+            eliminated.append(config)
+    return eliminated
+
+
+def race_step(
+    performance_data: PerformanceDataFrame,
+    solver: str,
+    configuration_ids: list[str],
+    instances: list[str],
+    objective: SparkleObjective,
+    test: str = "friedman",
+    confidence: float = 0.95,
+    first_test: int = 5,
+) -> list[str]:
+    """Eliminate configurations on the instances evaluated so far.
+
+    Configurations that are eliminated are marked as skipped on the instances they
+    have not been evaluated on.
+
+    Args:
+        performance_data: The PerformanceDataFrame holding the results.
+        solver: The solver of the configurations.
+        configuration_ids: The configurations in the race.
+        instances: All instances of the race.
+        objective: The objective to compare the configurations on.
+        test: The statistical test to use, one of `racing_tests`.
+        confidence: The confidence level of the test.
+        first_test: The number of evaluated instances before the first test.
+
+    Returns:
+        The configurations eliminated in this step.
+    """
+    if test not in racing_tests:
+        raise ValueError(f"Unknown racing test {test}, choose from {racing_tests}.")
+    skipped = performance_data.get_skipped_cells().get(solver, {})
+    candidates = [config for config in configuration_ids if config not in skipped]
+    if len(candidates) < 2:
+        return []
+    subdf = performance_data.xs(objective.name, level=0, drop_level=True)
+    subdf = subdf.xs(solver, axis=1, drop_level=True)
+    subdf = subdf.xs(PerformanceDataFrame.column_value, axis=1, level=1)
+    subdf = subdf.loc[instances, candidates].astype(float)
+    # Aggregate the runs
+    subdf = subdf.groupby(PerformanceDataFrame.index_instance).agg(
+        func=objective.run_aggregator.__name__
+    )
+    # Only instances evaluated by all remaining configurations can be compared
+    block = subdf.dropna(axis=0, how="any")
+    if len(block) < first_test:
+        return []
+    elimination = friedman_elimination if test == "friedman" else t_test_elimination
+    eliminated = elimination(block, objective.minimise, confidence)
+    if len(eliminated) == len(candidates):  # Never eliminate all
+        return []
+    for config in eliminated:
+        remaining = subdf.index[subdf[config].isna()].to_list()
+        performance_data.mark_skipped(solver, config, remaining)
+    return eliminated
+
+
+def submit_race(
+    solver: Solver,
+    instances: list[str],
+    performance_data: PerformanceDataFrame,
+    configuration_ids: list[str],
+    objective: SparkleObjective,
+    test: str = "friedman",
+    confidence: float = 0.95,
+    first_test: int = 5,
+    wave_size: int = 5,
+    cutoff_time: int = None,
+    sbatch_options: list[str] = None,
+    slurm_prepend: str | list[str] | Path = None,
+    dependencies: list[Run] = None,
+    log_dir: Path = None,
+    base_dir: Path = None,
+    run_on: Runner = Runner.SLURM,
+) -> list[Run]:
+    """Validate configurations by racing them over the instances.
+
+    The instances are submitted in waves, each followed by an elimination step on
+    which the next wave depends. Runs of eliminated configurations are skipped when
+    their jobs start.
+
+    Args:
+        solver: The solver of the configurations.
+        instances: The instances to validate on.
+        performance_data: The PerformanceDataFrame to store the results.
+        configuration_ids: The configurations to race.
+        objective: The objective to compare the configurations on.
+        test: The statistical test to use, one of `racing_tests`.
+        confidence: The confidence level of the test.
+        first_test: The number of evaluated instances before the first test.
+        wave_size: The number of instances per wave, after the first test.
+        cutoff_time: The cutoff time for the solver.
+        sbatch_options: List of slurm batch options to use
+        slurm_prepend: Slurm script to prepend to the sbatch
+        dependencies: List of runs the race depends on, e.g. the configurator.
+        log_dir: Path where to place output files.
+        base_dir: The base_dir of RunRunner where the sbatch scripts will be placed
+        run_on: On which platform to run the jobs. Default: Slurm.
+
+    Returns:
+        The runs of the waves and elimination steps.
+    """
+    if test not in racing_tests:
+        raise ValueError(f"Unknown racing test {test}, choose from {racing_tests}.")
+    instances = [str(instance) for instance in instances]
+    instance_names = [
+        Path(instance).stem
+        if Path(instance).stem in performance_data.instances
+        else str(Path(instance).with_suffix(""))
+        for instance in instances
+    ]
+    # The first wave evaluates enough instances for the first test
+    first_wave = max(first_test, 1)
+    waves = [instances[:first_wave]] + [
+        instances[i : i + wave_size]
+        for i in range(first_wave, len(instances), max(wave_size, 1))
+    ]
+    waves = [wave for wave in waves if wave]
+    runs = []
+    dependencies = dependencies or []
+    for index, wave in enumerate(waves):
+        wave_run = solver.run_performance_dataframe(
+            wave,
+            performance_data,
+            config_ids=configuration_ids,
+            cutoff_time=cutoff_time,
+            sbatch_options=sbatch_options,
+            slurm_prepend=slurm_prepend,
+            dependencies=dependencies,
+            log_dir=log_dir,
+            base_dir=base_dir,
+            job_name=f"Racing: Validating {len(configuration_ids)} {solver.name} "
+            f"Configurations, wave {index + 1}/{len(waves)}",
+            skip_existing=True,
+            run_on=run_on,
+        )
+        runs.append(wave_run)
+        if index == len(waves) - 1:
+            break  # No further waves to eliminate configurations for
+        cmd = (
+            f"python3 {Path(__file__).parent / 'racing_cli.py'} "
+            f"--performance-dataframe {performance_data.csv_filepath} "
+            f"--solver {solver.directory} "
+            f"--configuration-ids {' '.join(configuration_ids)} "
+            f"--instances {' '.join(instance_names)} "
+            f"--objective {objective.name} "
+            f"--test {test} --confidence {confidence} --first-test {first_test}"
+        )
+        step_run = rrr.add_to_queue(
+            runner=run_on,
+            cmd=cmd,
+            name=f"Racing: Elimination {index + 1}/{len(waves) - 1} of "
+            f"{solver.name} Configurations",
+            base_dir=base_dir,
+            sbatch_options=sbatch_options,
+            prepend=slurm_prepend,
+            # Local waves have finished once returned
+            dependencies=[wave_run] if run_on == Runner.SLURM else None,
+        )
+        runs.append(step_run)
+        dependencies = [step_run]
+        if run_on == Runner.LOCAL:
+            step_run.wait()
+    return runs
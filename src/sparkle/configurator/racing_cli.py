@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Run an elimination step of racing validation on the performance dataframe."""
+
+import sys
+import argparse
+from pathlib import Path
+from filelock import FileLock
+
+from sparkle.configurator.racing import race_step, racing_tests
+from sparkle.types import resolve_objective
+from sparkle.structures import PerformanceDataFrame
+
+
+def main(argv: list[str]) -> None:
+    """Main function of the command."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--performance-dataframe",
+        required=True,
+        type=Path,
+        help="path to the performance dataframe",
+    )
+    parser.add_argument("--solver", required=True, type=Path, help="path to solver")
+    parser.add_argument(
+        "--configuration-ids",
+        required=True,
+        type=str,
+        nargs="+",
+        help="the configurations in the race",
+    )
+    parser.add_argument(
+        "--instances",
+        required=True,
+        type=str,
+        nargs="+",
+        help="the instances of the race",
+    )
+    parser.add_argument(
+        "--objective",
+        required=True,
+        type=str,
+        help="the objective to compare the configurations on",
+    )
+    parser.add_argument(
+        "--test",
+        default="friedman",
+        choices=racing_tests,
+        help="the statistical test used to eliminate configurations",
+    )
+    parser.add_argument(
+        "--confidence",
+        default=0.95,
+        type=float,
+        help="the confidence level of the statistical test",
+    )
+    parser.add_argument(
+        "--first-test",
+        default=5,
+        type=int,
+        help="the number of evaluated instances before the first test",
+    )
+    args = parser.parse_args(argv)
+
+    lock = FileLock(f"{args.performance_dataframe}.lock")  # Lock the file
+    with lock.acquire(timeout=600):
+        performance_dataframe = PerformanceDataFrame(args.performance_dataframe)
+        eliminated = race_step(
+            performance_dataframe,
+            str(args.solver),
+            args.configuration_ids,
+            args.instances,
+            resolve_objective(args.objective),
+            test=args.test,
+            confidence=args.confidence,
+            first_test=args.first_test,
+        )
+    if eliminated:
+        print(f"Eliminated configurations: {', '.join(eliminated)}")
+    else:
+        print("No configurations eliminated.")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
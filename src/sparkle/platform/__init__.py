@@ -1,3 +1,4 @@
 """This package provides platform support for Sparkle."""
 
 from sparkle.platform.settings_objects import Settings, Option
+from sparkle.platform.snapshot_store import SnapshotStore
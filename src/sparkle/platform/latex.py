@@ -1,15 +1,29 @@
 """Helper classes/method for LaTeX and bibTeX."""
 
+from __future__ import annotations
+import functools
 import math
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
-import plotly
-import plotly.express as px
 import pylatex as pl
-import kaleido
 
-kaleido.get_chrome_sync()  # Ensure chrome is available for Kaleido
+if TYPE_CHECKING:
+    import plotly
+
+# The backends to render figures with. Plotly exports the figures through Kaleido,
+# which requires Chrome. PGFPlots figures are written as TikZ code compiled by LaTeX.
+figure_backends = ["plotly", "pgfplots"]
+
+
+@functools.cache
+def init_chrome() -> None:
+    """Ensure Chrome is available for Kaleido, only needed to export plotly figures."""
+    import kaleido
+
+    kaleido.get_chrome_sync()
 
 
 class AutoRef(pl.base_classes.CommandBase):
@@ -19,22 +33,219 @@ class AutoRef(pl.base_classes.CommandBase):
     packages = [pl.Package("hyperref")]
 
 
-def comparison_plot(
-    data_frame: pd.DataFrame, title: str = None
-) -> plotly.graph_objects.Figure:
+class ComparisonPlot:
+    """A scatter plot comparing the performance of two algorithms per instance."""
+
+    def __init__(
+        self: ComparisonPlot,
+        data_frame: pd.DataFrame,
+        title: str,
+        log_scale: bool,
+        plot_range: tuple[float, float],
+        max_value: float,
+    ) -> None:
+        """Initialise the plot.
+
+        Args:
+            data_frame: The data frame with the x values in the first column and the
+                y values in the second.
+            title: The title of the plot.
+            log_scale: Whether to use a log scale for both axes.
+            plot_range: The range of both axes.
+            max_value: The maximum value, marked by lines in the plot.
+        """
+        self.data_frame = data_frame
+        self.title = title
+        self.log_scale = log_scale
+        self.plot_range = plot_range
+        self.max_value = max_value
+
+    @staticmethod
+    def suffix(backend: str) -> str:
+        """Return the file suffix of the plots written by a backend."""
+        return ".tex" if backend == "pgfplots" else ".pdf"
+
+    @property
+    def dtick(self: ComparisonPlot) -> float:
+        """The tick step, on log scale in orders of magnitude."""
+        if self.log_scale:
+            return 1
+        # Tick every 10^(log(max)) / 10 for linear scale
+        return 10 ** (math.ceil(math.log(self.max_value, 10)) - 1)
+
+    def write(
+        self: ComparisonPlot,
+        path: Path,
+        backend: str = "plotly",
+        width: int = 500,
+        height: int = 500,
+    ) -> Path:
+        """Write the plot to file.
+
+        Args:
+            path: The path to write the plot to, its suffix is set by the backend.
+            backend: The backend to render the plot with, one of `figure_backends`.
+            width: The width of the image in pixels, for the plotly backend.
+            height: The height of the image in pixels, for the plotly backend.
+
+        Returns:
+            The path of the written plot.
+        """
+        if backend not in figure_backends:
+            raise ValueError(
+                f"Unknown figure backend {backend}, choose from {figure_backends}."
+            )
+        path = path.with_suffix(ComparisonPlot.suffix(backend))
+        if backend == "pgfplots":
+            path.write_text(self.to_pgfplots())
+        else:
+            init_chrome()
+            self.to_plotly().write_image(path, width=width, height=height)
+        return path
+
+    def to_pgfplots(self: ComparisonPlot) -> str:
+        """Return the plot as a TikZ picture with a PGFPlots axis."""
+        x_label, y_label = self.data_frame.columns[:2]
+        low, high = self.plot_range
+        options = [
+            f"xlabel={{{pl.utils.escape_latex(x_label)}}}",
+            f"ylabel={{{pl.utils.escape_latex(y_label)}}}",
+            f"xmin={low}, xmax={high}, ymin={low}, ymax={high}",
+            "width=10cm, height=10cm",
+            "grid=major, grid style={lightgray}",
+        ]
+        if self.title:
+            options.insert(0, f"title={{{pl.utils.escape_latex(self.title)}}}")
+        if self.log_scale:
+            options.append("xmode=log, ymode=log, minor grid style={lightgray!50}")
+        else:
+            options.append(f"xtick distance={self.dtick}, ytick distance={self.dtick}")
+        data = self.data_frame.iloc[:, :2].dropna().astype(float).to_numpy()
+        points = "".join(f"{x:.12g} {y:.12g}\n" for x, y in data)
+        # On log scale the lines can not start at zero
+        start = low if self.log_scale else 0
+        top = self.max_value
+        return (
+            "\\begin{tikzpicture}\n"
+            "\\begin{axis}[\n    " + ",\n    ".join(options) + "\n]\n"
+            "\\addplot[only marks, mark=x, color=blue] table {\n"
+            f"{points}}};\n"
+            f"\\addplot[gray, densely dotted] coordinates {{({start},{start}) "
+            f"({top},{top})}};\n"
+            f"\\addplot[red, dashed, opacity=0.7] coordinates {{({start},{top}) "
+            f"({top},{top})}};\n"
+            f"\\addplot[red, dashed, thin, opacity=0.7] coordinates {{({top},{start}) "
+            f"({top},{top})}};\n"
+            "\\end{axis}\n"
+            "\\end{tikzpicture}\n"
+        )
+
+    def to_plotly(self: ComparisonPlot) -> plotly.graph_objects.Figure:
+        """Return the plot as a plotly figure."""
+        import plotly.express as px
+
+        data_frame = self.data_frame
+        title = self.title
+        log_scale = self.log_scale
+        plot_range = self.plot_range
+        max_value = self.max_value
+        fig = px.scatter(
+            data_frame=data_frame,
+            x=data_frame.columns[0],
+            y=data_frame.columns[1],
+            range_x=plot_range,
+            range_y=plot_range,
+            title=title,
+            log_x=log_scale,
+            log_y=log_scale,
+            width=1000,
+            height=1000,
+        )
+        # Add dividing diagonal
+        fig.add_shape(
+            type="line",
+            x0=0,
+            y0=0,
+            x1=max_value,
+            y1=max_value,
+            line=dict(color="grey", dash="dot", width=1),
+        )
+        # Add maximum lines
+        fig.add_shape(
+            type="line",
+            opacity=0.7,
+            x0=0,
+            y0=max_value,
+            x1=max_value,
+            y1=max_value,
+            line=dict(color="red", width=1.5, dash="longdash"),
+        )
+        fig.add_shape(
+            type="line",
+            opacity=0.7,
+            x0=max_value,
+            y0=0,
+            x1=max_value,
+            y1=max_value,
+            line=dict(color="red", width=0.5, dash="longdash"),
+        )
+        fig.update_traces(marker=dict(color="RoyalBlue", symbol="x"))
+        fig.update_layout(plot_bgcolor="white", autosize=False, width=1000, height=1000)
+        minor = dict(ticks="inside", ticklen=6, showgrid=True) if log_scale else None
+        dtick = self.dtick
+        fig.update_xaxes(
+            mirror=True,
+            tickmode="linear",
+            ticks="outside",
+            tick0=0,
+            minor=minor,
+            dtick=dtick,
+            showline=True,
+            linecolor="black",
+            gridcolor="lightgrey",
+        )
+        fig.update_yaxes(
+            mirror=True,
+            tickmode="linear",
+            ticks="outside",
+            tick0=0,
+            minor=minor,
+            dtick=dtick,
+            showline=True,
+            linecolor="black",
+            gridcolor="lightgrey",
+        )
+        return fig
+
+
+def add_plot(figure: pl.Figure, plot_path: Path, width: str) -> None:
+    """Add a plot written by `ComparisonPlot.write` to a figure.
+
+    Args:
+        figure: The figure to add the plot to.
+        plot_path: The path of the plot, relative to the document.
+        width: The width of the plot in the document.
+    """
+    if plot_path.suffix == ".tex":
+        figure.packages.append(pl.Package("pgfplots"))
+        figure.append(
+            pl.NoEscape(f"\\resizebox{{{width}}}{{!}}{{\\input{{{plot_path}}}}}")
+        )
+    else:
+        figure.add_image(str(plot_path), width=pl.NoEscape(width))
+
+
+def comparison_plot(data_frame: pd.DataFrame, title: str = None) -> ComparisonPlot:
     """Creates a comparison plot from the given data frame.
 
     The first column is used for the x axis, the second for the y axis.
 
     Args:
         data_frame: The data frame with the data
-        x_label: The label for the x axis
-        y_label: The label for the y axis
         title: The title of the plot
-        output_plot: The path where the plot should be written to
 
     Returns:
-        The plot object
+        The plot object, which can be written with any of the `figure_backends`
     """
     from scipy import stats
 
@@ -76,71 +287,4 @@ def comparison_plot(
             order_magnitude - 1
         )
         plot_range = (0, next_step_max) if min_value > 0 else (min_value, next_step_max)
-    fig = px.scatter(
-        data_frame=data_frame,
-        x=data_frame.columns[0],
-        y=data_frame.columns[1],
-        range_x=plot_range,
-        range_y=plot_range,
-        title=title,
-        log_x=log_scale,
-        log_y=log_scale,
-        width=1000,
-        height=1000,
-    )
-    # Add dividing diagonal
-    fig.add_shape(
-        type="line",
-        x0=0,
-        y0=0,
-        x1=max_value,
-        y1=max_value,
-        line=dict(color="grey", dash="dot", width=1),
-    )
-    # Add maximum lines
-    fig.add_shape(
-        type="line",
-        opacity=0.7,
-        x0=0,
-        y0=max_value,
-        x1=max_value,
-        y1=max_value,
-        line=dict(color="red", width=1.5, dash="longdash"),
-    )
-    fig.add_shape(
-        type="line",
-        opacity=0.7,
-        x0=max_value,
-        y0=0,
-        x1=max_value,
-        y1=max_value,
-        line=dict(color="red", width=0.5, dash="longdash"),
-    )
-    fig.update_traces(marker=dict(color="RoyalBlue", symbol="x"))
-    fig.update_layout(plot_bgcolor="white", autosize=False, width=1000, height=1000)
-    minor = dict(ticks="inside", ticklen=6, showgrid=True) if log_scale else None
-    # Tick every 10^(log(max)) / 10 for linear scale, log scale is resolved by plotly
-    dtick = 1 if log_scale else 10 ** (math.ceil(math.log(max_value, 10)) - 1)
-    fig.update_xaxes(
-        mirror=True,
-        tickmode="linear",
-        ticks="outside",
-        tick0=0,
-        minor=minor,
-        dtick=dtick,
-        showline=True,
-        linecolor="black",
-        gridcolor="lightgrey",
-    )
-    fig.update_yaxes(
-        mirror=True,
-        tickmode="linear",
-        ticks="outside",
-        tick0=0,
-        minor=minor,
-        dtick=dtick,
-        showline=True,
-        linecolor="black",
-        gridcolor="lightgrey",
-    )
-    return fig
+    return ComparisonPlot(data_frame, title, log_scale, plot_range, max_value)
@@ -153,6 +153,30 @@ class ConfigurationOutput:
             config_keys.index(self.best_configuration_key)
         ]
 
+        # Estimate the uncertainty of the performances on the training set, with a
+        # fixed seed to keep the report reproducible
+        try:
+            self.bootstrap_train = performance_data_config.bootstrap(
+                solver_key,
+                objective=self.config_scenario.sparkle_objective,
+                instances=train_instances,
+                seed=0,
+            )
+        except ValueError:  # No configuration was evaluated on all instances
+            self.bootstrap_train = None
+
+        # Retrieve the non-dominated configurations when optimising multiple objectives
+        pareto_objectives = [
+            o
+            for o in self.config_scenario.sparkle_objectives
+            if not o.metric and o.name in performance_data_config.objective_names
+        ]
+        self.pareto_front_train = None
+        if len(pareto_objectives) > 1:
+            self.pareto_front_train = performance_data_config.pareto_front(
+                pareto_objectives, instances=train_instances
+            ).xs(solver_key, level=PerformanceDataFrame.column_solver)
+
         # TODO keep all instance set performance data together in a dictionary instead
         # of variables for train and test
         # Shitty hack to get status objective
@@ -216,6 +240,12 @@ class ConfigurationOutput:
             "configurator": self.configurator.__name__,
             "best_configuration": self.best_configuration,
             "best_performance_train": self.best_performance_train,
+            "bootstrap_train": None
+            if self.bootstrap_train is None
+            else self.bootstrap_train.to_dict(orient="index"),
+            "pareto_front_train": None
+            if self.pareto_front_train is None
+            else self.pareto_front_train.to_dict(orient="index"),
             "scenario": {
                 str(key): str(value)
                 for key, value in self.config_scenario.serialise().items()
@@ -129,9 +129,12 @@ class Settings:
     DEFAULT_parallel_portfolio_output = DEFAULT_output / "Parallel_Portfolio"
     DEFAULT_ablation_output = DEFAULT_output / "Ablation"
     DEFAULT_log_output = DEFAULT_output / "Log"
+    DEFAULT_log_harvest_index = DEFAULT_log_output / "harvested_logs.json"
+    DEFAULT_scenario_index = DEFAULT_output / "scenario_index.json"
 
     # Default output subdirs
     DEFAULT_output_analysis = DEFAULT_output / analysis_dir
+    DEFAULT_report_cache = DEFAULT_output_analysis / "Report_Cache"
 
     # Old default output dirs which should be part of something else
     DEFAULT_feature_data = DEFAULT_output / "Feature_Data"
@@ -156,6 +159,7 @@ class Settings:
 
     # Old default file paths from GV which should be turned into variables
     DEFAULT_feature_data_path = DEFAULT_feature_data / "feature_data.csv"
+    DEFAULT_feature_cache_dir = DEFAULT_feature_data / "Cache"
     DEFAULT_performance_data_path = DEFAULT_performance_data / "performance_data.csv"
 
     # Define sections and options
@@ -186,6 +190,20 @@ class Settings:
         ("target_cutoff_time", "cutoff_time_each_solver_call"),
         "Solver cutoff time in seconds.",
     )
+    OPTION_adaptive_capping = Option(
+        "adaptive_capping",
+        SECTION_general,
+        bool,
+        False,
+        tuple(),
+        "Run the solver jobs of an instance one after another, capping the cutoff "
+        "time of each run at the best known time of a time based objective on the "
+        "instance.",
+        cli_kwargs={
+            "action": "store_true",
+            "default": None,
+        },
+    )
     OPTION_extractor_cutoff_time = Option(
         "extractor_cutoff_time",
         SECTION_general,
@@ -194,6 +212,42 @@ class Settings:
         tuple("cutoff_time_each_feature_computation"),
         "Extractor cutoff time in seconds.",
     )
+    OPTION_feature_cache_size = Option(
+        "feature_cache_size",
+        SECTION_general,
+        int,
+        1024,
+        tuple(),
+        "Maximum size in MB of the feature extraction cache. Set to 0 to disable.",
+    )
+    OPTION_extractor_batch_size = Option(
+        "extractor_batch_size",
+        SECTION_general,
+        int,
+        1,
+        tuple(),
+        "The number of instances an extractor job computes features for.",
+    )
+    OPTION_extractor_batch_workers = Option(
+        "extractor_batch_workers",
+        SECTION_general,
+        int,
+        1,
+        tuple(),
+        "The number of instances an extractor job computes features for concurrently.",
+    )
+    OPTION_result_store = Option(
+        "result_store",
+        SECTION_general,
+        str,
+        "csv",
+        tuple(),
+        "Where jobs write their results. With csv, each job appends to the CSV file "
+        "of the performance or feature data under a file lock. With sqlite, jobs "
+        "write to an SQLite database in WAL mode next to the CSV file, which is "
+        "merged into the data when it is loaded.",
+        cli_kwargs={"choices": ["csv", "sqlite"]},
+    )
     OPTION_run_on = Option(
         "run_on",
         SECTION_general,
@@ -219,6 +273,16 @@ class Settings:
         tuple(),
         "Seed to use for pseudo-random number generators.",
     )
+    OPTION_figure_backend = Option(
+        "figure_backend",
+        SECTION_general,
+        str,
+        "plotly",
+        tuple(),
+        "The backend to render the figures of the report with. Plotly exports images "
+        "through Chrome, PGFPlots writes the figures as TikZ code compiled by LaTeX.",
+        cli_kwargs={"choices": ["plotly", "pgfplots"]},
+    )
     OPTION_appendices = Option(
         "appendices",
         SECTION_general,
@@ -259,6 +323,41 @@ class Settings:
         ("maximum_iterations",),
         "The maximum number of iterations a configurator can do in a single job.",
     )
+    OPTION_configurator_racing_test = Option(
+        "racing_test",
+        SECTION_configuration,
+        str,
+        None,
+        tuple(),
+        "The statistical test used to race the configurations during validation, "
+        "eliminating configurations that are significantly worse. If not set, all "
+        "configurations are validated on all instances.",
+        cli_kwargs={"choices": ["friedman", "t-test"]},
+    )
+    OPTION_configurator_racing_first_test = Option(
+        "racing_first_test",
+        SECTION_configuration,
+        int,
+        5,
+        tuple(),
+        "The number of instances evaluated before the first racing test.",
+    )
+    OPTION_configurator_racing_wave_size = Option(
+        "racing_wave_size",
+        SECTION_configuration,
+        int,
+        5,
+        tuple(),
+        "The number of instances evaluated between consecutive racing tests.",
+    )
+    OPTION_configurator_racing_confidence = Option(
+        "racing_confidence",
+        SECTION_configuration,
+        float,
+        0.95,
+        tuple(),
+        "The confidence level of the racing tests.",
+    )
 
     # ABLATION Options
     SECTION_ablation = "ablation"
@@ -279,8 +378,8 @@ class Settings:
             "max_parallel_runs_per_node",
             "maximum_parallel_runs_per_node",
         ),
-        "The maximum number of ablation analysis jobs to run in parallel on a single "
-        "node.",
+        "The maximum number of solver runs an ablation analysis executes in parallel "
+        "on a single node. Defaults to the number of CPUs when running locally.",
     )
 
     # SELECTION Options
@@ -313,6 +412,37 @@ class Settings:
         ),
         "The minimum marginal contribution a solver (configuration) must have to be used for the selector.",
     )
+    OPTION_selector_batch_size = Option(
+        "selector_batch_size",
+        SECTION_selection,
+        int,
+        1,
+        tuple(),
+        "The number of instances a selector job predicts and runs schedules for.",
+    )
+    OPTION_selection_run_aggregation = Option(
+        "run_aggregation",
+        SECTION_selection,
+        str,
+        None,
+        tuple(),
+        "How the runs of an instance are aggregated for the selector, e.g. mean, "
+        "median, min or max, or a number between 0 and 1 for a quantile. Defaults to "
+        "the run aggregator of the objective.",
+    )
+    OPTION_selection_expand_runs = Option(
+        "expand_runs",
+        SECTION_selection,
+        bool,
+        False,
+        tuple(),
+        "Train the selector on every run of an instance as a separate sample, "
+        "instead of on the aggregated runs.",
+        cli_kwargs={
+            "action": "store_true",
+            "default": None,
+        },
+    )
 
     # SMAC2 Options
     SECTION_smac2 = "smac2"
@@ -458,6 +588,15 @@ class Settings:
         " for the optimization. Use this argument if you use multi-fidelity or instance "
         "optimization.",
     )
+    OPTION_smac3_n_workers = Option(
+        "n_workers",
+        SECTION_smac3,
+        int,
+        None,
+        tuple(),
+        "The number of trials SMAC3 evaluates concurrently per run/job. On Slurm, each "
+        "job requests a CPU per trial.",
+    )
 
     # IRACE Options
     SECTION_irace = "irace"
@@ -636,9 +775,15 @@ class Settings:
             OPTION_objectives,
             OPTION_configurator,
             OPTION_solver_cutoff_time,
+            OPTION_adaptive_capping,
             OPTION_extractor_cutoff_time,
+            OPTION_feature_cache_size,
+            OPTION_extractor_batch_size,
+            OPTION_extractor_batch_workers,
+            OPTION_result_store,
             OPTION_run_on,
             OPTION_appendices,
+            OPTION_figure_backend,
             OPTION_verbosity,
             OPTION_seed,
         ],
@@ -646,6 +791,10 @@ class Settings:
             OPTION_configurator_number_of_runs,
             OPTION_configurator_solver_call_budget,
             OPTION_configurator_max_iterations,
+            OPTION_configurator_racing_test,
+            OPTION_configurator_racing_first_test,
+            OPTION_configurator_racing_wave_size,
+            OPTION_configurator_racing_confidence,
         ],
         SECTION_ablation: [
             OPTION_ablation_racing,
@@ -655,6 +804,9 @@ class Settings:
             OPTION_selection_class,
             OPTION_selection_model,
             OPTION_minimum_marginal_contribution,
+            OPTION_selector_batch_size,
+            OPTION_selection_run_aggregation,
+            OPTION_selection_expand_runs,
         ],
         SECTION_smac2: [
             OPTION_smac2_wallclock_time_budget,
@@ -675,6 +827,7 @@ class Settings:
             OPTION_smac3_use_default_config,
             OPTION_smac3_min_budget,
             OPTION_smac3_max_budget,
+            OPTION_smac3_n_workers,
         ],
         SECTION_irace: [
             OPTION_irace_max_time,
@@ -720,7 +873,12 @@ class Settings:
         self.__sparkle_objectives: list[SparkleObjective] = None
         self.__general_sparkle_configurator: Configurator = None
         self.__solver_cutoff_time: int = None
+        self.__adaptive_capping: bool = None
         self.__extractor_cutoff_time: int = None
+        self.__feature_cache_size: int = None
+        self.__extractor_batch_size: int = None
+        self.__extractor_batch_workers: int = None
+        self.__result_store: str = None
         self.__run_on: Runner = None
         self.__appendices: bool = False
         self.__verbosity_level: VerbosityLevel = None
@@ -730,6 +888,10 @@ class Settings:
         self.__configurator_solver_call_budget: int = None
         self.__configurator_number_of_runs: int = None
         self.__configurator_max_iterations: int = None
+        self.__configurator_racing_test: str = None
+        self.__configurator_racing_first_test: int = None
+        self.__configurator_racing_wave_size: int = None
+        self.__configurator_racing_confidence: float = None
 
         # Ablation attributes
         self.__ablation_racing_flag: bool = None
@@ -739,6 +901,9 @@ class Settings:
         self.__selection_model: str = None
         self.__selection_class: str = None
         self.__minimum_marginal_contribution: float = None
+        self.__selector_batch_size: int = None
+        self.__selection_run_aggregation: str = None
+        self.__selection_expand_runs: bool = None
 
         # SMAC2 attributes
         self.__smac2_wallclock_time_budget: int = None
@@ -759,6 +924,7 @@ class Settings:
         self.__smac3_use_default_config: bool = None
         self.__smac3_min_budget: float = None
         self.__smac3_max_budget: float = None
+        self.__smac3_n_workers: int = None
 
         # IRACE attributes
         self.__irace_max_time: int = None
@@ -941,6 +1107,15 @@ class Settings:
             )
         return self.__solver_cutoff_time
 
+    @property
+    def adaptive_capping(self: Settings) -> bool:
+        """Whether to cap solver runs at the best known time on the instance."""
+        if self.__adaptive_capping is None:
+            self.__adaptive_capping = self._abstract_getter(
+                Settings.OPTION_adaptive_capping
+            )
+        return self.__adaptive_capping
+
     @property
     def extractor_cutoff_time(self: Settings) -> int:
         """Extractor cutoff time in seconds."""
@@ -950,6 +1125,40 @@ class Settings:
             )
         return self.__extractor_cutoff_time
 
+    @property
+    def feature_cache_size(self: Settings) -> int:
+        """Maximum size of the feature extraction cache in MB."""
+        if self.__feature_cache_size is None:
+            self.__feature_cache_size = self._abstract_getter(
+                Settings.OPTION_feature_cache_size
+            )
+        return self.__feature_cache_size
+
+    @property
+    def extractor_batch_size(self: Settings) -> int:
+        """Number of instances per feature extractor job."""
+        if self.__extractor_batch_size is None:
+            self.__extractor_batch_size = self._abstract_getter(
+                Settings.OPTION_extractor_batch_size
+            )
+        return self.__extractor_batch_size
+
+    @property
+    def extractor_batch_workers(self: Settings) -> int:
+        """Number of instances a feature extractor job computes concurrently."""
+        if self.__extractor_batch_workers is None:
+            self.__extractor_batch_workers = self._abstract_getter(
+                Settings.OPTION_extractor_batch_workers
+            )
+        return self.__extractor_batch_workers
+
+    @property
+    def result_store(self: Settings) -> str:
+        """Where jobs write their results, csv or sqlite."""
+        if self.__result_store is None:
+            self.__result_store = self._abstract_getter(Settings.OPTION_result_store)
+        return self.__result_store
+
     @property
     def run_on(self: Settings) -> Runner:
         """On which compute to run (Local or Slurm)."""
@@ -962,6 +1171,11 @@ class Settings:
         """Whether to include appendices in the report."""
         return self._abstract_getter(Settings.OPTION_appendices)
 
+    @property
+    def figure_backend(self: Settings) -> str:
+        """The backend to render the figures of the report with."""
+        return self._abstract_getter(Settings.OPTION_figure_backend)
+
     @property
     def verbosity_level(self: Settings) -> VerbosityLevel:
         """Verbosity level to use in CLI commands."""
@@ -1030,6 +1244,42 @@ class Settings:
             )
         return self.__configurator_max_iterations
 
+    @property
+    def configurator_racing_test(self: Settings) -> str:
+        """Get the statistical test to race configurations with, None if disabled."""
+        if self.__configurator_racing_test is None:
+            self.__configurator_racing_test = self._abstract_getter(
+                Settings.OPTION_configurator_racing_test
+            )
+        return self.__configurator_racing_test
+
+    @property
+    def configurator_racing_first_test(self: Settings) -> int:
+        """Get the number of instances evaluated before the first racing test."""
+        if self.__configurator_racing_first_test is None:
+            self.__configurator_racing_first_test = self._abstract_getter(
+                Settings.OPTION_configurator_racing_first_test
+            )
+        return self.__configurator_racing_first_test
+
+    @property
+    def configurator_racing_wave_size(self: Settings) -> int:
+        """Get the number of instances evaluated between racing tests."""
+        if self.__configurator_racing_wave_size is None:
+            self.__configurator_racing_wave_size = self._abstract_getter(
+                Settings.OPTION_configurator_racing_wave_size
+            )
+        return self.__configurator_racing_wave_size
+
+    @property
+    def configurator_racing_confidence(self: Settings) -> float:
+        """Get the confidence level of the racing tests."""
+        if self.__configurator_racing_confidence is None:
+            self.__configurator_racing_confidence = self._abstract_getter(
+                Settings.OPTION_configurator_racing_confidence
+            )
+        return self.__configurator_racing_confidence
+
     # Ablation settings ###
     @property
     def ablation_racing_flag(self: Settings) -> bool:
@@ -1077,6 +1327,33 @@ class Settings:
             )
         return self.__minimum_marginal_contribution
 
+    @property
+    def selector_batch_size(self: Settings) -> int:
+        """Get the number of instances per selector job."""
+        if self.__selector_batch_size is None:
+            self.__selector_batch_size = self._abstract_getter(
+                Settings.OPTION_selector_batch_size
+            )
+        return self.__selector_batch_size
+
+    @property
+    def selection_run_aggregation(self: Settings) -> str:
+        """Get the aggregation of the runs of an instance for the selector."""
+        if self.__selection_run_aggregation is None:
+            self.__selection_run_aggregation = self._abstract_getter(
+                Settings.OPTION_selection_run_aggregation
+            )
+        return self.__selection_run_aggregation
+
+    @property
+    def selection_expand_runs(self: Settings) -> bool:
+        """Get whether the selector is trained on every run as a sample."""
+        if self.__selection_expand_runs is None:
+            self.__selection_expand_runs = self._abstract_getter(
+                Settings.OPTION_selection_expand_runs
+            )
+        return self.__selection_expand_runs
+
     # Configuration: SMAC2 specific settings ###
     @property
     def smac2_wallclock_time_budget(self: Settings) -> int:
@@ -1221,6 +1498,15 @@ class Settings:
             )
         return self.__smac3_max_budget
 
+    @property
+    def smac3_n_workers(self: Settings) -> int:
+        """Return the number of concurrent SMAC3 trials."""
+        if self.__smac3_n_workers is None:
+            self.__smac3_n_workers = self._abstract_getter(
+                Settings.OPTION_smac3_n_workers
+            )
+        return self.__smac3_n_workers
+
     # IRACE settings ###
     @property
     def irace_max_time(self: Settings) -> int:
@@ -1454,6 +1740,7 @@ class Settings:
                     "use_default_config": self.smac3_use_default_config,
                     "min_budget": self.smac3_min_budget,
                     "max_budget": self.smac3_max_budget,
+                    "n_workers": self.smac3_n_workers,
                     "solver_calls": self.smac3_number_of_trials
                     or configurator_settings["solver_calls"],
                 }
@@ -0,0 +1,223 @@
+"""Module to manage incremental snapshots of a Sparkle platform."""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import stat
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+class SnapshotStore:
+    """Content addressed store for incremental platform snapshots.
+
+    Files are split into fixed size chunks, which are compressed and stored under
+    their content hash. Each snapshot is a JSON manifest listing its directories and
+    files with their chunk hashes, so unchanged files are referenced by later
+    snapshots rather than being stored again.
+    """
+
+    manifest_suffix = ".json"
+    manifest_version = 1
+    chunk_dir_name = "Chunks"
+    chunk_size = 4 * 2**20  # Bytes per chunk
+    compression_level = 6
+
+    def __init__(self: SnapshotStore, directory: Path, max_workers: int = None) -> None:
+        """Initialise a SnapshotStore.
+
+        Args:
+            directory: The directory in which the manifests are stored. The chunks
+                are stored in a subdirectory. Created when it does not exist.
+            max_workers: The number of threads used to hash, compress and
+                decompress files. If None, determined by the ThreadPoolExecutor.
+        """
+        self.directory = directory
+        self.chunk_directory = directory / SnapshotStore.chunk_dir_name
+        self.max_workers = max_workers
+        self.chunk_directory.mkdir(parents=True, exist_ok=True)
+
+    def manifest_path(self: SnapshotStore, name: str) -> Path:
+        """Return the path of the manifest of a snapshot."""
+        return self.directory / f"{name}{SnapshotStore.manifest_suffix}"
+
+    def chunk_path(self: SnapshotStore, chunk_hash: str) -> Path:
+        """Return the path of a chunk, fanned out over subdirectories."""
+        return self.chunk_directory / chunk_hash[:2] / chunk_hash
+
+    @property
+    def manifests(self: SnapshotStore) -> list[Path]:
+        """Return the manifests in the store, from oldest to newest."""
+        return sorted(
+            self.directory.glob(f"*{SnapshotStore.manifest_suffix}"),
+            key=lambda path: path.stat().st_mtime_ns,
+        )
+
+    @staticmethod
+    def load_manifest(manifest_path: Path) -> dict:
+        """Read a snapshot manifest.
+
+        Args:
+            manifest_path: The manifest file.
+
+        Returns:
+            The manifest as a dictionary.
+        """
+        manifest = json.loads(manifest_path.read_text())
+        if manifest.get("version") != SnapshotStore.manifest_version:
+            raise ValueError(
+                f"Unsupported snapshot manifest version {manifest.get('version')} "
+                f"in {manifest_path}."
+            )
+        return manifest
+
+    @staticmethod
+    def is_included(path: str, include: list[str] = None) -> bool:
+        """Check whether a relative path lies within any of the included paths.
+
+        Args:
+            path: The relative (posix) path to check.
+            include: The relative (posix) paths to include. If None, all paths are
+                included.
+
+        Returns:
+            True if the path equals or lies below one of the included paths.
+        """
+        if include is None:
+            return True
+        return any(path == i or path.startswith(f"{i}/") for i in include)
+
+    def _store_chunk(self: SnapshotStore, data: bytes) -> str:
+        """Compress and store a chunk, unless already present, and return its hash."""
+        chunk_hash = hashlib.sha256(data).hexdigest()
+        path = self.chunk_path(chunk_hash)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # Unique temporary file so that concurrent writers never clash
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(zlib.compress(data, SnapshotStore.compression_level))
+            tmp_path.replace(path)
+        return chunk_hash
+
+    def _store_file(self: SnapshotStore, path: Path) -> list[str]:
+        """Store all chunks of a file and return their hashes."""
+        chunks = []
+        with path.open("rb") as fin:
+            while data := fin.read(SnapshotStore.chunk_size):
+                chunks.append(self._store_chunk(data))
+        return chunks
+
+    def save(self: SnapshotStore, name: str, paths: list[Path], root: Path) -> Path:
+        """Save a snapshot of directories and files.
+
+        Files whose size and modification time are unchanged since the most recent
+        snapshot reuse its chunks without being read again.
+
+        Args:
+            name: The name of the snapshot.
+            paths: The directories and files to include.
+            root: The directory to which all paths are stored relatively.
+
+        Returns:
+            The path of the manifest of the snapshot.
+        """
+        manifest_path = self.manifest_path(name)
+        if manifest_path.exists():
+            raise FileExistsError(f"Snapshot {manifest_path} already exists!")
+        # Files recorded by the most recent snapshot
+        previous = {}
+        if self.manifests:
+            previous = {
+                entry["path"]: entry
+                for entry in SnapshotStore.load_manifest(self.manifests[-1])["files"]
+            }
+        directories, files = [], []
+        for path in paths:
+            if path.is_file():
+                files.append(path)
+                continue
+            for dir_path, _, file_names in os.walk(path):
+                directories.append(Path(dir_path))
+                files.extend(Path(dir_path) / file_name for file_name in file_names)
+
+        def snapshot_file(path: Path) -> dict:
+            """Create the manifest entry of a file, storing its chunks if needed."""
+            file_stat = path.stat()
+            entry = {
+                "path": path.relative_to(root).as_posix(),
+                "mode": stat.S_IMODE(file_stat.st_mode),
+                "size": file_stat.st_size,
+                "mtime_ns": file_stat.st_mtime_ns,
+            }
+            known = previous.get(entry["path"])
+            if (
+                known is not None
+                and known["size"] == entry["size"]
+                and known["mtime_ns"] == entry["mtime_ns"]
+                and all(self.chunk_path(chunk).exists() for chunk in known["chunks"])
+            ):
+                entry["chunks"] = known["chunks"]
+            else:
+                entry["chunks"] = self._store_file(path)
+            return entry
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            entries = list(executor.map(snapshot_file, files))
+        manifest = {
+            "version": SnapshotStore.manifest_version,
+            "name": name,
+            "created": time.time(),
+            "directories": [path.relative_to(root).as_posix() for path in directories],
+            "files": entries,
+        }
+        tmp_path = manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest))
+        tmp_path.replace(manifest_path)
+        return manifest_path
+
+    def restore_file(self: SnapshotStore, entry: dict, destination: Path) -> None:
+        """Write a file of a manifest by streaming its chunks.
+
+        Args:
+            entry: The manifest entry of the file.
+            destination: The directory to which the path of the entry is relative.
+        """
+        path = destination / entry["path"]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as fout:
+            for chunk in entry["chunks"]:
+                fout.write(zlib.decompress(self.chunk_path(chunk).read_bytes()))
+        path.chmod(entry["mode"])
+        os.utime(path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+
+    def restore(
+        self: SnapshotStore,
+        manifest_path: Path,
+        destination: Path,
+        include: list[str] = None,
+    ) -> None:
+        """Restore a snapshot.
+
+        Args:
+            manifest_path: The manifest of the snapshot.
+            destination: The directory in which to restore the snapshot.
+            include: The relative (posix) paths to restore. If None, everything
+                is restored.
+        """
+        manifest = SnapshotStore.load_manifest(manifest_path)
+        for directory in manifest["directories"]:
+            if SnapshotStore.is_included(directory, include):
+                (destination / directory).mkdir(parents=True, exist_ok=True)
+        files = [
+            entry
+            for entry in manifest["files"]
+            if SnapshotStore.is_included(entry["path"], include)
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(
+                executor.map(lambda entry: self.restore_file(entry, destination), files)
+            )
@@ -12,8 +12,8 @@ from runrunner.base import Status, Runner
 from runrunner.local import Run, LocalRun
 
 from sparkle.types import SparkleCallable, SolverStatus
-from sparkle.structures import FeatureDataFrame
-from sparkle.tools import RunSolver
+from sparkle.structures import FeatureDataFrame, FeatureCache
+from sparkle.tools import RunSolver, async_runner
 from sparkle.instance import InstanceSet
 
 
@@ -260,7 +260,10 @@ class Extractor(SparkleCallable):
         slurm_prepend: str | list[str] | Path = None,
         dependencies: list[Run] = None,
         log_dir: Path = None,
-    ) -> None:
+        feature_cache: FeatureCache = None,
+        batch_size: int = 1,
+        batch_workers: int = 1,
+    ) -> Run:
         """Run the Extractor CLI and write result to the FeatureDataFrame.
 
         Args:
@@ -272,10 +275,16 @@ class Extractor(SparkleCallable):
             run_on: The runner to use.
             sbatch_options: Additional options to pass to sbatch.
             srun_options: Additional options to pass to srun.
-            parallel_jobs: Number of parallel jobs to run.
+            parallel_jobs: Number of parallel jobs to run through Slurm. Local jobs
+                run on all cores.
             slurm_prepend: Slurm script to prepend to the sbatch
             dependencies: List of dependencies to add to the job.
             log_dir: The directory to write logs to.
+            feature_cache: The feature cache to look up results in before running
+                the extractor, and to store new results in. If None, no cache is used.
+            batch_size: The number of instances to compute features for per job.
+                The results of a job are written to the FeatureDataFrame at once.
+            batch_workers: The number of instances each job computes concurrently.
         """
         instances = (
             instance_set
@@ -284,26 +293,64 @@ class Extractor(SparkleCallable):
         )
         log_dir = Path() if log_dir is None else log_dir
         feature_group = f"--feature-group {feature_group} " if feature_group else ""
+        extra_args = ""
+        if feature_cache is not None:
+            extra_args = f" --cache-dir {feature_cache.directory}"
+            if feature_cache.max_size is not None:
+                extra_args += f" --cache-size {feature_cache.max_size}"
+            # Hashed once for all jobs, instead of by every job
+            extra_args += (
+                f" --extractor-hash {feature_cache.extractor_hash(self.directory)}"
+            )
+        if batch_workers is not None and batch_workers > 1:
+            extra_args += f" --workers {batch_workers}"
+        batch_size = 1 if batch_size is None else max(batch_size, 1)
+        batches = [
+            instances[index : index + batch_size]
+            for index in range(0, len(instances), batch_size)
+        ]
         commands = [
             f"python3 {Extractor.extractor_cli} "
             f"--extractor {self.directory} "
-            f"--instance {instance_path} "
-            f"--feature-csv {feature_dataframe.csv_filepath} "
+            + " ".join(f"--instance {instance_path}" for instance_path in batch)
+            + f" --feature-csv {feature_dataframe.csv_filepath} "
             f"{feature_group}"
             f"--cutoff {cutoff_time} "
             f"--log-dir {log_dir}"
-            for instance_path in instances
+            f"{extra_args}"
+            for batch in batches
         ]
 
         job_name = f"Run Extractor {self.name} on {feature_group} for {len(instances)} instances"
-        import subprocess
+        if run_on == Runner.LOCAL:
+            print("Waiting for the local calculations to finish.")
+            jobs_done = 0
+
+            def report(job: async_runner.AsyncJob) -> None:
+                """Report the progress when a job has finished."""
+                nonlocal jobs_done
+                jobs_done += 1
+                print(f"Executing Progress: {jobs_done} out of {len(commands)}")
+
+            # Each job uses as many cores as it computes instances concurrently
+            run = async_runner.run(
+                commands,
+                name=job_name,
+                parallel_jobs=max(1, async_runner.cpu_count() // max(1, batch_workers)),
+                stdout=None,  # Print
+                stderr=None,  # Print
+                callback=report,
+                dependencies=dependencies,
+            )
+            print("Computing features done!")
+            return run
 
         run = rrr.add_to_queue(
             runner=run_on,
             cmd=commands,
             name=job_name,
-            stdout=None if run_on == Runner.LOCAL else subprocess.PIPE,  # Print
-            stderr=None if run_on == Runner.LOCAL else subprocess.PIPE,  # Print
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             base_dir=log_dir,
             sbatch_options=sbatch_options,
             srun_options=srun_options,
@@ -311,18 +358,7 @@ class Extractor(SparkleCallable):
             prepend=slurm_prepend,
             dependencies=dependencies,
         )
-        if isinstance(run, LocalRun):
-            print("Waiting for the local calculations to finish.")
-            run.wait()
-            for job in run.jobs:
-                jobs_done = sum(j.status == Status.COMPLETED for j in run.jobs)
-                print(f"Executing Progress: {jobs_done} out of {len(run.jobs)}")
-                if jobs_done == len(run.jobs):
-                    break
-                job.wait()
-            print("Computing features done!")
-        else:
-            print(f"Running {self.name} through Slurm with Job IDs: {run.run_id}")
+        print(f"Running {self.name} through Slurm with Job IDs: {run.run_id}")
         return run
 
     def get_feature_vector(
@@ -1,15 +1,77 @@
 #!/usr/bin/env python3
 # -*- coding: UTF-8 -*-
-"""Execute Feature Extractor for an instance, write features to FeatureDataFrame."""
+"""Execute Feature Extractor for instances, write features to FeatureDataFrame."""
 
+from __future__ import annotations
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from filelock import FileLock
 
-from sparkle.structures import FeatureDataFrame
+from sparkle.structures import FeatureDataFrame, FeatureCache
 from sparkle.selector import Extractor
 
 
+def compute_instance_features(
+    extractor: Extractor,
+    instance_path: list[Path],
+    feature_group: str,
+    cutoff_time: str,
+    log_dir: Path,
+    feature_cache: FeatureCache = None,
+    cache_group: str = None,
+) -> list[tuple[str, str, float]] | None:
+    """Compute the features of a single (multi file) instance.
+
+    Args:
+        extractor: The extractor to run.
+        instance_path: The file(s) of the instance.
+        feature_group: The feature group to compute, None for all groups.
+        cutoff_time: The maximum CPU time for the extractor.
+        log_dir: The directory to write logs to.
+        feature_cache: The cache to retrieve and store results. Optional.
+        cache_group: The feature group the results are cached under, None for all.
+
+    Returns:
+        The features as (feature_group, feature_name, value) tuples, or None
+        if the extractor failed on the instance.
+    """
+    instance_list = [str(filepath) for filepath in instance_path]
+    if feature_group:
+        print(
+            f"Calling {extractor.name} with feature group {feature_group} for instance {instance_list} with cutoff {cutoff_time}"
+        )
+    else:
+        print(
+            f"Calling {extractor.name} for instance {instance_list} with cutoff {cutoff_time}"
+        )
+
+    if feature_cache is not None:
+        features = feature_cache.get(extractor.directory, cache_group, instance_path)
+        if features is not None:
+            print(f"Retrieved features of {instance_list} from the feature cache.")
+            return features
+
+    try:
+        features = extractor.run(
+            instance_list,
+            feature_group=feature_group,
+            cutoff_time=cutoff_time,
+            log_dir=log_dir,
+        )
+    except (TimeoutError, RuntimeError) as exception:
+        print(
+            "EXCEPTION during retrieving extractor results.\n"
+            f"****** WARNING: Feature vector computation on instance {instance_list}"
+            f" failed! ******\n{exception}"
+        )
+        return None
+    if feature_cache is not None and features:
+        feature_cache.put(extractor.directory, cache_group, instance_path, features)
+    return features
+
+
 if __name__ == "__main__":
     # Define command line arguments
     parser = argparse.ArgumentParser()
@@ -21,7 +83,9 @@ if __name__ == "__main__":
         required=True,
         type=Path,
         nargs="+",
-        help="path to instance file(s) to run on",
+        action="append",
+        help="path to instance file(s) to run on. Can be repeated to compute the "
+        "features of multiple instances in one job.",
     )
     parser.add_argument(
         "--feature-csv", required=True, type=Path, help="path to feature data CSV file"
@@ -30,7 +94,7 @@ if __name__ == "__main__":
         "--cutoff",
         required=True,
         type=str,
-        help="the maximum CPU time for the extractor.",
+        help="the maximum CPU time for the extractor per instance.",
     )
     parser.add_argument(
         "--feature-group",
@@ -43,85 +107,141 @@ if __name__ == "__main__":
     parser.add_argument(
         "--log-dir", type=Path, required=True, help="path to the log directory"
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        required=False,
+        help="path to the feature cache directory. If not provided, no cache is used.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        required=False,
+        help="the maximum size of the feature cache in MB.",
+    )
+    parser.add_argument(
+        "--extractor-hash",
+        type=str,
+        required=False,
+        help="the content hash of the extractor directory in the feature cache. If "
+        "not provided, the directory is hashed.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="the number of instances to compute features for concurrently.",
+    )
     args = parser.parse_args()
 
     # Process command line arguments
-    log_dir = args.log_dir
-
-    # Instance agument is a list to allow for multifile instances
-    instance_path: list[Path] = args.instance
-    instance_name = instance_path[0].stem
+    # Each instance argument is a list to allow for multifile instances
+    instance_paths: list[list[Path]] = args.instance
     extractor_path = args.extractor
     feature_data_csv_path = args.feature_csv
-    cutoff_extractor = args.cutoff
-
-    # Ensure stringifcation of path objects
-    if isinstance(instance_path, list):
-        instance_list = [str(filepath) for filepath in instance_path]
-    else:
-        instance_list = [str(instance_path)]
 
     extractor = Extractor(extractor_path)
-    if args.feature_group:
-        print(
-            f"Calling {extractor.name} with feature group {args.feature_group} for instance {instance_list} with cutoff {cutoff_extractor}"
-        )
-    else:
-        print(
-            f"Calling {extractor.name} for instance {instance_list} with cutoff {cutoff_extractor}"
+    # Extractors that cannot compute groups separately always compute all features
+    cache_group = args.feature_group
+    if cache_group is not None and not extractor.groupwise_computation:
+        cache_group = None
+    feature_cache = None
+    if args.cache_dir:
+        feature_cache = FeatureCache(
+            args.cache_dir,
+            args.cache_size,
+            {extractor.directory: args.extractor_hash} if args.extractor_hash else None,
         )
 
-    features = extractor.run(
-        instance_list,
+    compute = partial(
+        compute_instance_features,
+        extractor,
         feature_group=args.feature_group,
-        cutoff_time=cutoff_extractor,
-        log_dir=log_dir,
+        cutoff_time=args.cutoff,
+        log_dir=args.log_dir,
+        feature_cache=feature_cache,
+        cache_group=cache_group,
     )
+    if args.workers > 1 and len(instance_paths) > 1:
+        # NOTE: Processes instead of threads, as the local RunRunner queue is serial
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(compute, instance_paths))
+    else:
+        results = [compute(instance_path) for instance_path in instance_paths]
 
-    if features is None or len(features) == 0:
+    # Group the results per instance and feature group
+    instance_results: dict[Path, dict[str, tuple[list[str], list[float]]]] = {}
+    for instance_path, features in zip(instance_paths, results):
+        if not features:
+            continue
+        feature_data_per_group = {}
+        for feature_group, feature_name, value in features:
+            if feature_group not in feature_data_per_group:
+                feature_data_per_group[feature_group] = [[], []]
+            print(
+                f"{extractor_path.name} {instance_path[0].stem} {feature_group} {feature_name} | {value}"
+            )  # For logging purposes
+            feature_data_per_group[feature_group][0] += [feature_name]
+            feature_data_per_group[feature_group][1] += [float(value)]
+        instance_results[instance_path[0]] = feature_data_per_group
+
+    if not instance_results:
         raise ValueError(
             "No features found! This may be due to a timeout. Check extractor logs."
         )
 
-    feature_data_per_group = {}
-    for feature_group, feature_name, value in features:
-        if feature_group not in feature_data_per_group:
-            feature_data_per_group[feature_group] = [[], []]
-        print(
-            f"{extractor_path.name} {instance_name} {feature_group} {feature_name} | {value}"
-        )  # For logging purposes
-        feature_data_per_group[feature_group][0] += [feature_name]
-        feature_data_per_group[feature_group][1] += [float(value)]
-
-    # Now that we have our result, we write it to the FeatureDataCSV with a FileLock
-    lock = FileLock(f"{feature_data_csv_path}.lock")
-    if features is not None:
-        print("Writing features to file...")
-        with lock.acquire(timeout=600):
-            feature_data = FeatureDataFrame(feature_data_csv_path)
-            instance_key = (
-                instance_name
-                if instance_name in feature_data.instances
-                else str(instance_path[0].with_suffix(""))
-            )
-            for feature_group, (
-                feature_names,
-                feature_values,
-            ) in feature_data_per_group.items():
-                # for feature_group, feature_name, value in features:
-                feature_data.set_value(
-                    instance_key,
+    store = FeatureDataFrame.result_store(feature_data_csv_path)
+    if store.exists:  # Single row upserts, without reading the FeatureDataCSV
+        print("Writing features to the result store...")
+        store.upsert(
+            [
+                (
+                    str(instance_path.with_suffix("")),
                     extractor_path.name,
                     feature_group,
+                    feature_name,
+                    float(value),
+                )
+                for instance_path, feature_data_per_group in instance_results.items()
+                for feature_group, (
                     feature_names,
                     feature_values,
-                    append_write_csv=True,
+                ) in feature_data_per_group.items()
+                for feature_name, value in zip(feature_names, feature_values)
+            ]
+        )
+    else:
+        # Now that we have our results, we write them to the FeatureDataCSV with a FileLock
+        lock = FileLock(f"{feature_data_csv_path}.lock")
+        print("Writing features to file...")
+        with lock.acquire(timeout=600):
+            feature_data = FeatureDataFrame(feature_data_csv_path)
+            instance_keys = []
+            for instance_path, feature_data_per_group in instance_results.items():
+                instance_key = (
+                    instance_path.stem
+                    if instance_path.stem in feature_data.instances
+                    else str(instance_path.with_suffix(""))
                 )
+                for feature_group, (
+                    feature_names,
+                    feature_values,
+                ) in feature_data_per_group.items():
+                    feature_data.set_value(
+                        instance_key,
+                        extractor_path.name,
+                        feature_group,
+                        feature_names,
+                        feature_values,
+                    )
+                instance_keys.append(instance_key)
+            # Append all rows at once
+            feature_data.append_csv(instance_keys)
         lock.release()
-        print("Writing successful!")
-    else:
+    print("Writing successful!")
+    if len(instance_results) < len(instance_paths):
         print(
-            "EXCEPTION during retrieving extractor results.\n"
-            f"****** WARNING: Feature vector computation on instance {instance_path}"
-            " failed! ******"
+            f"WARNING: Feature computation failed for "
+            f"{len(instance_paths) - len(instance_results)} out of "
+            f"{len(instance_paths)} instances. Check the extractor logs."
         )
@@ -1,12 +1,13 @@
 """File to handle a Selector for selecting Solvers."""
 
 from __future__ import annotations
+import copy
+import functools
 import random
 from pathlib import Path
 
 
 from sklearn.base import ClassifierMixin, RegressorMixin
-from asf.cli import cli_train as asf_cli
 from asf.predictors import AbstractPredictor
 from asf.selectors.abstract_model_based_selector import AbstractModelBasedSelector
 
@@ -18,12 +19,14 @@ import pandas as pd
 from sparkle.types import SparkleObjective, resolve_objective
 from sparkle.structures import FeatureDataFrame, PerformanceDataFrame
 from sparkle.instance import InstanceSet
+from sparkle.tools import async_runner
 
 
 class Selector:
     """The Selector class for handling Algorithm Selection."""
 
     selector_cli = Path(__file__).parent / "selector_cli.py"
+    construct_cli = Path(__file__).parent / "selector_construct_cli.py"
 
     def __init__(
         self: Selector,
@@ -55,7 +58,7 @@ class Selector:
 
     def construct(
         self: Selector,
-        selection_scenario: SelectionScenario,
+        selection_scenario: SelectionScenario | list[SelectionScenario],
         run_on: Runner = Runner.SLURM,
         job_name: str = None,
         sbatch_options: list[str] = None,
@@ -65,7 +68,9 @@ class Selector:
         """Construct the Selector.
 
         Args:
-            selection_scenario: The scenario to construct the Selector for.
+            selection_scenario: The scenario(s) to construct the Selector for.
+                Multiple scenarios are constructed in one job, which reads data files
+                shared by the scenarios only once.
             run_on: Which runner to use. Defaults to slurm.
             job_name: Name to give the construction job when submitting.
             sbatch_options: Additional options to pass to sbatch.
@@ -75,21 +80,23 @@ class Selector:
         Returns:
             The construction Run
         """
-        selection_scenario.create_scenario()
-        selector = self.selector_class(
-            model_class=self.model_class,
-            budget=selection_scenario.solver_cutoff,
-            maximize=not selection_scenario.objective.minimise,
-        )
-        cmd = asf_cli.build_cli_command(
-            selector,
-            selection_scenario.feature_target_path,
-            selection_scenario.performance_target_path,
-            selection_scenario.selector_file_path,
+        scenarios = (
+            selection_scenario
+            if isinstance(selection_scenario, list)
+            else [selection_scenario]
         )
-        cmd = [" ".join([str(c) for c in cmd])]
+        for scenario in scenarios:
+            scenario.create_scenario()
+        cmd = [
+            f"python3 {Selector.construct_cli} --selector-scenario "
+            f"{' '.join(str(scenario.scenario_file) for scenario in scenarios)}"
+        ]
 
-        job_name = job_name or f"Selector Construction {selection_scenario.name}"
+        job_name = job_name or (
+            f"Selector Construction {scenarios[0].name}"
+            if len(scenarios) == 1
+            else f"Selector Construction of {len(scenarios)} scenarios"
+        )
         construct = rrr.add_to_queue(
             runner=run_on,
             cmd=cmd,
@@ -101,10 +108,28 @@ class Selector:
 
         if run_on == Runner.LOCAL:
             construct.wait()
-            if not selection_scenario.selector_file_path.is_file():
-                print(f"Selector construction of {self.name} failed!")
+            for scenario in scenarios:
+                if not scenario.selector_file_path.is_file():
+                    print(f"Selector construction of {scenario.name} failed!")
         return construct
 
+    def fit(self: Selector, selection_scenario: SelectionScenario) -> None:
+        """Train the Selector on a scenario and save it to the scenario directory.
+
+        Args:
+            selection_scenario: The scenario to train the Selector on.
+        """
+        selector = self.selector_class(
+            model_class=self.model_class,
+            budget=selection_scenario.solver_cutoff,
+            maximize=not selection_scenario.objective.minimise,
+        )
+        selector.fit(
+            selection_scenario.feature_data, selection_scenario.performance_data
+        )
+        selection_scenario.directory.mkdir(parents=True, exist_ok=True)
+        selector.save(selection_scenario.selector_file_path)
+
     def run(
         self: Selector,
         selector_path: Path,
@@ -113,25 +138,38 @@ class Selector:
     ) -> list:
         """Run the Selector, returning the prediction schedule upon success."""
         instance_features = feature_data.get_instance(instance, as_dataframe=True)
-        # instance_features = feature_data[
-        #     [
-        #         instance,
-        #     ]
-        # ]
-        # instance_features.columns = instance_features.columns.map("_".join)  # Reduce columns multi index
+        schedules = self.run_batch(selector_path, instance_features)
+        if schedules is None:
+            return None
+        return schedules[instance]
+
+    def run_batch(
+        self: Selector,
+        selector_path: Path,
+        feature_matrix: pd.DataFrame,
+    ) -> dict[str, list[tuple[str, str, float]]]:
+        """Run the Selector on multiple instances, loading the model only once.
+
+        Args:
+            selector_path: The path to the constructed Selector.
+            feature_matrix: The features with one row per instance.
+
+        Returns:
+            The prediction schedule per instance as a list of (solver, configuration
+            id, time budget) tuples, or None if the Selector failed.
+        """
         selector = self.selector_class.load(selector_path)
-        schedule = selector.predict(instance_features)
-        if schedule is None:
+        schedules = selector.predict(feature_matrix)
+        if schedules is None:
             print(f"ERROR: Selector {self.name} failed predict schedule!")
             return None
-        # ASF presents result as schedule per instance, we only use one in this setting
-        schedule = schedule[instance]
-        for index, (solver, time) in enumerate(schedule):
-            # Split solver name back into solver and config id
-            # NOTE: There is an issue with this incase the Solver name has an "_" in its name... We need to change the delimiter to different character(s)
-            solver_name, conf_index = solver.split("_", maxsplit=1)
-            schedule[index] = (solver_name, conf_index, time)
-        return schedule
+        for schedule in schedules.values():
+            for index, (solver, time) in enumerate(schedule):
+                # Split solver name back into solver and config id
+                # NOTE: There is an issue with this incase the Solver name has an "_" in its name... We need to change the delimiter to different character(s)
+                solver_name, conf_index = solver.split("_", maxsplit=1)
+                schedule[index] = (solver_name, conf_index, time)
+        return schedules
 
     def run_cli(
         self: Selector,
@@ -144,6 +182,7 @@ class Selector:
         job_name: str = None,
         dependencies: list[Run] = None,
         log_dir: Path = None,
+        batch_size: int = 1,
     ) -> Run:
         """Run the Selector CLI and write result to the Scenario PerformanceDataFrame.
 
@@ -157,6 +196,8 @@ class Selector:
             job_name: Name to give the Slurm job when submitting.
             dependencies: List of dependencies to add to the job.
             log_dir: The directory to write logs to.
+            batch_size: The number of instances to run the Selector on per job. The
+                Selector model is loaded once per job.
 
         Returns:
             The Run object.
@@ -168,37 +209,68 @@ class Selector:
             if isinstance(instance_set, list)
             else instance_set.instance_paths
         )
-        commands = [
-            f"python3 {Selector.selector_cli} "
-            f"--selector-scenario {scenario_path} "
-            f"--instance {instance_path} "
-            f"--feature-data {feature_data} "
-            f"--log-dir {log_dir} "
-            f"--seed {random.randint(0, 2**32 - 1)}"
-            for instance_path in instances
-        ]
+        batch_size = max(1, batch_size)
+        commands = []
+        for index in range(0, len(instances), batch_size):
+            batch = instances[index : index + batch_size]
+            seeds = [random.randint(0, 2**32 - 1) for _ in batch]
+            commands.append(
+                f"python3 {Selector.selector_cli} "
+                f"--selector-scenario {scenario_path} "
+                f"--instance {' '.join(str(instance) for instance in batch)} "
+                f"--feature-data {feature_data} "
+                f"--log-dir {log_dir} "
+                f"--seed {' '.join(str(seed) for seed in seeds)}"
+            )
 
         job_name = (
             f"Run Selector {self.name} on {len(instances)} instances"
             if not job_name
             else job_name
         )
+        if run_on == Runner.LOCAL:  # Finished once returned
+            return async_runner.run(
+                commands,
+                name=job_name,
+                stdout=None,  # Print
+                stderr=None,  # Print
+                dependencies=dependencies,
+            )
         import subprocess
 
-        r = rrr.add_to_queue(
+        return rrr.add_to_queue(
             cmd=commands,
             name=job_name,
-            stdout=None if run_on == Runner.LOCAL else subprocess.PIPE,  # Print
-            stderr=None if run_on == Runner.LOCAL else subprocess.PIPE,  # Print
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             base_dir=log_dir,
             runner=run_on,
             sbatch_options=sbatch_options,
             prepend=slurm_prepend,
             dependencies=dependencies,
         )
-        if run_on == Runner.LOCAL:
-            r.wait()
-        return r
+
+
+@functools.lru_cache(maxsize=4)
+def _read_csv(path: Path, modified: int, size: int) -> pd.DataFrame:
+    """Read a CSV file, cached on its path, modification time and size."""
+    return pd.read_csv(path, index_col=0)
+
+
+def read_selection_data(path: Path) -> pd.DataFrame:
+    """Read feature or performance data in selector format.
+
+    Scenarios sharing data files, e.g. ablated scenarios, read a file only once as
+    long as it does not change. The returned DataFrame must not be modified.
+
+    Args:
+        path: The path to the CSV file, with instances as index.
+
+    Returns:
+        The data in the file.
+    """
+    stat = path.stat()
+    return _read_csv(path, stat.st_mtime_ns, stat.st_size)
 
 
 class SelectionScenario:
@@ -218,28 +290,56 @@ class SelectionScenario:
         extractor_cutoff: int | float = None,
         ablate: bool = False,
         subdir_path: Path = None,
+        run_aggregation: str | float = None,
+        expand_runs: bool = False,
+        excluded_solvers: list[str] = None,
+        parent_selector_performance_path: Path = None,
     ) -> None:
-        """Initialize a scenario for a selector."""
+        """Initialize a scenario for a selector.
+
+        Args:
+            parent_directory: The directory in which to place the scenario.
+            selector: The selector of the scenario.
+            objective: The objective the selector optimises.
+            performance_data: The performance data, or the path to it in selector
+                format.
+            feature_data: The feature data, or the path to it in selector format.
+            feature_extractors: The feature extractors, when reading from file.
+            solver_cutoff: The cutoff time of the solvers.
+            extractor_cutoff: The cutoff time of the feature extractors.
+            ablate: Whether to create the scenarios ablating each solver.
+            subdir_path: The subdirectory of the scenario in the parent directory.
+            run_aggregation: How to aggregate the runs of an instance, the name of an
+                aggregation such as mean or median, or the quantile to take. Defaults
+                to the run aggregator of the objective.
+            expand_runs: Train the selector on every run as a separate sample,
+                instead of on the aggregated runs.
+            excluded_solvers: The solvers (configurations) excluded from the
+                performance data, without changing its file. Used for ablation.
+            parent_selector_performance_path: The selector performance data of the
+                scenario this scenario was ablated from, which holds the
+                configurations of the solvers.
+        """
         self.selector: Selector = selector
         self.objective: SparkleObjective = objective
         self.solver_cutoff: float = solver_cutoff
         self.extractor_cutoff: float = extractor_cutoff
+        self.run_aggregation: str | float = run_aggregation
+        self.expand_runs: bool = expand_runs
+        self.excluded_solvers: list[str] = excluded_solvers or []
+        self.parent_selector_performance_path: Path = parent_selector_performance_path
+        self._parent_selector_performance_data: PerformanceDataFrame = None
         if subdir_path is not None:
-            self.directory = parent_directory / subdir_path
+            directory = parent_directory / subdir_path
         elif isinstance(performance_data, PerformanceDataFrame):
-            self.directory: Path = (
+            directory = (
                 parent_directory
                 / selector.name
                 / "_".join([Path(s).name for s in performance_data.solvers])
             )
         else:
-            self.directory = performance_data.parent
-        self.name = f"{selector.name} on {self.directory.name}"
-        self.selector_file_path: Path = self.directory / "portfolio_selector"
-        self.scenario_file: Path = self.directory / "scenario.txt"
-        self.selector_performance_path: Path = (
-            self.directory / "selector_performance.csv"
-        )
+            directory = performance_data.parent
+        self._set_directory(directory)
         if self.selector_performance_path.exists():
             self.selector_performance_data = PerformanceDataFrame(
                 self.selector_performance_path
@@ -251,36 +351,33 @@ class SelectionScenario:
             )
 
         if isinstance(performance_data, PerformanceDataFrame):  # Convert
-            # Convert the dataframes to Selector Format
-            new_column_names: list[str] = []
-            for solver, config_id, _ in performance_data.columns:
-                if f"{solver}_{config_id}" not in new_column_names:
-                    new_column_names.append(f"{solver}_{config_id}")
-            self.performance_data = performance_data.drop(
-                [PerformanceDataFrame.column_seed], axis=1, level=2
+            # Convert the dataframes to Selector Format, a column per configuration
+            values = performance_data.xs(
+                PerformanceDataFrame.column_value, axis=1, level=2, drop_level=True
             )
-            self.performance_data = self.performance_data.droplevel(
-                [
-                    PerformanceDataFrame.column_configuration,
-                    PerformanceDataFrame.column_meta,
-                ],
-                axis=1,
-            )
-            self.performance_data = self.performance_data.droplevel(
+            values.columns = [f"{solver}_{config_id}" for solver, config_id in values]
+            # Enforce data type to be numeric
+            values = values.astype(float)
+            # The performance of every run, with instances and runs as index
+            self.run_samples: pd.DataFrame = values.droplevel(
                 PerformanceDataFrame.index_objective, axis=0
             )
-            self.performance_data.columns = new_column_names
             # Requires instances as index for both, columns as features / solvers
-            # TODO: This should be an aggregation instead?
-            self.performance_data.index = self.performance_data.index.droplevel("Run")
-            # Enforce data type to be numeric
-            self.performance_data = self.performance_data.astype(float)
+            if expand_runs:
+                self.performance_data = self.run_samples.droplevel(
+                    PerformanceDataFrame.index_run, axis=0
+                )
+            else:
+                self.performance_data = SelectionScenario.aggregate_runs(
+                    values, run_aggregation or objective.run_aggregator.__name__
+                )
             self.performance_target_path = self.directory / "performance_data.csv"
         else:  # Read from Path
-            self.performance_data: pd.DataFrame = pd.read_csv(
-                performance_data, index_col=0
-            )
+            self.performance_data: pd.DataFrame = read_selection_data(
+                performance_data
+            ).drop(columns=self.excluded_solvers)
             self.performance_target_path: Path = performance_data
+            self.run_samples = None
 
         if isinstance(feature_data, FeatureDataFrame):  # Convert
             self.feature_extractors = feature_data.extractors
@@ -291,46 +388,115 @@ class SelectionScenario:
             )  # Reduce Column Multi Index to single
             # ASF -> feature columns, instance rows
             self.feature_data: pd.DataFrame = feature_target.astype(float)
+            if not self.performance_data.index.is_unique:  # A sample per run
+                self.feature_data = self.feature_data.reindex(
+                    self.performance_data.index
+                )
             self.feature_target_path: Path = self.directory / "feature_data.csv"
         else:  # Read from Path
             self.feature_extractors = feature_extractors
-            self.feature_data: pd.DataFrame = pd.read_csv(feature_data)
+            self.feature_data: pd.DataFrame = read_selection_data(feature_data)
             self.feature_target_path: Path = feature_data
 
         self.ablation_scenarios: list[SelectionScenario] = []
         if ablate and len(self.performance_data.columns) > 2:
-            for solver in self.performance_data.columns:
-                solver_key, conf_id = solver.split("_", maxsplit=1)
-                ablate_subdir = Path(f"ablated_{Path(solver).name}")
-                ablated_directory = self.directory / ablate_subdir
-                if (ablated_directory / "performance_data.csv").exists():
-                    ablated_pd = ablated_directory / "performance_data.csv"
-                elif isinstance(performance_data, PerformanceDataFrame):
-                    ablated_pd = performance_data.clone()
-                    ablated_pd.remove_configuration(solver_key, conf_id)
-                else:  # Note we could do this but it would be hacky?
-                    raise ValueError(
-                        "Cannot ablate scenario after loading from file! "
-                        "Requires original PerformanceDataFrame."
-                    )
-
-                self.ablation_scenarios.append(
-                    SelectionScenario(
-                        parent_directory=self.directory,
-                        selector=selector,
-                        objective=objective,
-                        performance_data=ablated_pd,
-                        feature_data=feature_data,
-                        solver_cutoff=solver_cutoff,
-                        ablate=False,  # If we set to true here, recursion would happen
-                        subdir_path=ablate_subdir,
-                    )
+            self.ablation_scenarios = [
+                self.ablate(solver) for solver in self.performance_data.columns
+            ]
+
+    def _set_directory(self: SelectionScenario, directory: Path) -> None:
+        """Set the directory of the scenario and the paths of its files."""
+        self.directory: Path = directory
+        self.name = f"{self.selector.name} on {self.directory.name}"
+        self.selector_file_path: Path = self.directory / "portfolio_selector"
+        self.scenario_file: Path = self.directory / "scenario.txt"
+        self.selector_performance_path: Path = (
+            self.directory / "selector_performance.csv"
+        )
+
+    def ablate(self: SelectionScenario, solver: str) -> SelectionScenario:
+        """Create the scenario without a solver (configuration).
+
+        The ablated scenario shares the data and data files of this scenario, the
+        solver is only excluded in memory and in the scenario file. Its selector
+        performance data only holds the selector.
+
+        Args:
+            solver: The solver (configuration) column to exclude.
+
+        Returns:
+            The ablated scenario, in a subdirectory of this scenario.
+        """
+        scenario = copy.copy(self)
+        scenario._set_directory(self.directory / f"ablated_{Path(solver).name}")
+        scenario.excluded_solvers = self.excluded_solvers + [solver]
+        scenario.parent_selector_performance_path = self.selector_performance_path
+        scenario._parent_selector_performance_data = self.selector_performance_data
+        scenario.performance_data = self.performance_data.drop(columns=solver)
+        scenario.run_samples = None
+        scenario.ablation_scenarios = []
+        if scenario.selector_performance_path.exists():
+            scenario.selector_performance_data = PerformanceDataFrame(
+                scenario.selector_performance_path
+            )
+        else:  # Write to file later
+            scenario.selector_performance_data = PerformanceDataFrame(
+                None,
+                solvers=[SelectionScenario.__selector_solver_name__],
+                objectives=self.selector_performance_data.objective_names,
+                instances=self.selector_performance_data.instances,
+                n_runs=self.selector_performance_data.num_runs,
+            )
+        return scenario
+
+    def get_full_configuration(
+        self: SelectionScenario, solver: str, configuration_id: str
+    ) -> dict:
+        """Return the configuration of a solver in the scenario."""
+        if self.parent_selector_performance_path is None:
+            performance_data = self.selector_performance_data
+        else:  # Ablated, the configurations are kept by the parent scenario
+            if self._parent_selector_performance_data is None:
+                self._parent_selector_performance_data = PerformanceDataFrame(
+                    self.parent_selector_performance_path
                 )
+            performance_data = self._parent_selector_performance_data
+        return performance_data.get_full_configuration(solver, configuration_id)
+
+    @staticmethod
+    def aggregate_runs(
+        performance: pd.DataFrame, aggregation: str | float
+    ) -> pd.DataFrame:
+        """Aggregate the runs of every instance.
+
+        Args:
+            performance: The performance values, with the objectives, instances and
+                runs as index.
+            aggregation: The name of the aggregation, e.g. mean or median, or the
+                quantile to take.
+
+        Returns:
+            The aggregated performance values, with the instances as index.
+        """
+        grouped = performance.groupby(
+            level=[
+                PerformanceDataFrame.index_objective,
+                PerformanceDataFrame.index_instance,
+            ],
+            sort=False,
+        )
+        try:
+            quantile = float(aggregation)
+        except (TypeError, ValueError):
+            aggregated = grouped.agg(aggregation)
+        else:
+            aggregated = grouped.quantile(quantile)
+        return aggregated.droplevel(PerformanceDataFrame.index_objective, axis=0)
 
     @property
     def training_instances(self: SelectionScenario) -> list[str]:
         """Get the training instances."""
-        return self.performance_data.index.to_list()
+        return self.performance_data.index.unique().to_list()
 
     @property
     def test_instances(self: SelectionScenario) -> list[str]:
@@ -363,10 +529,15 @@ class SelectionScenario:
         return self.performance_data.columns.to_list()
 
     def create_scenario(self: SelectionScenario) -> None:
-        """Prepare the scenario directories."""
+        """Prepare the scenario directories.
+
+        Ablated scenarios share the data files of their parent scenario, which are
+        not written.
+        """
         self.directory.mkdir(parents=True, exist_ok=True)
-        self.performance_data.to_csv(self.performance_target_path)
-        self.feature_data.to_csv(self.feature_target_path)
+        if not self.excluded_solvers:
+            self.performance_data.to_csv(self.performance_target_path)
+            self.feature_data.to_csv(self.feature_target_path)
         self.selector_performance_data.save_csv(self.selector_performance_path)
         self.create_scenario_file()
 
@@ -390,6 +561,11 @@ class SelectionScenario:
             f"performance_data: {self.performance_target_path}\n"
             f"feature_data: {self.feature_target_path}\n"
             f"feature_extractors: {','.join(self.feature_extractors)}\n"
+            f"run_aggregation: {self.run_aggregation}\n"
+            f"expand_runs: {self.expand_runs}\n"
+            f"excluded_solvers: {','.join(self.excluded_solvers)}\n"
+            f"parent_selector_performance_data: "
+            f"{self.parent_selector_performance_path}\n"
         )
 
     @staticmethod
@@ -414,7 +590,24 @@ class SelectionScenario:
             performance_data=Path(values["performance_data"]),
             feature_data=Path(values["feature_data"]),
             feature_extractors=values["feature_extractors"].split(","),
-            solver_cutoff=float(values["solver_cutoff"]),
-            extractor_cutoff=float(values["extractor_cutoff"]),
+            solver_cutoff=None
+            if values["solver_cutoff"] == "None"
+            else float(values["solver_cutoff"]),
+            extractor_cutoff=None
+            if values["extractor_cutoff"] == "None"
+            else float(values["extractor_cutoff"]),
             ablate=ast.literal_eval(values["ablate"]),
+            run_aggregation=None
+            if values.get("run_aggregation", "None") == "None"
+            else values["run_aggregation"],
+            expand_runs=ast.literal_eval(values.get("expand_runs", "False")),
+            excluded_solvers=[
+                solver
+                for solver in values.get("excluded_solvers", "").split(",")
+                if solver
+            ],
+            parent_selector_performance_path=None
+            if values.get("parent_selector_performance_data", "None") == "None"
+            else Path(values["parent_selector_performance_data"]),
+            subdir_path=Path(),  # The scenario directory may not hold the data files
         )
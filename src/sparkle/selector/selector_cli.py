@@ -13,82 +13,49 @@ from sparkle.selector import SelectionScenario
 from sparkle.instance import Instance_Set
 
 
-def main(argv: list[str]) -> None:
-    """Main function of the Selector CLI."""
-    # Define command line arguments
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        "--selector-scenario",
-        required=True,
-        type=Path,
-        help="path to portfolio selector scenario",
-    )
-    parser.add_argument(
-        "--instance", required=True, type=Path, help="path to instance to run on"
-    )
-    parser.add_argument(
-        "--feature-data", required=True, type=Path, help="path to feature data"
-    )
-    parser.add_argument(
-        "--seed",
-        type=int,
-        required=False,
-        help="seed to use for the solver. If not provided, read from "
-        "the PerformanceDataFrame or generate one.",
-    )
-    parser.add_argument(
-        "--log-dir", type=Path, required=False, help="path to the log directory"
+def resolve_feature_instance(
+    instance: Path, instance_name: str, feature_data: FeatureDataFrame
+) -> str:
+    """Resolve the name of an instance in the feature data."""
+    if instance_name in feature_data.instances:
+        return instance_name
+    if Path(instance_name).name in feature_data.instances:
+        return Path(instance_name).name
+    if str(instance) in feature_data.instances:
+        return str(instance)
+    if str(Path(instance).with_suffix("")) in feature_data.instances:
+        return str(Path(instance).with_suffix(""))
+    raise ValueError(
+        f"Could not resolve {instance} features in {feature_data.csv_filepath}"
     )
-    args = parser.parse_args(argv)
 
-    # Process command line arguments
-    selector_scenario = SelectionScenario.from_file(args.selector_scenario)
-    feature_data = FeatureDataFrame(Path(args.feature_data))
-    instance_set = Instance_Set(args.instance)
-    instance = str(instance_set.instance_paths[0])
-    instance_name = instance_set.instance_names[0]
-    seed = args.seed
-    if seed is None:
-        # Try to read from PerformanceDataFrame
-        seed = selector_scenario.selector_performance_data.get_value(
-            selector_scenario.__selector_solver_name__,
-            instance_name,
-            solver_fields=[PerformanceDataFrame.column_seed],
-        )
-        if seed is None:  # Still no value
-            import random
-
-            seed = random.randint(0, 2**32 - 1)
-
-    # Note: Following code could be adjusted to run entire instance set
-    # Run portfolio selector
-    print(f"Sparkle portfolio selector predicting for instance {instance_name} ...")
-    feature_instance_name = instance_name
-    if instance_name not in feature_data.instances:
-        if Path(instance_name).name in feature_data.instances:
-            feature_instance_name = Path(instance_name).name
-        elif str(instance) in feature_data.instances:
-            feature_instance_name = str(instance)
-        elif str(Path(instance).with_suffix("")) in feature_data.instances:
-            feature_instance_name = str(Path(instance).with_suffix(""))
-        else:
-            raise ValueError(
-                f"Could not resolve {instance} features in {feature_data.csv_filepath}"
-            )
-    predict_schedule = selector_scenario.selector.run(
-        selector_scenario.selector_file_path, feature_instance_name, feature_data
-    )
 
-    if predict_schedule is None:  # Selector Failed to produce prediction
-        sys.exit(-1)
+def run_schedule(
+    selector_scenario: SelectionScenario,
+    instance: str,
+    predict_schedule: list[tuple[str, str, float]],
+    seed: int,
+    log_dir: Path = None,
+) -> float:
+    """Run the predicted schedule of the selector on an instance.
 
+    Args:
+        selector_scenario: The scenario of the selector.
+        instance: The path to the instance to run on.
+        predict_schedule: The (solver, configuration id, cutoff time) to run.
+        seed: The seed to use for the solvers.
+        log_dir: The directory to write logs to.
+
+    Returns:
+        The objective value of the selector on the instance.
+    """
     print(
-        f"Predicting done! Running schedule [{', '.join(str(x) for x in predict_schedule)}] ..."
+        f"Running schedule [{', '.join(str(x) for x in predict_schedule)}] "
+        f"on instance {instance} ..."
     )
-    performance_data = selector_scenario.selector_performance_data
     selector_output = {}
     for solver, config_id, cutoff_time in predict_schedule:
-        config = performance_data.get_full_configuration(solver, config_id)
+        config = selector_scenario.get_full_configuration(solver, config_id)
         solver = Solver(Path(solver))
         print(
             f"\t- Calling {solver.name} ({config_id}) with time budget {cutoff_time} "
@@ -100,7 +67,7 @@ def main(argv: list[str]) -> None:
             seed=seed,
             cutoff_time=cutoff_time,
             configuration=config,
-            log_dir=args.log_dir,
+            log_dir=log_dir,
         )
         for key in solver_output:
             if key in selector_output and isinstance(solver_output[key], (int, float)):
@@ -130,6 +97,106 @@ def main(argv: list[str]) -> None:
         )
     else:
         print(f"Selector {selector_scenario.selector.name} did not solve {instance}.")
+    return selector_value
+
+
+def main(argv: list[str]) -> None:
+    """Main function of the Selector CLI."""
+    # Define command line arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--selector-scenario",
+        required=True,
+        type=Path,
+        help="path to portfolio selector scenario",
+    )
+    parser.add_argument(
+        "--instance",
+        required=True,
+        type=Path,
+        nargs="+",
+        help="path to instance(s) to run on",
+    )
+    parser.add_argument(
+        "--feature-data", required=True, type=Path, help="path to feature data"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        nargs="+",
+        required=False,
+        help="seed(s) to use for the solver, one for all instances or one per "
+        "instance. If not provided, read from the PerformanceDataFrame or generate "
+        "one.",
+    )
+    parser.add_argument(
+        "--log-dir", type=Path, required=False, help="path to the log directory"
+    )
+    args = parser.parse_args(argv)
+
+    # Process command line arguments
+    selector_scenario = SelectionScenario.from_file(args.selector_scenario)
+    feature_data = FeatureDataFrame(Path(args.feature_data))
+    instances, instance_names = [], []
+    for instance_path in args.instance:
+        instance_set = Instance_Set(instance_path)
+        instances.append(str(instance_set.instance_paths[0]))
+        instance_names.append(instance_set.instance_names[0])
+    seeds = args.seed
+    if seeds is None:
+        seeds = [None] * len(instances)
+    elif len(seeds) == 1:
+        seeds = seeds * len(instances)
+    elif len(seeds) != len(instances):
+        raise ValueError(
+            f"Expected one seed or one seed per instance, got {len(seeds)} seeds for "
+            f"{len(instances)} instances."
+        )
+    for index, (instance_name, seed) in enumerate(zip(instance_names, seeds)):
+        if seed is None:
+            # Try to read from PerformanceDataFrame
+            seed = selector_scenario.selector_performance_data.get_value(
+                selector_scenario.__selector_solver_name__,
+                instance_name,
+                solver_fields=[PerformanceDataFrame.column_seed],
+            )
+            if seed is None:  # Still no value
+                import random
+
+                seed = random.randint(0, 2**32 - 1)
+            seeds[index] = seed
+
+    # Run portfolio selector, predicting all instances at once
+    print(
+        f"Sparkle portfolio selector predicting for instance(s) "
+        f"{', '.join(instance_names)} ..."
+    )
+    feature_instance_names = [
+        resolve_feature_instance(instance, instance_name, feature_data)
+        for instance, instance_name in zip(instances, instance_names)
+    ]
+    predict_schedules = selector_scenario.selector.run_batch(
+        selector_scenario.selector_file_path, feature_data.loc[feature_instance_names]
+    )
+
+    if predict_schedules is None:  # Selector Failed to produce prediction
+        sys.exit(-1)
+    print("Predicting done!")
+
+    selector_values = [
+        run_schedule(
+            selector_scenario,
+            instance,
+            predict_schedules[feature_instance_name],
+            seed,
+            args.log_dir,
+        )
+        for instance, feature_instance_name, seed in zip(
+            instances, feature_instance_names, seeds
+        )
+    ]
+
+    performance_data = selector_scenario.selector_performance_data
     print(f"Writing results to {performance_data.csv_filepath} ...")
     try:
         # Creating a seperate locked file for writing
@@ -137,13 +204,14 @@ def main(argv: list[str]) -> None:
         with lock.acquire(timeout=60):
             # Reload the dataframe to latest version
             performance_data = PerformanceDataFrame(performance_data.csv_filepath)
-            performance_data.set_value(
-                selector_value,
-                selector_scenario.__selector_solver_name__,
-                instance_name,
-                objective=selector_scenario.objective.name,
-                append_write_csv=True,
-            )
+            for instance_name, selector_value in zip(instance_names, selector_values):
+                performance_data.set_value(
+                    selector_value,
+                    selector_scenario.__selector_solver_name__,
+                    instance_name,
+                    objective=selector_scenario.objective.name,
+                    append_write_csv=True,
+                )
         lock.release()
     except Timeout:
         print(f"ERROR: Cannot acquire File Lock on {performance_data}.")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Construct Sparkle portfolio selectors of one or more SelectionScenarios."""
+
+import argparse
+import sys
+from pathlib import Path
+
+from sparkle.selector import SelectionScenario
+
+
+def main(argv: list[str]) -> None:
+    """Main function of the Selector construction CLI."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--selector-scenario",
+        required=True,
+        type=Path,
+        nargs="+",
+        help="path(s) to the portfolio selector scenario(s) to construct",
+    )
+    args = parser.parse_args(argv)
+
+    # Scenarios sharing data files, e.g. ablated scenarios, read them only once
+    for scenario_file in args.selector_scenario:
+        scenario = SelectionScenario.from_file(scenario_file)
+        print(f"Constructing selector {scenario.name} ...")
+        scenario.selector.fit(scenario)
+        print(f"Selector written to {scenario.selector_file_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 import sys
+from collections.abc import Callable
 from typing import Any
 import shlex
 import ast
@@ -12,12 +13,11 @@ from pathlib import Path
 from ConfigSpace import ConfigurationSpace
 
 import runrunner as rrr
-from runrunner.local import LocalRun
 from runrunner.slurm import Run, SlurmRun
 from runrunner.base import Status, Runner
 
 from sparkle.tools.parameters import PCSConverter, PCSConvention
-from sparkle.tools import RunSolver
+from sparkle.tools import RunSolver, async_runner
 from sparkle.types import SparkleCallable, SolverStatus
 from sparkle.solver import verifiers
 from sparkle.instance import InstanceSet
@@ -299,42 +299,41 @@ class Solver(SparkleCallable):
                 cmds.append(" ".join(solver_cmd))
 
         commandname = f"Run Solver {self.name} on {set_label}"
-        run = rrr.add_to_queue(
-            runner=run_on,
-            cmd=cmds,
-            name=commandname,
-            base_dir=log_dir,
-            sbatch_options=sbatch_options,
-            prepend=slurm_prepend,
-        )
-
-        if isinstance(run, LocalRun):
-            run.wait()
-            if run.status == Status.ERROR:  # Subprocess resulted in error
-                print(f"WARNING: Solver {self.name} execution seems to have failed!\n")
-                for i, job in enumerate(run.jobs):
-                    print(
-                        f"[Job {i}] The used command was: {cmds[i]}\n"
-                        "The error yielded was:\n"
-                        f"\t-stdout: '{job.stdout}'\n"
-                        f"\t-stderr: '{job.stderr}'\n"
-                    )
-                return {
-                    "status": SolverStatus.ERROR,
-                }
+        if run_on != Runner.LOCAL:
+            return rrr.add_to_queue(
+                runner=run_on,
+                cmd=cmds,
+                name=commandname,
+                base_dir=log_dir,
+                sbatch_options=sbatch_options,
+                prepend=slurm_prepend,
+            )
 
-            solver_outputs = []
+        run = async_runner.run(cmds, name=commandname)
+        if run.status == Status.ERROR:  # Subprocess resulted in error
+            print(f"WARNING: Solver {self.name} execution seems to have failed!\n")
             for i, job in enumerate(run.jobs):
-                solver_cmd = cmds[i].split(" ")
-                solver_output = Solver.parse_solver_output(
-                    run.jobs[i].stdout,
-                    solver_call=solver_cmd,
-                    objectives=objectives,
-                    verifier=self.verifier,
+                print(
+                    f"[Job {i}] The used command was: {cmds[i]}\n"
+                    "The error yielded was:\n"
+                    f"\t-stdout: '{job.stdout}'\n"
+                    f"\t-stderr: '{job.stderr}'\n"
                 )
-                solver_outputs.append(solver_output)
-            return solver_outputs if len(solver_outputs) > 1 else solver_output
-        return run
+            return {
+                "status": SolverStatus.ERROR,
+            }
+
+        solver_outputs = []
+        for i, job in enumerate(run.jobs):
+            solver_cmd = cmds[i].split(" ")
+            solver_output = Solver.parse_solver_output(
+                run.jobs[i].stdout,
+                solver_call=solver_cmd,
+                objectives=objectives,
+                verifier=self.verifier,
+            )
+            solver_outputs.append(solver_output)
+        return solver_outputs if len(solver_outputs) > 1 else solver_output
 
     def run_performance_dataframe(
         self: Solver,
@@ -351,7 +350,9 @@ class Solver(SparkleCallable):
         log_dir: Path = None,
         base_dir: Path = None,
         job_name: str = None,
+        skip_existing: bool = False,
         run_on: Runner = Runner.SLURM,
+        callback: Callable[[async_runner.AsyncJob], None] = None,
     ) -> Run:
         """Run the solver from and place the results in the performance dataframe.
 
@@ -378,15 +379,63 @@ class Solver(SparkleCallable):
             base_dir: Path where to place output files.
             job_name: Name of the job
                 If None, will generate a name based on Solver and Instances
+            skip_existing: Whether each job should skip its run when the values are
+                already present in the performance dataframe at execution time.
             run_on: On which platform to run the jobs. Default: Slurm.
+            callback: Called with each local job once it has finished, while the
+                other jobs continue. Not used for Slurm.
+
+        Returns:
+            SlurmRun or Local run of the job. Local runs have finished once returned.
+        """
+        set_name = instances.name if isinstance(instances, InstanceSet) else "instances"
+        cmds = self.performance_dataframe_commands(
+            instances,
+            performance_dataframe,
+            config_ids=config_ids,
+            run_ids=run_ids,
+            cutoff_time=cutoff_time,
+            objective=objective,
+            train_set=train_set,
+            log_dir=log_dir,
+            skip_existing=skip_existing,
+        )
+        job_name = f"Run {self.name} on {set_name}" if job_name is None else job_name
+        if run_on == Runner.LOCAL:  # Local runs are finished once returned
+            return async_runner.run(
+                cmds, name=job_name, callback=callback, dependencies=dependencies
+            )
+        return rrr.add_to_queue(
+            runner=run_on,
+            cmd=cmds,
+            name=job_name,
+            base_dir=base_dir,
+            sbatch_options=sbatch_options,
+            prepend=slurm_prepend,
+            dependencies=dependencies,
+        )
+
+    def performance_dataframe_commands(
+        self: Solver,
+        instances: str | list[str] | InstanceSet,
+        performance_dataframe: PerformanceDataFrame,
+        config_ids: str | list[str] = None,
+        run_ids: list[int] | list[list[int]] = None,
+        cutoff_time: int = None,
+        objective: SparkleObjective = None,
+        train_set: InstanceSet = None,
+        log_dir: Path = None,
+        skip_existing: bool = False,
+    ) -> list[str]:
+        """Build the commands running the solver for the performance dataframe.
+
+        See `Solver.run_performance_dataframe` for the arguments.
 
         Returns:
-            SlurmRun or Local run of the job.
+            A command per combination of instance, configuration and run.
         """
         instances = [instances] if isinstance(instances, str) else instances
-        set_name = "instances"
         if isinstance(instances, InstanceSet):
-            set_name = instances.name
             instances = [str(i) for i in instances.instance_paths]
         if not isinstance(config_ids, list):
             config_ids = [config_ids]
@@ -419,55 +468,91 @@ class Solver(SparkleCallable):
                     performance_dataframe.run_ids,
                 )
             ]
-        objective_arg = f"--target-objective {objective.name}" if objective else ""
+        # We run all instances/configs/runs combinations
+        # For each value we try to resolve from the PDF, to avoid high read loads during executions
+        return [
+            self.performance_dataframe_command(
+                instance,
+                performance_dataframe,
+                run_id,
+                config_id=config_id,
+                configuration=config,
+                cutoff_time=cutoff_time,
+                objective=objective,
+                train_set=train_set,
+                log_dir=log_dir,
+                skip_existing=skip_existing,
+            )
+            for instance, config_id, config, run_id in combinations
+        ]
+
+    def performance_dataframe_command(
+        self: Solver,
+        instance: str,
+        performance_dataframe: PerformanceDataFrame,
+        run_id: int,
+        config_id: str = None,
+        configuration: dict = None,
+        cutoff_time: int = None,
+        objective: SparkleObjective = None,
+        train_set: InstanceSet = None,
+        log_dir: Path = None,
+        skip_existing: bool = False,
+        adaptive_capping: bool = False,
+    ) -> str:
+        """Build the command running the solver for the performance dataframe.
+
+        Args:
+            instance: The instance to run the solver on.
+            performance_dataframe: The performance dataframe to read and write.
+            run_id: The run index in the performance dataframe to write to.
+            config_id: The configuration id to use, read by the job if the
+                configuration is not given.
+            configuration: The configuration to use.
+            cutoff_time: The cutoff time for the solver, measured through RunSolver.
+            objective: The objective to use, when determining the best configuration
+                or the adaptive cap.
+            train_set: If given, the job determines the best configuration of the
+                solver on these instances and runs with it.
+            log_dir: Path where to place output files.
+            skip_existing: Whether the job should skip its run when the values are
+                already present in the performance dataframe at execution time.
+            adaptive_capping: Whether the job should cap its cutoff time at the best
+                known time on the instance.
+
+        Returns:
+            The command as a string.
+        """
+        if configuration:
+            config_arg = f"--configuration '{json.dumps(configuration)}' "
+        elif config_id:
+            config_arg = f"--configuration-id {config_id} "
+        else:
+            config_arg = ""
+        objective_arg = f"--target-objective {objective.name} " if objective else ""
         train_arg = (
             "--best-configuration-instances "
             + " ".join([str(i) for i in train_set.instance_paths])
+            + " "
             if train_set
             else ""
         )
-        configuration_args = [
-            ""
-            if not config_id and not config
-            else f"--configuration-id {config_id}"
-            if not config
-            else f"--configuration '{json.dumps(config)}'"
-            for _, config_id, config, _ in combinations
-        ]
-
-        # We run all instances/configs/runs combinations
-        # For each value we try to resolve from the PDF, to avoid high read loads during executions
-        cmds = [
+        return (
             f"python3 {Solver.solver_cli} "
             f"--solver {self.directory} "
             f"--instance {instance} "
-            f"{config_arg} "
-            # f"{'--configuration-id ' + config_id if not config else '--configuration"' + str(config) + '\"'} "
+            f"{config_arg}"
             f"--run-index {run_id} "
             f"--objectives {' '.join([obj.name for obj in performance_dataframe.objectives])} "
             f"--performance-dataframe {performance_dataframe.csv_filepath} "
             f"--cutoff-time {cutoff_time} "
             f"--log-dir {log_dir} "
             f"--seed {random.randint(0, 2**32 - 1)} "
-            f"{objective_arg} "
+            f"{objective_arg}"
             f"{train_arg}"
-            for (instance, _, _, run_id), config_arg in zip(
-                combinations, configuration_args
-            )
-        ]
-        job_name = f"Run {self.name} on {set_name}" if job_name is None else job_name
-        r = rrr.add_to_queue(
-            runner=run_on,
-            cmd=cmds,
-            name=job_name,
-            base_dir=base_dir,
-            sbatch_options=sbatch_options,
-            prepend=slurm_prepend,
-            dependencies=dependencies,
-        )
-        if run_on == Runner.LOCAL:
-            r.wait()
-        return r
+            f"{'--skip-existing ' if skip_existing else ''}"
+            f"{'--adaptive-capping' if adaptive_capping else ''}"
+        ).strip()
 
     @staticmethod
     def config_str_to_dict(config_str: str) -> dict[str, str]:
@@ -7,17 +7,82 @@ import ast
 from filelock import FileLock
 import argparse
 from pathlib import Path
+import math
 import random
 import time
 
 from runrunner import Runner
 
 from sparkle.solver import Solver
-from sparkle.types import resolve_objective
-from sparkle.structures import PerformanceDataFrame
+from sparkle.types import resolve_objective, SolverStatus, SparkleObjective
+from sparkle.structures import PerformanceDataFrame, ResultStore
 from sparkle.tools.solver_wrapper_parsing import parse_commandline_dict
 
 
+def read_performance_dataframe(
+    csv_filepath: Path, desynchronise: bool = True
+) -> PerformanceDataFrame:
+    """Read the PerformanceDataFrame, under its file lock if jobs append to the CSV.
+
+    Args:
+        csv_filepath: The path of the PerformanceDataFrame.
+        desynchronise: Whether to wait a random time before acquiring the lock, to
+            spread out jobs that start at the same time.
+
+    Returns:
+        The PerformanceDataFrame, including the results in its result store.
+    """
+    if PerformanceDataFrame.result_store(csv_filepath).exists:
+        return PerformanceDataFrame(csv_filepath)  # Jobs do not write to the CSV
+    if desynchronise:  # From other possible jobs writing to the same file
+        time.sleep(random.random() * 10)
+    lock = FileLock(f"{csv_filepath}.lock")  # Lock the file
+    with lock.acquire(timeout=600):
+        return PerformanceDataFrame(csv_filepath)
+
+
+def capping_bound(
+    performance_dataframe: PerformanceDataFrame,
+    instance: str,
+    objective: SparkleObjective,
+    cutoff_time: int,
+    exclude: tuple[str, str] = None,
+) -> int | None:
+    """Determine the adaptive cap of a run from the best known time on the instance.
+
+    Args:
+        performance_dataframe: The performance dataframe holding the known results.
+        instance: The name of the instance.
+        objective: The time based objective to determine the best known time with.
+        cutoff_time: The cutoff time of the run.
+        exclude: The (solver, configuration id) of the run, whose own previous
+            results do not bound it.
+
+    Returns:
+        The capped cutoff time, or None if no known time lies below the cutoff.
+    """
+    if not objective.time or not objective.minimise or cutoff_time is None:
+        return None
+    if instance not in performance_dataframe.instances:
+        return None
+    exclude_solvers = (
+        [exclude]
+        if exclude is not None and exclude in performance_dataframe.columns.droplevel(2)
+        else None
+    )
+    if exclude_solvers and len(performance_dataframe.columns.droplevel(2).unique()) < 2:
+        return None  # No other results to bound the run
+    best = performance_dataframe.best_instance_performance(
+        objective, instances=[instance], exclude_solvers=exclude_solvers
+    ).get(instance)
+    # Penalised values of unsuccessful runs lie at or above the cutoff
+    if best is None or math.isnan(best) or best >= cutoff_time:
+        return None
+    # RunSolver measures in whole seconds
+    bound = max(math.ceil(best), 1)
+    return bound if bound < cutoff_time else None
+
+
 def main(argv: list[str]) -> None:
     """Main function of the command."""
     # Define command line arguments
@@ -97,6 +162,22 @@ def main(argv: list[str]) -> None:
         " or the first one given by the dataframe to determine the best"
         "configuration.",
     )
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Skip the run if the PerformanceDataFrame already holds its values, "
+        "e.g. imported from the trials of a configurator, or if it is marked as "
+        "skipped, e.g. by racing validation.",
+    )
+    parser.add_argument(
+        "--adaptive-capping",
+        action="store_true",
+        help="Cap the cutoff time of the run at the best known time on the instance "
+        "of the target objective, or the first time based objective. Runs stopped at "
+        "the cap are recorded with the CAPPED status and penalised as a timeout. "
+        "The runs of an instance are chained in one job, so the run does not wait to "
+        "desynchronise its writes from other jobs.",
+    )
     args = parser.parse_args(argv)
     # Process command line arguments
     log_dir = args.log_dir
@@ -120,6 +201,7 @@ def main(argv: list[str]) -> None:
     # By default, run the default configuration
     config_id = PerformanceDataFrame.default_configuration
     configuration = None
+    performance_dataframe = None
     # If no seed is provided by CLI, generate one
     seed = args.seed if args.seed else random.randint(0, 2**32 - 1)
     # Parse the provided objectives if present
@@ -142,16 +224,14 @@ def main(argv: list[str]) -> None:
         or args.best_configuration_instances
         or not objectives
     ):  # Read from PerformanceDataFrame, can be slow
-        # Desyncronize from other possible jobs writing to the same file
         print(
             "Reading from Performance DataFrame.. "
             f"[{'configuration' if (args.configuration_id or args.best_configuration_instances) else ''} "
             f"{'objectives' if not objectives else ''}]"
         )
-        time.sleep(random.random() * 10)
-        lock = FileLock(f"{args.performance_dataframe}.lock")  # Lock the file
-        with lock.acquire(timeout=600):
-            performance_dataframe = PerformanceDataFrame(args.performance_dataframe)
+        performance_dataframe = read_performance_dataframe(
+            args.performance_dataframe, desynchronise=not args.adaptive_capping
+        )
 
         if not objectives:
             objectives = performance_dataframe.objectives
@@ -184,16 +264,83 @@ def main(argv: list[str]) -> None:
                 str(args.solver), config_id
             )
 
+        if args.skip_existing:
+            try:
+                existing = [
+                    performance_dataframe.get_value(
+                        str(args.solver), instance_name, config_id, o.name, run_index
+                    )
+                    for o in objectives
+                ]
+            except KeyError:  # Not (yet) in the PerformanceDataFrame
+                existing = [None]
+            skipped = performance_dataframe.get_skipped_cells()
+            if instance_name in skipped.get(str(args.solver), {}).get(config_id, []):
+                print(
+                    f"Skipping {solver}/{config_id} on instance {instance_name}: "
+                    "the run is intentionally skipped, e.g. eliminated by racing."
+                )
+                return
+            if all(str(value) not in ("nan", "None") for value in existing):
+                print(
+                    f"Skipping {solver}/{config_id} on instance {instance_name}, run "
+                    f"{run_index}: the PerformanceDataFrame already holds its values."
+                )
+                return
+
+    cutoff_time = args.cutoff_time
+    capped = False
+    if args.adaptive_capping:
+        if performance_dataframe is None:  # Read the best known times
+            performance_dataframe = read_performance_dataframe(
+                args.performance_dataframe, desynchronise=False
+            )
+        capping_objective = (
+            resolve_objective(args.target_objective)
+            if args.target_objective
+            else next((o for o in objectives if o.time), None)
+        )
+        bound = (
+            capping_bound(
+                performance_dataframe,
+                instance_name,
+                capping_objective,
+                cutoff_time,
+                exclude=(str(args.solver), config_id),
+            )
+            if capping_objective
+            else None
+        )
+        if bound is not None:
+            print(
+                f"Adaptive capping: capping the cutoff time at {bound} seconds, the "
+                f"best known {capping_objective.name} on instance {instance_name}."
+            )
+            cutoff_time, capped = bound, True
+
     print(f"Running Solver {solver} on instance {instance_name} with seed {seed}..")
     solver_output = solver.run(
         run_instances,
         objectives=objectives,
         seed=seed,
         configuration=configuration.copy() if configuration else None,
-        cutoff_time=args.cutoff_time,
+        cutoff_time=cutoff_time,
         log_dir=log_dir,
         run_on=Runner.LOCAL,
     )
+    status_key = next((o.name for o in objectives if o.stem == "status"), "status")
+    if capped and solver_output.get(status_key) == SolverStatus.TIMEOUT:
+        # The run is not a timeout, it is known to be slower than the cap
+        solver_output[status_key] = SolverStatus.CAPPED
+        for objective in objectives:
+            if objective.time:  # Penalised like a timeout at the full cutoff time
+                solver_output[objective.name] = (
+                    objective.post_process(
+                        args.cutoff_time, args.cutoff_time, SolverStatus.CAPPED
+                    )
+                    if objective.post_process is not None
+                    else args.cutoff_time
+                )
 
     # Prepare the results for the DataFrame for each objective
     result = [
@@ -213,8 +360,28 @@ def main(argv: list[str]) -> None:
             f"{objective.name}, {instance_name}, {args.run_index} | {args.solver}, {config_id}: {solver_output[objective.name]}"
         )
 
-    # Desyncronize from other possible jobs writing to the same file
-    time.sleep(random.random() * 100)
+    store = PerformanceDataFrame.result_store(args.performance_dataframe)
+    if store.exists:  # Single row upserts, without the file lock or reading the CSV
+        store.upsert(
+            [
+                (
+                    objective.name,
+                    instance_name,
+                    run_index,
+                    str(args.solver),
+                    config_id,
+                    ResultStore.convert(solver_output[objective.name]),
+                    seed,
+                )
+                for objective in objectives
+            ]
+        )
+        return
+
+    # Desyncronize from other possible jobs writing to the same file. The runs of an
+    # instance with adaptive capping are chained in one job and never write at once
+    if not args.adaptive_capping:
+        time.sleep(random.random() * 100)
 
     # Now that we have all the results, we can add them to the performance dataframe
     lock = FileLock(f"{args.performance_dataframe}.lock")  # Lock the file
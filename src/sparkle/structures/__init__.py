@@ -2,3 +2,5 @@
 
 from sparkle.structures.feature_dataframe import FeatureDataFrame
 from sparkle.structures.performance_dataframe import PerformanceDataFrame
+from sparkle.structures.feature_cache import FeatureCache
+from sparkle.structures.result_store import ResultStore
@@ -0,0 +1,206 @@
+"""Module to manage a persistent cache of feature extraction results."""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+
+class FeatureCache:
+    """Content addressed cache for feature extraction results.
+
+    Entries are keyed on the content hash of the extractor directory, the feature
+    group and the content hash of the instance file(s). Each entry is stored as a
+    single JSON file, the modification time of which is used for LRU eviction.
+    """
+
+    entry_suffix = ".json"
+    all_groups = "__all__"  # Key used when no feature group was requested
+    chunk_size = 2**20  # Bytes to read at once when hashing files
+
+    def __init__(
+        self: FeatureCache,
+        directory: Path,
+        max_size: int = None,
+        extractor_hashes: dict[Path, str] = None,
+    ) -> None:
+        """Initialise a FeatureCache.
+
+        Args:
+            directory: The directory in which the cache entries are stored.
+                Created when it does not exist.
+            max_size: The maximum size of the cache in megabytes. If None, the
+                cache is not bounded.
+            extractor_hashes: The known content hashes of extractor directories, as
+                determined by extractor_hash. Other extractors are hashed when used.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self._extractor_hashes: dict[Path, str] = dict(extractor_hashes or {})
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def hash_file(path: Path, digest: hashlib._Hash = None) -> str:
+        """Return the SHA256 hex digest of the contents of a file.
+
+        Args:
+            path: The file to hash.
+            digest: Optional digest to update instead of creating a new one.
+
+        Returns:
+            The hex digest of the (updated) digest.
+        """
+        digest = hashlib.sha256() if digest is None else digest
+        with path.open("rb") as fin:
+            while chunk := fin.read(FeatureCache.chunk_size):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_directory(directory: Path) -> str:
+        """Return the SHA256 hex digest of all files and their relative paths."""
+        digest = hashlib.sha256()
+        for path in sorted(p for p in directory.rglob("*") if p.is_file()):
+            digest.update(str(path.relative_to(directory)).encode())
+            FeatureCache.hash_file(path, digest)
+        return digest.hexdigest()
+
+    def extractor_hash(self: FeatureCache, extractor_dir: Path) -> str:
+        """Return the content hash of an extractor directory, hashing it only once.
+
+        Args:
+            extractor_dir: The directory of the extractor.
+
+        Returns:
+            The hex digest of the directory.
+        """
+        if extractor_dir not in self._extractor_hashes:
+            self._extractor_hashes[extractor_dir] = FeatureCache.hash_directory(
+                extractor_dir
+            )
+        return self._extractor_hashes[extractor_dir]
+
+    def key(
+        self: FeatureCache,
+        extractor_dir: Path,
+        feature_group: str | None,
+        instance: Path | list[Path],
+    ) -> str:
+        """Determine the cache key of an extractor, feature group and instance.
+
+        Args:
+            extractor_dir: The directory of the extractor.
+            feature_group: The feature group computed, None for all groups.
+            instance: The instance file, or list of files for multi file instances.
+
+        Returns:
+            The key as a hex digest string.
+        """
+        instance = instance if isinstance(instance, list) else [instance]
+        instance_digest = hashlib.sha256()
+        for file in instance:
+            FeatureCache.hash_file(Path(file), instance_digest)
+        feature_group = (
+            FeatureCache.all_groups if feature_group is None else feature_group
+        )
+        key = (
+            f"{self.extractor_hash(extractor_dir)}:{feature_group}:"
+            f"{instance_digest.hexdigest()}"
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _entry_path(self: FeatureCache, key: str) -> Path:
+        """Return the path of the cache entry for a key."""
+        return self.directory / f"{key}{FeatureCache.entry_suffix}"
+
+    def get(
+        self: FeatureCache,
+        extractor_dir: Path,
+        feature_group: str | None,
+        instance: Path | list[Path],
+    ) -> list[tuple[str, str, float]] | None:
+        """Retrieve the cached features, if present.
+
+        Args:
+            extractor_dir: The directory of the extractor.
+            feature_group: The feature group computed, None for all groups.
+            instance: The instance file, or list of files for multi file instances.
+
+        Returns:
+            A list of (feature_group, feature_name, value) tuples, or None when the
+            entry is not in the cache.
+        """
+        entry = self._entry_path(self.key(extractor_dir, feature_group, instance))
+        try:
+            features = json.loads(entry.read_text())
+            os.utime(entry)  # Mark as recently used
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return [tuple(feature) for feature in features]
+
+    def put(
+        self: FeatureCache,
+        extractor_dir: Path,
+        feature_group: str | None,
+        instance: Path | list[Path],
+        features: list[tuple[str, str, float]],
+    ) -> None:
+        """Store features in the cache and evict entries if it exceeds its size.
+
+        Args:
+            extractor_dir: The directory of the extractor.
+            feature_group: The feature group computed, None for all groups.
+            instance: The instance file, or list of files for multi file instances.
+            features: A list of (feature_group, feature_name, value) tuples.
+        """
+        entry = self._entry_path(self.key(extractor_dir, feature_group, instance))
+        # Write to a unique temporary file first so concurrent readers never
+        # observe a partially written entry
+        tmp_entry = entry.with_suffix(f".{os.getpid()}.tmp")
+        tmp_entry.write_text(json.dumps([list(feature) for feature in features]))
+        tmp_entry.replace(entry)
+        self.evict()
+
+    @property
+    def size(self: FeatureCache) -> int:
+        """Return the size of the cache in bytes."""
+        return sum(
+            entry.stat().st_size
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(FeatureCache.entry_suffix)
+        )
+
+    def evict(self: FeatureCache) -> int:
+        """Remove least recently used entries until the cache fits its maximum size.
+
+        Returns:
+            The number of removed entries.
+        """
+        if self.max_size is None:
+            return 0
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(FeatureCache.entry_suffix):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # Removed by a concurrent process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        total_size = sum(size for _, size, _ in entries)
+        max_bytes = self.max_size * 2**20
+        removed = 0
+        for _, size, path in sorted(entries):  # Oldest first
+            if total_size <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+            removed += 1
+        return removed
+
+    def clear(self: FeatureCache) -> None:
+        """Remove all entries from the cache."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 import math
+import os
+import warnings
 from pathlib import Path
 
 import pandas as pd
 
+from sparkle.structures.result_store import ResultStore
+
 
 class FeatureDataFrame(pd.DataFrame):
     """Class to manage feature data CSV files and common operations on them."""
@@ -16,6 +20,8 @@ class FeatureDataFrame(pd.DataFrame):
     feature_name_dim = "FeatureName"
     instances_index_dim = "Instances"
     multi_dim_column_names = [extractor_dim, feature_group_dim, feature_name_dim]
+    column_value = "Value"
+    _store_ids: list[int] = None  # The ids of the rows merged from the result store
 
     def __init__(
         self: FeatureDataFrame,
@@ -25,6 +31,9 @@ class FeatureDataFrame(pd.DataFrame):
     ) -> None:
         """Initialise a FeatureDataFrame object.
 
+        When a result store exists next to the CSV file, its features are merged
+        into the DataFrame, see `FeatureDataFrame.result_store`.
+
         Arguments:
             csv_filepath: The Path for the CSV storage. If it does not exist,
                 a new DataFrame will be initialised and stored here.
@@ -97,6 +106,99 @@ class FeatureDataFrame(pd.DataFrame):
         self.sort_index(axis=0, inplace=True)
         self.sort_index(axis=1, inplace=True)
 
+        self._store_ids = []
+        store = FeatureDataFrame.result_store(csv_filepath)
+        if store.exists:
+            features = store.read()
+            known = self._merge_features(features)
+            self._store_ids = features.index[known].to_list()
+            if not known.all():
+                warnings.warn(
+                    f"{(~known).sum()} features in {store.path} belong to instances "
+                    f"or features that are not in {csv_filepath}. They are kept in "
+                    "the store."
+                )
+
+    @staticmethod
+    def result_store(csv_filepath: Path) -> ResultStore:
+        """Return the SQLite result store belonging to a CSV file.
+
+        Extractor jobs write their features to the store, if it exists, as single
+        row upserts instead of appending them to the CSV file under a file lock.
+        The features are merged when the FeatureDataFrame is loaded, and removed
+        from the store when it is saved to the CSV file.
+
+        Args:
+            csv_filepath: The path of the CSV file.
+
+        Returns:
+            The store, with a row per (Instance, Extractor, FeatureGroup,
+            FeatureName) holding its Value.
+        """
+        return ResultStore(
+            ResultStore.path_of(csv_filepath),
+            keys=[FeatureDataFrame.instances_index_dim]
+            + FeatureDataFrame.multi_dim_column_names,
+            fields=[FeatureDataFrame.column_value],
+        )
+
+    def use_result_store(self: FeatureDataFrame, enable: bool = True) -> None:
+        """Create or remove the result store of the CSV file.
+
+        Args:
+            enable: If True, create the store. Otherwise, save the merged features
+                to the CSV file and remove the store.
+        """
+        store = FeatureDataFrame.result_store(self.csv_filepath)
+        if enable:
+            store.create()
+        elif store.exists:
+            self.save_csv()
+            store.remove()
+
+    def _merge_features(self: FeatureDataFrame, features: pd.DataFrame) -> pd.Series:
+        """Assign the features of a long format table from the result store.
+
+        Instances are stored by their path without suffix, and matched on their
+        name when the DataFrame holds it instead. Features of unknown instances
+        or columns are not assigned, and later rows take precedence.
+
+        Args:
+            features: The table of features.
+
+        Returns:
+            Per row of the table, whether it belongs to a known instance and column.
+        """
+        if features.empty:
+            return pd.Series(True, index=features.index, dtype=bool)
+        instances = features[FeatureDataFrame.instances_index_dim].astype(str)
+        names = instances.map(lambda instance: Path(instance).name)
+        features = features.assign(
+            **{
+                FeatureDataFrame.instances_index_dim: instances.where(
+                    instances.isin(self.index), names
+                )
+            }
+        )
+        known = features[FeatureDataFrame.instances_index_dim].isin(
+            self.index
+        ) & pd.MultiIndex.from_frame(features[self.multi_dim_column_names]).isin(
+            self.columns
+        )
+        keys = [FeatureDataFrame.instances_index_dim] + self.multi_dim_column_names
+        features = features[known].drop_duplicates(subset=keys, keep="last")
+        if features.empty:
+            return known
+        # Pivot to the layout of the FeatureDataFrame
+        wide = features.set_index(keys)[FeatureDataFrame.column_value].unstack(
+            self.multi_dim_column_names
+        )
+        current = self.loc[wide.index, wide.columns]
+        self.loc[wide.index, wide.columns] = current.mask(
+            wide.notna(), wide.astype(float)
+        )
+        return known
+
     def add_extractor(
         self: FeatureDataFrame,
         extractor: str,
@@ -219,16 +321,39 @@ class FeatureDataFrame(pd.DataFrame):
         # self.loc[(feature_group, feature_name, extractor), instance] = value
         self.loc[instance, (extractor, feature_group, feature_name)] = value
         if append_write_csv:
-            writeable = self.loc[[instance], :]  # Take line
-            # Append the new rows to the dataframe csv file
-            import os
+            self.append_csv(instance)
+
+    def append_csv(self: FeatureDataFrame, instances: str | list[str]) -> None:
+        """Append the rows of one or more instances to the CSV file.
+
+        The rows are written with a single write call. Duplicate instances in the
+        file are resolved when loading, keeping the last row. If the CSV file has a
+        result store, the features are written to the store instead.
 
-            csv_string = writeable.to_csv(header=False)  # Convert to the csv lines
-            for line in csv_string.splitlines():  # Should be only one line, but is safe now if we were to do multiple values
-                fd = os.open(f"{self.csv_filepath}", os.O_WRONLY | os.O_APPEND)
-                os.write(fd, f"{line}\n".encode("utf-8"))  # Encode to create buffer
-                # Open and close for each line to minimise possibilities of conflict
-                os.close(fd)
+        Args:
+            instances: The instance(s) of which the rows should be appended.
+        """
+        if isinstance(instances, str):
+            instances = [instances]
+        if not instances:
+            return
+        store = FeatureDataFrame.result_store(self.csv_filepath)
+        if store.exists:
+            rows = self.loc[instances, :]
+            store.upsert(
+                [
+                    (instance,) + column + (ResultStore.convert(value),)
+                    for instance, values in rows.iterrows()
+                    for column, value in values.items()
+                ]
+            )
+            return
+        csv_string = self.loc[instances, :].to_csv(header=False, lineterminator="\n")
+        fd = os.open(f"{self.csv_filepath}", os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, csv_string.encode("utf-8"))  # Encode to create buffer
+        finally:
+            os.close(fd)
 
     def has_missing_vectors(self: FeatureDataFrame) -> bool:
         """Returns True if there are any Extractors still to be run on any instance."""
@@ -336,3 +461,7 @@ class FeatureDataFrame(pd.DataFrame):
             raise ValueError("Cannot save DataFrame: no `csv_filepath` was provided.")
         self.sort_index(inplace=True)
         self.to_csv(csv_filepath)
+        if csv_filepath == self.csv_filepath and self._store_ids:
+            # The merged features are now part of the CSV file
+            FeatureDataFrame.result_store(csv_filepath).fold(self._store_ids)
+            self._store_ids = []
@@ -3,6 +3,9 @@
 from __future__ import annotations
 import ast
 import copy
+import json
+import os
+import warnings
 from typing import Any
 import itertools
 from pathlib import Path
@@ -11,6 +14,7 @@ import numpy as np
 import pandas as pd
 
 from sparkle.types import SparkleObjective, resolve_objective
+from sparkle.structures.result_store import ResultStore
 
 
 class PerformanceDataFrame(pd.DataFrame):
@@ -34,6 +38,7 @@ class PerformanceDataFrame(pd.DataFrame):
     multi_column_names = [column_solver, column_configuration, column_meta]
     multi_column_value = [column_value, column_seed]
     multi_column_dtypes = [str, int]
+    _store_ids: list[int] = None  # The ids of the rows merged from the result store
 
     def __init__(
         self: PerformanceDataFrame,
@@ -53,6 +58,9 @@ class PerformanceDataFrame(pd.DataFrame):
                 * Instance
                 * Runs (Static, given in constructor or read from file)
 
+        When a result store exists next to the CSV file, its results are merged
+        into the DataFrame, see `PerformanceDataFrame.result_store`.
+
         Args:
             csv_filepath: If path exists, load from Path.
                 Otherwise create new and save to this path.
@@ -168,8 +176,75 @@ class PerformanceDataFrame(pd.DataFrame):
         self.sort_index(axis=0, inplace=True)
         self.sort_index(axis=1, inplace=True)
 
+        self._store_ids = []
         if csv_filepath and not self.csv_filepath.exists():  # New Performance DataFrame
             self.save_csv()
+        elif csv_filepath:
+            store = PerformanceDataFrame.result_store(csv_filepath)
+            if store.exists:
+                results = store.read()
+                if not results.empty:
+                    self.set_values(results)
+                    solver_configurations = pd.MultiIndex.from_frame(
+                        results[
+                            [
+                                PerformanceDataFrame.column_solver,
+                                PerformanceDataFrame.column_configuration,
+                            ]
+                        ]
+                    )
+                    known = pd.MultiIndex.from_frame(
+                        results[PerformanceDataFrame.multi_index_names]
+                    ).isin(self.index) & solver_configurations.isin(
+                        self.columns.droplevel(PerformanceDataFrame.column_meta)
+                    )
+                    self._store_ids = results.index[known].to_list()
+                    if not known.all():
+                        warnings.warn(
+                            f"{(~known).sum()} results in {store.path} belong to "
+                            f"cells that are not in {csv_filepath}. They are kept in "
+                            "the store."
+                        )
+
+    @staticmethod
+    def result_store(csv_filepath: Path) -> ResultStore:
+        """Return the SQLite result store belonging to a CSV file.
+
+        Jobs write their results to the store, if it exists, as single row upserts
+        instead of appending them to the CSV file under a file lock. The results
+        are merged when the PerformanceDataFrame is loaded, and removed from the
+        store when it is saved to the CSV file.
+
+        Args:
+            csv_filepath: The path of the CSV file.
+
+        Returns:
+            The store, with a row per (Objective, Instance, Run, Solver,
+            Configuration) cell holding its Value and Seed.
+        """
+        return ResultStore(
+            ResultStore.path_of(csv_filepath),
+            keys=PerformanceDataFrame.multi_index_names
+            + [
+                PerformanceDataFrame.column_solver,
+                PerformanceDataFrame.column_configuration,
+            ],
+            fields=PerformanceDataFrame.multi_column_value,
+        )
+
+    def use_result_store(self: PerformanceDataFrame, enable: bool = True) -> None:
+        """Create or remove the result store of the CSV file.
+
+        Args:
+            enable: If True, create the store. Otherwise, save the merged results to
+                the CSV file and remove the store.
+        """
+        store = PerformanceDataFrame.result_store(self.csv_filepath)
+        if enable:
+            store.create()
+        elif store.exists:
+            self.save_csv()
+            store.remove()
 
     # Properties
 
@@ -286,6 +361,52 @@ class PerformanceDataFrame(pd.DataFrame):
             .any()
         )
 
+    @property
+    def skipped_cells_path(self: PerformanceDataFrame) -> Path | None:
+        """Return the path of the file recording the intentionally skipped cells."""
+        if self.csv_filepath is None:
+            return None
+        return self.csv_filepath.with_name(f"{self.csv_filepath.stem}_skipped.json")
+
+    def get_skipped_cells(self: PerformanceDataFrame) -> dict[str, dict[str, list[str]]]:
+        """Return the instances intentionally left empty per solver and configuration.
+
+        Cells are skipped on purpose by e.g. racing validation. They are not
+        considered to be missing values, and configurations with skipped instances
+        are not compared to fully evaluated configurations.
+
+        Returns:
+            Dictionary mapping solver and configuration id to the skipped instances.
+        """
+        path = self.skipped_cells_path
+        if path is None or not path.exists():
+            return {}
+        return json.loads(path.read_text())
+
+    def mark_skipped(
+        self: PerformanceDataFrame,
+        solver: str,
+        configuration: str,
+        instances: list[str],
+    ) -> None:
+        """Record that the cells of a configuration on instances are skipped on purpose.
+
+        Args:
+            solver: The solver of the configuration.
+            configuration: The configuration id.
+            instances: The instances that are skipped.
+        """
+        skipped = self.get_skipped_cells()
+        configuration_skipped = skipped.setdefault(solver, {}).setdefault(
+            configuration, []
+        )
+        configuration_skipped.extend(
+            instance for instance in instances if instance not in configuration_skipped
+        )
+        tmp_path = self.skipped_cells_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(skipped, indent=2))
+        tmp_path.replace(self.skipped_cells_path)
+
     def verify_objective(self: PerformanceDataFrame, objective: str) -> str:
         """Method to check whether the specified objective is valid.
 
@@ -658,9 +779,9 @@ class PerformanceDataFrame(pd.DataFrame):
             solver_fields: The level to which each value should be assinged.
                 Defaults to ["Value"].
             append_write_csv: For concurrent writing to the PerformanceDataFrame.
-                If True, the value is directly appended to the CSV file.
-                This will create duplicate entries in the file, but these are combined
-                when loading the file.
+                If True, the value is directly appended to the CSV file, or written
+                to its result store if it exists. This will create duplicate entries
+                in the file, but these are combined when loading the file.
         """
         # Convert indices to slices for None values
         solver = slice(solver) if solver is None else solver
@@ -675,7 +796,34 @@ class PerformanceDataFrame(pd.DataFrame):
         for item, level in zip(value, solver_fields):
             self.loc[(objective, instance, run), (solver, configuration, level)] = item
 
-        if append_write_csv:
+        store = (
+            PerformanceDataFrame.result_store(self.csv_filepath)
+            if append_write_csv and self.csv_filepath
+            else None
+        )
+        if store is not None and store.exists:
+            cells = self.loc[
+                (objective, instance, run), (solver, configuration, slice(None))
+            ]
+            if isinstance(cells, pd.Series):  # Single row, convert to pd.DataFrame
+                cells = self.loc[
+                    [(objective, instance, run)], (solver, configuration, slice(None))
+                ]
+            store.upsert(
+                [
+                    index
+                    + column
+                    + tuple(
+                        ResultStore.convert(cells.loc[index, column + (field,)])
+                        for field in PerformanceDataFrame.multi_column_value
+                    )
+                    for index in cells.index
+                    for column in cells.columns.droplevel(
+                        PerformanceDataFrame.column_meta
+                    ).unique()
+                ]
+            )
+        elif append_write_csv:
             writeable = self.loc[(objective, instance, run), :]
             if isinstance(writeable, pd.Series):  # Single row, convert to pd.DataFrame
                 writeable = self.loc[[(objective, instance, run)], :]
@@ -689,6 +837,67 @@ class PerformanceDataFrame(pd.DataFrame):
                 # Open and close for each line to minimise possibilities of conflict
                 os.close(fd)
 
+    def set_values(self: PerformanceDataFrame, values: pd.DataFrame) -> None:
+        """Assign many values at once from a long format table.
+
+        Each row of the table sets the solver fields present as its columns, i.e.
+        `Value` and/or `Seed`, of the cell identified by the index columns
+        `Objective`, `Instance`, `Run`, `Solver` and `Configuration`. When an index
+        column is absent, the row is set for all of its values. Later rows take
+        precedence over earlier rows for the same cell, missing values in the table
+        do not overwrite the PerformanceDataFrame and rows of unknown cells are
+        ignored.
+
+        Args:
+            values: The table of values to assign.
+        """
+        table = values
+        for level, options in [
+            (PerformanceDataFrame.index_objective, self.objective_names),
+            (PerformanceDataFrame.index_instance, self.instances),
+            (PerformanceDataFrame.index_run, self.run_ids),
+            (PerformanceDataFrame.column_solver, self.solvers),
+        ]:
+            if level not in table.columns:
+                table = table.merge(pd.DataFrame({level: options}), how="cross")
+        if PerformanceDataFrame.column_configuration not in table.columns:
+            solver_configurations = pd.DataFrame(
+                self.columns.droplevel(PerformanceDataFrame.column_meta)
+                .unique()
+                .to_list(),
+                columns=[
+                    PerformanceDataFrame.column_solver,
+                    PerformanceDataFrame.column_configuration,
+                ],
+            )
+            table = table.merge(
+                solver_configurations, on=PerformanceDataFrame.column_solver
+            )
+        cell = PerformanceDataFrame.multi_index_names + [
+            PerformanceDataFrame.column_solver,
+            PerformanceDataFrame.column_configuration,
+        ]
+        table = table.drop_duplicates(subset=cell, keep="last").set_index(cell)
+        for field in PerformanceDataFrame.multi_column_value:
+            if field not in table.columns:
+                continue
+            # Pivot to the layout of the PerformanceDataFrame
+            wide = table[field].unstack(
+                [
+                    PerformanceDataFrame.column_solver,
+                    PerformanceDataFrame.column_configuration,
+                ]
+            )
+            wide.columns = pd.MultiIndex.from_tuples(
+                [(solver, config, field) for solver, config in wide.columns],
+                names=PerformanceDataFrame.multi_column_names,
+            )
+            wide = wide.loc[wide.index.isin(self.index), wide.columns.isin(self.columns)]
+            if wide.empty:
+                continue
+            current = self.loc[wide.index, wide.columns]
+            self.loc[wide.index, wide.columns] = current.mask(wide.notna(), wide)
+
     def get_value(
         self: PerformanceDataFrame,
         solver: str | list[str] = None,
@@ -773,9 +982,12 @@ class PerformanceDataFrame(pd.DataFrame):
             ]
         else:
             result = []
+            skipped = self.get_skipped_cells()
             for (solver, config), (objective, instance, run) in itertools.product(
                 df.columns, df.index
             ):
+                if instance in skipped.get(solver, {}).get(config, []):
+                    continue  # Intentionally left empty
                 value = df.loc[(objective, instance, run), (solver, config)]
                 if value is None or (
                     isinstance(value, (int, float)) and math.isnan(value)
@@ -839,6 +1051,17 @@ class PerformanceDataFrame(pd.DataFrame):
         # Aggregate the instances
         sub_series = subdf.agg(func=objective.instance_aggregator.__name__)
         sub_series = sub_series.dropna()
+        skipped = self.get_skipped_cells().get(solver, {})
+        if skipped and len(sub_series) > 1:
+            # Configurations skipped on some of the instances, e.g. eliminated by a
+            # race, are only compared when no configuration has been fully evaluated
+            partial = [
+                config
+                for config in sub_series.index
+                if set(skipped.get(config, [])) & set(subdf.index)
+            ]
+            if len(partial) < len(sub_series):
+                sub_series = sub_series.drop(partial)
         if sub_series.empty:  # If all values are NaN, raise an error
             raise ValueError(
                 f"No valid performance measurements for solver '{solver}' (Configuration: '{configuration}') "
@@ -868,6 +1091,192 @@ class PerformanceDataFrame(pd.DataFrame):
         """
         return self.configuration_performance(solver, None, objective, instances)
 
+    def bootstrap(
+        self: PerformanceDataFrame,
+        solver: str,
+        objective: str | SparkleObjective = None,
+        instances: list[str] = None,
+        replicates: int = 1000,
+        confidence: float = 0.95,
+        seed: int = None,
+    ) -> pd.DataFrame:
+        """Bootstrap the performance of the configurations of a solver.
+
+        The instances are resampled with replacement, the same resample for all
+        configurations, and the runs and instances aggregated per replicate. The
+        replicates are drawn as a (replicates x instances) index matrix. For the mean
+        and sum, the resamples reduce to instance counts that are multiplied with the
+        (instances x configurations) performance matrix, otherwise the aggregator is
+        applied to blocks of replicates at once.
+
+        Args:
+            solver: The solver of the configurations
+            objective: The objective to bootstrap
+            instances: The instances to resample. Defaults to all instances.
+            replicates: The number of bootstrap replicates
+            confidence: The confidence level of the intervals
+            seed: The seed of the resampling
+
+        Returns:
+            Per configuration id the performance, the lower and upper bound of the
+            percentile confidence interval and the probability that it is the best
+            configuration, i.e. the fraction of replicates in which it was. Only the
+            configurations with a value on all instances are compared.
+        """
+        objective = self.verify_objective(objective)
+        if isinstance(objective, str):
+            objective = resolve_objective(objective)
+        subdf = self.xs(objective.name, level=0).xs(solver, axis=1, level=0)
+        subdf = subdf.xs(PerformanceDataFrame.column_value, axis=1, level=1)
+        if instances:
+            subdf = subdf.loc[instances, :]
+        subdf = subdf.astype(float).groupby(
+            level=PerformanceDataFrame.index_instance, sort=False
+        )
+        subdf = subdf.agg(objective.run_aggregator.__name__).dropna(axis=1)
+        if subdf.empty:
+            raise ValueError(
+                f"No configuration of solver '{solver}' has a value for objective "
+                f"'{objective.name}' on all instances."
+            )
+        performance = subdf.to_numpy()  # (instances x configurations)
+        num_instances = performance.shape[0]
+        rng = np.random.default_rng(seed)
+        samples = np.empty((replicates, performance.shape[1]))
+        # Bound the memory of the index matrix and its gathered values
+        block = max(1, 2**24 // (num_instances * max(1, performance.shape[1])))
+        aggregator = objective.instance_aggregator
+        for start in range(0, replicates, block):
+            stop = min(start + block, replicates)
+            indices = rng.integers(0, num_instances, size=(stop - start, num_instances))
+            if aggregator in (np.mean, np.sum):
+                offsets = np.arange(stop - start)[:, np.newaxis] * num_instances
+                counts = np.bincount(
+                    (indices + offsets).ravel(),
+                    minlength=(stop - start) * num_instances,
+                ).reshape(stop - start, num_instances)
+                samples[start:stop] = counts @ performance
+                if aggregator is np.mean:
+                    samples[start:stop] /= num_instances
+            else:
+                samples[start:stop] = aggregator(performance[indices], axis=1)
+        best = samples.argmin(axis=1) if objective.minimise else samples.argmax(axis=1)
+        alpha = (1 - confidence) / 2
+        lower, upper = np.quantile(samples, [alpha, 1 - alpha], axis=0)
+        return pd.DataFrame(
+            {
+                "performance": aggregator(performance, axis=0),
+                "lower": lower,
+                "upper": upper,
+                "probability_best": np.bincount(best, minlength=samples.shape[1])
+                / replicates,
+            },
+            index=pd.Index(
+                subdf.columns, name=PerformanceDataFrame.column_configuration
+            ),
+        )
+
+    def pareto_front(
+        self: PerformanceDataFrame,
+        objectives: list[str | SparkleObjective] = None,
+        instances: list[str] = None,
+    ) -> pd.DataFrame:
+        """Return the solver configurations that are not dominated on the objectives.
+
+        Each objective is aggregated per configuration over the runs and instances
+        with its own aggregators. A configuration is dominated if another one is at
+        least as good on all objectives, and better on at least one of them.
+
+        Args:
+            objectives: The objectives to compare on. Defaults to all objectives
+                that are not metrics.
+            instances: The instances which should be selected for the evaluation
+
+        Returns:
+            The aggregated performance of the non-dominated configurations, with a
+            column per objective and indexed by solver and configuration id, sorted
+            by the first objective. Configurations missing a value are left out.
+        """
+        if objectives is None:
+            objectives = [o for o in self.objectives if not o.metric]
+        objectives = [
+            resolve_objective(o) if isinstance(o, str) else o for o in objectives
+        ]
+        performance = {}
+        for objective in objectives:
+            values = self.xs(objective.name, level=0).xs(
+                PerformanceDataFrame.column_value, axis=1, level=2
+            )
+            if instances is not None:
+                values = values.loc[instances, :]
+            values = values.astype(float).groupby(
+                level=PerformanceDataFrame.index_instance, sort=False
+            )
+            values = values.agg(objective.run_aggregator.__name__)
+            performance[objective.name] = values.agg(
+                objective.instance_aggregator.__name__
+            )
+        performance = pd.DataFrame(performance).dropna()
+        performance.index.names = [
+            PerformanceDataFrame.column_solver,
+            PerformanceDataFrame.column_configuration,
+        ]
+        skipped = self.get_skipped_cells()
+        if skipped:
+            # Configurations skipped on some of the instances, e.g. eliminated by a
+            # race, are only compared when no configuration has been fully evaluated
+            selected = set(self.instances if instances is None else instances)
+            partial = [
+                (solver, config)
+                for solver, config in performance.index
+                if set(skipped.get(solver, {}).get(config, [])) & selected
+            ]
+            if len(partial) < len(performance):
+                performance = performance.drop(partial)
+        # Minimise all columns of the cost matrix
+        signs = np.array([1.0 if o.minimise else -1.0 for o in objectives])
+        costs = performance.to_numpy() * signs
+        front = performance[PerformanceDataFrame.non_dominated(costs)]
+        if objectives:
+            front = front.sort_values(
+                objectives[0].name, ascending=objectives[0].minimise
+            )
+        return front
+
+    @staticmethod
+    def non_dominated(costs: np.ndarray, block_size: int = 64) -> np.ndarray:
+        """Return which rows of a cost matrix are not dominated by another row.
+
+        All columns are minimised. A row is dominated if another row is at most as
+        large in all columns, and smaller in at least one of them. As a row can only
+        be dominated by rows with a smaller sum, the rows are visited in order of
+        their sum, a block at a time, removing all later rows the block dominates.
+
+        Args:
+            costs: The (rows x objectives) cost matrix, without missing values.
+            block_size: The number of rows compared against the later rows at once.
+
+        Returns:
+            A boolean array, True for the rows that are not dominated.
+        """
+        costs = np.asarray(costs, dtype=float)
+        candidates = np.argsort(costs.sum(axis=1), kind="stable")
+        index = 0
+        while index < len(candidates):
+            block = costs[candidates[index : index + block_size], np.newaxis, :]
+            later = costs[np.newaxis, candidates[index:], :]
+            # (block x later): whether a row of the block dominates a later row
+            dominates = (block <= later).all(axis=2) & (block < later).any(axis=2)
+            dominated = dominates.any(axis=0)
+            # Rows before the block are not dominated by it, nor are its first rows
+            candidates = np.concatenate(
+                (candidates[:index], candidates[index:][~dominated])
+            )
+            index += block.shape[0] - dominated[: block.shape[0]].sum()
+        mask = np.zeros(len(costs), dtype=bool)
+        mask[candidates] = True
+        return mask
+
     def best_instance_performance(
         self: PerformanceDataFrame,
         objective: str | SparkleObjective = None,
@@ -954,44 +1363,130 @@ class PerformanceDataFrame(pd.DataFrame):
             target_solver: If not None, store the found values in this solver of the DF.
             objective: The objective for which we calculate the best performance
 
+        Multiple runs of an instance are aggregated with the run aggregator of the
+        objective.
+
         Returns:
             The performance of the schedule over the instances in the dictionary.
         """
         objective = self.verify_objective(objective)
         if isinstance(objective, str):
             objective = resolve_objective(objective)
-        select = min if objective.minimise else max
-        performances = [0.0] * len(schedule.keys())
         if not isinstance(target_solver, tuple):
             target_conf = PerformanceDataFrame.default_configuration
         else:
             target_solver, target_conf = target_solver
         if target_solver and target_solver not in self.solvers:
             self.add_solver(target_solver)
-        for ix, instance in enumerate(schedule.keys()):
-            for iy, (solver, config, max_runtime) in enumerate(schedule[instance]):
-                performance = float(
-                    self.get_value(solver, instance, config, objective.name)
+        instances = list(schedule.keys())
+        num_steps = max((len(steps) for steps in schedule.values()), default=0)
+        performances = np.zeros(len(instances))
+        if instances and num_steps > 0:
+            # Gather the values of all steps at once from the objective matrix
+            values = self.xs(objective.name, level=0).xs(
+                PerformanceDataFrame.column_value, axis=1, level=2
+            )
+            values = values.astype(float).groupby(
+                level=PerformanceDataFrame.index_instance, sort=False
+            )
+            values = values.agg(objective.run_aggregator.__name__)
+            row_index = values.index.get_indexer(instances)
+            if (row_index < 0).any():
+                raise KeyError(
+                    f"Instances {np.asarray(instances)[row_index < 0].tolist()} are "
+                    "not in the PerformanceDataFrame."
                 )
-                if max_runtime is not None:  # We are dealing with runtime
-                    performances[ix] += performance
-                    if performance < max_runtime:
-                        break  # Solver finished in time
-                else:  # Quality, we take the best found performance
-                    if iy == 0:  # First solver, set initial value
-                        performances[ix] = performance
-                        continue
-                    performances[ix] = select(performances[ix], performance)
-            if target_solver is not None:
-                self.set_value(
-                    performances[ix],
-                    target_solver,
-                    instance,
-                    target_conf,
-                    objective.name,
+            steps = [
+                (ix, iy, solver, config, max_runtime)
+                for ix, instance in enumerate(instances)
+                for iy, (solver, config, max_runtime) in enumerate(schedule[instance])
+            ]
+            step_x, step_y, solvers, configs, max_runtimes = zip(*steps)
+            step_x, step_y = np.array(step_x), np.array(step_y)
+            column_index = values.columns.get_indexer(list(zip(solvers, configs)))
+            if (column_index < 0).any():
+                unknown = [
+                    (solver, config)
+                    for solver, config, index in zip(solvers, configs, column_index)
+                    if index < 0
+                ]
+                raise KeyError(
+                    f"Solver configurations {unknown} are not in the "
+                    "PerformanceDataFrame."
+                )
+            # Padded (instance x step) arrays, padding is ignored below
+            performance = np.full((len(instances), num_steps), np.nan)
+            performance[step_x, step_y] = values.to_numpy()[
+                row_index[step_x], column_index
+            ]
+            is_step = np.zeros((len(instances), num_steps), dtype=bool)
+            is_step[step_x, step_y] = True
+            runtime_step = np.zeros((len(instances), num_steps), dtype=bool)
+            max_runtime = np.full((len(instances), num_steps), np.inf)
+            timed = np.array([m is not None for m in max_runtimes])
+            runtime_step[step_x[timed], step_y[timed]] = True
+            max_runtime[step_x[timed], step_y[timed]] = np.array(
+                [m for m in max_runtimes if m is not None], dtype=float
+            )
+            runtime = (runtime_step == is_step).all(axis=1)
+            quality = (~runtime_step).all(axis=1)
+            # Runtime: add up the steps until a solver finishes within its maximum
+            finished = is_step & (performance < max_runtime)
+            last_step = np.where(
+                finished.any(axis=1), finished.argmax(axis=1), num_steps - 1
+            )
+            taken = is_step & (np.arange(num_steps) <= last_step[:, None])
+            runtime_performance = np.where(taken, performance, 0.0).sum(axis=1)
+            # Quality: the best value of all steps. Like min/max, missing values are
+            # ignored, unless the value of the first step is missing
+            reduce = np.fmin if objective.minimise else np.fmax
+            quality_performance = np.where(
+                np.isnan(performance[:, 0]),
+                np.nan,
+                reduce.reduce(performance, axis=1),
+            )
+            performances = np.where(runtime, runtime_performance, quality_performance)
+            for ix in np.flatnonzero(~runtime & ~quality):  # Mixed schedules
+                performances[ix] = self._schedule_step_performance(
+                    performance[ix][is_step[ix]],
+                    [max_runtimes[i] for i in np.flatnonzero(step_x == ix)],
+                    objective.minimise,
                 )
+        performances = performances.tolist()
+        if target_solver is not None and instances:
+            # Assign the performances to all runs of the instances
+            rows = self.index[
+                (self.index.get_level_values(0) == objective.name)
+                & self.index.get_level_values(1).isin(instances)
+            ]
+            self.loc[
+                rows, (target_solver, target_conf, PerformanceDataFrame.column_value)
+            ] = (
+                pd.Series(performances, index=instances)
+                .reindex(rows.get_level_values(1))
+                .to_numpy()
+            )
         return performances
 
+    @staticmethod
+    def _schedule_step_performance(
+        performances: list[float], max_runtimes: list[float], minimise: bool
+    ) -> float:
+        """Return the performance of the steps of a schedule on a single instance."""
+        select = min if minimise else max
+        result = 0.0
+        for iy, (performance, max_runtime) in enumerate(zip(performances, max_runtimes)):
+            if max_runtime is not None:  # We are dealing with runtime
+                result += performance
+                if performance < max_runtime:
+                    break  # Solver finished in time
+            else:  # Quality, we take the best found performance
+                if iy == 0:  # First solver, set initial value
+                    result = performance
+                    continue
+                result = select(result, performance)
+        return result
+
     def marginal_contribution(
         self: PerformanceDataFrame,
         objective: str | SparkleObjective = None,
@@ -1092,6 +1587,10 @@ class PerformanceDataFrame(pd.DataFrame):
                 for config_id in self.attrs[solver]:
                     configuration = self.attrs[solver][config_id]
                     fout.write(f"${solver},{config_id},{str(configuration)}\n")
+        if csv_filepath == self.csv_filepath and self._store_ids:
+            # The merged results are now part of the CSV file
+            PerformanceDataFrame.result_store(csv_filepath).fold(self._store_ids)
+            self._store_ids = []
 
     def clone(
         self: PerformanceDataFrame, csv_filepath: Path = None
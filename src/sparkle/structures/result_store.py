@@ -0,0 +1,155 @@
+"""Module to store the results of concurrent jobs in an SQLite database."""
+
+from __future__ import annotations
+import math
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+class ResultStore:
+    """Long format table of results in an SQLite database in WAL mode.
+
+    The store lives next to the CSV file of a PerformanceDataFrame or
+    FeatureDataFrame. Jobs write their results as single row upserts, which SQLite
+    serialises through its write ahead log, instead of taking a global file lock and
+    appending to the CSV. The DataFrame pivots the rows into its own layout when it
+    is loaded, and folds them, i.e. removes them from the store, once it saved them
+    to the CSV file. Rows of cells the DataFrame does not hold are kept.
+    """
+
+    suffix = ".db"
+    column_id = "id"  # Increases with every write, also for rewritten cells
+    timeout = 600  # Seconds to wait for the write lock of the database
+
+    def __init__(
+        self: ResultStore, path: Path, keys: list[str], fields: list[str]
+    ) -> None:
+        """Initialise a ResultStore.
+
+        Args:
+            path: The path of the SQLite database.
+            keys: The columns identifying a cell, e.g. objective, instance and run.
+            fields: The columns holding the results of a cell, e.g. value and seed.
+        """
+        self.path = path
+        self.keys = keys
+        self.fields = fields
+
+    @staticmethod
+    def path_of(csv_filepath: Path) -> Path:
+        """Return the path of the store belonging to a CSV file."""
+        return csv_filepath.with_suffix(ResultStore.suffix)
+
+    @property
+    def exists(self: ResultStore) -> bool:
+        """Whether the database exists."""
+        return self.path.exists()
+
+    @staticmethod
+    def convert(value: Any) -> float | int | str | None:
+        """Convert a value to a type that SQLite stores, missing values to None."""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        if isinstance(value, (bool, np.integer)):
+            return int(value)
+        if isinstance(value, (int, float)):
+            return value
+        return str(value)
+
+    def connect(self: ResultStore) -> sqlite3.Connection:
+        """Connect to the database, creating its table when it does not exist."""
+        connection = sqlite3.connect(self.path, timeout=ResultStore.timeout)
+        # Readers do not block the writer and vice versa, and single row writes
+        # only sync the log
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        # Columns without a type keep the type of each value, e.g. a float or status
+        columns = ", ".join(f'"{column}"' for column in self.keys + self.fields)
+        keys = ", ".join(f'"{key}"' for key in self.keys)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            f"{columns}, UNIQUE ({keys}) ON CONFLICT REPLACE)"
+        )
+        return connection
+
+    def create(self: ResultStore) -> None:
+        """Create the database, if it does not exist yet."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connect().close()
+
+    def upsert(self: ResultStore, rows: list[tuple]) -> None:
+        """Write rows, replacing the rows of the same cells.
+
+        Args:
+            rows: The rows to write, with the values of the keys followed by the
+                values of the fields.
+        """
+        columns = self.keys + self.fields
+        names = ", ".join(f'"{column}"' for column in columns)
+        placeholders = ", ".join("?" * len(columns))
+        connection = self.connect()
+        try:
+            with connection:  # One transaction
+                connection.executemany(
+                    f"INSERT INTO results ({names}) VALUES ({placeholders})",  # noqa: S608
+                    rows,
+                )
+        finally:
+            connection.close()
+
+    def read(self: ResultStore) -> pd.DataFrame:
+        """Read all rows of the store.
+
+        Returns:
+            The rows in order of writing, indexed by their id. The ids of the rows
+            that were saved elsewhere can be passed to `fold`.
+        """
+        if not self.exists:
+            return pd.DataFrame(
+                columns=self.keys + self.fields,
+                index=pd.Index([], name=ResultStore.column_id, dtype=int),
+            )
+        connection = self.connect()
+        try:
+            table = pd.read_sql_query(
+                "SELECT * FROM results ORDER BY id",
+                connection,
+                index_col=ResultStore.column_id,
+            )
+        finally:
+            connection.close()
+        return table
+
+    def fold(self: ResultStore, ids: list[int]) -> None:
+        """Remove rows by their id, e.g. after saving them.
+
+        Rows that were not read, or were rewritten after they were read, have
+        another id and are kept.
+
+        Args:
+            ids: The ids of the rows to remove.
+        """
+        if not len(ids) or not self.exists:
+            return
+        connection = self.connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "DELETE FROM results WHERE id = ?", [(int(i),) for i in ids]
+                )
+        finally:
+            connection.close()
+
+    def remove(self: ResultStore) -> None:
+        """Remove the database and its log files."""
+        for path in (
+            self.path,
+            self.path.with_name(f"{self.path.name}-wal"),
+            self.path.with_name(f"{self.path.name}-shm"),
+        ):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,332 @@
+"""Run commands locally and concurrently on an asyncio event loop.
+
+Each command runs as a subprocess of the event loop, which starts the next command
+as soon as one finishes, keeping as many commands running as there are cores. A
+callback is called for each finished job, e.g. to write its results or report the
+progress, while the other jobs continue.
+
+The runs mirror the interface of the local runs of RunRunner, i.e. the jobs, their
+status and output, but are finished when returned.
+"""
+
+from __future__ import annotations
+import asyncio
+import math
+import os
+import shlex
+import signal
+import subprocess
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any
+
+from runrunner.base import Status
+
+
+def cpu_count() -> int:
+    """Return the number of cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class AsyncJob:
+    """A single command executed as a subprocess of the event loop."""
+
+    def __init__(
+        self: AsyncJob,
+        cmd: str,
+        name: str = None,
+        path: Path = None,
+        stdout: Path | int | None = subprocess.PIPE,
+        stderr: Path | int | None = subprocess.PIPE,
+    ) -> None:
+        """Initialise the job, which is executed by `AsyncJob.run`.
+
+        Args:
+            cmd: The command to execute as a single string.
+            name: The name of the job. Defaults to the name of the executable.
+            path: The working directory of the command. Defaults to the current one.
+            stdout: Where to write the standard output. A path is overwritten, PIPE
+                captures it in `AsyncJob.stdout` and None passes it through.
+            stderr: Where to write the standard error, like stdout.
+        """
+        self.cmd = cmd
+        self.name = name or Path(shlex.split(cmd)[0]).name
+        self.path = path
+        self.status = Status.WAITING
+        self._stdout_target = stdout
+        self._stderr_target = stderr
+        self._stdout: str = None
+        self._stderr: str = None
+        self._process: asyncio.subprocess.Process = None
+        self._new_session = False
+
+    @staticmethod
+    def _read(target: Path | int | None, captured: str) -> str:
+        """Return the captured output, or the contents of the output file."""
+        if isinstance(target, Path):
+            return target.read_text() if target.exists() else ""
+        return captured or ""
+
+    @property
+    def stdout(self: AsyncJob) -> str:
+        """Return the standard output of the job."""
+        return AsyncJob._read(self._stdout_target, self._stdout)
+
+    @property
+    def stderr(self: AsyncJob) -> str:
+        """Return the standard error of the job."""
+        return AsyncJob._read(self._stderr_target, self._stderr)
+
+    @property
+    def pid(self: AsyncJob) -> int:
+        """Return the PID of the process of the job, None if not started."""
+        return None if self._process is None else self._process.pid
+
+    @property
+    def returncode(self: AsyncJob) -> int:
+        """Return the exit code of the job, None if it has not finished."""
+        return None if self._process is None else self._process.returncode
+
+    @property
+    def is_finished(self: AsyncJob) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self.status in (Status.COMPLETED, Status.ERROR, Status.KILLED)
+
+    async def run(self: AsyncJob, new_session: bool = False) -> AsyncJob:
+        """Execute the job, unless it was killed before it started.
+
+        Args:
+            new_session: Whether to start the command in a new session, such that
+                `AsyncJob.kill` also kills the processes it started.
+
+        Returns:
+            The job.
+        """
+        if self.status == Status.KILLED:
+            return self
+        self._new_session = new_session
+        files: list[IO] = []
+        targets = []
+        for target in (self._stdout_target, self._stderr_target):
+            if isinstance(target, Path):
+                files.append(target.open("w"))
+                target = files[-1]
+            targets.append(target)
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *shlex.split(self.cmd),
+                stdout=targets[0],
+                stderr=targets[1],
+                cwd=self.path,
+                start_new_session=new_session,
+            )
+        except OSError as error:  # E.g. the executable does not exist
+            self._stderr = f"ERROR starting job {self.name}: {error}"
+            self.status = Status.ERROR
+            return self
+        finally:
+            for file in files:  # The subprocess holds its own descriptors
+                file.close()
+        self.status = Status.RUNNING
+        try:
+            stdout, stderr = await self._process.communicate()
+        except asyncio.CancelledError:
+            self.kill()
+            raise
+        self._stdout = None if stdout is None else stdout.decode()
+        self._stderr = None if stderr is None else stderr.decode()
+        if self.status != Status.KILLED:
+            self.status = Status.COMPLETED if self.returncode == 0 else Status.ERROR
+        return self
+
+    def kill(self: AsyncJob) -> None:
+        """Kill the job, or prevent it from starting if it is still waiting."""
+        if self.is_finished:
+            return
+        if self._process is not None:
+            if self._process.returncode is not None:  # Exited, status is set by run
+                return
+            try:
+                if self._new_session:  # Including the processes it started
+                    os.killpg(self._process.pid, signal.SIGKILL)
+                else:
+                    self._process.kill()
+            except (ProcessLookupError, PermissionError):
+                pass
+        self.status = Status.KILLED
+
+    def __repr__(self: AsyncJob) -> str:
+        """Return a simple representation of the job."""
+        return f"JOB {self.name}"
+
+
+class AsyncRun:
+    """A set of jobs executed concurrently, limited to a number of parallel jobs."""
+
+    def __init__(
+        self: AsyncRun,
+        jobs: list[AsyncJob],
+        name: str = None,
+        parallel_jobs: int = None,
+        group_size: int = 1,
+        race: bool = False,
+        callback: Callable[[AsyncJob], None] = None,
+    ) -> None:
+        """Initialise the run, which is executed by `AsyncRun.execute`.
+
+        Args:
+            jobs: The jobs to execute, in order of starting them.
+            name: The name of the run.
+            parallel_jobs: The maximum number of groups running at the same time.
+                Defaults to the number of cores.
+            group_size: The number of consecutive jobs that form a group. The jobs of
+                a group start at the same time.
+            race: Whether the first job of a group to complete successfully kills the
+                other jobs of the group, including the processes they started.
+            callback: Called with each job when it has finished, including killed
+                jobs, while the other jobs continue.
+        """
+        self.jobs = jobs
+        self.name = name
+        self.parallel_jobs = max(1, parallel_jobs or cpu_count())
+        self.group_size = max(1, group_size)
+        self.race = race
+        self.callback = callback
+
+    @property
+    def groups(self: AsyncRun) -> list[list[AsyncJob]]:
+        """Return the jobs per group."""
+        return [
+            self.jobs[index : index + self.group_size]
+            for index in range(0, len(self.jobs), self.group_size)
+        ]
+
+    @property
+    def status(self: AsyncRun) -> Status:
+        """Return the status of the run, in the order of RunRunner's local runs."""
+        statuses = [job.status for job in self.jobs]
+        if Status.ERROR in statuses:
+            return Status.ERROR
+        if all(status == Status.WAITING for status in statuses):
+            return Status.WAITING
+        if Status.RUNNING in statuses:
+            return Status.RUNNING
+        if all(status == Status.COMPLETED for status in statuses):
+            return Status.COMPLETED
+        if Status.KILLED in statuses:
+            return Status.KILLED
+        return Status.NOTSET
+
+    async def _run_job(self: AsyncRun, job: AsyncJob, group: list[AsyncJob]) -> None:
+        """Run a job of a group and report it when it has finished."""
+        await job.run(new_session=self.race)
+        if self.race and job.status == Status.COMPLETED:
+            for other in group:
+                other.kill()
+        if self.callback is not None:
+            self.callback(job)
+
+    async def _run_group(
+        self: AsyncRun, group: list[AsyncJob], semaphore: asyncio.Semaphore
+    ) -> None:
+        """Run the jobs of a group once there is room for it."""
+        async with semaphore:
+            await asyncio.gather(*(self._run_job(job, group) for job in group))
+
+    async def execute(self: AsyncRun) -> AsyncRun:
+        """Run all jobs, starting a waiting group as soon as another has finished."""
+        semaphore = asyncio.Semaphore(self.parallel_jobs)
+        tasks = [
+            asyncio.ensure_future(self._run_group(group, semaphore))
+            for group in self.groups
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:  # E.g. a failing callback, do not leave processes behind
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self
+
+    def wait(self: AsyncRun) -> AsyncRun:
+        """Return the run, which has finished once it is returned by `run`."""
+        return self
+
+    def kill(self: AsyncRun) -> None:
+        """Kill all unfinished jobs of the run."""
+        for job in self.jobs:
+            job.kill()
+
+    def __len__(self: AsyncRun) -> int:
+        """Return the number of jobs."""
+        return len(self.jobs)
+
+
+def run(
+    cmds: str | list[str],
+    name: str = None,
+    path: Path = None,
+    parallel_jobs: int = None,
+    stdout: Path | list[Path] | int | None = subprocess.PIPE,
+    stderr: Path | list[Path] | int | None = subprocess.PIPE,
+    group_size: int = 1,
+    race: bool = False,
+    callback: Callable[[AsyncJob], None] = None,
+    dependencies: list[Any] = None,
+) -> AsyncRun:
+    """Run commands locally and concurrently, returning when all have finished.
+
+    Args:
+        cmds: The command(s) to run.
+        name: The name of the run. The jobs are named after it and their index.
+        path: The working directory of the commands. Defaults to the current one.
+        parallel_jobs: The maximum number of jobs, or groups, running at the same
+            time. Defaults to the number of cores.
+        stdout: Where to write the standard output of the jobs, either for all jobs
+            or a path per job. See `AsyncJob`.
+        stderr: Where to write the standard error of the jobs, like stdout.
+        group_size: The number of consecutive jobs that start at the same time.
+        race: Whether the first job of a group to complete kills the others.
+        callback: Called with each job when it has finished.
+        dependencies: Runs to wait for before starting, e.g. local runs of RunRunner
+            which execute in the background.
+
+    Returns:
+        The finished run.
+    """
+    for dependency in dependencies or []:
+        dependency.wait()
+    cmds = [cmds] if isinstance(cmds, str) else cmds
+    stdout = stdout if isinstance(stdout, list) else [stdout] * len(cmds)
+    stderr = stderr if isinstance(stderr, list) else [stderr] * len(cmds)
+    if not len(cmds) == len(stdout) == len(stderr):
+        raise ValueError("`cmds`, `stdout` and `stderr` must have the same length")
+    digits = math.ceil(math.log10(len(cmds) + 1))
+    jobs = [
+        AsyncJob(
+            cmd,
+            name=None if name is None else f"{name}_{index + 1:0{digits}}",
+            path=path,
+            stdout=out,
+            stderr=err,
+        )
+        for index, (cmd, out, err) in enumerate(zip(cmds, stdout, stderr))
+    ]
+    async_run = AsyncRun(
+        jobs,
+        name=name,
+        parallel_jobs=parallel_jobs,
+        group_size=group_size,
+        race=race,
+        callback=callback,
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:  # No event loop in this thread, the usual case
+        return asyncio.run(async_run.execute())
+    # Called from within an event loop, which can not be nested
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, async_run.execute()).result()
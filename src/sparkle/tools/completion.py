@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Event-driven notification of finished jobs.
+
+Jobs that run elsewhere, e.g. through Slurm, are wrapped by this module, which writes
+a sentinel file when the command has finished. The sentinel directory is watched
+with inotify where available, and scanned at a short interval otherwise, as
+inotify does not observe writes by other nodes on shared file systems.
+
+Executed as a script, this module runs a command and writes its sentinel:
+    python3 completion.py <sentinel_file> <command> [<args>]
+"""
+
+from __future__ import annotations
+import ctypes
+import ctypes.util
+import os
+import select
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# inotify event masks, see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+
+class SentinelWatcher:
+    """Watches a directory for the sentinel files of finished jobs."""
+
+    def __init__(
+        self: SentinelWatcher, directory: Path, scan_interval: float = 1.0
+    ) -> None:
+        """Initialise the watcher.
+
+        Args:
+            directory: The directory in which the sentinel files are written.
+            scan_interval: Maximum number of seconds between scans of the directory,
+                which catch sentinels that inotify does not report.
+        """
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.scan_interval = scan_interval
+        self.seen: set[str] = set()
+        self._fd = SentinelWatcher._inotify_fd(directory)
+
+    @staticmethod
+    def _inotify_fd(directory: Path) -> int | None:
+        """Create an inotify file descriptor watching the directory, if available."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, str(directory).encode(), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def scan(self: SentinelWatcher) -> set[str]:
+        """Return the names of the sentinels that were not seen before."""
+        with os.scandir(self.directory) as entries:
+            names = {
+                entry.name for entry in entries if not entry.name.startswith(".")
+            } - self.seen
+        self.seen |= names
+        return names
+
+    def wait(self: SentinelWatcher, timeout: float = None) -> set[str]:
+        """Wait for new sentinel files.
+
+        Args:
+            timeout: Maximum number of seconds to wait. If None, wait indefinitely.
+
+        Returns:
+            The names of the new sentinel files, empty if the timeout passed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not (new := self.scan()):
+            remaining = self.scan_interval
+            if deadline is not None:
+                remaining = min(remaining, deadline - time.monotonic())
+                if remaining <= 0:
+                    break
+            if self._fd is None:
+                time.sleep(remaining)
+                continue
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if ready:
+                try:  # Drain the events, the directory scan determines what is new
+                    while os.read(self._fd, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+        return new
+
+    def close(self: SentinelWatcher) -> None:
+        """Stop watching the directory."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self: SentinelWatcher) -> SentinelWatcher:
+        """Enter the context, returning the watcher."""
+        return self
+
+    def __exit__(self: SentinelWatcher, *args: object) -> None:
+        """Exit the context, closing the watcher."""
+        self.close()
+
+
+if __name__ == "__main__":
+    # Run the command, passing through its output, and announce its completion
+    sentinel = Path(sys.argv[1])
+    returncode = subprocess.run(sys.argv[2:]).returncode
+    tmp_path = sentinel.with_name(f".{sentinel.name}.tmp")
+    tmp_path.write_text(str(returncode))
+    tmp_path.replace(sentinel)  # Appears at once, fully written
+    sys.exit(returncode)
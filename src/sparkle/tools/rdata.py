@@ -0,0 +1,364 @@
+"""Pure Python reader for R data files, e.g. the results of IRACE.
+
+Supports the binary (XDR) serialisation format, versions 2 and 3, as written by
+`save()` and `saveRDS()`. Lists and atomic vectors are converted to Python
+objects, data frames to pandas DataFrames. Objects without a Python counterpart,
+such as environments and functions, are read but kept as `RObject`.
+"""
+
+from __future__ import annotations
+import bz2
+import gzip
+import lzma
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# SEXP types, see R's serialize.c
+NILSXP = 0
+SYMSXP = 1
+LISTSXP = 2
+CLOSXP = 3
+ENVSXP = 4
+PROMSXP = 5
+LANGSXP = 6
+SPECIALSXP = 7
+BUILTINSXP = 8
+CHARSXP = 9
+LGLSXP = 10
+INTSXP = 13
+REALSXP = 14
+CPLXSXP = 15
+STRSXP = 16
+DOTSXP = 17
+VECSXP = 19
+EXPRSXP = 20
+BCODESXP = 21
+EXTPTRSXP = 22
+WEAKREFSXP = 23
+RAWSXP = 24
+S4SXP = 25
+# Pseudo types
+ALTREP_SXP = 238
+ATTRLISTSXP = 239
+ATTRLANGSXP = 240
+BASEENV_SXP = 241
+EMPTYENV_SXP = 242
+BCREPREF = 243
+BCREPDEF = 244
+GENERICREFSXP = 245
+CLASSREFSXP = 246
+PERSISTSXP = 247
+PACKAGESXP = 248
+NAMESPACESXP = 249
+BASENAMESPACE_SXP = 250
+MISSINGARG_SXP = 251
+UNBOUNDVALUE_SXP = 252
+GLOBALENV_SXP = 253
+NILVALUE_SXP = 254
+REFSXP = 255
+
+NA_INTEGER = -(2**31)
+
+
+@dataclass
+class RObject:
+    """An R object without a direct Python counterpart."""
+
+    type: int
+    value: Any = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RSymbol:
+    """An R symbol (name)."""
+
+    name: str
+
+
+class RDataReader:
+    """Reads the objects of an R serialisation stream."""
+
+    def __init__(self: RDataReader, data: bytes) -> None:
+        """Initialise the reader on decompressed data, positioned after the magic."""
+        self.data = data
+        self.position = 0
+        self.references: list[Any] = []
+
+    def read_bytes(self: RDataReader, n: int) -> bytes:
+        """Read n raw bytes."""
+        if self.position + n > len(self.data):
+            raise ValueError("Unexpected end of R data stream.")
+        chunk = self.data[self.position : self.position + n]
+        self.position += n
+        return chunk
+
+    def read_int(self: RDataReader) -> int:
+        """Read a big endian 32 bit integer."""
+        return struct.unpack(">i", self.read_bytes(4))[0]
+
+    def read_length(self: RDataReader) -> int:
+        """Read the length of a vector, which may be a long length."""
+        length = self.read_int()
+        if length == -1:
+            upper, lower = self.read_int(), self.read_int()
+            length = (upper << 32) + (lower & 0xFFFFFFFF)
+        return length
+
+    def read_header(self: RDataReader) -> None:
+        """Read the header of the serialisation stream."""
+        if self.read_bytes(2) != b"X\n":
+            raise ValueError(
+                "Only the binary (XDR) R serialisation format is supported."
+            )
+        version = self.read_int()
+        self.read_int()  # R version of the writer
+        self.read_int()  # Minimal R version of the reader
+        if version == 3:
+            self.read_bytes(self.read_int())  # Native encoding
+        elif version != 2:
+            raise ValueError(f"Unsupported R serialisation version {version}.")
+
+    def read_string_vector(self: RDataReader) -> list[str]:
+        """Read a string vector as used by persistent and namespace references."""
+        if self.read_int() != 0:
+            raise ValueError("Names in persistent strings are not supported.")
+        return [self.read_item() for _ in range(self.read_int())]
+
+    def read_attributes(self: RDataReader, flags: int) -> dict[str, Any]:
+        """Read the attributes of an item, if it has any."""
+        if not flags & (1 << 9):
+            return {}
+        attributes = self.read_item()
+        return attributes if isinstance(attributes, dict) else {}
+
+    def read_pairlist(self: RDataReader, flags: int) -> Any:  # noqa: ANN401
+        """Read a pairlist, returned as a dictionary if all elements are tagged."""
+        tags, values = [], []
+        attributes = {}
+        sexptype = flags & 0xFF
+        while True:
+            if flags & (1 << 9):
+                attributes = self.read_item()
+            tag = self.read_item() if flags & (1 << 10) else None
+            tags.append(tag.name if isinstance(tag, RSymbol) else tag)
+            values.append(self.read_item())
+            # The tail of the list is stored as the next item, read it iteratively
+            flags = self.read_int()
+            if flags & 0xFF != sexptype:
+                self.position -= 4
+                tail = self.read_item()
+                if tail is not None:
+                    values.append(tail)
+                    tags.append(None)
+                break
+        if sexptype == LISTSXP and all(tag is not None for tag in tags):
+            return dict(zip(tags, values))
+        return RObject(sexptype, list(zip(tags, values)), attributes)
+
+    def read_bytecode_language(
+        self: RDataReader, sexptype: int, representations: list
+    ) -> Any:  # noqa: ANN401
+        """Read a language object stored in the constant pool of byte code."""
+        if sexptype == BCREPREF:
+            return representations[self.read_int()]
+        if sexptype not in (BCREPDEF, LANGSXP, LISTSXP, ATTRLANGSXP, ATTRLISTSXP):
+            return self.read_item()
+        index = -1
+        if sexptype == BCREPDEF:
+            index = self.read_int()
+            sexptype = self.read_int()
+        # Registered before its contents are read, as these may refer to it
+        language = RObject(LANGSXP)
+        if index >= 0:
+            representations[index] = language
+        if sexptype in (ATTRLANGSXP, ATTRLISTSXP):
+            self.read_item()  # Attributes
+        tag = self.read_item()
+        car = self.read_bytecode_language(self.read_int(), representations)
+        cdr = self.read_bytecode_language(self.read_int(), representations)
+        language.value = (tag, car, cdr)
+        return language
+
+    def read_bytecode(self: RDataReader, representations: list) -> RObject:
+        """Read a byte code object."""
+        code = self.read_item()
+        constants = []
+        for _ in range(self.read_int()):
+            sexptype = self.read_int()
+            if sexptype == BCODESXP:
+                constants.append(self.read_bytecode(representations))
+            elif sexptype in (
+                LANGSXP,
+                LISTSXP,
+                BCREPDEF,
+                BCREPREF,
+                ATTRLANGSXP,
+                ATTRLISTSXP,
+            ):
+                constants.append(self.read_bytecode_language(sexptype, representations))
+            else:
+                constants.append(self.read_item())
+        return RObject(BCODESXP, (code, constants))
+
+    def read_altrep(self: RDataReader) -> Any:  # noqa: ANN401
+        """Read an ALTREP object, expanded to its regular representation."""
+        info = self.read_item()
+        state = self.read_item()
+        attributes = self.read_item()
+        info = info.value if isinstance(info, RObject) else info
+        class_name = info[0][1].name
+        if class_name in ("compact_intseq", "compact_realseq"):
+            length, start, step = state
+            values = [start + i * step for i in range(int(length))]
+            if class_name == "compact_intseq":
+                values = [int(value) for value in values]
+        elif class_name.startswith("wrap_"):
+            values = state[0]
+        elif class_name == "deferred_string":
+            source = state.value[0][1] if isinstance(state, RObject) else state
+            values = [None if value is None else str(value) for value in source]
+        else:
+            raise ValueError(f"Unsupported ALTREP class {class_name}.")
+        return self.convert(values, attributes if isinstance(attributes, dict) else {})
+
+    def read_item(self: RDataReader) -> Any:  # noqa: ANN401
+        """Read the next object of the stream."""
+        flags = self.read_int()
+        sexptype = flags & 0xFF
+        if sexptype == NILVALUE_SXP:
+            return None
+        if sexptype in (
+            EMPTYENV_SXP,
+            BASEENV_SXP,
+            GLOBALENV_SXP,
+            UNBOUNDVALUE_SXP,
+            MISSINGARG_SXP,
+            BASENAMESPACE_SXP,
+        ):
+            return RObject(sexptype)
+        if sexptype == REFSXP:
+            index = flags >> 8
+            if index == 0:
+                index = self.read_int()
+            return self.references[index - 1]
+        if sexptype in (PERSISTSXP, PACKAGESXP, NAMESPACESXP):
+            item = RObject(sexptype, self.read_string_vector())
+            self.references.append(item)
+            return item
+        if sexptype == SYMSXP:
+            symbol = RSymbol(self.read_item())
+            self.references.append(symbol)
+            return symbol
+        if sexptype == ENVSXP:
+            environment = RObject(ENVSXP)
+            self.references.append(environment)
+            self.read_int()  # Locked
+            enclosure = self.read_item()
+            frame = self.read_item()
+            hashtab = self.read_item()
+            environment.attributes = self.read_item() or {}
+            environment.value = (enclosure, frame, hashtab)
+            return environment
+        if sexptype in (LISTSXP, LANGSXP, CLOSXP, PROMSXP, DOTSXP):
+            return self.read_pairlist(flags)
+        if sexptype == ALTREP_SXP:
+            return self.read_altrep()
+        if sexptype in (EXTPTRSXP, WEAKREFSXP):
+            item = RObject(sexptype)
+            self.references.append(item)
+            if sexptype == EXTPTRSXP:
+                item.value = (self.read_item(), self.read_item())
+            item.attributes = self.read_attributes(flags)
+            return item
+        if sexptype in (SPECIALSXP, BUILTINSXP):
+            return RObject(sexptype, self.read_bytes(self.read_int()).decode())
+        if sexptype == CHARSXP:
+            length = self.read_int()
+            if length == -1:
+                return None  # NA_character_
+            return self.read_bytes(length).decode("utf-8", errors="replace")
+        if sexptype in (LGLSXP, INTSXP):
+            length = self.read_length()
+            values = np.frombuffer(self.read_bytes(4 * length), dtype=">i4")
+            values = [None if v == NA_INTEGER else int(v) for v in values]
+            if sexptype == LGLSXP:
+                values = [None if v is None else bool(v) for v in values]
+        elif sexptype == REALSXP:
+            length = self.read_length()
+            values = np.frombuffer(self.read_bytes(8 * length), dtype=">f8").tolist()
+        elif sexptype == CPLXSXP:
+            length = self.read_length()
+            parts = np.frombuffer(self.read_bytes(16 * length), dtype=">f8")
+            values = [complex(r, i) for r, i in zip(parts[::2], parts[1::2])]
+        elif sexptype == RAWSXP:
+            values = self.read_bytes(self.read_length())
+        elif sexptype in (STRSXP, VECSXP, EXPRSXP):
+            values = [self.read_item() for _ in range(self.read_length())]
+        elif sexptype == BCODESXP:
+            representations = [None] * self.read_int()
+            values = self.read_bytecode(representations)
+        elif sexptype == S4SXP:
+            values = RObject(S4SXP)
+        else:
+            raise ValueError(f"Unsupported R object type {sexptype}.")
+        attributes = self.read_attributes(flags)
+        if sexptype in (BCODESXP, S4SXP):
+            values.attributes = attributes
+            return values
+        return self.convert(values, attributes, sexptype == VECSXP)
+
+    @staticmethod
+    def convert(values: list, attributes: dict[str, Any], is_list: bool = False) -> Any:  # noqa: ANN401
+        """Convert a vector with its attributes to a Python object."""
+        r_class = attributes.get("class") or []
+        if "data.frame" in r_class:
+            dataframe = pd.DataFrame(dict(zip(attributes.get("names", []), values)))
+            row_names = attributes.get("row.names")
+            # Compact row names c(NA, -n) are the default 1..n
+            if (
+                row_names
+                and len(row_names) == len(dataframe)
+                and not (len(row_names) == 2 and row_names[0] is None)
+            ):
+                dataframe.index = row_names
+            return dataframe
+        if "factor" in r_class:
+            levels = attributes.get("levels", [])
+            return [None if v is None else levels[v - 1] for v in values]
+        if is_list and attributes.get("names") is not None:
+            return dict(zip(attributes["names"], values))
+        return values
+
+
+def read_rdata(path: Path) -> dict[str, Any]:
+    """Read the objects saved in an R data file.
+
+    Args:
+        path: Path to the .Rdata/.rda file, created with `save()`, or an .rds file
+            created with `saveRDS()`. May be compressed with gzip, bzip2 or xz.
+
+    Returns:
+        A dictionary mapping the object names to their values. For an .rds file,
+        the single object is stored under None.
+    """
+    data = Path(path).read_bytes()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    elif data[:3] == b"BZh":
+        data = bz2.decompress(data)
+    elif data[:6] == b"\xfd7zXZ\x00":
+        data = lzma.decompress(data)
+    reader = RDataReader(data)
+    if data[:5] in (b"RDX2\n", b"RDX3\n"):
+        reader.position = 5
+        reader.read_header()
+        objects = reader.read_item()
+        return objects if isinstance(objects, dict) else {}
+    reader.read_header()
+    return {None: reader.read_item()}
@@ -78,6 +78,7 @@ class PAR(SparkleObjective):
         SolverStatus.KILLED,
         SolverStatus.ERROR,
         SolverStatus.TIMEOUT,
+        SolverStatus.CAPPED,
         SolverStatus.WRONG,
         SolverStatus.UNKNOWN,
     }
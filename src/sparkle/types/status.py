@@ -18,6 +18,7 @@ class SolverStatus(str, Enum):
     WRONG = "WRONG"
     ERROR = "ERROR"
     KILLED = "KILLED"
+    CAPPED = "CAPPED"  # Stopped at an adaptive cap below the cutoff time
 
     def __str__(self: SolverStatus) -> str:
         """Return the string value of the SolverStatus."""
@@ -0,0 +1,71 @@
+"""Test the global variables helper functions."""
+
+import shutil
+from pathlib import Path
+import pytest
+
+from sparkle.CLI.help import global_variables as gv
+from sparkle.platform.settings_objects import Settings
+from sparkle.structures import PerformanceDataFrame
+
+
+def test_scenario_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test registering and looking up scenarios through the scenario index."""
+    monkeypatch.chdir(tmp_path)  # Execute in PyTest tmp dir
+    monkeypatch.setattr(gv, "__scenario_index", None)
+    monkeypatch.setattr(gv, "__scenarios", {})
+    portfolio_dir = Settings.DEFAULT_parallel_portfolio_output
+
+    def portfolio(name: str, solver: str) -> PerformanceDataFrame:
+        """Create the results of a parallel portfolio."""
+        (portfolio_dir / name).mkdir(parents=True)
+        return PerformanceDataFrame(
+            portfolio_dir / name / "results.csv",
+            solvers=[solver],
+            objectives=["PAR10"],
+            instances=["Instance1"],
+        )
+
+    portfolio("A", "SolverA")
+    # Without an index, it is built from the scenario files
+    assert not Settings.DEFAULT_scenario_index.exists()
+    scenarios = gv.parallel_portfolio_scenarios()
+    assert [s.csv_filepath for s in scenarios] == [portfolio_dir / "A" / "results.csv"]
+    assert Settings.DEFAULT_scenario_index.exists()
+    assert gv.configuration_scenarios() == []
+    assert gv.selection_scenarios() == []
+
+    gv.register_scenario(portfolio("B", "SolverB"), instance_sets=["SetB"])
+    assert len(gv.parallel_portfolio_scenarios()) == 2
+    assert [s.solvers for s in gv.parallel_portfolio_scenarios(solvers=["SolverA"])] == [
+        ["SolverA"]
+    ]
+    assert [
+        s.solvers for s in gv.parallel_portfolio_scenarios(instance_sets=["SetB"])
+    ] == [["SolverB"]]
+
+    # Scenarios are not searched for, unless the index is rebuilt
+    portfolio("C", "SolverC")
+    shutil.rmtree(portfolio_dir / "A")
+    assert [s.solvers for s in gv.parallel_portfolio_scenarios()] == [["SolverB"]]
+    assert sorted(
+        s.solvers[0] for s in gv.parallel_portfolio_scenarios(refresh=True)
+    ) == ["SolverB", "SolverC"]
+    # The instance sets of registered portfolios are kept, unless rebuilt
+    assert (
+        gv.scenario_index()[str(portfolio_dir / "B" / "results.csv")]["instance_sets"]
+        == []
+    )
+
+    # Otherwise they are the directories of the instances of the portfolio
+    (portfolio_dir / "D").mkdir(parents=True)
+    PerformanceDataFrame(
+        portfolio_dir / "D" / "results.csv",
+        solvers=["SolverD"],
+        objectives=["PAR10"],
+        instances=["Instances/SetD/Instance1", "Instances/SetD/Instance2"],
+    )
+    assert [
+        s.solvers
+        for s in gv.parallel_portfolio_scenarios(instance_sets=["SetD"], refresh=True)
+    ] == [["SolverD"]]
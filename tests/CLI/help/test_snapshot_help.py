@@ -0,0 +1,69 @@
+"""Test the snapshot helper functions."""
+
+import os
+from pathlib import Path
+import pytest
+
+from sparkle.CLI.help import snapshot_help as snh
+from sparkle.platform import SnapshotStore
+
+
+def test_load_snapshot_selective(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test restoring only part of a snapshot."""
+    monkeypatch.chdir(tmp_path)
+    for directory in ["Instances", "Output/Performance_Data"]:
+        Path(directory).mkdir(parents=True)
+    Path("Instances/instance.cnf").write_text("snapshot")
+    Path("Output/Performance_Data/performance_data.csv").write_text("snapshot")
+    Path("Output/report.txt").write_text("snapshot")
+    manifest = SnapshotStore(Path("Snapshots")).save(
+        "test", [Path("Instances"), Path("Output")], Path()
+    )
+    Path("Instances/instance.cnf").write_text("current")
+    Path("Output/Performance_Data/performance_data.csv").write_text("current")
+    Path("Output/report.txt").write_text("current")
+
+    snh.load_snapshot(
+        manifest,
+        include=[Path("Output/Performance_Data/"), Path("Output/Performance_Data/x")],
+    )
+    assert Path("Output/Performance_Data/performance_data.csv").read_text() == "snapshot"
+    assert Path("Output/report.txt").read_text() == "current"
+    assert Path("Instances/instance.cnf").read_text() == "current"
+    assert not any(path.name.startswith(".snapshot") for path in Path().iterdir())
+    # Paths that are not in the snapshot leave the platform untouched
+    with pytest.raises(SystemExit):
+        snh.load_snapshot(manifest, include=[Path("Solvers")])
+    assert Path("Instances/instance.cnf").read_text() == "current"
+
+
+def test_swap_into_platform_rollback(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a failing swap restores the original platform."""
+    monkeypatch.chdir(tmp_path)
+    staging = Path("staging")
+    for directory in ["A", "B"]:
+        Path(directory).mkdir()
+        Path(directory, "file").write_text("current")
+        (staging / directory).mkdir(parents=True)
+        (staging / directory / "file").write_text("staged")
+    original_replace = os.replace
+
+    def failing_replace(src: Path, dst: Path) -> None:
+        """Fail when moving in the second staged directory."""
+        if Path(src) == staging / "B":
+            raise OSError("Simulated failure")
+        original_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        snh.swap_into_platform(staging, [Path("A"), Path("B")])
+    assert Path("A/file").read_text() == "current"
+    assert Path("B/file").read_text() == "current"
+    monkeypatch.setattr(os, "replace", original_replace)
+    snh.swap_into_platform(staging, [Path("A"), Path("B")])
+    assert Path("A/file").read_text() == "staged"
+    assert Path("B/file").read_text() == "staged"
@@ -20,3 +20,90 @@ def test_cleanup_command(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Non
     # TODO: Add --logs test to see if logs are deleted
     # TODO: Add --performance-data to test if files are correctly extracted and cleaned from the logs, as well as removing wrong rows
     # TODO: Add more tests for --all option and --remove command
+
+
+def test_check_logs_performance_data(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test harvesting missing performance values from the logs."""
+    from sparkle.structures import PerformanceDataFrame
+    from sparkle.platform.settings_objects import Settings
+
+    log_dir = tmp_path / "Log"
+    (log_dir / "Run").mkdir(parents=True)
+    monkeypatch.setattr(Settings, "DEFAULT_log_output", log_dir)
+    performance_data = PerformanceDataFrame(
+        tmp_path / "performance_data.csv",
+        solvers=["SolverA", "SolverB"],
+        objectives=["PAR10"],
+        instances=["InstanceA", "InstanceB"],
+    )
+    performance_data.set_value("5.0", "SolverB", "InstanceA", objective="PAR10", run=1)
+    (log_dir / "Run" / "solver_1.out").write_text(
+        "Some solver output\n"
+        "PAR10, InstanceA, 1 | SolverA, Default: 1.0\n"
+        "PAR10, InstanceA, 1 | SolverB, Default: 2.0\n"  # Already has a value
+        "PAR10, InstanceC, 1 | SolverA, Default: 3.0\n"  # Unknown instance
+    )
+    (log_dir / "Run" / "solver_2.out").write_text(
+        "PAR10, InstanceB, 1 | SolverB, Default: 4.0\n"
+        "PAR10, InstanceB, 1 | SolverA, Default: 6.0"  # Incomplete line
+    )
+    (log_dir / "Run" / "solver_2.err").write_text(
+        "PAR10, InstanceB, 1 | SolverA, Default: 7.0\n"  # Not a .out log
+    )
+    index_path = log_dir / "harvested_logs.json"
+    assert cleanup.check_logs_performance_data(performance_data, index_path) == 2
+    assert (
+        performance_data.get_value("SolverA", "InstanceA", objective="PAR10", run=1)
+        == "1.0"
+    )
+    assert (
+        performance_data.get_value("SolverB", "InstanceA", objective="PAR10", run=1)
+        == "5.0"
+    )
+    assert (
+        performance_data.get_value("SolverB", "InstanceB", objective="PAR10", run=1)
+        == "4.0"
+    )
+    assert (
+        PerformanceDataFrame(performance_data.csv_filepath).get_value(
+            "SolverB", "InstanceB", objective="PAR10", run=1
+        )
+        == 4.0
+    )
+    # Harvested lines are not read again, the completed line is
+    with (log_dir / "Run" / "solver_2.out").open("a") as fout:
+        fout.write("\n")
+    assert cleanup.check_logs_performance_data(performance_data, index_path) == 1
+    assert (
+        performance_data.get_value("SolverA", "InstanceB", objective="PAR10", run=1)
+        == "6.0"
+    )
+    assert cleanup.check_logs_performance_data(performance_data, index_path) == 0
+    # Lines of cells that were unknown are harvested once the cells are added
+    performance_data.add_instance("InstanceC")
+    assert cleanup.check_logs_performance_data(performance_data, index_path) == 1
+    assert (
+        performance_data.get_value("SolverA", "InstanceC", objective="PAR10", run=1)
+        == "3.0"
+    )
+    # The offsets are only updated once the values have been saved
+    with (log_dir / "Run" / "solver_2.out").open("a") as fout:
+        fout.write("PAR10, InstanceC, 1 | SolverB, Default: 8.0\n")
+
+    def fail_save(*_: object) -> None:
+        """Fail to save the performance data."""
+        raise OSError("Disk full")
+
+    with monkeypatch.context() as patch, pytest.raises(OSError):
+        patch.setattr(performance_data, "save_csv", fail_save)
+        cleanup.check_logs_performance_data(performance_data, index_path)
+    performance_data.set_value("nan", "SolverB", "InstanceC", objective="PAR10", run=1)
+    assert cleanup.check_logs_performance_data(performance_data, index_path) == 1
+    assert (
+        PerformanceDataFrame(performance_data.csv_filepath).get_value(
+            "SolverB", "InstanceC", objective="PAR10", run=1
+        )
+        == 8.0
+    )
@@ -1,6 +1,11 @@
 """Test the generate report CLI entry point."""
 
+import shutil
+import subprocess
+import sys
+from functools import partial
 from pathlib import Path
+import pandas as pd
 import pytest
 import pylatex as pl
 
@@ -177,6 +182,11 @@ def test_generate_configuration(tmp_path: Path, monkeypatch: pytest.MonkeyPatch)
             manual_best_key = "ManualBest"
             config_output.best_configuration_key = manual_best_key
             config_output.best_configuration = best_configuration
+        # To cover the Pareto front of multiple objectives
+        config_output.pareto_front_train = pd.DataFrame(
+            {"PAR10": [10.0, 20.0], "Accuracy:max": [0.5, 0.9]},
+            index=[config_output.best_configuration_key, "Other"],
+        )
         config_pairs.append((config_output, configuration_scenario))
 
     Path(report.default_filepath).parent.mkdir(parents=True, exist_ok=True)
@@ -192,6 +202,8 @@ def test_generate_configuration(tmp_path: Path, monkeypatch: pytest.MonkeyPatch)
     assert "Parameter importance via Ablation" in latex_output
     assert "Ablation table" in latex_output
     assert "Best found configuration values" in latex_output
+    assert "Pareto Front" in latex_output
+    assert "Uncertainty of the Configuration Performance" in latex_output
 
 
 @pytest.mark.parametrize(
@@ -286,6 +298,90 @@ def test_generate_appendix(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> N
     assert "Performance DataFrame" in latex_output
 
 
+def test_generate_sections(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test reusing cached report sections."""
+    import pandas as pd
+    from types import SimpleNamespace
+    from sparkle.platform import latex
+
+    monkeypatch.setattr(
+        generate_report.gv,
+        "settings",
+        lambda: SimpleNamespace(figure_backend="pgfplots"),
+    )
+    plot = latex.comparison_plot(pd.DataFrame({"A": [1.0, 2.0], "B": [2.0, 1.0]}))
+    report_dir = tmp_path / "report"
+    cache_dir = tmp_path / "cache"
+    calls = []
+
+    def section(
+        report: pl.Document, name: str, figures: list[tuple[str, Path]] = None
+    ) -> None:
+        """Generate a section with a figure."""
+        calls.append(name)
+        plot_dir = Path(report.default_filepath).parent / f"{name}_plots"
+        plot_dir.mkdir()
+        plot_path = generate_report.write_figure(plot, plot_dir / "figure.pdf", figures)
+        report.append(pl.Section(f"Section {name}"))
+        with report.create(pl.Figure()) as figure:
+            latex.add_plot(figure, plot_path.relative_to(plot_dir.parent), "5cm")
+
+    def generate(names: list[str]) -> pl.Document:
+        """Generate a report of the sections."""
+        shutil.rmtree(report_dir, ignore_errors=True)
+        report_dir.mkdir()
+        report = pl.Document(default_filepath=str(report_dir / "report"))
+        sections = [
+            (generate_report.section_key(name), partial(section, name=name))
+            for name in names
+        ]
+        generate_report.generate_sections(report, sections, cache_dir)
+        return report
+
+    report = generate(["A", "B"])
+    assert calls == ["A", "B"]
+    assert (report_dir / "A_plots" / "figure.tex").exists()
+    assert (report_dir / "B_plots" / "figure.tex").exists()
+    latex_output = report.dumps()
+    assert latex_output.index("Section A") < latex_output.index("Section B")
+    assert "\\usepackage{pgfplots}" in latex_output
+    assert "\\input{B_plots/figure.tex}" in latex_output
+    # Unchanged sections are reused, including their figures
+    report = generate(["B", "C"])
+    assert calls == ["A", "B", "C"]
+    assert (report_dir / "B_plots" / "figure.tex").exists()
+    assert "Section B" in report.dumps()
+    # Sections no longer in the report are removed from the cache
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def selection_key() -> str:
+    """Determine the section key of the test selection scenario."""
+    selection_scenario = SelectionScenario.from_file(
+        Path("tests/test_files/Selector/scenario/scenario_with_test.txt")
+    )
+    return generate_report.selection_section_key(
+        SelectionOutput(selection_scenario), selection_scenario
+    )
+
+
+def test_selection_section_key() -> None:
+    """Test the key of a selection section does not depend on the process."""
+    key = selection_key()
+    other_process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from tests.CLI.test_generate_report import selection_key\n"
+            "print(selection_key())",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert other_process.stdout.splitlines()[-1] == key
+
+
 def test_main(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Test main of generate report."""
     if tools.get_cluster_name() != "kathleen":
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 from pathlib import Path
+import time
 from unittest.mock import patch, MagicMock
 import pytest
 import argparse
@@ -177,3 +178,27 @@ def test_parser_function() -> None:
     returned_parser = rpp.parser_function()
     assert returned_parser.description == expected_description
     assert isinstance(returned_parser, argparse.ArgumentParser)
+
+
+def test_run_jobs_locally(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the remaining jobs on an instance are killed once one completes."""
+    seeds = 2
+    settings = SimpleNamespace(parallel_portfolio_num_seeds_per_solver=seeds)
+    monkeypatch.setattr(rpp.gv, "settings", lambda: settings)
+    # Per instance, only the first seed of the second solver finishes quickly
+    cmd_list = []
+    for _ in instance_file._instance_paths:
+        for solver_index in range(len(solvers)):
+            for seed in range(seeds):
+                quick = solver_index == 1 and seed == 0
+                cmd_list.append("echo done" if quick else "sleep 60")
+    defaults = {"status": SolverStatus.UNKNOWN}
+    start = time.time()
+    job_output_dict, outputs = rpp.run_jobs_locally(
+        cmd_list, instance_file, solvers, defaults, tmp_path
+    )
+    assert time.time() - start < 30
+    assert outputs.count("done\n") == len(instance_file._instance_paths)
+    for instance_output in job_output_dict.values():
+        assert instance_output[solvers[0].name]["status"] == SolverStatus.KILLED
+        assert instance_output[solvers[1].name]["status"] == SolverStatus.UNKNOWN
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import shutil
+import tempfile
 from unittest.mock import Mock, ANY
 from unittest import TestCase
 from unittest.mock import patch
@@ -114,6 +115,52 @@ class TestConfiguratorSMAC2(TestCase):
             "configuration_id": 1,
         }
 
+    def test_smac2_get_incumbent_trials(self: TestConfiguratorSMAC2) -> None:
+        """Testing reading the runs of the final incumbent from the state files."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_dir = Path(tmp_dir) / "scenario"
+            state_dir = run_dir / "state-run7"
+            state_dir.mkdir(parents=True)
+            (state_dir / "instances.txt").write_text("a.cnf\nb.cnf\nc.cnf\n")
+            header = (
+                '"Run Number","Run History Configuration ID","Instance ID",'
+                '"Response Value (y)","Censored?","Cutoff Time Used","Seed",'
+                '"Runtime","Run Length","Run Result Code","Run Quality",'
+                '"SMAC Iteration","SMAC Cumulative Runtime","Run Result",'
+                '"Additional Algorithm Run Data","Wall Clock Time",\n'
+            )
+            (state_dir / "runs_and_results-it2.csv").write_text(header)
+            (state_dir / "runs_and_results-it10.csv").write_text(
+                header
+                + "1,1,1,3.0,0,60.0,11,3.0,0,1,0,1,3.0,SAT,,3.5,\n"
+                + "2,2,1,5.0,0,60.0,12,5.0,0,1,0,2,8.0,SAT,,5.5,\n"
+                + "3,2,2,10.0,1,10.0,13,10.0,0,2,0,2,18.0,TIMEOUT,,10.5,\n"
+                + "4,2,3,1.0,0,60.0,14,1.0,0,-1,0,3,19.0,CRASHED,,1.5,\n"
+            )
+            log_lines = [
+                f"[INFO ] Logging to: {run_dir / 'log-run7.txt'}",
+                "SMAC's final incumbent: config 2 (internal ID: 0x3E63), with ...",
+            ]
+            trials, source = SMAC2.get_incumbent_trials(log_lines, self.conf_scenario)
+        assert source == state_dir / "runs_and_results-it10.csv"
+        assert trials == [
+            {
+                "instance": "a.cnf",
+                "seed": 12,
+                "cutoff_time": 60.0,
+                "timeout": False,
+                "value": 5.0,
+            },
+            {
+                "instance": "b.cnf",
+                "seed": 13,
+                "cutoff_time": 10.0,
+                "timeout": True,
+                "value": 600,  # Penalised by the objective
+            },
+        ]
+        assert SMAC2.get_incumbent_trials([], self.conf_scenario) == ([], None)
+
     def test_smac2_get_status_from_logs(self: TestConfiguratorSMAC2) -> None:
         """Testing status retrievel from logs."""
         # TODO: Write test
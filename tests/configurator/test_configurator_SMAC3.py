@@ -1,13 +1,20 @@
 """Test methods of SMAC3 configurator."""
 
+import json
+import os
 from pathlib import Path
 import pytest
 from unittest.mock import patch
 
+from ConfigSpace import Configuration
+from smac.runhistory.dataclasses import TrialInfo
+from smac.runner.abstract_runner import StatusType
+
 from sparkle.solver import Solver
 from sparkle.instance import Instance_Set
 from sparkle.structures import PerformanceDataFrame
-from sparkle.types import resolve_objective
+from sparkle.types import SolverStatus, resolve_objective
+from sparkle.configurator import implementations
 from sparkle.configurator.implementations import SMAC3, SMAC3Scenario
 
 
@@ -108,9 +115,14 @@ def test_smac3_configure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Non
     scenario.create_scenario()
     smac_configurator = SMAC3()
     scenario.solver = solver_relative_path
-    with patch("runrunner.add_to_queue", new=lambda *args, **kwargs: None):
+    with patch("runrunner.add_to_queue", return_value=None) as add_to_queue:
         runs = smac_configurator.configure(scenario, data_target)
     assert runs == [None, None]
+    # Each configuration job requests a core for every worker of its run
+    assert "--cpus-per-task=2" in add_to_queue.call_args_list[0].kwargs["sbatch_options"]
+    assert "--cpus-per-task=2" not in add_to_queue.call_args_list[1].kwargs.get(
+        "sbatch_options", []
+    )
 
 
 def test_organise_output(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -142,3 +154,207 @@ def test_organise_output(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Non
         "sel_var_div": "3",
     }
     assert configuration == expected
+
+
+def test_organise_output_import_trials(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test importing the trials of the best configuration for validation."""
+    file = Path(
+        "tests/test_files/Configuration/results/"
+        "runhistory_PbO-CCSAT-Generic_PTN_SMAC3.json"
+    ).absolute()
+    solver = Solver(Path("tests/test_files/Solvers/Test-Solver").absolute())
+    instance_set = Instance_Set(
+        Path("tests/test_files/Instances/Train-Instance-Set").absolute()
+    )
+    scenario = SMAC3Scenario(
+        solver,
+        instance_set,
+        [resolve_objective("PAR10")],
+        1,
+        Path(),
+        solver_cutoff_time=60,
+        solver_calls=5,
+        timestamp="20260101-0000",
+    )
+    monkeypatch.chdir(tmp_path)  # Execute in PyTest tmp dir
+    solver_key = str(solver.directory)
+    instances = ["Ptn-7824-b11", "Ptn-7824-b17", "Ptn-7824-b03", "Ptn-7824-b01"]
+    performance_data = PerformanceDataFrame(
+        Path("performance_data.csv"),
+        solvers=[solver_key],
+        objectives=["PAR10"],
+        instances=instances,
+        n_runs=2,
+    )
+    performance_data.add_configuration(solver_key, "SMAC3_0", {})
+    performance_data.set_value(5.0, solver_key, "Ptn-7824-b03", "SMAC3_0", "PAR10", 1)
+    performance_data.save_csv()
+
+    SMAC3.organise_output(file, performance_data.csv_filepath, scenario, "SMAC3_0")
+    performance_data = PerformanceDataFrame(performance_data.csv_filepath)
+    for instance, run, value in [
+        ("Ptn-7824-b11", 1, 600.0),
+        ("Ptn-7824-b17", 1, 600.0),
+        ("Ptn-7824-b03", 1, 5.0),  # Existing values are kept
+        ("Ptn-7824-b03", 2, 600.0),
+    ]:
+        assert (
+            float(
+                performance_data.get_value(solver_key, instance, "SMAC3_0", "PAR10", run)
+            )
+            == value
+        )
+    assert (
+        performance_data.get_value(
+            solver_key, "Ptn-7824-b11", "SMAC3_0", "PAR10", 1, solver_fields=["Seed"]
+        )
+        == 1948619912
+    )
+    assert performance_data.is_missing(solver_key, "Ptn-7824-b01")
+    provenance = json.loads((scenario.validation / "SMAC3_0_imported.json").read_text())
+    assert provenance["source"] == str(file)
+    assert len(provenance["trials"]) == 3
+
+
+def test_organise_output_trial_cutoff_and_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test importing trials with their own cutoff time, budget and costs."""
+    solver = Solver(Path("tests/test_files/Solvers/Test-Solver").absolute())
+    instance_set = Instance_Set(
+        Path("tests/test_files/Instances/Train-Instance-Set").absolute()
+    )
+    scenario = SMAC3Scenario(
+        solver,
+        instance_set,
+        [resolve_objective("PAR10")],
+        1,
+        Path(),
+        solver_cutoff_time=60,
+        solver_calls=5,
+        max_budget=60,
+        timestamp="20260101-0000",
+    )
+    monkeypatch.chdir(tmp_path)  # Execute in PyTest tmp dir
+
+    def entry(config: int, instance: str, seed: int, cost: list, **kwargs: dict) -> dict:
+        """Create a run history entry."""
+        return {
+            "config_id": config,
+            "instance": f"Instances/PTN/{instance}.cnf",
+            "seed": seed,
+            "budget": None,
+            "cost": cost,
+            "status": 1,  # Success
+            "additional_info": {"cutoff_time": 60},
+            **kwargs,
+        }
+
+    runhistory = {
+        "configs": {"1": {"param": "a"}, "2": {"param": "b"}},
+        "data": [
+            entry(1, "Ptn-7824-b11", 1, [5.0, 0.9]),
+            # A timeout at a lower cutoff time than the scenario is not imported
+            entry(
+                1,
+                "Ptn-7824-b17",
+                2,
+                [600.0, 0.1],
+                status=3,
+                additional_info={"cutoff_time": 10},
+            ),
+            # Nor is a trial with less than the maximum budget
+            entry(1, "Ptn-7824-b03", 3, [7.0, 0.5], budget=10),
+            entry(2, "Ptn-7824-b11", 4, [700.0, 0.2]),
+        ],
+    }
+    file = tmp_path / "runhistory.json"
+    file.write_text(json.dumps(runhistory))
+    solver_key = str(solver.directory)
+    performance_data = PerformanceDataFrame(
+        Path("performance_data.csv"),
+        solvers=[solver_key],
+        objectives=["PAR10"],
+        instances=["Ptn-7824-b11", "Ptn-7824-b17", "Ptn-7824-b03"],
+    )
+    performance_data.add_configuration(solver_key, "SMAC3_0", {})
+    performance_data.save_csv()
+
+    SMAC3.organise_output(file, performance_data.csv_filepath, scenario, "SMAC3_0")
+    performance_data = PerformanceDataFrame(performance_data.csv_filepath)
+    assert performance_data.get_full_configuration(solver_key, "SMAC3_0") == {
+        "param": "a",
+        "configuration_id": "SMAC3_0",
+    }
+    value = performance_data.get_value(solver_key, "Ptn-7824-b11", "SMAC3_0", "PAR10")
+    assert float(value) == 5.0
+    assert performance_data.is_missing(solver_key, "Ptn-7824-b17")
+    assert performance_data.is_missing(solver_key, "Ptn-7824-b03")
+
+
+def test_worker_cores(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the workers are only pinned to the cores given to their run."""
+    from sparkle.configurator.implementations.SMAC3 import smac3_target_algorithm
+
+    implementations.SMAC3 = SMAC3
+    monkeypatch.setattr(os, "sched_getaffinity", lambda _: {7, 5}, raising=False)
+    assert smac3_target_algorithm.worker_cores(2) == [5, 7]
+    # Other runs may use the remaining cores of the node
+    assert smac3_target_algorithm.worker_cores(1) is None
+    monkeypatch.setattr(os, "sched_getaffinity", lambda _: {0, 1, 2, 3})
+    assert smac3_target_algorithm.worker_cores(2) is None
+
+
+def stub_target(config: Configuration, instance: str, seed: int) -> dict:
+    """Stub of the solver call, reporting the seed as the cost of a trial."""
+    return {
+        "status": SolverStatus.SUCCESS,
+        "wall_time": 0.5,
+        "cpu_time": 0.25,
+        "memory": 0,
+        "PAR10": float(seed),
+        "accuray:min": 1.0,
+    }
+
+
+def test_smac3_parallel_target_function_runner() -> None:
+    """Test running trials concurrently in the process pool of workers."""
+    from sparkle.configurator.implementations.SMAC3 import smac3_target_algorithm
+
+    # Importing the directory of the target algorithm shadows the SMAC3 class
+    implementations.SMAC3 = SMAC3
+    scenario_file = Path("tests/test_files/Configuration/test_smac3_scenario.txt")
+    scenario = SMAC3Scenario.from_file(scenario_file)
+    smac3_scenario = scenario.smac3_scenario
+    runner = smac3_target_algorithm.SparkleParallelTargetFunctionRunner(
+        smac3_scenario,
+        scenario_file=scenario_file,
+        run_index=1,
+        n_workers=2,
+        required_arguments=["instance", "seed"],
+        target_function=stub_target,
+    )
+    config = smac3_scenario.configspace.get_default_configuration()
+    trials = [TrialInfo(config, instance="instance", seed=seed) for seed in range(3)]
+    try:
+        for trial in trials:  # The third trial waits for a free worker
+            runner.submit_trial(trial)
+        assert runner.count_available_workers() >= 0
+        results = []
+        while runner.is_running():
+            runner.wait()
+            results.extend(runner.iter_results())
+    finally:
+        runner.close()
+    assert sorted(info.seed for info, _ in results) == [0, 1, 2]
+    for info, value in results:
+        assert value.status == StatusType.SUCCESS
+        assert value.cost == float(info.seed)  # Only the first objective is optimised
+        assert value.time == 0.5
+        assert value.cpu_time == 0.25
+    # The workers have shut down
+    assert not runner._executor._processes
+    with pytest.raises(RuntimeError):
+        runner.submit_trial(trials[0])
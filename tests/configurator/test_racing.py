@@ -0,0 +1,86 @@
+"""Test the racing validation of configurations."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sparkle.configurator import racing
+from sparkle.structures import PerformanceDataFrame
+from sparkle.types import resolve_objective
+
+
+def test_friedman_elimination() -> None:
+    """Test eliminating configurations with the Friedman test."""
+    rng = np.random.default_rng(42)
+    performance = pd.DataFrame(
+        {
+            "good": rng.uniform(1, 2, 10),
+            "fair": rng.uniform(1.1, 2.1, 10),
+            "bad": rng.uniform(10, 20, 10),
+        }
+    )
+    assert racing.friedman_elimination(performance) == ["bad"]
+    assert "good" in racing.friedman_elimination(performance, minimise=False)
+    # Ties never lead to eliminations
+    assert (
+        racing.friedman_elimination(pd.DataFrame({"a": [1.0] * 5, "b": [1.0] * 5})) == []
+    )
+    # Two configurations are compared by the Wilcoxon test
+    assert racing.friedman_elimination(performance[["good", "bad"]]) == ["bad"]
+
+
+def test_t_test_elimination() -> None:
+    """Test eliminating configurations with paired t-tests."""
+    performance = pd.DataFrame(
+        {
+            "good": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "close": [1.1, 1.9, 3.2, 3.9, 5.1],
+            "bad": [5.0, 7.0, 6.0, 9.0, 10.0],
+        }
+    )
+    assert racing.t_test_elimination(performance) == ["bad"]
+    assert racing.t_test_elimination(performance, confidence=0.0) == ["close", "bad"]
+
+
+def test_race_step(tmp_path: Path) -> None:
+    """Test that eliminated configurations are marked as skipped."""
+    instances = [f"Instance{i}" for i in range(8)]
+    performance_data = PerformanceDataFrame(
+        tmp_path / "performance_data.csv",
+        objectives=["PAR10"],
+        instances=instances,
+    )
+    solver = "Solvers/Solver"
+    configurations = ["good", "fair", "bad"]
+    performance_data.add_solver(solver, [(config, {}) for config in configurations])
+    # The good and fair configurations alternate, the bad one is always worst
+    for index, instance in enumerate(instances[:6]):
+        values = [1, 2, 100] if index % 2 else [2, 1, 100]
+        for config, value in zip(configurations, values):
+            performance_data.set_value(value, solver, instance, config)
+    objective = resolve_objective("PAR10")
+
+    # Not enough instances for the first test
+    assert (
+        racing.race_step(
+            performance_data, solver, configurations, instances, objective, first_test=7
+        )
+        == []
+    )
+    eliminated = racing.race_step(
+        performance_data, solver, configurations, instances, objective, first_test=5
+    )
+    assert eliminated == ["bad"]
+    assert performance_data.get_skipped_cells() == {
+        solver: {"bad": ["Instance6", "Instance7"]}
+    }
+    # Skipped cells are no longer missing
+    jobs = performance_data.get_job_list()
+    assert (solver, "bad", "Instance6", 1) not in jobs
+    assert (solver, "good", "Instance6", 1) in jobs
+    # The eliminated configuration does not take part in the next steps
+    assert (
+        racing.race_step(performance_data, solver, configurations, instances, objective)
+        == []
+    )
@@ -0,0 +1,62 @@
+"""Test the target algorithm daemon of the configurators."""
+
+import os
+import time
+from pathlib import Path
+import pytest
+
+from sparkle.configurator.implementations import target_daemon
+
+solver_dir = Path("tests/test_files/Solvers/Test-Solver").absolute()
+
+
+def wait_for(condition: callable, timeout: float = 60) -> bool:
+    """Poll a condition until it holds or the timeout expires."""
+    end = time.time() + timeout
+    while not condition():
+        if time.time() > end:
+            return False
+        time.sleep(0.1)
+    return True
+
+
+def test_target_daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that calls are forwarded to the daemon, which stops when idle."""
+    monkeypatch.delenv(target_daemon.disable_variable, raising=False)
+    script = tmp_path / "target_algorithm.py"
+    script.write_text(
+        "import os\nimport sys\n\n\n"
+        "def run_target(argv):\n"
+        "    daemon = sys.modules['target_daemon'].__name__\n"
+        "    return f\"{os.getpid()} {os.getcwd()} {daemon} {' '.join(argv)}\"\n"
+    )
+    socket_path = target_daemon.socket_path(script, solver_dir)
+    assert len(str(socket_path)) < 100
+    assert not socket_path.exists()
+    # Without a daemon the call is left to the client
+    monkeypatch.setattr(target_daemon, "start_daemon", lambda *_: None)
+    assert target_daemon.call(script, ["a", "b"], solver_dir) is None
+    monkeypatch.undo()
+
+    assert target_daemon.start_daemon(script, solver_dir, timeout=2)
+    try:
+        assert wait_for(socket_path.exists)
+        monkeypatch.chdir(tmp_path)
+        output = target_daemon.call(script, ["a", "b"], solver_dir)
+        pid, cwd, daemon, arguments = output.split(" ", 3)
+        assert int(pid) != os.getpid()
+        assert Path(cwd) == tmp_path
+        assert daemon == "__main__"  # The scripts share the module of the daemon
+        assert arguments == "a b"
+        # The daemon removes its socket once it has been idle
+        assert wait_for(lambda: not socket_path.exists())
+    finally:
+        socket_path.unlink(missing_ok=True)
+
+
+def test_irace_run_target() -> None:
+    """Test the IRACE target function answers the test call without a solver run."""
+    from sparkle.configurator.implementations.IRACE import irace_target_algorithm
+
+    argv = [str(solver_dir), "PAR10", "60", "1", "1", "1234567", "instance.cnf"]
+    assert irace_target_algorithm.run_target(argv) == "0 60"
@@ -0,0 +1,40 @@
+"""Test the LaTeX helper functions."""
+
+from pathlib import Path
+
+import pandas as pd
+import pylatex as pl
+import pytest
+
+from sparkle.platform import latex
+
+
+def test_comparison_plot(tmp_path: Path) -> None:
+    """Test creating and writing a comparison plot without Chrome."""
+    data = pd.DataFrame(
+        {"Default": [1.0, 20.0, 3.5, float("nan")], "Best": [2.0, 10.0, 3.0, 4.0]}
+    )
+    plot = latex.comparison_plot(data, "Default vs Best")
+    assert not plot.log_scale
+    assert plot.plot_range == (0, 20)
+
+    pgfplots = plot.to_pgfplots()
+    assert "title={Default vs Best}" in pgfplots
+    assert "xlabel={Default}" in pgfplots
+    assert "1 2\n20 10\n3.5 3\n}" in pgfplots  # Missing values are left out
+    path = plot.write(tmp_path / "plot.pdf", backend="pgfplots")
+    assert path == tmp_path / "plot.tex"
+    assert path.read_text() == pgfplots
+    with pytest.raises(ValueError):
+        plot.write(tmp_path / "plot.pdf", backend="unknown")
+
+    # The plotly figure is only exported through Chrome when written
+    figure = plot.to_plotly()
+    assert figure.layout.xaxis.range == (0, 20)
+
+    document = pl.Document()
+    with document.create(pl.Figure()) as figure:
+        latex.add_plot(figure, Path("plot.tex"), r"0.6\textwidth")
+    output = document.dumps()
+    assert r"\usepackage{pgfplots}" in output
+    assert r"\resizebox{0.6\textwidth}{!}{\input{plot.tex}}" in output
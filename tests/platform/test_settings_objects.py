@@ -71,7 +71,7 @@ def test_read_from_file() -> None:
 
     # Ablation
     assert settings.ablation_racing_flag is False
-    assert settings.ablation_max_parallel_runs_per_node == 8
+    assert settings.ablation_max_parallel_runs_per_node is None
 
     # Selection
     assert settings.selection_model == "RandomForestClassifier"
@@ -294,7 +294,7 @@ def test_read_with_cli_file() -> None:
 
     # Ablation
     assert settings.ablation_racing_flag is False
-    assert settings.ablation_max_parallel_runs_per_node == 8
+    assert settings.ablation_max_parallel_runs_per_node == 3
 
     # Selection
     assert settings.selection_model == "RandomForestClassifier"
@@ -445,7 +445,7 @@ def test_submitted_seeds(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Non
     rng = random.Random(next_seed)
     next_seed = rng.randint(0, 2**32 - 1)
     gv.__settings = None
-    with patch("runrunner.add_to_queue") as mock_add_to_queue:
+    with patch("sparkle.tools.async_runner.run") as mock_run:
         with pytest.raises(SystemExit) as pytest_wrapped_e:
             run_solvers.main(
                 [
@@ -461,10 +461,10 @@ def test_submitted_seeds(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Non
         assert pytest_wrapped_e.value.code == 0
         assert gv.settings().seed == next_seed
 
-        mock_add_to_queue.assert_called_once()
-        _, kwargs = mock_add_to_queue.call_args
+        mock_run.assert_called_once()
+        args, _ = mock_run.call_args
 
-        for cmd in kwargs["cmd"]:
+        for cmd in args[0]:
             match = re.search(r"--seed (\d+)", cmd)
             seed_str = match.group(1)
             cur_seed = int(seed_str)
@@ -0,0 +1,68 @@
+"""Tests for the snapshot store class."""
+
+from pathlib import Path
+import pytest
+
+from sparkle.platform import SnapshotStore
+
+
+@pytest.fixture
+def platform_dir(tmp_path: Path) -> Path:
+    """Pytest fixture providing a small platform to snapshot."""
+    root = tmp_path / "Platform"
+    (root / "Solvers" / "SolverA").mkdir(parents=True)
+    (root / "Solvers" / "SolverA" / "wrapper.sh").write_text("#!/bin/bash\n")
+    (root / "Solvers" / "SolverA" / "wrapper.sh").chmod(0o755)
+    (root / "Instances" / "Empty").mkdir(parents=True)
+    (root / "Instances" / "empty.cnf").write_bytes(b"")
+    (root / "Output").mkdir()
+    (root / "Output" / "large.txt").write_bytes(b"x" * (SnapshotStore.chunk_size + 10))
+    return root
+
+
+def test_snapshot_save_restore(platform_dir: Path, tmp_path: Path) -> None:
+    """Test that a restored snapshot equals the original files."""
+    store = SnapshotStore(tmp_path / "Snapshots")
+    paths = [platform_dir / name for name in ["Solvers", "Instances", "Output"]]
+    manifest_path = store.save("first", paths, platform_dir)
+    assert manifest_path == store.manifest_path("first")
+    with pytest.raises(FileExistsError):
+        store.save("first", paths, platform_dir)
+    manifest = SnapshotStore.load_manifest(manifest_path)
+    large = next(f for f in manifest["files"] if f["path"] == "Output/large.txt")
+    assert len(large["chunks"]) == 2
+
+    destination = tmp_path / "Restored"
+    store.restore(manifest_path, destination)
+    for path in platform_dir.rglob("*"):
+        restored = destination / path.relative_to(platform_dir)
+        assert restored.exists()
+        if path.is_file():
+            assert restored.read_bytes() == path.read_bytes()
+    assert (destination / "Instances" / "Empty").is_dir()
+    assert (destination / "Solvers" / "SolverA" / "wrapper.sh").stat().st_mode & 0o100
+
+
+def test_snapshot_incremental(platform_dir: Path, tmp_path: Path) -> None:
+    """Test that unchanged content is shared between snapshots."""
+    store = SnapshotStore(tmp_path / "Snapshots")
+    paths = [platform_dir / name for name in ["Solvers", "Instances", "Output"]]
+    store.save("first", paths, platform_dir)
+    n_chunks = len(list(store.chunk_directory.rglob("*")))
+    # Unchanged platform does not add any chunks
+    store.save("second", paths, platform_dir)
+    assert len(list(store.chunk_directory.rglob("*"))) == n_chunks
+    assert store.manifests == [
+        store.manifest_path("first"),
+        store.manifest_path("second"),
+    ]
+    # A changed file only adds its own chunk
+    (platform_dir / "Solvers" / "SolverA" / "wrapper.sh").write_text("#!/bin/sh\n")
+    store.save("third", paths, platform_dir)
+    new_chunks = len(list(store.chunk_directory.rglob("*"))) - n_chunks
+    assert new_chunks in (1, 2)  # The chunk and possibly its fan out directory
+    destination = tmp_path / "Restored"
+    store.restore(store.manifest_path("first"), destination)
+    assert (
+        destination / "Solvers" / "SolverA" / "wrapper.sh"
+    ).read_text() == "#!/bin/bash\n"
@@ -5,6 +5,7 @@ from unittest.mock import patch, Mock
 
 from pathlib import Path
 from sparkle.selector import Selector, SelectionScenario
+from sparkle.selector import selector_construct_cli
 from sparkle.types.objective import PAR
 from runrunner.base import Runner
 from sparkle.structures import PerformanceDataFrame, FeatureDataFrame
@@ -85,12 +86,15 @@ def test_construct(
     assert kwargs["base_dir"] == base_dir
     assert kwargs["sbatch_options"] == sbatch_options
     cmd_str = kwargs["cmd"][0]
-    assert f"--selector {selector.selector_class.__name__}" in cmd_str
-    assert f"--model {selector.model_class.__name__}" in cmd_str
-    assert f"--budget {solver_cutoff}" in cmd_str
-    assert f"--feature-data {scenario.feature_target_path}" in cmd_str
-    assert f"--performance-data {scenario.performance_target_path}" in cmd_str
-    assert f"--model-path {scenario.directory / 'portfolio_selector'}" in cmd_str
+    assert str(Selector.construct_cli) in cmd_str
+    assert f"--selector-scenario {scenario.scenario_file}" in cmd_str
+    assert scenario.scenario_file.is_file()
+    loaded = SelectionScenario.from_file(scenario.scenario_file)
+    assert loaded.selector.name == selector.name
+    assert loaded.solver_cutoff == solver_cutoff
+    assert loaded.feature_target_path == scenario.feature_target_path
+    assert loaded.performance_target_path == scenario.performance_target_path
+    assert loaded.selector_file_path == scenario.directory / "portfolio_selector"
 
 
 @patch("runrunner.add_to_queue")
@@ -154,3 +158,151 @@ def test_run(instance: str) -> None:
     solvers = ["Solvers/CSCCSat", "Solvers/PbO-CCSAT-Generic", "Solvers/MiniSAT"]
     schedule = selector.run(selector_path, instance, feature_data)
     assert schedule[0][0] in solvers  # Schedule has shape [(solver, config, budget)]
+
+
+def test_run_batch() -> None:
+    """Test for method run_batch."""
+    selector = Selector(MultiClassClassifier, RandomForestClassifier)
+    selector_path = Path("tests/test_files/Selector/portfolio_selector_test")
+    feature_data_path = Path("tests/test_files/Output/Feature_Data/feature_data.csv")
+    feature_data = FeatureDataFrame(feature_data_path)
+    instances = [
+        "Instances/PTN/Ptn-7824-b03.cnf",
+        "Instances/PTN/Ptn-7824-b15.cnf",
+        "Instances/PTN/Ptn-7824-b21.cnf",
+    ]
+    with patch.object(
+        MultiClassClassifier, "load", wraps=MultiClassClassifier.load
+    ) as mock_load:
+        schedules = selector.run_batch(selector_path, feature_data.loc[instances])
+    mock_load.assert_called_once()
+    assert sorted(schedules.keys()) == instances
+    for instance in instances:
+        assert schedules[instance] == selector.run(selector_path, instance, feature_data)
+
+
+def test_run_aggregation(tmp_path: Path) -> None:
+    """Test the aggregation and expansion of the runs of a selection scenario."""
+    instances = ["Instance1", "Instance2"]
+    performance_data = PerformanceDataFrame(
+        tmp_path / "performance_data.csv",
+        solvers=["SolverA", "SolverB"],
+        objectives=["PAR10"],
+        instances=instances,
+        n_runs=3,
+    )
+    for run, (a, b) in enumerate([(1.0, 6.0), (2.0, 4.0), (9.0, 5.0)], start=1):
+        performance_data.set_value(a, "SolverA", instances, run=run)
+        performance_data.set_value(b, "SolverB", instances, run=run)
+    feature_data = FeatureDataFrame(
+        tmp_path / "feature_data.csv",
+        instances=instances,
+        extractor_data={"Extractor": [("group", "feature")]},
+    )
+    for value, instance in enumerate(instances):
+        feature_data.set_value(instance, "Extractor", "group", "feature", value)
+    selector = Selector(MultiClassClassifier, RandomForestClassifier)
+
+    def scenario(name: str, **kwargs: object) -> SelectionScenario:
+        """Create a scenario for the performance data."""
+        return SelectionScenario(
+            tmp_path,
+            selector,
+            PAR(10),
+            performance_data,
+            feature_data,
+            solver_cutoff=60,
+            extractor_cutoff=60,
+            subdir_path=Path(name),
+            **kwargs,
+        )
+
+    # Defaults to the run aggregator of the objective, the mean
+    mean = scenario("mean")
+    assert mean.performance_data.index.to_list() == instances
+    assert mean.performance_data.loc["Instance1"].to_list() == [4.0, 5.0]
+    median = scenario("median", run_aggregation="median")
+    assert median.performance_data.loc["Instance2"].to_list() == [2.0, 5.0]
+    quantile = scenario("quantile", run_aggregation=1.0)
+    assert quantile.performance_data.loc["Instance1"].to_list() == [9.0, 6.0]
+    assert mean.run_samples.loc[("Instance2", 3)].to_list() == [9.0, 5.0]
+
+    expanded = scenario("expanded", expand_runs=True)
+    assert expanded.performance_data.index.to_list() == [
+        instance for instance in instances for _ in range(3)
+    ]
+    assert expanded.performance_data.index.equals(expanded.feature_data.index)
+    assert expanded.feature_data.iloc[:, 0].to_list() == [0, 0, 0, 1, 1, 1]
+    assert expanded.training_instances == instances
+
+    # The aggregation is kept when reading the scenario from file
+    median.create_scenario()
+    loaded = SelectionScenario.from_file(median.scenario_file)
+    assert loaded.run_aggregation == "median"
+    assert not loaded.expand_runs
+
+
+def test_ablation_scenarios(tmp_path: Path) -> None:
+    """Test ablation scenarios sharing the data of their parent scenario."""
+    instances = [f"Instance{i}" for i in range(6)]
+    solvers = ["SolverA", "SolverB", "SolverC"]
+    performance_data = PerformanceDataFrame(
+        tmp_path / "performance_data.csv",
+        solvers=solvers,
+        objectives=["PAR10"],
+        instances=instances,
+    )
+    feature_data = FeatureDataFrame(
+        tmp_path / "feature_data.csv",
+        instances=instances,
+        extractor_data={"Extractor": [("group", "feature")]},
+    )
+    for index, instance in enumerate(instances):
+        feature_data.set_value(instance, "Extractor", "group", "feature", index)
+        for offset, solver in enumerate(solvers):
+            performance_data.set_value((index + offset) % 3, solver, instance)
+    scenario = SelectionScenario(
+        tmp_path,
+        Selector(MultiClassClassifier, RandomForestClassifier),
+        PAR(10),
+        performance_data,
+        feature_data,
+        solver_cutoff=60,
+        extractor_cutoff=60,
+        ablate=True,
+    )
+    assert len(scenario.ablation_scenarios) == len(solvers)
+    ablated = scenario.ablation_scenarios[0]
+    assert ablated.directory == scenario.directory / "ablated_SolverA_Default"
+    assert ablated.excluded_solvers == ["SolverA_Default"]
+    assert ablated.solvers == ["SolverB_Default", "SolverC_Default"]
+    assert ablated.feature_data is scenario.feature_data
+    assert ablated.selector_performance_data.solvers == [
+        SelectionScenario.__selector_solver_name__
+    ]
+    assert ablated.get_full_configuration("SolverA", "Default") == {}
+
+    scenario.create_scenario()
+    for ablated_scenario in scenario.ablation_scenarios:
+        ablated_scenario.create_scenario()
+    # Only the parent scenario writes the data files
+    assert not (ablated.directory / "performance_data.csv").exists()
+    assert not (ablated.directory / "feature_data.csv").exists()
+    loaded = SelectionScenario.from_file(ablated.scenario_file)
+    assert loaded.directory == ablated.directory
+    assert loaded.performance_target_path == scenario.performance_target_path
+    assert loaded.solvers == ablated.solvers
+    assert loaded.get_full_configuration("SolverA", "Default") == {}
+    parent = SelectionScenario.from_file(scenario.scenario_file)
+    assert [s.directory for s in parent.ablation_scenarios] == [
+        s.directory for s in scenario.ablation_scenarios
+    ]
+
+    # Construct all selectors in one call
+    selector_construct_cli.main(
+        ["--selector-scenario", str(scenario.scenario_file)]
+        + [str(s.scenario_file) for s in scenario.ablation_scenarios]
+    )
+    assert scenario.selector_file_path.is_file()
+    for ablated_scenario in scenario.ablation_scenarios:
+        assert ablated_scenario.selector_file_path.is_file()
@@ -6,13 +6,15 @@ import pytest
 from unittest.mock import patch, Mock
 
 from sparkle.types import SolverStatus
+from sparkle.structures import PerformanceDataFrame
 
+from asf.selectors import MultiClassClassifier
 from sparkle.selector.selector_cli import main as selector_cli
 
 
-@patch("runrunner.add_to_queue")
+@patch("sparkle.solver.Solver.run")
 def test_selector_cli(
-    mock_add_queue: Mock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    mock_solver_run: Mock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """Test the Selector CLI entry point."""
     scenario_path = Path("tests/test_files/Selector/scenario").absolute()
@@ -40,7 +42,7 @@ def test_selector_cli(
         "--seed",
         "0",
     ]
-    mock_add_queue.return_value = {
+    mock_solver_run.return_value = {
         "status": SolverStatus.SAT,
         "quality": 0,
         "cpu_time": 0.48925,
@@ -50,4 +52,58 @@ def test_selector_cli(
     }
     selector_cli(arguments)
     # TODO: Add checks based on the patch call
-    mock_add_queue.assert_called_once()
+    mock_solver_run.assert_called_once()
+
+
+@patch("sparkle.solver.Solver.run")
+def test_selector_cli_batch(
+    mock_solver_run: Mock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the Selector CLI entry point with multiple instances in one job."""
+    scenario_path = Path("tests/test_files/Selector/scenario").absolute()
+    feature_data = Path("tests/test_files/Selector/example_feature_data.csv").absolute()
+    instance_paths = [
+        Path("Examples/Resources/Instances/PTN2/Ptn-7824-b12.cnf"),
+        Path("Examples/Resources/Instances/PTN2/Ptn-7824-b14.cnf"),
+    ]
+    instance_paths_absolute = [path.absolute() for path in instance_paths]
+    csccsat = Path("Examples/Resources/Solvers/CSCCSat").absolute()
+    # Execute tmp dir
+    monkeypatch.chdir(tmp_path)
+    shutil.copyfile(feature_data, Path("example_feature_data.csv"))
+    for instance_path, instance_path_absolute in zip(
+        instance_paths, instance_paths_absolute
+    ):
+        instance_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(instance_path_absolute, instance_path)
+    shutil.copytree(scenario_path, Path("scenario"))
+    shutil.copytree(csccsat, Path("Solvers/CSCCSat"))
+    # Results can only be written for instances known to the selector
+    performance_data = PerformanceDataFrame(Path("scenario/selector_performance.csv"))
+    performance_data.add_instance("Ptn-7824-b14")
+    performance_data.save_csv()
+    arguments = [
+        "--selector-scenario",
+        "scenario/scenario.txt",
+        "--feature-data",
+        "example_feature_data.csv",
+        "--instance",
+        *[str(instance_path) for instance_path in instance_paths],
+        "--seed",
+        "0",
+        "1",
+    ]
+    mock_solver_run.return_value = {
+        "status": SolverStatus.SAT,
+        "quality": 0,
+        "cpu_time": 0.48925,
+        "wall_time": 0.52824,
+        "memory": 1537.2734375,
+        "PAR10": 0.48925,
+    }
+    with patch.object(
+        MultiClassClassifier, "load", wraps=MultiClassClassifier.load
+    ) as mock_load:
+        selector_cli(arguments)
+    assert mock_load.call_count == 1
+    assert mock_solver_run.call_count == len(instance_paths)
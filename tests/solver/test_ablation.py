@@ -247,3 +247,44 @@ def test_submit_ablation(mock_requirements: Mock, test_set: Instance_Set) -> Non
         assert isinstance(result, list), (
             f"submit_ablation should return a list. Instead got: {result}"
         )
+
+
+def test_stream_ablation_table(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test reading the rounds of an ablation while it is running."""
+    monkeypatch.chdir(tmp_path)  # Execute in PyTest tmp dir
+    scenario_stream = AblationScenario(
+        configuration_scenario,
+        None,
+        cutoff_length,
+        concurrent_clis,
+        best_configuration,
+        ablation_racing,
+    )
+    scenario_stream.log_file.parent.mkdir(parents=True)
+    chunks = [
+        "Ablation analysis started.\n   Round   Flipped Parameter  Source value",
+        "  Target value    Result\n   0   -source-   N/A   N/A   387.79922\n   1   ED",
+        "R, EDRalpha   0, 0.1   1, 0.1013 19.5\n",
+        "   2   -target-   N/A   N/A   19.19058",
+    ]
+
+    def finished() -> bool:
+        """Write the next chunk of the log, finished when all are written."""
+        if chunks:
+            with scenario_stream.log_file.open("a") as fout:
+                fout.write(chunks.pop(0))
+        return not chunks
+
+    rows = []
+    for row in scenario_stream.stream_ablation_table(finished, poll_interval=0):
+        rows.append(row)
+        # The rounds are yielded while the ablation is still running
+        assert chunks or row[0] == "2"
+    assert rows == [
+        ["0", "-source-", "N/A", "N/A", "387.79922"],
+        ["1", "EDR, EDRalpha", "0, 0.1", "1, 0.1013", "19.5"],
+        ["2", "-target-", "N/A", "N/A", "19.19058"],
+    ]
+    # Without the final table, only partial reads see the completed rounds
+    assert scenario_stream.read_ablation_table() == []
+    assert scenario_stream.read_ablation_table(partial=True)[1:] == rows
@@ -5,6 +5,7 @@ import time
 import math
 import stat
 import re
+import shlex
 import pytest
 from pathlib import Path
 import shutil
@@ -14,6 +15,7 @@ from tests.CLI import tools as cli_tools
 
 from sparkle.solver import Solver, solver_cli
 from sparkle.structures import PerformanceDataFrame
+from sparkle.types import SolverStatus
 from sparkle.platform.settings_objects import Settings
 
 from runrunner.base import Runner, Status
@@ -75,6 +77,42 @@ def test_solver_cli(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         )
 
 
+def test_solver_cli_skip_existing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that runs whose values are already present are skipped."""
+    solver_path = Path("tests/test_files/Solvers/Test-Solver").absolute()
+    monkeypatch.chdir(tmp_path)
+    pdf = PerformanceDataFrame(
+        Path("performance_data.csv"),
+        solvers=[str(solver_path)],
+        instances=["instance"],
+        objectives=["PAR10"],
+    )
+    pdf.add_configuration(str(solver_path), "config_1", {"init_solution": "1"})
+    pdf.set_value(3.0, str(solver_path), "instance", "config_1", "PAR10", 1)
+    pdf.save_csv()
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    with patch.object(Solver, "run", side_effect=AssertionError("Solver was run")):
+        solver_cli.main(
+            [
+                "--performance-dataframe",
+                str(pdf.csv_filepath),
+                "--solver",
+                str(solver_path),
+                "--instance",
+                "instance.cnf",
+                "--run-index",
+                "1",
+                "--configuration-id",
+                "config_1",
+                "--log-dir",
+                str(tmp_path),
+                "--skip-existing",
+            ]
+        )
+
+
 @pytest.mark.performance
 def test_solver_cli_performance(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Test the Solver CLI entry point with high concurrency.
@@ -221,3 +259,152 @@ def test_solver_cli_performance(tmp_path: Path, monkeypatch: pytest.MonkeyPatch)
     # Clean up
     monkeypatch.chdir(current_dir)
     shutil.rmtree(tmp_dir)
+
+
+def test_solver_cli_adaptive_capping(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that runs are capped at the best known time on the instance."""
+    solver_path = Path("tests/test_files/Solvers/Test-Solver").absolute()
+    monkeypatch.chdir(tmp_path)
+    pdf = PerformanceDataFrame(
+        Path("performance_data.csv"),
+        solvers=[str(solver_path)],
+        instances=["instance", "unknown"],
+        objectives=["PAR10", "status"],
+    )
+    pdf.add_configuration(str(solver_path), "config_1", {"init_solution": "1"})
+    # A best known time of whole seconds, which equals the cap
+    pdf.set_value(4.0, str(solver_path), "instance", "config_1", "PAR10", 1)
+    pdf.set_value(7.0, str(solver_path), "instance", "Default", "PAR10", 1)
+    pdf.set_value(50.0, str(solver_path), "unknown", "config_1", "PAR10", 1)
+    pdf.save_csv()
+    par10 = pdf.objectives[0]
+    # The own results of a configuration do not bound it
+    assert solver_cli.capping_bound(pdf, "instance", par10, 5) == 4
+    assert (
+        solver_cli.capping_bound(
+            pdf, "instance", par10, 5, exclude=(str(solver_path), "config_1")
+        )
+        is None
+    )
+    assert solver_cli.capping_bound(pdf, "instance", par10, 100) == 4
+    assert solver_cli.capping_bound(pdf, "unknown", par10, 5) is None
+
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    output = {"status": SolverStatus.TIMEOUT, "PAR10": 40.0}
+    with patch.object(Solver, "run", return_value=output) as run:
+        solver_cli.main(
+            [
+                "--performance-dataframe",
+                str(pdf.csv_filepath),
+                "--solver",
+                str(solver_path),
+                "--instance",
+                "instance.cnf",
+                "--run-index",
+                "1",
+                "--objectives",
+                "PAR10",
+                "status",
+                "--cutoff-time",
+                "100",
+                "--log-dir",
+                str(tmp_path),
+                "--adaptive-capping",
+            ]
+        )
+    assert run.call_args.kwargs["cutoff_time"] == 4
+    pdf = PerformanceDataFrame(pdf.csv_filepath)
+    get_value = pdf.get_value
+    # Penalised as a timeout at the full cutoff time, not the cap
+    assert float(get_value(str(solver_path), "instance", "Default", "PAR10", 1)) == 1000
+    assert get_value(str(solver_path), "instance", "Default", "status", 1) == "CAPPED"
+    # The capped configuration does not tie with the best one
+    assert pdf.best_configuration(str(solver_path), "PAR10", ["instance"]) == (
+        "config_1",
+        4.0,
+    )
+
+
+def test_solver_cli_adaptive_capping_chain(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the chained runs of an instance do not wait before their writes."""
+    solver_path = Path("tests/test_files/Solvers/Test-Solver").absolute()
+    monkeypatch.chdir(tmp_path)
+    pdf = PerformanceDataFrame(
+        Path("performance_data.csv"),
+        solvers=[str(solver_path)],
+        instances=["instance"],
+        objectives=["PAR10", "status"],
+    )
+    pdf.add_configuration(str(solver_path), "config_1", {"init_solution": "1"})
+    pdf.save_csv()
+    solver = Solver(solver_path)
+    chain = [
+        solver.performance_dataframe_command(
+            "instance.cnf",
+            pdf,
+            1,
+            config_id=config_id,
+            cutoff_time=100,
+            log_dir=tmp_path,
+            adaptive_capping=True,
+        )
+        for config_id in ["config_1", PerformanceDataFrame.default_configuration]
+    ]
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    output = {"status": SolverStatus.SUCCESS, "PAR10": 3.0}
+    with patch.object(Solver, "run", return_value=output) as run:
+        for command in chain:
+            solver_cli.main(shlex.split(command)[2:])
+    assert sleeps == []
+    # The second run of the chain is capped by the result of the first
+    assert run.call_args.kwargs["cutoff_time"] == 3
+    pdf = PerformanceDataFrame(pdf.csv_filepath)
+    assert (
+        float(pdf.get_value(str(solver_path), "instance", "config_1", "PAR10", 1)) == 3
+    )
+
+
+def test_solver_cli_result_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that results are written to the result store, if it exists."""
+    solver_path = Path("tests/test_files/Solvers/Test-Solver").absolute()
+    monkeypatch.chdir(tmp_path)
+    pdf = PerformanceDataFrame(
+        Path("performance_data.csv"),
+        solvers=[str(solver_path)],
+        instances=["instance"],
+        objectives=["PAR10"],
+    )
+    pdf.use_result_store()
+    csv_content = pdf.csv_filepath.read_text()
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    output = {"status": SolverStatus.SUCCESS, "PAR10": 1.5}
+    with patch.object(Solver, "run", return_value=output):
+        solver_cli.main(
+            [
+                "--performance-dataframe",
+                str(pdf.csv_filepath),
+                "--solver",
+                str(solver_path),
+                "--instance",
+                "instance.cnf",
+                "--run-index",
+                "1",
+                "--objectives",
+                "PAR10",
+                "--seed",
+                "5",
+                "--log-dir",
+                str(tmp_path),
+            ]
+        )
+    assert pdf.csv_filepath.read_text() == csv_content  # Not appended to
+    pdf = PerformanceDataFrame(pdf.csv_filepath)
+    assert float(pdf.get_value(str(solver_path), "instance", "Default", "PAR10")) == 1.5
+    assert pdf.get_value(str(solver_path), "instance", solver_fields=["Seed"]) == 5
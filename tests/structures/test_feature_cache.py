@@ -0,0 +1,103 @@
+"""Tests for the feature cache class."""
+
+import os
+import math
+from pathlib import Path
+import pytest
+
+from sparkle.structures import FeatureCache
+
+SAMPLE_FEATURES = [
+    ("Group1", "Feature1", 1.5),
+    ("Group1", "Feature2", math.nan),
+    ("Group2", "Feature3", 3.0),
+]
+
+
+@pytest.fixture
+def cache_setup(tmp_path: Path) -> tuple[FeatureCache, Path, Path]:
+    """Pytest fixture providing a cache, an extractor directory and an instance."""
+    extractor_dir = tmp_path / "Extractor"
+    extractor_dir.mkdir()
+    (extractor_dir / "sparkle_extractor_wrapper.py").write_text("print('features')")
+    instance = tmp_path / "instance.cnf"
+    instance.write_text("p cnf 1 1\n1 0\n")
+    return FeatureCache(tmp_path / "Cache"), extractor_dir, instance
+
+
+def test_feature_cache_put_get(cache_setup: tuple[FeatureCache, Path, Path]) -> None:
+    """Test storing and retrieving features."""
+    cache, extractor_dir, instance = cache_setup
+    assert cache.get(extractor_dir, None, instance) is None
+    cache.put(extractor_dir, None, instance, SAMPLE_FEATURES)
+    features = cache.get(extractor_dir, None, instance)
+    assert features[0] == SAMPLE_FEATURES[0]
+    assert features[2] == SAMPLE_FEATURES[2]
+    assert math.isnan(features[1][2])
+    # Different feature group is a different entry
+    assert cache.get(extractor_dir, "Group1", instance) is None
+    # Multi file instances are keyed on all files
+    assert cache.get(extractor_dir, None, [instance, instance]) is None
+
+
+def test_feature_cache_content_keys(
+    cache_setup: tuple[FeatureCache, Path, Path], tmp_path: Path
+) -> None:
+    """Test that the cache is keyed on content rather than on paths."""
+    cache, extractor_dir, instance = cache_setup
+    cache.put(extractor_dir, "Group1", instance, SAMPLE_FEATURES[:2])
+    # Same content under a different name hits the cache
+    copy_instance = tmp_path / "copy.cnf"
+    copy_instance.write_bytes(instance.read_bytes())
+    assert cache.get(extractor_dir, "Group1", copy_instance) is not None
+    # Modified instance misses the cache
+    instance.write_text("p cnf 2 1\n1 2 0\n")
+    assert cache.get(extractor_dir, "Group1", instance) is None
+    # Modified extractor misses the cache
+    cache = FeatureCache(cache.directory)
+    (extractor_dir / "sparkle_extractor_wrapper.py").write_text("print('other')")
+    assert cache.get(extractor_dir, "Group1", copy_instance) is None
+
+
+def test_feature_cache_extractor_hashes(
+    cache_setup: tuple[FeatureCache, Path, Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that known extractor hashes are used instead of hashing the directory."""
+    cache, extractor_dir, instance = cache_setup
+    cache.put(extractor_dir, "Group1", instance, SAMPLE_FEATURES[::2])
+    extractor_hash = cache.extractor_hash(extractor_dir)
+
+    def hash_directory(_: Path) -> str:
+        """Fail when the directory is hashed."""
+        raise AssertionError("The extractor directory was hashed again")
+
+    monkeypatch.setattr(FeatureCache, "hash_directory", hash_directory)
+    cache = FeatureCache(
+        cache.directory, extractor_hashes={extractor_dir: extractor_hash}
+    )
+    assert cache.get(extractor_dir, "Group1", instance) == SAMPLE_FEATURES[::2]
+
+
+def test_feature_cache_evict(cache_setup: tuple[FeatureCache, Path, Path]) -> None:
+    """Test the least recently used eviction of the cache."""
+    cache, extractor_dir, instance = cache_setup
+    cache.put(extractor_dir, "Group1", instance, SAMPLE_FEATURES)
+    cache.put(extractor_dir, "Group2", instance, SAMPLE_FEATURES)
+    entry_size = cache.size // 2
+    # Age the first entry
+    first_entry = cache._entry_path(cache.key(extractor_dir, "Group1", instance))
+    os.utime(first_entry, (0, 0))
+    cache.max_size = (entry_size * 1.5) / 2**20
+    assert cache.evict() == 1
+    assert cache.get(extractor_dir, "Group1", instance) is None
+    assert cache.get(extractor_dir, "Group2", instance) is not None
+
+
+def test_feature_cache_clear(cache_setup: tuple[FeatureCache, Path, Path]) -> None:
+    """Test clearing the cache."""
+    cache, extractor_dir, instance = cache_setup
+    cache.put(extractor_dir, None, instance, SAMPLE_FEATURES)
+    assert cache.size > 0
+    cache.clear()
+    assert cache.size == 0
+    assert cache.directory.exists()
@@ -138,6 +138,18 @@ def test_set_value(feature_df: FeatureDataFrame) -> None:
     assert new_value == -1.5
 
 
+def test_append_csv(feature_df: FeatureDataFrame) -> None:
+    """Test for method append_csv."""
+    feature_df.set_value("Instance_X", "ExtractorB", "Group2", "Feature3", 1.0)
+    feature_df.set_value("Instance_Y", "ExtractorB", "Group2", "Feature3", 2.0)
+    feature_df.append_csv(["Instance_X", "Instance_Y"])
+    # Appended rows take precedence over the (empty) original rows
+    loaded_df = FeatureDataFrame(feature_df.csv_filepath)
+    assert loaded_df.num_instances == 2
+    assert loaded_df.get_value("Instance_X", "ExtractorB", "Group2", "Feature3") == 1.0
+    assert loaded_df.get_value("Instance_Y", "ExtractorB", "Group2", "Feature3") == 2.0
+
+
 def test_has_missing_vectors(feature_df: FeatureDataFrame) -> None:
     """Test for method has_missing_vectors in specific scenarios."""
     # Initially, all vectors are missing
@@ -3,10 +3,12 @@
 from __future__ import annotations
 from pathlib import Path
 import math
+import numpy as np
 
 import pytest
 
 from sparkle.structures import PerformanceDataFrame
+from sparkle.types import SparkleObjective
 
 csv_example_path = Path("tests/test_files/performance/example-runtime-performance.csv")
 pd = PerformanceDataFrame(csv_example_path)
@@ -501,6 +503,63 @@ def test_set_get_value() -> None:
     pd_mo = PerformanceDataFrame(csv_example_mo)
 
 
+def test_set_values(tmp_path: Path) -> None:
+    """Test setting values from a long format table."""
+    import pandas
+
+    pdf = PerformanceDataFrame(
+        tmp_path / "performance_data.csv",
+        objectives=["PAR10", "Quality"],
+        instances=["Instance1", "Instance2"],
+        n_runs=2,
+    )
+    pdf.add_solver("SolverA", [("Default", {}), ("Other", {})])
+    pdf.add_solver("SolverB")
+    # Absent index columns are broadcast, the last row of a cell takes precedence
+    pdf.set_values(
+        pandas.DataFrame(
+            {
+                "Instance": ["Instance1", "Instance1", "Unknown"],
+                "Solver": ["SolverA", "SolverA", "SolverA"],
+                "Seed": [1, 2, 3],
+            }
+        )
+    )
+    seeds = pdf.xs("Seed", axis=1, level=2)
+    assert (seeds.loc[(slice(None), "Instance1", slice(None)), "SolverA"] == 2).all(
+        axis=None
+    )
+    assert (
+        seeds.loc[(slice(None), "Instance2", slice(None)), "SolverA"]
+        .isna()
+        .all(axis=None)
+    )
+    assert seeds["SolverB"].isna().all(axis=None)
+    pdf.set_values(
+        pandas.DataFrame(
+            {
+                "Objective": ["PAR10", "PAR10", "Quality"],
+                "Instance": ["Instance1", "Instance2", "Instance2"],
+                "Run": [1, 2, 1],
+                "Solver": ["SolverA", "SolverB", "SolverA"],
+                "Configuration": ["Other", None, "Default"],
+                "Value": [3.0, 4.0, 5.0],
+            }
+        ).fillna({"Configuration": PerformanceDataFrame.default_configuration})
+    )
+    assert pdf.get_value("SolverA", "Instance1", "Other", "PAR10", 1) == 3.0
+    assert pandas.isna(pdf.get_value("SolverA", "Instance1", "Default", "PAR10", 1))
+    assert pdf.get_value("SolverB", "Instance2", objective="PAR10", run=2) == 4.0
+    assert pdf.get_value("SolverA", "Instance2", "Default", "Quality", 1) == 5.0
+    # Missing values do not overwrite
+    pdf.set_values(
+        pandas.DataFrame(
+            {"Solver": ["SolverA"], "Configuration": ["Other"], "Value": [math.nan]}
+        )
+    )
+    assert pdf.get_value("SolverA", "Instance1", "Other", "PAR10", 1) == 3.0
+
+
 def test_get_full_configurations() -> None:
     """Test getting full configurations."""
     result = pd_mo.get_configurations("RandomForest")
@@ -639,6 +698,98 @@ def test_best_configuration() -> None:
     assert result == (best_conf, best_value)"""
 
 
+def test_skipped_cells(tmp_path: Path) -> None:
+    """Test that intentionally skipped cells are handled as partial data."""
+    pdf = PerformanceDataFrame(
+        tmp_path / "performance_data.csv",
+        objectives=["PAR10"],
+        instances=["Instance1", "Instance2", "Instance3"],
+    )
+    pdf.add_solver("Solver", [("Full", {}), ("Partial", {})])
+    pdf.set_value(
+        [5.0, 5.0, 5.0], "Solver", ["Instance1", "Instance2", "Instance3"], "Full"
+    )
+    pdf.set_value(1.0, "Solver", "Instance1", "Partial")
+    assert pdf.get_skipped_cells() == {}
+    pdf.mark_skipped("Solver", "Partial", ["Instance2", "Instance3"])
+    pdf.mark_skipped("Solver", "Partial", ["Instance3"])
+    assert pdf.get_skipped_cells() == {"Solver": {"Partial": ["Instance2", "Instance3"]}}
+    assert [job for job in pdf.get_job_list() if job[0] == "Solver"] == []
+    # Partially evaluated configurations are not compared to complete ones
+    assert pdf.best_configuration("Solver", "PAR10") == ("Full", 5.0)
+    assert pdf.configuration_performance("Solver", "Partial", "PAR10") == (
+        "Partial",
+        1.0,
+    )
+    # Unless their evaluated instances are considered
+    assert pdf.best_configuration("Solver", "PAR10", ["Instance1"]) == ("Partial", 1.0)
+    pdf.save_csv()
+    assert PerformanceDataFrame(pdf.csv_filepath).get_skipped_cells() == {
+        "Solver": {"Partial": ["Instance2", "Instance3"]}
+    }
+
+
+def test_bootstrap(tmp_path: Path) -> None:
+    """Test the bootstrap confidence intervals of configurations."""
+    instances = [f"Instance{index}" for index in range(20)]
+    pdf = PerformanceDataFrame(
+        tmp_path / "performance_data.csv", objectives=["PAR10"], instances=instances
+    )
+    pdf.add_solver("Solver", [("Fast", {}), ("Slow", {}), ("Partial", {})])
+    pdf.set_value([[float(i) for i in range(20)]], "Solver", instances, "Fast")
+    pdf.set_value([[float(i) + 10 for i in range(20)]], "Solver", instances, "Slow")
+    pdf.set_value(0.0, "Solver", "Instance0", "Partial")
+    bootstrap = pdf.bootstrap("Solver", replicates=200, seed=1)
+    # Only the configurations evaluated on all instances are compared
+    assert bootstrap.index.tolist() == ["Fast", "Slow"]
+    assert bootstrap["performance"].tolist() == [9.5, 19.5]
+    assert (bootstrap["lower"] < bootstrap["performance"]).all()
+    assert (bootstrap["performance"] < bootstrap["upper"]).all()
+    # The same resamples are used for all configurations
+    assert bootstrap["upper"]["Fast"] + 10 == pytest.approx(bootstrap["upper"]["Slow"])
+    assert bootstrap["probability_best"].tolist() == [1.0, 0.0]
+    assert pdf.bootstrap("Solver", replicates=200, seed=1).equals(bootstrap)
+    # Other aggregators are applied to the resampled performance directly
+    median = pdf.bootstrap(
+        "Solver",
+        SparkleObjective("PAR10", instance_aggregator=np.median),
+        instances=instances[:10],
+        replicates=50,
+        confidence=0.5,
+        seed=1,
+    )
+    assert median["performance"].tolist() == [4.5, 14.5]
+    assert (median["lower"] <= median["upper"]).all()
+    pdf.add_solver("Unevaluated")
+    with pytest.raises(ValueError):
+        pdf.bootstrap("Unevaluated")
+
+
+def test_pareto_front() -> None:
+    """Test the non-dominated configurations on multiple objectives."""
+    front = pd_mo.pareto_front(["PAR10", "TrainAccuracy:max"], ["mnist.csv"])
+    assert front.columns.tolist() == ["PAR10", "TrainAccuracy:max"]
+    assert front.index.tolist() == [
+        ("RandomForest", "Config1"),
+        ("RandomForest", "Config5"),
+        ("MultiLayerPerceptron", "Config3"),
+        ("MultiLayerPerceptron", "Config4"),
+    ]
+    assert front.loc[("MultiLayerPerceptron", "Config4")].tolist() == [55.1, 0.819]
+    # Defaults to all objectives and instances
+    front = pd_mo.pareto_front()
+    assert front.columns.tolist() == pd_mo.objective_names
+    assert len(front) == 6
+    assert front.loc[("RandomForest", "Config1"), "PAR10"] == 4.75
+
+    costs = np.array([[1, 4], [2, 2], [4, 1], [2, 3], [1, 4], [3, 3]])
+    expected = [True, True, True, False, True, False]
+    for block_size in (1, 2, 64):
+        assert PerformanceDataFrame.non_dominated(costs, block_size).tolist() == (
+            expected
+        )
+
+
 def test_best_instance_performance() -> None:
     """Test calculating best score on instance."""
     bp_instance_runtime = [30.0, 5.0, 3.0, 8.0, 41.0]
@@ -672,9 +823,77 @@ def test_best_performance() -> None:
     assert results == vbs_portfolio
 
 
-def test_schedule_performance() -> None:
-    """Test scheduling performance."""
-    pass
+def test_schedule_performance(tmp_path: Path) -> None:
+    """Test scheduling performance against a step by step evaluation."""
+    import random
+
+    rng = random.Random(42)
+    solvers = ["SolverA", "SolverB", "SolverC"]
+    instances = [f"Instance{i}" for i in range(40)]
+    pdf = PerformanceDataFrame(
+        tmp_path / "performance_data.csv",
+        solvers=solvers,
+        objectives=["PAR10", "Quality:max"],
+        instances=instances,
+    )
+    for solver in solvers:
+        for objective in pdf.objective_names:
+            values = [rng.choice([rng.uniform(0, 20), math.nan]) for _ in instances]
+            pdf.set_value(values, solver, instances, objective=objective)
+
+    def step_by_step(schedule: dict, objective: str, minimise: bool) -> list[float]:
+        """The performance of a schedule, evaluated one step at a time."""
+        select = min if minimise else max
+        performances = [0.0] * len(schedule)
+        for ix, instance in enumerate(schedule):
+            for iy, (solver, config, max_runtime) in enumerate(schedule[instance]):
+                performance = float(pdf.get_value(solver, instance, config, objective))
+                if max_runtime is not None:
+                    performances[ix] += performance
+                    if performance < max_runtime:
+                        break
+                else:
+                    if iy == 0:
+                        performances[ix] = performance
+                        continue
+                    performances[ix] = select(performances[ix], performance)
+        return performances
+
+    def random_schedule(timed: bool | None) -> dict:
+        """Random schedules, with maximum runtimes, without or mixed (None)."""
+        return {
+            instance: [
+                (
+                    rng.choice(solvers),
+                    PerformanceDataFrame.default_configuration,
+                    rng.choice([rng.uniform(0, 20), None])
+                    if timed is None
+                    else (rng.uniform(0, 20) if timed else None),
+                )
+                for _ in range(rng.randint(0, 4))
+            ]
+            for instance in rng.sample(instances, 30)
+        }
+
+    for objective, minimise, timed in [
+        ("PAR10", True, True),
+        ("Quality:max", False, False),
+        ("PAR10", True, None),
+    ]:
+        schedule = random_schedule(timed)
+        expected = step_by_step(schedule, objective, minimise)
+        results = pdf.schedule_performance(schedule, "Selector", objective)
+        assert results == pytest.approx(expected, nan_ok=True)
+        stored = [
+            pdf.get_value("Selector", instance, objective=objective)
+            for instance in schedule
+        ]
+        assert stored == pytest.approx(expected, nan_ok=True)
+    assert pdf.schedule_performance({}, objective="PAR10") == []
+    with pytest.raises(KeyError):
+        pdf.schedule_performance(
+            {"Unknown": [("SolverA", "Default", None)]}, objective="PAR10"
+        )
 
 
 def test_marginal_contribution() -> None:
@@ -0,0 +1,115 @@
+"""Tests for the SQLite result store of the performance and feature data."""
+
+import math
+from pathlib import Path
+
+import pytest
+
+from sparkle.structures import FeatureDataFrame, PerformanceDataFrame, ResultStore
+
+
+def test_result_store(tmp_path: Path) -> None:
+    """Test writing, reading and folding the rows of a result store."""
+    store = ResultStore(tmp_path / "results.db", keys=["Key"], fields=["Value"])
+    assert not store.exists
+    assert store.read().empty
+    store.create()
+    assert store.exists
+    store.upsert([("a", 1.0), ("b", "SUCCESS")])
+    store.upsert([("a", 2.0)])  # Replaces the previous row of the cell
+    table = store.read()
+    assert table.to_dict("records") == [
+        {"Key": "b", "Value": "SUCCESS"},
+        {"Key": "a", "Value": 2.0},
+    ]
+    store.upsert([("c", None), ("b", "TIMEOUT")])
+    store.fold(table.index)  # Rows written after reading are kept
+    table = store.read()
+    assert table["Key"].to_list() == ["c", "b"]
+    store.fold(table.index[:1])
+    assert store.read()["Key"].to_list() == ["b"]
+    assert ResultStore.convert(math.nan) is None
+    store.remove()
+    assert not store.exists
+
+
+def test_performance_dataframe_result_store(tmp_path: Path) -> None:
+    """Test merging and folding the results of a PerformanceDataFrame store."""
+    csv_path = tmp_path / "performance_data.csv"
+    pdf = PerformanceDataFrame(
+        csv_path, solvers=["SolverA"], objectives=["PAR10"], instances=["Instance1"]
+    )
+    pdf.use_result_store()
+    store = PerformanceDataFrame.result_store(csv_path)
+    assert store.exists
+    store.upsert([("PAR10", "Instance1", 1, "SolverA", "Default", 3.5, 42)])
+    store.upsert([("PAR10", "Unknown", 1, "SolverA", "Default", 1.0, 1)])
+    with pytest.warns(UserWarning, match="1 results"):
+        pdf = PerformanceDataFrame(csv_path)
+    assert float(pdf.get_value("SolverA", "Instance1", objective="PAR10")) == 3.5
+    assert pdf.get_value("SolverA", "Instance1", solver_fields=["Seed"]) == 42
+    # Jobs appending to the CSV write to the store instead
+    pdf.set_value(
+        [7.0, 1], "SolverA", "Instance1", "Default", "PAR10", 1, ["Value", "Seed"], True
+    )
+    table = store.read()
+    assert table.iloc[-1].to_list() == [
+        "PAR10",
+        "Instance1",
+        1,
+        "SolverA",
+        "Default",
+        7.0,
+        1,
+    ]
+    pdf.save_csv()  # The merged results are removed from the store, later ones kept
+    table = store.read()
+    # The result of the unknown instance survives, until the instance is added
+    assert table[PerformanceDataFrame.index_instance].to_list() == [
+        "Unknown",
+        "Instance1",
+    ]
+    with pytest.warns(UserWarning):
+        pdf = PerformanceDataFrame(csv_path)
+    pdf.add_instance("Unknown")
+    pdf.save_csv()
+    pdf = PerformanceDataFrame(csv_path)
+    assert float(pdf.get_value("SolverA", "Unknown", objective="PAR10")) == 1.0
+    pdf.save_csv()
+    assert store.read().empty
+    assert float(PerformanceDataFrame(csv_path).get_value("SolverA", "Instance1")) == 7.0
+    pdf.use_result_store(False)
+    assert not store.exists
+    assert float(PerformanceDataFrame(csv_path).get_value("SolverA", "Instance1")) == 7.0
+
+
+def test_feature_dataframe_result_store(tmp_path: Path) -> None:
+    """Test merging the features of a FeatureDataFrame store."""
+    csv_path = tmp_path / "feature_data.csv"
+    fdf = FeatureDataFrame(
+        csv_path,
+        instances=["Instance1", "Set/Instance2"],
+        extractor_data={"ExtractorA": [("Group1", "Feature1")]},
+    )
+    fdf.use_result_store()
+    store = FeatureDataFrame.result_store(csv_path)
+    store.upsert(
+        [
+            ("/abs/path/Instance1", "ExtractorA", "Group1", "Feature1", 1.5),
+            ("Set/Instance2", "ExtractorA", "Group1", "Feature1", 2.5),
+            ("Instance1", "ExtractorA", "Group1", "Unknown", 3.0),
+        ]
+    )
+    with pytest.warns(UserWarning, match="1 features"):
+        fdf = FeatureDataFrame(csv_path)
+    assert fdf.get_value("Instance1", "ExtractorA", "Group1", "Feature1") == 1.5
+    assert fdf.get_value("Set/Instance2", "ExtractorA", "Group1", "Feature1") == 2.5
+    fdf.save_csv()
+    # The feature of the unknown column is kept
+    assert store.read()[FeatureDataFrame.feature_name_dim].to_list() == ["Unknown"]
+    assert (
+        FeatureDataFrame(csv_path).get_value(
+            "Instance1", "ExtractorA", "Group1", "Feature1"
+        )
+        == 1.5
+    )
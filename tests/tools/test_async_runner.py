@@ -0,0 +1,55 @@
+"""Tests for the asyncio based local runner."""
+
+import time
+from pathlib import Path
+
+from runrunner.base import Status
+
+from sparkle.tools import async_runner
+
+
+def test_run_refills_and_reports() -> None:
+    """Test that jobs run concurrently and are reported as they finish."""
+    finished = []
+    start = time.perf_counter()
+    run = async_runner.run(
+        ["sleep 0.5", "echo solved", "false", "sleep 0.5"],
+        name="Test",
+        parallel_jobs=2,
+        callback=lambda job: finished.append(job.name),
+    )
+    elapsed = time.perf_counter() - start
+    # The slot of the quick jobs is refilled at once, the sleeps run side by side
+    assert elapsed < 0.9
+    assert finished[:2] == ["Test_2", "Test_3"]
+    assert sorted(finished) == ["Test_1", "Test_2", "Test_3", "Test_4"]
+    assert [job.status for job in run.jobs] == [
+        Status.COMPLETED,
+        Status.COMPLETED,
+        Status.ERROR,
+        Status.COMPLETED,
+    ]
+    assert run.status == Status.ERROR
+    assert run.jobs[1].stdout == "solved\n"
+    assert async_runner.run("does_not_exist").status == Status.ERROR
+
+
+def test_run_race(tmp_path: Path) -> None:
+    """Test that the first successful job of a group kills the others."""
+    outputs = [tmp_path / f"job_{index}.out" for index in range(4)]
+    start = time.perf_counter()
+    run = async_runner.run(
+        ["sleep 10", "echo first", "bash -c 'sleep 10; echo late'", "echo second"],
+        stdout=outputs,
+        group_size=2,
+        race=True,
+    )
+    assert time.perf_counter() - start < 5
+    assert [job.status for job in run.jobs] == [
+        Status.KILLED,
+        Status.COMPLETED,
+        Status.KILLED,
+        Status.COMPLETED,
+    ]
+    assert run.jobs[1].stdout == "first\n"
+    assert outputs[2].read_text() == ""
@@ -0,0 +1,40 @@
+"""Tests for the event-driven completion notification, including their latency."""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from sparkle.tools import completion
+
+
+def test_sentinel_watcher_latency(tmp_path: Path) -> None:
+    """Test that a sentinel is noticed well within the scan interval."""
+    sentinel_dir = tmp_path / "Finished"
+    delay = 0.2
+    with completion.SentinelWatcher(sentinel_dir, scan_interval=5.0) as watcher:
+        inotify = watcher._fd is not None
+        assert watcher.wait(timeout=0.05) == set()
+        timer = threading.Timer(delay, lambda: (sentinel_dir / "3").write_text("0"))
+        start = time.perf_counter()
+        timer.start()
+        assert watcher.wait(timeout=10) == {"3"}
+        latency = time.perf_counter() - start - delay
+        # Seen sentinels are not reported again
+        assert watcher.wait(timeout=0.05) == set()
+    print(f"Sentinel notification latency: {latency * 1000:.1f} ms")
+    if inotify:  # Otherwise the directory is only scanned every 5 seconds
+        assert latency < 1.0
+
+
+def test_sentinel_wrapper(tmp_path: Path) -> None:
+    """Test that the wrapper writes the exit code of the command as sentinel."""
+    sentinel = tmp_path / "0"
+    result = subprocess.run(
+        [sys.executable, completion.__file__, str(sentinel), "echo", "solved"],
+        capture_output=True,
+    )
+    assert result.stdout.decode().strip() == "solved"
+    assert sentinel.read_text() == "0"
+    assert not list(tmp_path.glob(".*"))
@@ -0,0 +1,80 @@
+"""Tests for the R data reader."""
+
+import gzip
+import struct
+from pathlib import Path
+
+from sparkle.tools import rdata
+
+irace_results = Path("tests/test_files/Configuration/test_output_irace.Rdata")
+
+
+def r_int(*values: int) -> bytes:
+    """Encode big endian integers."""
+    return struct.pack(f">{len(values)}i", *values)
+
+
+def r_string(value: str) -> bytes:
+    """Encode a CHARSXP."""
+    return r_int(rdata.CHARSXP, len(value)) + value.encode()
+
+
+def test_read_rdata_irace() -> None:
+    """Test reading the results of an IRACE run."""
+    results = rdata.read_rdata(irace_results)["iraceResults"]
+    assert results["iterationElites"] == [7]
+    configurations = results["allConfigurations"]
+    assert configurations.shape == (8, 25)
+    assert configurations[".ID."].to_list() == list(range(1, 9))
+    assert results["scenario"]["parameterFile"][0].endswith(".pcs")
+
+
+def test_read_rds(tmp_path: Path) -> None:
+    """Test reading a list with a factor, a compact sequence and NA values."""
+    has_attributes, has_tag = 1 << 9, 1 << 10
+    header = b"X\n" + r_int(3, 0x040400, 0x030500, 5) + b"UTF-8"
+    names = r_int(rdata.STRSXP, 3) + r_string("f") + r_string("seq") + r_string("na")
+    factor = (
+        r_int(rdata.INTSXP | has_attributes | (1 << 8), 3, 2, 1, rdata.NA_INTEGER)
+        + r_int(rdata.LISTSXP | has_tag, rdata.SYMSXP)
+        + r_string("levels")
+        + r_int(rdata.STRSXP, 2)
+        + r_string("a")
+        + r_string("b")
+        + r_int(rdata.LISTSXP | has_tag, rdata.SYMSXP)
+        + r_string("class")
+        + r_int(rdata.STRSXP, 1)
+        + r_string("factor")
+        + r_int(rdata.NILVALUE_SXP)
+    )
+    info = (
+        r_int(rdata.LISTSXP, rdata.SYMSXP)
+        + r_string("compact_intseq")
+        + r_int(rdata.LISTSXP, rdata.SYMSXP)
+        + r_string("base")
+        + r_int(rdata.LISTSXP, rdata.INTSXP, 1, rdata.INTSXP, rdata.NILVALUE_SXP)
+    )
+    sequence = (
+        r_int(rdata.ALTREP_SXP)
+        + info
+        + r_int(rdata.REALSXP, 3)
+        + struct.pack(">3d", 4, 10, 2)
+        + r_int(rdata.NILVALUE_SXP)
+    )
+    missing = r_int(rdata.STRSXP, 1, rdata.CHARSXP, -1)
+    data = (
+        header
+        + r_int(rdata.VECSXP | has_attributes, 3)
+        + factor
+        + sequence
+        + missing
+        + r_int(rdata.LISTSXP | has_tag, rdata.SYMSXP)
+        + r_string("names")
+        + names
+        + r_int(rdata.NILVALUE_SXP)
+    )
+    path = tmp_path / "object.rds"
+    path.write_bytes(gzip.compress(data))
+    assert rdata.read_rdata(path) == {
+        None: {"f": ["b", "a", None], "seq": [10, 12, 14, 16], "na": [None]}
+    }